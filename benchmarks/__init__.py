@@ -0,0 +1 @@
+"""Initializes the benchmarks package (run with ``python -m benchmarks``)."""
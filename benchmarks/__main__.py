@@ -0,0 +1,64 @@
+"""
+EcoPulse AI Benchmark Runner.
+Runs the performance suite, writes machine-readable results and compares them with
+the stored baseline::
+
+    python -m benchmarks                       # full run, compare with baseline
+    python -m benchmarks --quick analytics     # smaller workloads, one layer
+    python -m benchmarks --save-baseline       # record a new baseline
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks import cases  # noqa: F401  (registers the benchmark cases)
+from benchmarks.harness import (
+    BASELINE_PATH,
+    DEFAULT_TOLERANCE,
+    compare,
+    format_comparison,
+    load,
+    run,
+    save,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EcoPulse AI performance benchmarks.")
+    parser.add_argument("names", nargs="*", help="benchmark name prefixes (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads (CI smoke run)")
+    parser.add_argument("--output", default="bench_results.json", help="results JSON path")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # keep pipeline INFO logs out of the timings
+    document = run(args.names, quick=args.quick)
+    save(document, args.output)
+    print(f"results written to {args.output}")
+
+    if args.save_baseline:
+        save(document, args.baseline)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against (run with --save-baseline)")
+        return 0
+
+    baseline = load(args.baseline)
+    if baseline["meta"].get("quick") != args.quick:
+        print("note: baseline and current run use different workload sizes")
+    rows = compare(document, baseline, args.tolerance)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+EcoPulse AI Benchmark Cases.
+Hot paths measured by the suite, on deterministic synthetic telemetry and on the
+recorded capture in ``data/sensor_stream.jsonl``.
+"""
+
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.harness import Metrics, benchmark, latency_stats, throughput, time_calls
+from ecopulse_ai.config import REPLAY_FILE, SIMULATOR_DISTRICTS
+
+SEED = 2026
+
+
+def synthetic_records(n: int, sensors: int = 50, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Deterministic telemetry spread over ``sensors`` sensors and the simulator districts."""
+    rng = random.Random(seed)
+    districts = SIMULATOR_DISTRICTS
+    return [
+        {
+            "timestamp": f"2026-02-25T10:{(i // 60) % 60:02d}:{i % 60:02d}",
+            "sensor_id": f"SENSOR-{i % sensors:05d}",
+            "district": districts[i % len(districts)],
+            "aqi": rng.uniform(20, 380),
+            "pm25": rng.uniform(5, 160),
+            "co2": rng.uniform(350, 2200),
+            "temperature": rng.uniform(15, 40),
+            "humidity": rng.uniform(20, 90),
+            "wind_speed": rng.uniform(0, 25),
+            "traffic_density": rng.uniform(0, 100),
+            "industrial_index": rng.uniform(0, 60),
+        }
+        for i in range(n)
+    ]
+
+
+def capture_records(limit: int = 0) -> List[Dict[str, Any]]:
+    """Normalized records of the recorded capture (all of them when ``limit`` is 0)."""
+    from ecopulse_ai.streaming.replay import normalize_records, scan_lines
+    from ecopulse_ai.streaming.vectorized import decode_batch
+
+    records: List[Dict[str, Any]] = []
+    for lines in scan_lines(REPLAY_FILE):
+        records.extend(normalize_records(decode_batch(lines)))
+        if limit and len(records) >= limit:
+            return records[:limit]
+    return records
+
+
+def enriched_history(n: int = 100) -> List[Dict[str, Any]]:
+    from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics_batch
+
+    return calculate_analytics_batch(capture_records(n), hour=12)
+
+
+@contextmanager
+def serve(app: Any) -> Iterator[str]:
+    """Serves a WSGI app on an ephemeral local port with a threaded server."""
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+# --- Analytics ---
+
+
+@benchmark("analytics.calculate_analytics")
+def bench_calculate_analytics(quick: bool) -> Metrics:
+    """Scalar per-record enrichment with live per-sensor rolling statistics."""
+    from ecopulse_ai.analytics.rolling import RollingStats
+    from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics
+
+    records = synthetic_records(2000 if quick else 20000)
+    stats: Dict[str, RollingStats] = {}
+
+    def run() -> int:
+        for record in records:
+            sensor_stats = stats.setdefault(record["sensor_id"], RollingStats())
+            calculate_analytics(record, stats=sensor_stats)
+        return len(records)
+
+    return {"records_per_sec": throughput(run)}
+
+
+@benchmark("analytics.calculate_analytics_batch")
+def bench_calculate_analytics_batch(quick: bool) -> Metrics:
+    """Vectorized micro-batch enrichment (500-record batches) into the state store."""
+    from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics_batch
+    from ecopulse_ai.streaming.state_store import SensorStateStore
+
+    records = synthetic_records(5000 if quick else 50000)
+    batches = [records[i : i + 500] for i in range(0, len(records), 500)]
+    state = SensorStateStore()
+
+    def run() -> int:
+        for batch in batches:
+            state.append_batch(calculate_analytics_batch(batch, state=state, hour=12))
+        return len(records)
+
+    return {"records_per_sec": throughput(run)}
+
+
+@benchmark("analytics.replay_capture")
+def bench_replay_capture(quick: bool) -> Metrics:
+    """End-to-end replay of the recorded capture: mmap scan, decode, analytics, state."""
+    from ecopulse_ai.streaming.replay import analytics_sink, replay
+    from ecopulse_ai.streaming.state_store import SensorStateStore
+
+    limit = 1000 if quick else None
+
+    def run() -> int:
+        return replay(REPLAY_FILE, analytics_sink(SensorStateStore()), limit=limit).records
+
+    return {"records_per_sec": throughput(run)}
+
+
+# --- Forecasting & Alerts ---
+
+
+@benchmark("forecast.horizon")
+def bench_forecast(quick: bool) -> Metrics:
+    """Web-tier forecast from a 20-point history, and the engine's streaming forecaster."""
+    from ecopulse_ai.analytics.prediction import StreamingForecaster, get_forecast_horizon
+
+    history = [r["aqi"] for r in synthetic_records(20)]
+    calls = 500 if quick else 5000
+    metrics = latency_stats(time_calls(lambda: get_forecast_horizon(history, 5), calls))
+
+    forecaster = StreamingForecaster()
+    values = iter([r["aqi"] for r in synthetic_records(calls + 10, sensors=1)])
+
+    def step() -> None:
+        forecaster.push(next(values))
+        forecaster.horizon(5)
+
+    metrics.update(latency_stats(time_calls(step, calls), prefix="streaming_"))
+    return metrics
+
+
+@benchmark("alerts.get_alert_status")
+def bench_alerts(quick: bool) -> Metrics:
+    """Threshold evaluation over the recorded capture."""
+    from ecopulse_ai.analytics.alerts import get_alert_status
+
+    records = capture_records(1000 if quick else 0)
+
+    def run() -> int:
+        for record in records:
+            get_alert_status(record)
+        return len(records)
+
+    return {"records_per_sec": throughput(run)}
+
+
+# --- Web API ---
+
+
+@benchmark("api.metrics_proxy")
+def bench_metrics_proxy(quick: bool) -> Metrics:
+    """
+    Concurrent authenticated clients polling ``/api/metrics`` through the web tier,
+    backed by a real engine HTTP server holding the replayed capture.
+    """
+    from ecopulse_ai.api import engine_client
+    from ecopulse_ai.api.app import create_app
+    from ecopulse_ai.streaming.pathway_pipeline import create_shim_app
+    from ecopulse_ai.streaming.replay import analytics_sink, replay
+    from ecopulse_ai.streaming.state_store import SensorStateStore
+
+    state = SensorStateStore()
+    replay(REPLAY_FILE, analytics_sink(state), limit=500)
+    clients, per_client = (4, 25) if quick else (16, 100)
+
+    with (
+        serve(create_shim_app(state)) as engine_url,
+        mock.patch.object(
+            engine_client, "_client", engine_client.EngineClient(base_url=engine_url)
+        ),
+        serve(create_app()) as web_url,
+    ):
+
+        def client(_: int) -> List[float]:
+            session = requests.Session()
+            session.post(
+                f"{web_url}/login",
+                data={"email": "admin@ecopulse.ai", "password": "greenbharat2026"},
+                allow_redirects=False,
+            )
+            samples = []
+            for _ in range(per_client):
+                response = session.get(f"{web_url}/api/metrics", timeout=10)
+                response.raise_for_status()
+                samples.append(response.elapsed.total_seconds())
+            return samples
+
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(client, range(clients)))  # warm-up (connections, cache)
+            start = time.perf_counter()
+            samples = [s for batch in pool.map(client, range(clients)) for s in batch]
+            elapsed = time.perf_counter() - start
+
+    return {
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        **latency_stats(samples),
+    }
+
+
+# --- Reports ---
+
+
+@benchmark("reports.pdf")
+def bench_reports(quick: bool) -> Metrics:
+    """PDF rendering time of the full audit and the mayor briefing."""
+    from ecopulse_ai.reports.generator import generate_full_report, generate_mayor_briefing
+
+    data = enriched_history(100)
+    calls = 2 if quick else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        full = time_calls(lambda: generate_full_report(data, f"{tmp}/full.pdf"), calls, 1)
+        mayor = time_calls(lambda: generate_mayor_briefing(data, f"{tmp}/mayor.pdf"), calls, 1)
+    return {**latency_stats(full, prefix="full_"), **latency_stats(mayor, prefix="mayor_")}
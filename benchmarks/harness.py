@@ -0,0 +1,168 @@
+"""
+EcoPulse AI Benchmark Harness.
+Registry, timing helpers and baseline comparison for the performance suite. Every
+benchmark returns flat numeric metrics; names ending in ``_per_sec`` are
+throughputs (higher is better), everything else (``_ms``, ``_s``) is a latency
+(lower is better). Results are written as JSON and compared against a stored
+baseline with a relative tolerance; maxima are recorded but too noisy to gate on.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+Metrics = Dict[str, float]
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25  # 25% slower than baseline counts as a regression
+
+REGISTRY: Dict[str, Callable[[bool], Metrics]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable[[bool], Metrics]], Callable[[bool], Metrics]]:
+    """
+    Registers a benchmark. The function receives ``quick`` (smaller workloads for CI)
+    and returns its metrics.
+    """
+
+    def register(fn: Callable[[bool], Metrics]) -> Callable[[bool], Metrics]:
+        REGISTRY[name] = fn
+        return fn
+
+    return register
+
+
+def latency_stats(samples: List[float], prefix: str = "") -> Metrics:
+    """Median, p95 and max of per-call durations (seconds in, milliseconds out)."""
+    ms = np.array(samples) * 1000
+    p50, p95 = np.percentile(ms, [50, 95])
+    return {
+        f"{prefix}p50_ms": round(float(p50), 4),
+        f"{prefix}p95_ms": round(float(p95), 4),
+        f"{prefix}max_ms": round(float(ms.max()), 4),
+    }
+
+
+def time_calls(fn: Callable[[], Any], calls: int, warmup: int = 3) -> List[float]:
+    """Durations of ``calls`` sequential invocations of ``fn`` after a short warm-up."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def throughput(fn: Callable[[], int], repeat: int = 3) -> float:
+    """Best-of-``repeat`` items per second for ``fn``, which returns the items it processed."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        best = max(best, items / max(time.perf_counter() - start, 1e-9))
+    return round(best, 1)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Machine and revision metadata stored next to the results."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(names: Optional[List[str]] = None, quick: bool = False) -> Dict[str, Any]:
+    """Runs the selected benchmarks (all by default) and returns the results document."""
+    results: Dict[str, Metrics] = {}
+    for name, fn in REGISTRY.items():
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        print(f"running {name} ...", flush=True)
+        results[name] = fn(quick)
+    return {"meta": {**environment(), "quick": quick}, "results": results}
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def gated(metric: str) -> bool:
+    """Whether a metric takes part in regression checks."""
+    return not metric.endswith("max_ms")
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """
+    Compares every metric present in both documents.
+
+    Returns:
+        List[Dict[str, Any]]: One row per metric with the baseline and current values,
+        the change (positive = better) and whether it regressed beyond ``tolerance``.
+    """
+    rows = []
+    for name, metrics in current.get("results", {}).items():
+        reference = baseline.get("results", {}).get(name, {})
+        for metric, value in metrics.items():
+            base = reference.get(metric)
+            if not gated(metric) or base is None or base == 0 or value is None:
+                continue
+            change = (value - base) / base
+            if not higher_is_better(metric):
+                change = -change
+            rows.append(
+                {
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": base,
+                    "current": value,
+                    "change": round(change, 4),
+                    "regression": change < -tolerance,
+                }
+            )
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':36} {'metric':18} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['benchmark']:36} {row['metric']:18} {row['baseline']:>12} "
+            f"{row['current']:>12} {row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(document: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -1,63 +1,27 @@
 import logging
-from typing import List, Dict, Any
-from ecopulse_ai.config import THRESHOLDS
+from typing import List, Dict, Any, Optional
+from ecopulse_ai.analytics.rules import RULES
 
 logger = logging.getLogger("Analytics-Alerts")
 
 
-def get_alert_status(current_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+def get_alert_status(
+    current_data: Dict[str, Any], hour: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
     Evaluates current environmental telemetry against predefined safety thresholds.
 
+    Every metric in ``config.THRESHOLDS`` (AQI, PM2.5, CO2) is checked against the
+    compiled rule set; each raises at most one alert, at the highest level reached.
+
     Args:
         current_data (Dict[str, Any]): Dictionary containing sensor readings (aqi, co2, etc.).
+        hour (Optional[int]): Local hour, enabling peak-hour threshold adjustments.
 
     Returns:
         List[Dict[str, Any]]: A list of active alert dictionaries with severity and recommendations.
     """
-    alerts: List[Dict[str, Any]] = []
-
-    # Air Quality Index (AQI) Evaluation
-    aqi = float(current_data.get("aqi", 0))
-    if aqi >= THRESHOLDS["AQI"]["emergency"]:
-        alerts.append(
-            {
-                "type": "AQI",
-                "level": "Emergency",
-                "value": aqi,
-                "msg": "Hazardous air quality! Immediate shelter advised. Cease all outdoor activities.",
-            }
-        )
-    elif aqi >= THRESHOLDS["AQI"]["critical"]:
-        alerts.append(
-            {
-                "type": "AQI",
-                "level": "Critical",
-                "value": aqi,
-                "msg": "Very unhealthy air levels detected. High-risk groups should remain indoors.",
-            }
-        )
-    elif aqi >= THRESHOLDS["AQI"]["warning"]:
-        alerts.append(
-            {
-                "type": "AQI",
-                "level": "Warning",
-                "value": aqi,
-                "msg": "Air quality is deteriorating. Moderate health risks for sensitive individuals.",
-            }
-        )
-
-    # Carbon Dioxide (CO2) Evaluation
-    co2 = float(current_data.get("co2", 0))
-    if co2 >= THRESHOLDS["CO2"]["warning"]:
-        alerts.append(
-            {
-                "type": "CO2",
-                "level": "Warning",
-                "value": co2,
-                "msg": "High carbon dioxide levels detected. Ventilation and air circulation required.",
-            }
-        )
-
-    logger.debug(f"Calculated {len(alerts)} active alerts for current data state.")
+    alerts = RULES.evaluate(current_data, hour)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Calculated {len(alerts)} active alerts for current data state.")
     return alerts
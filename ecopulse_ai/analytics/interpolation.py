@@ -0,0 +1,342 @@
+"""
+EcoPulse AI Spatial Interpolation.
+Continuous AQI surfaces between sensors: inverse-distance weighting and a kriging-lite
+(ordinary kriging with a fixed exponential variogram) evaluated in bulk with NumPy over
+the k nearest sensors of every grid point. The surface is cut into fixed lat/lon tiles
+that are cached and recomputed only after a sensor within reach of them changes.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ecopulse_ai.analytics.spatial import BBox, Cell
+from ecopulse_ai.config import (
+    HEATMAP_CACHE_TILES,
+    HEATMAP_IDW_POWER,
+    HEATMAP_KRIGING_NUGGET,
+    HEATMAP_KRIGING_RANGE,
+    HEATMAP_MAX_TILES,
+    HEATMAP_NEIGHBORS,
+    HEATMAP_RADIUS_DEGREES,
+    HEATMAP_REFRESH_SECONDS,
+    HEATMAP_TILE_CELLS,
+    HEATMAP_TILE_DEGREES,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional: neighbours then come from a chunked brute-force search
+    cKDTree = None
+
+logger = logging.getLogger("Analytics-Interpolation")
+
+HEATMAP_TILES = REGISTRY.counter(
+    "ecopulse_heatmap_tiles_total", "Heatmap tiles served", ("outcome",)
+)
+
+_SEARCH_BLOCK = 1 << 20  # distance-matrix entries per brute-force chunk
+_KRIGING_BLOCK = 4096  # grid points solved per batched linear system
+_TILE_STRIDE = 1 << 32  # packs a tile (i, j) into i * stride + j for vectorized dedupe
+
+# (layout_version, sensor lat/lon (n, 2), latest values (n,))
+PointSource = Callable[[], Tuple[int, np.ndarray, np.ndarray]]
+# (tile generation it was computed at, monotonic time, rendered tile or None when empty)
+TileEntry = Tuple[int, float, Optional[Dict[str, Any]]]
+
+
+class NeighborIndex:
+    """
+    k-nearest-neighbour search over sensor positions within a radius.
+
+    Positions are projected to a local equirectangular plane (longitude scaled by the
+    cosine of the mean latitude) so distances read as degrees of latitude. Uses SciPy's
+    KD-tree when installed; otherwise a vectorized brute-force search in chunks, which
+    returns the same ``(distances, indices)`` layout (``inf`` / ``size`` for misses).
+    """
+
+    def __init__(self, positions: np.ndarray):
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.size = len(positions)
+        self._scale = math.cos(math.radians(float(positions[:, 0].mean()))) if self.size else 1.0
+        self.points = self.project(positions)
+        self._tree = cKDTree(self.points) if cKDTree is not None and self.size else None
+
+    def project(self, latlon: np.ndarray) -> np.ndarray:
+        return np.column_stack([latlon[:, 0], latlon[:, 1] * self._scale])
+
+    def query(self, targets: np.ndarray, k: int, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The ``k`` nearest sensors of each target (lat/lon) strictly within ``radius``.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: ``(m, k)`` distances and sensor indices,
+            nearest first; missing neighbours are ``inf`` and ``size``.
+        """
+        xy = self.project(np.asarray(targets, dtype=np.float64).reshape(-1, 2))
+        if self._tree is not None:
+            d, idx = self._tree.query(xy, k=k, distance_upper_bound=radius)
+            return d.reshape(len(xy), k), idx.reshape(len(xy), k)
+
+        d = np.full((len(xy), k), np.inf)
+        idx = np.full((len(xy), k), self.size, dtype=np.intp)
+        if not self.size:
+            return d, idx
+        take = min(k, self.size)
+        step = max(1, _SEARCH_BLOCK // self.size)
+        for start in range(0, len(xy), step):
+            block = xy[start : start + step]
+            d2 = ((block[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2)
+            if take < self.size:
+                near = np.argpartition(d2, take - 1, axis=1)[:, :take]
+            else:
+                near = np.broadcast_to(np.arange(self.size), (len(block), self.size))
+            near_d2 = np.take_along_axis(d2, near, axis=1)
+            order = np.argsort(near_d2, axis=1, kind="stable")
+            dist = np.sqrt(np.take_along_axis(near_d2, order, axis=1))
+            found = np.take_along_axis(near, order, axis=1)
+            inside = dist < radius
+            d[start : start + len(block), :take] = np.where(inside, dist, np.inf)
+            idx[start : start + len(block), :take] = np.where(inside, found, self.size)
+        return d, idx
+
+
+def _neighbours(
+    index: NeighborIndex, values: np.ndarray, targets: np.ndarray, k: int, radius: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Neighbour distances, indices, values and validity mask of each target."""
+    d, idx = index.query(targets, k, radius)
+    v = np.append(np.asarray(values, dtype=np.float64), np.nan)[idx]
+    valid = np.isfinite(d) & ~np.isnan(v)
+    return d, idx, np.where(valid, v, 0.0), valid
+
+
+def idw(
+    index: NeighborIndex,
+    values: np.ndarray,
+    targets: np.ndarray,
+    k: int = HEATMAP_NEIGHBORS,
+    radius: float = HEATMAP_RADIUS_DEGREES,
+    power: float = HEATMAP_IDW_POWER,
+) -> np.ndarray:
+    """
+    Inverse-distance-weighted estimate at each target (NaN with no sensor in range).
+    A target on top of a sensor takes that sensor's value.
+    """
+    out = np.full(len(targets), np.nan)
+    if not index.size or not len(targets):
+        return out
+    d, _, v, valid = _neighbours(index, values, targets, k, radius)
+    weights = np.where(valid, 1.0 / np.maximum(d, 1e-9) ** power, 0.0)
+    total = weights.sum(axis=1)
+    covered = total > 0
+    out[covered] = (weights[covered] * v[covered]).sum(axis=1) / total[covered]
+    return out
+
+
+def _variogram(h: np.ndarray, practical_range: float, nugget: float) -> np.ndarray:
+    """Unit-sill exponential variogram (0 at the origin, nugget just beyond it)."""
+    return np.where(
+        h > 0, nugget + (1.0 - nugget) * (1.0 - np.exp(-3.0 * h / practical_range)), 0.0
+    )
+
+
+def kriging(
+    index: NeighborIndex,
+    values: np.ndarray,
+    targets: np.ndarray,
+    k: int = HEATMAP_NEIGHBORS,
+    radius: float = HEATMAP_RADIUS_DEGREES,
+    practical_range: float = HEATMAP_KRIGING_RANGE,
+    nugget: float = HEATMAP_KRIGING_NUGGET,
+) -> np.ndarray:
+    """
+    Ordinary-kriging estimate at each target from its ``k`` nearest sensors in range.
+
+    "Lite": the variogram is fixed rather than fitted (ordinary-kriging weights do not
+    depend on the sill), and each target's (k+1)-square system is solved in batches
+    with ``np.linalg.solve``. Missing neighbours get zero weight; estimates are
+    clipped at zero.
+    """
+    out = np.full(len(targets), np.nan)
+    if not index.size or not len(targets):
+        return out
+    d, idx, v, valid = _neighbours(index, values, targets, k, radius)
+    rows = np.flatnonzero(valid.any(axis=1))
+    padded = np.vstack([index.points, np.zeros((1, 2))])
+    diagonal = np.arange(k)
+
+    for start in range(0, len(rows), _KRIGING_BLOCK):
+        sel = rows[start : start + _KRIGING_BLOCK]
+        ok = valid[sel]
+        pts = padded[idx[sel]]
+        pair = np.linalg.norm(pts[:, :, None, :] - pts[:, None, :, :], axis=3)
+
+        system = np.zeros((len(sel), k + 1, k + 1))
+        system[:, :k, :k] = _variogram(pair, practical_range, nugget) * (
+            ok[:, :, None] & ok[:, None, :]
+        )
+        system[:, diagonal, diagonal] = ~ok  # isolates missing neighbours (weight 0)
+        system[:, :k, k] = ok
+        system[:, k, :k] = ok
+        rhs = np.zeros((len(sel), k + 1))
+        rhs[:, :k] = np.where(ok, _variogram(d[sel], practical_range, nugget), 0.0)
+        rhs[:, k] = 1.0
+        try:
+            weights = np.linalg.solve(system, rhs[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:  # co-located sensors make a system singular
+            weights = (np.linalg.pinv(system) @ rhs[:, :, None])[:, :, 0]
+        out[sel] = np.maximum((weights[:, :k] * v[sel]).sum(axis=1), 0.0)
+    return out
+
+
+INTERPOLATORS: Dict[str, Callable[..., np.ndarray]] = {"idw": idw, "kriging": kriging}
+
+
+class HeatmapTiles:
+    """
+    Cache of interpolated AQI tiles with per-tile dirty tracking.
+
+    Tile ``(i, j)`` covers latitudes ``[i, i + 1) * tile`` and longitudes
+    ``[j, j + 1) * tile``, sampled at ``cells`` x ``cells`` cell centres. The state
+    store calls ``invalidate`` with the positions of sensors whose reading changed,
+    which bumps the generation of every tile within the neighbour radius; ``tiles``
+    serves cached tiles and recomputes, in one vectorized pass, only the requested
+    ones that are missing or dirty (and older than ``refresh`` seconds).
+
+    Args:
+        source (PointSource): Returns the current sensor layout version, positions and
+            latest values (the KD-tree is rebuilt only when the layout changes).
+    """
+
+    def __init__(
+        self,
+        source: PointSource,
+        tile: float = HEATMAP_TILE_DEGREES,
+        cells: int = HEATMAP_TILE_CELLS,
+        radius: float = HEATMAP_RADIUS_DEGREES,
+        refresh: float = HEATMAP_REFRESH_SECONDS,
+        capacity: int = HEATMAP_CACHE_TILES,
+        max_tiles: int = HEATMAP_MAX_TILES,
+    ):
+        self._source = source
+        self.tile = tile
+        self.cells = cells
+        self.radius = radius
+        self.refresh = refresh
+        self.capacity = capacity
+        self.max_tiles = max_tiles
+        self._generation: Dict[Cell, int] = {}
+        self._spreads: Dict[Tuple[int, int], np.ndarray] = {}  # tile offsets per reach
+        self._cache: "OrderedDict[Tuple[str, Cell], TileEntry]" = OrderedDict()
+        self._index: Optional[NeighborIndex] = None
+        self._layout = -1
+        self._lock = threading.Lock()
+        offsets = (np.arange(cells) + 0.5) / cells
+        lat, lon = np.meshgrid(offsets, offsets, indexing="ij")
+        self._offsets = np.column_stack([lat.ravel(), lon.ravel()])
+
+    def invalidate(self, positions: np.ndarray) -> None:
+        """Marks every tile within reach of the given sensor positions as dirty."""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if not len(positions):
+            return
+        widest = math.cos(math.radians(min(80.0, float(np.abs(positions[:, 0]).max()))))
+        reach_lat = int(math.ceil(self.radius / self.tile))
+        reach_lon = int(math.ceil(self.radius / (self.tile * widest)))
+        cells = np.floor(positions / self.tile).astype(np.int64)
+        base = np.unique(cells[:, 0] * _TILE_STRIDE + cells[:, 1])  # one int key per tile
+        spread = self._spreads.get((reach_lat, reach_lon))
+        if spread is None:
+            di, dj = np.meshgrid(
+                np.arange(-reach_lat, reach_lat + 1),
+                np.arange(-reach_lon, reach_lon + 1),
+                indexing="ij",
+            )
+            spread = self._spreads[(reach_lat, reach_lon)] = (di * _TILE_STRIDE + dj).ravel()
+        touched = np.unique(base[:, None] + spread[None, :])
+        rows = (touched + _TILE_STRIDE // 2) // _TILE_STRIDE
+        with self._lock:
+            for key in zip(rows.tolist(), (touched - rows * _TILE_STRIDE).tolist()):
+                self._generation[key] = self._generation.get(key, 0) + 1
+
+    def tile_keys(self, bbox: BBox) -> List[Cell]:
+        """Tiles overlapping ``bbox``, south-west first."""
+        min_lat, min_lon, max_lat, max_lon = bbox
+        i0, j0 = math.floor(min_lat / self.tile), math.floor(min_lon / self.tile)
+        i1, j1 = math.floor(max_lat / self.tile), math.floor(max_lon / self.tile)
+        count = (i1 - i0 + 1) * (j1 - j0 + 1)
+        if count > self.max_tiles:
+            raise ValueError(f"bbox spans {count} tiles (limit {self.max_tiles})")
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def _grid(self, key: Cell) -> np.ndarray:
+        return (np.array(key, dtype=np.float64) + self._offsets) * self.tile
+
+    def _render(self, key: Cell, field: np.ndarray) -> Optional[Dict[str, Any]]:
+        if np.isnan(field).all():
+            return None  # no sensor within reach: nothing to draw
+        grid = np.round(field, 1).reshape(self.cells, self.cells).tolist()
+        i, j = key
+        return {
+            "tile": [i, j],
+            "bounds": [
+                round(i * self.tile, 6),
+                round(j * self.tile, 6),
+                round((i + 1) * self.tile, 6),
+                round((j + 1) * self.tile, 6),
+            ],
+            "cells": self.cells,
+            "values": [[None if x != x else x for x in row] for row in grid],
+        }
+
+    def tiles(self, bbox: BBox, method: str = "idw") -> List[Dict[str, Any]]:
+        """
+        Interpolated tiles overlapping ``bbox`` that have at least one sensor in reach.
+        Each tile's ``values`` rows run south to north, columns west to east.
+
+        Raises:
+            ValueError: For an unknown method or a bbox spanning too many tiles.
+        """
+        interpolate = INTERPOLATORS.get(method)
+        if interpolate is None:
+            raise ValueError(f"Unknown interpolation method: {method}")
+        keys = self.tile_keys(bbox)
+        now = time.monotonic()
+        results: Dict[Cell, Optional[Dict[str, Any]]] = {}
+        stale: List[Tuple[Cell, int]] = []
+        with self._lock:
+            for key in keys:
+                generation = self._generation.get(key, 0)
+                entry = self._cache.get((method, key))
+                if entry is not None and (entry[0] == generation or now - entry[1] < self.refresh):
+                    self._cache.move_to_end((method, key))
+                    results[key] = entry[2]
+                else:
+                    stale.append((key, generation))
+        HEATMAP_TILES.labels("hit").inc(len(keys) - len(stale))
+
+        if stale:
+            layout, positions, values = self._source()
+            with self._lock:
+                if layout != self._layout or self._index is None:
+                    self._index, self._layout = NeighborIndex(positions), layout
+                index = self._index
+            targets = np.vstack([self._grid(key) for key, _ in stale])
+            field = interpolate(index, values, targets).reshape(len(stale), -1)
+            rendered = [self._render(key, row) for (key, _), row in zip(stale, field)]
+            with self._lock:
+                for (key, generation), tile in zip(stale, rendered):
+                    self._cache[(method, key)] = (generation, now, tile)
+                    self._cache.move_to_end((method, key))
+                    results[key] = tile
+                while len(self._cache) > self.capacity:
+                    self._cache.popitem(last=False)
+            HEATMAP_TILES.labels("computed").inc(len(stale))
+        return [results[key] for key in keys if results[key] is not None]
@@ -1,15 +1,13 @@
 import json
 import logging
-from typing import Dict, Any, List
-from openai import OpenAI
-from ecopulse_ai.config import OPENAI_API_KEY
+from typing import Dict, Any, List, Tuple
 from ecopulse_ai.analytics.health_score import calculate_composite_health
+from ecopulse_ai.config import PLAN_FORECAST_BUCKET
+from ecopulse_ai.rag.gateway import aqi_bucket, get_gateway, telemetry_fingerprint
+from ecopulse_ai.rag.providers import LOCAL_PROVIDER, get_provider
 
 logger = logging.getLogger("Analytics-Planner")
 
-# Initialize OpenAI client with project-wide key
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 PLANNER_PROMPT = """
 You are the EcoPulse AI Smart City Operations Planner.
 Your task is to generate a detailed, AI-driven operational plan called "Today's Air Action Plan" based on environmental data.
@@ -39,16 +37,57 @@ Be specific and professional.
 """
 
 
+def risk_probability(current_aqi: float, forecast: Any) -> float:
+    """
+    Heuristic deterioration risk (5-95%): the current AQI share of 300, nudged up when
+    the forecast rises above it. A non-numeric forecast counts as no upward trend.
+    """
+    try:
+        rising = float(forecast) > current_aqi
+    except (TypeError, ValueError):
+        rising = False
+    risk_prob = min(95, (current_aqi / 300) * 100 + (10 if rising else -5))
+    return round(max(5, risk_prob), 1)
+
+
+def plan_trigger(
+    latest_metrics: Dict[str, Any], forecast: Any, alerts: List[Dict[str, Any]]
+) -> Tuple[Any, ...]:
+    """
+    The inputs a plan is regenerated for: severity band, ``PLAN_FORECAST_BUCKET``-wide
+    forecast bucket and the active alert set. Plans are kept while these are unchanged.
+    """
+    severity, _, alert_set = telemetry_fingerprint(latest_metrics, alerts)
+    return severity, aqi_bucket(forecast, PLAN_FORECAST_BUCKET), alert_set
+
+
+def _request_plan(context: str, facts: Dict[str, Any]) -> Dict[str, Any]:
+    """One JSON-mode completion (raises on failure so fallbacks are never cached)."""
+    messages = [
+        {"role": "system", "content": PLANNER_PROMPT},
+        {"role": "user", "content": f"Generate the action plan for this context: {context}"},
+    ]
+    return json.loads(
+        get_provider().complete("action_plan", messages, facts, timeout=10.0, json_mode=True)
+    )
+
+
 def generate_action_plan(
-    latest_metrics: Dict[str, Any], forecast: float, alerts: List[Dict[str, Any]]
+    latest_metrics: Dict[str, Any],
+    forecast: Any,
+    alerts: List[Dict[str, Any]],
+    refresh: bool = False,
 ) -> Dict[str, Any]:
     """
     Orchestrates the generation of an AI-driven operational plan using the Greenhouse Gas Health engine.
+    The LLM plan is shared through the gateway while the ``plan_trigger`` is unchanged;
+    health score, risk and metrics are always the current ones.
 
     Args:
         latest_metrics (Dict[str, Any]): The latest sensor telemetry.
-        forecast (float): The projected AQI for the next period.
+        forecast (Any): The projected AQI for the next period (or a status string).
         alerts (List[Dict[str, Any]]): Currently active system alerts.
+        refresh (bool): Bypass the gateway cache and request a new plan.
 
     Returns:
         Dict[str, Any]: A structured action plan from the LLM or a safe fallback.
@@ -62,8 +101,7 @@ def generate_action_plan(
 
     # Calculate a heuristic risk probability based on current levels and trends
     current_aqi = latest_metrics.get("aqi", 0)
-    risk_prob = min(95, (current_aqi / 300) * 100 + (10 if forecast > current_aqi else -5))
-    risk_prob = round(max(5, risk_prob), 1)
+    risk_prob = risk_probability(current_aqi, forecast)
 
     context = f"""
     Live AQI: {current_aqi}
@@ -73,57 +111,29 @@ def generate_action_plan(
     Calculated Risk Probability: {risk_prob}%
     """
 
+    facts = {
+        "aqi": current_aqi,
+        "forecast": forecast,
+        "alerts": len(alerts),
+        "health_score": health_score,
+        "risk_prob": risk_prob,
+    }
+
     try:
         logger.info("Requesting operational action plan from AI engine...")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": PLANNER_PROMPT},
-                {
-                    "role": "user",
-                    "content": f"Generate the action plan for this context: {context}",
-                },
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            timeout=10.0,
-        )
-
-        plan = json.loads(response.choices[0].message.content)
-
-        # Enforce consistent structure
-        plan.update(
-            {"health_score": health_score, "risk_prob": risk_prob, "metrics": latest_metrics}
+        plan = dict(
+            get_gateway().call(
+                "action_plan",
+                "",
+                plan_trigger(latest_metrics, forecast, alerts),
+                lambda: _request_plan(context, facts),
+                refresh=refresh,
+            )
         )
-        return plan
-
     except Exception as e:
         logger.warning(f"AI Plan Generation failed (using static fallback): {e}")
-        return {
-            "summary": "Air quality is deteriorating; proactive measures required.",
-            "recommendations": [
-                {
-                    "title": "Commute Advisory",
-                    "description": "Encourage remote work for non-essential sectors to reduce peak traffic emissions.",
-                    "impact": "High",
-                },
-                {
-                    "title": "Industrial Regulation",
-                    "description": "Implement Stage 1 output reduction for high-emission plants in the industrial belt.",
-                    "impact": "Medium",
-                },
-                {
-                    "title": "Public Safety",
-                    "description": "Postpone all outdoor school activities and city marathons.",
-                    "impact": "High",
-                },
-            ],
-            "projected_impacts": [
-                {"metric": "Expected AQI Reduction", "value": "12-18%"},
-                {"metric": "Health Risk Improvement", "value": "25%"},
-            ],
-            "operational_readiness": "Partial",
-            "health_score": health_score,
-            "risk_prob": risk_prob,
-            "metrics": latest_metrics,
-        }
+        plan = json.loads(LOCAL_PROVIDER.complete("action_plan", [], facts))
+
+    # Enforce consistent structure
+    plan.update({"health_score": health_score, "risk_prob": risk_prob, "metrics": latest_metrics})
+    return plan
@@ -1,18 +1,242 @@
-import numpy as np
+import math
 import logging
-from typing import List, Union
-from sklearn.linear_model import LinearRegression
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
+from ecopulse_ai.analytics.rolling import RollingWindow
+from ecopulse_ai.config import (
+    FORECAST_CONFIDENCE_Z,
+    FORECAST_WINDOW,
+    HOLT_ALPHA,
+    HOLT_BETA,
+    HOLT_GAMMA,
+    HOLT_SEASON_LENGTH,
+)
 
 logger = logging.getLogger("Analytics-Prediction")
 
 
+class StreamingTrend:
+    """
+    Sliding-window ordinary least squares kept as sufficient statistics.
+
+    The window is indexed ``x = 0 .. n-1`` (oldest first). Appending a point adds its
+    contribution to the running sums; evicting the oldest point removes it and shifts
+    every remaining ``x`` down by one, which is a closed-form adjustment of the sums.
+    Both the fit and a prediction are therefore O(1) regardless of window length.
+    """
+
+    def __init__(self, window: int = FORECAST_WINDOW):
+        if window < 2:
+            raise ValueError("Trend window must hold at least two points.")
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._sx = 0.0
+        self._sxx = 0.0
+        self._sy = 0.0
+        self._syy = 0.0
+        self._sxy = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            n = len(self._values)  # points remaining, still indexed 1..n
+            self._sy -= old
+            self._syy -= old * old
+            # Drop x=0, then re-index x -> x-1 for the remaining points
+            self._sxy = self._sxy - self._sy
+            self._sxx = self._sxx - 2.0 * self._sx + n
+            self._sx = self._sx - n
+
+        x = float(len(self._values))
+        self._values.append(value)
+        self._sx += x
+        self._sxx += x * x
+        self._sy += value
+        self._syy += value * value
+        self._sxy += x * value
+
+    def coefficients(self) -> Optional[Dict[str, float]]:
+        """
+        Returns the fitted intercept, slope and residual standard error, or None if
+        fewer than two points are available.
+        """
+        n = len(self._values)
+        if n < 2:
+            return None
+        sxx_c = self._sxx - self._sx * self._sx / n
+        if sxx_c <= 0:
+            return None
+        slope = (self._sxy - self._sx * self._sy / n) / sxx_c
+        intercept = (self._sy - slope * self._sx) / n
+        sse = self._syy - intercept * self._sy - slope * self._sxy
+        dof = max(1, n - 2)
+        return {
+            "intercept": intercept,
+            "slope": slope,
+            "sigma": math.sqrt(max(0.0, sse) / dof),
+            "x_mean": self._sx / n,
+            "sxx": sxx_c,
+        }
+
+    def predict(self, steps_ahead: int = 1) -> Optional[Dict[str, float]]:
+        """
+        Projects the trend ``steps_ahead`` points past the newest observation.
+
+        Returns:
+            Optional[Dict[str, float]]: ``value``, ``lower`` and ``upper`` prediction band.
+        """
+        coef = self.coefficients()
+        if coef is None:
+            return None
+        n = len(self._values)
+        x0 = n - 1 + steps_ahead
+        value = coef["intercept"] + coef["slope"] * x0
+        se = coef["sigma"] * math.sqrt(1 + 1 / n + (x0 - coef["x_mean"]) ** 2 / coef["sxx"])
+        margin = FORECAST_CONFIDENCE_Z * se
+        return {"value": value, "lower": value - margin, "upper": value + margin}
+
+
+class HoltForecaster:
+    """
+    Holt (double) exponential smoothing, or additive Holt-Winters when a season
+    length is configured. Each observation updates level, trend and season in O(1);
+    one-step errors feed an EWMA residual variance used for widening confidence bands.
+    """
+
+    def __init__(
+        self,
+        alpha: float = HOLT_ALPHA,
+        beta: float = HOLT_BETA,
+        gamma: float = HOLT_GAMMA,
+        season_length: int = HOLT_SEASON_LENGTH,
+    ):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.season_length = season_length
+        self.level: Optional[float] = None
+        self.trend = 0.0
+        self.season: List[float] = [0.0] * max(0, season_length)
+        self.residual_var = 0.0
+        self.count = 0
+
+    def _season(self, t: int) -> float:
+        return self.season[t % self.season_length] if self.season_length else 0.0
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        t = self.count
+        self.count += 1
+        if self.level is None:
+            self.level = value
+            return
+
+        seasonal = self._season(t)
+        error = value - (self.level + self.trend + seasonal)
+        self.residual_var = (1 - self.alpha) * self.residual_var + self.alpha * error * error
+
+        previous_level = self.level
+        self.level = self.alpha * (value - seasonal) + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - previous_level) + (1 - self.beta) * self.trend
+        if self.season_length:
+            idx = t % self.season_length
+            self.season[idx] = self.gamma * (value - self.level) + (1 - self.gamma) * seasonal
+
+    def forecast(self, n_steps: int = 5) -> List[Dict[str, float]]:
+        """
+        Projects ``n_steps`` future values with confidence bands.
+
+        Returns:
+            List[Dict[str, float]]: One ``{step, value, lower, upper}`` entry per step.
+        """
+        if self.level is None or self.count < 2:
+            return []
+        sigma = math.sqrt(self.residual_var)
+        points: List[Dict[str, float]] = []
+        spread = 0.0
+        for h in range(1, n_steps + 1):
+            # Variance multiplier for Holt's linear method: 1 + sum (alpha(1 + j*beta))^2
+            if h > 1:
+                spread += (self.alpha * (1 + (h - 1) * self.beta)) ** 2
+            value = self.level + h * self.trend + self._season(self.count - 1 + h)
+            margin = FORECAST_CONFIDENCE_Z * sigma * math.sqrt(1 + spread)
+            points.append(
+                {
+                    "step": h,
+                    "value": round(value, 2),
+                    "lower": round(value - margin, 2),
+                    "upper": round(value + margin, 2),
+                }
+            )
+        return points
+
+
+class StreamingForecaster:
+    """
+    Per-sensor forecasting state combining the sliding trend line and Holt smoothing.
+    The streaming engine pushes every AQI reading; reads never refit anything.
+    """
+
+    def __init__(self, window: int = FORECAST_WINDOW):
+        self.trend = StreamingTrend(window)
+        self.holt = HoltForecaster()
+
+    def push(self, value: float) -> None:
+        self.trend.push(value)
+        self.holt.push(value)
+
+    def next_value(self) -> Union[float, str]:
+        """Next-step linear trend projection (same contract as ``get_aqi_forecast``)."""
+        if len(self.trend) < 5:
+            return "Insufficient data"
+        prediction = self.trend.predict(1)
+        return "Prediction Error" if prediction is None else round(prediction["value"], 2)
+
+    def horizon(self, n_steps: int = 5, method: str = "holt") -> Dict[str, Any]:
+        """
+        Multi-step projection with confidence bands.
+
+        Args:
+            n_steps (int): Number of future steps to project.
+            method (str): ``"holt"`` for exponential smoothing or ``"linear"`` for the
+                sliding least-squares trend.
+
+        Returns:
+            Dict[str, Any]: The method used and a list of projected points.
+        """
+        if method == "linear":
+            points = []
+            for h in range(1, n_steps + 1):
+                prediction = self.trend.predict(h)
+                if prediction is None:
+                    break
+                points.append({"step": h, **{k: round(v, 2) for k, v in prediction.items()}})
+        else:
+            points = self.holt.forecast(n_steps)
+        return {"method": method, "points": points}
+
+
+def _forecaster_from_history(history: Sequence[float]) -> StreamingForecaster:
+    forecaster = StreamingForecaster(window=max(2, len(history)))
+    for value in history:
+        forecaster.push(value)
+    return forecaster
+
+
 def get_aqi_forecast(history: List[float], n_steps: int = 5) -> Union[float, str]:
     """
-    Predicts future AQI values using a linear regression model based on historical trends.
+    Predicts the next AQI value by extrapolating the least-squares trend of the history.
+
+    The fit is closed-form over running sums, so no model object is built per call.
 
     Args:
         history (List[float]): A list of past AQI values.
-        n_steps (int): The number of future steps to project (default: 5).
+        n_steps (int): Horizon length used by ``get_forecast_horizon``; the value
+            returned here is always the next temporal step.
 
     Returns:
         Union[float, str]: The predicted AQI value or a status string if data is insufficient.
@@ -22,32 +246,47 @@ def get_aqi_forecast(history: List[float], n_steps: int = 5) -> Union[float, str
         return "Insufficient data"
 
     try:
-        y = np.array(history).reshape(-1, 1)
-        X = np.arange(len(history)).reshape(-1, 1)
-
-        model = LinearRegression()
-        model.fit(X, y)
-
-        # Predict the next temporal step
-        next_step = len(history)
-        prediction = model.predict([[next_step]])[0][0]
-
-        return round(float(prediction), 2)
+        return _forecaster_from_history(history).next_value()
     except Exception as e:
         logger.error(f"Prediction model failure: {e}")
         return "Prediction Error"
 
 
-def calculate_volatility(history: List[float]) -> float:
+def get_forecast_horizon(
+    history: List[float], n_steps: int = 5, method: str = "holt"
+) -> Dict[str, Any]:
     """
-    Calculates the statistical volatility (standard deviation) of the historical data.
+    Projects ``n_steps`` future AQI values with confidence bands.
 
     Args:
         history (List[float]): A list of past AQI values.
+        n_steps (int): The number of future steps to project (default: 5).
+        method (str): ``"holt"`` (exponential smoothing) or ``"linear"`` (trend line).
+
+    Returns:
+        Dict[str, Any]: The method used and the projected points (empty if data is insufficient).
+    """
+    if len(history) < 5:
+        return {"method": method, "points": []}
+    return _forecaster_from_history(history).horizon(n_steps, method)
+
+
+def calculate_volatility(history: Union[List[float], RollingWindow]) -> float:
+    """
+    Calculates the statistical volatility (standard deviation) of the historical data.
+
+    Args:
+        history (Union[List[float], RollingWindow]): Past AQI values, or a live rolling
+            window maintained by the streaming engine (read in O(1)).
 
     Returns:
         float: The calculated standard deviation.
     """
     if len(history) < 5:
         return 0.0
-    return float(np.std(history))
+    if isinstance(history, RollingWindow):
+        return history.std()
+    window = RollingWindow(len(history))
+    for value in history:
+        window.push(value)
+    return window.std()
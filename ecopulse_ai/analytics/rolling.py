@@ -0,0 +1,406 @@
+"""
+EcoPulse AI Rolling Statistics.
+O(1)-per-event sliding-window statistics for every raw telemetry channel: Welford
+add/remove mean and variance, monotonic-deque min/max, bisect-maintained quantiles and
+an EWMA, bundled per sensor so momentum and volatility never rebuild value lists.
+"""
+
+import bisect
+import logging
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import ROLLING_EWMA_SPAN, ROLLING_WINDOW
+
+logger = logging.getLogger("Analytics-Rolling")
+
+# Raw telemetry channels tracked for every sensor
+ROLLING_METRICS: Tuple[str, ...] = (
+    "aqi",
+    "pm25",
+    "co2",
+    "temperature",
+    "humidity",
+    "wind_speed",
+    "traffic_density",
+    "industrial_index",
+)
+
+
+class RollingWindow:
+    """
+    Sliding-window statistics over the last ``size`` observations of one metric.
+
+    Mean and variance use Welford's add/remove updates, min/max use monotonic deques,
+    and quantiles are read from a sorted copy of the window kept in step with bisect.
+    Every update is O(1) except the sorted-window maintenance, which is a binary search
+    plus a memmove of at most ``size`` floats.
+    """
+
+    def __init__(self, size: int = ROLLING_WINDOW):
+        if size < 1:
+            raise ValueError("Rolling window size must be a positive integer.")
+        self.size = size
+        self._values: Deque[float] = deque()
+        self._sorted: List[float] = []
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._seq = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        """True once the window holds ``size`` observations."""
+        return len(self._values) == self.size
+
+    @property
+    def last(self) -> Optional[float]:
+        """The most recent observation, or None if nothing has been pushed."""
+        return self._values[-1] if self._values else None
+
+    def push(self, value: float) -> None:
+        """
+        Adds an observation, evicting the oldest one once the window is full.
+        """
+        value = float(value)
+        if len(self._values) == self.size:
+            self._evict()
+
+        self._values.append(value)
+        n = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+        bisect.insort(self._sorted, value)
+
+        seq = self._seq
+        self._seq += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+
+    def _evict(self) -> None:
+        old = self._values.popleft()
+        n = len(self._values)
+        if n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            delta = old - self._mean
+            self._mean -= delta / n
+            self._m2 -= delta * (old - self._mean)
+
+        del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+        oldest_seq = self._seq - n - 1
+        if self._max and self._max[0][0] == oldest_seq:
+            self._max.popleft()
+        if self._min and self._min[0][0] == oldest_seq:
+            self._min.popleft()
+
+    def mean(self) -> float:
+        return self._mean if self._values else 0.0
+
+    def variance(self) -> float:
+        """Population variance of the window (matches ``np.var``)."""
+        if not self._values:
+            return 0.0
+        return max(0.0, self._m2 / len(self._values))
+
+    def std(self) -> float:
+        """Population standard deviation of the window (matches ``np.std``)."""
+        return math.sqrt(self.variance())
+
+    def min(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    def max(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Linearly interpolated quantile of the window (matches ``np.quantile``).
+
+        Args:
+            q (float): Quantile in the closed interval [0, 1].
+
+        Returns:
+            float: The interpolated value, or 0.0 for an empty window.
+        """
+        if not self._sorted:
+            return 0.0
+        pos = min(max(q, 0.0), 1.0) * (len(self._sorted) - 1)
+        lower = int(pos)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        frac = pos - lower
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * frac
+
+
+class EWMA:
+    """
+    Exponentially weighted moving average and variance with O(1) updates.
+    """
+
+    def __init__(self, span: float = ROLLING_EWMA_SPAN):
+        if span < 1:
+            raise ValueError("EWMA span must be at least 1.")
+        self.alpha = 2.0 / (span + 1.0)
+        self.value: Optional[float] = None
+        self.var = 0.0
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        if self.value is None:
+            self.value = value
+            return value
+        delta = value - self.value
+        self.value += self.alpha * delta
+        self.var = (1.0 - self.alpha) * (self.var + self.alpha * delta * delta)
+        return self.value
+
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class RollingStats:
+    """
+    Per-sensor bundle of rolling windows and EWMAs covering every telemetry metric.
+    """
+
+    def __init__(
+        self,
+        window: int = ROLLING_WINDOW,
+        ewma_span: float = ROLLING_EWMA_SPAN,
+        metrics: Sequence[str] = ROLLING_METRICS,
+    ):
+        self.window = window
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self.windows: Dict[str, RollingWindow] = {m: RollingWindow(window) for m in self.metrics}
+        self.ewma: Dict[str, EWMA] = {m: EWMA(ewma_span) for m in self.metrics}
+
+    @classmethod
+    def from_history(
+        cls, history: Iterable[Dict[str, Any]], window: int = ROLLING_WINDOW
+    ) -> "RollingStats":
+        """
+        Seeds a stats bundle from past records (only the trailing ``window`` matter).
+        """
+        stats = cls(window=window)
+        for record in history:
+            stats.update(record)
+        return stats
+
+    def __getitem__(self, metric: str) -> RollingWindow:
+        return self.windows[metric]
+
+    def last(self, metric: str) -> Optional[float]:
+        return self.windows[metric].last
+
+    def update(self, record: Dict[str, Any]) -> None:
+        """
+        Pushes every tracked metric present on the record into its windows.
+        """
+        for metric in self.metrics:
+            value = record.get(metric)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                logger.debug(f"Skipping non-numeric {metric} value: {value!r}")
+                continue
+            self.windows[metric].push(value)
+            self.ewma[metric].push(value)
+
+    def push_row(self, values: Sequence[float]) -> None:
+        """
+        Pushes one pre-validated float per tracked metric (in ``metrics`` order),
+        skipping the per-field lookup and conversion done by ``update``.
+        """
+        for metric, value in zip(self.metrics, values):
+            self.windows[metric].push(value)
+            self.ewma[metric].push(value)
+
+    def summary(self, metric: str) -> Dict[str, float]:
+        """
+        Returns a JSON-ready snapshot of a metric's rolling statistics.
+        """
+        win = self.windows[metric]
+        ewma = self.ewma[metric]
+        return {
+            "mean": round(win.mean(), 2),
+            "std": round(win.std(), 2),
+            "min": round(win.min(), 2),
+            "max": round(win.max(), 2),
+            "p50": round(win.quantile(0.5), 2),
+            "p95": round(win.quantile(0.95), 2),
+            "ewma": round(ewma.value or 0.0, 2),
+        }
+
+
+def occurrence_rank(slots: np.ndarray) -> np.ndarray:
+    """
+    Rank of each row among the rows sharing its slot (0 for the first, 1 for the next...),
+    so a batch can be applied in rounds in which every slot occurs at most once.
+    """
+    n = len(slots)
+    order = np.argsort(slots, kind="stable")
+    sorted_slots = slots[order]
+    starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+    lengths = np.diff(np.r_[starts, n])
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - np.repeat(starts, lengths)
+    return rank
+
+
+class RollingTable:
+    """
+    Columnar rolling windows for many sensors at once, updated a micro-batch at a time.
+
+    Windows, sliding sums and sums of squares, and EWMAs for every sensor live in shared
+    NumPy arrays indexed by a sensor slot. A batch is applied in "rounds" where each
+    sensor occurs at most once, so every round is a handful of vectorized array updates
+    while per-sensor ordering is preserved. Min/max/quantiles are derived from the
+    window on read, which keeps the write path free of per-sensor Python objects.
+    """
+
+    # Recompute sliding sums from the raw windows after this many pushes (drift control)
+    REFRESH_INTERVAL = 100_000
+
+    def __init__(
+        self,
+        window: int = ROLLING_WINDOW,
+        ewma_span: float = ROLLING_EWMA_SPAN,
+        metrics: Sequence[str] = ROLLING_METRICS,
+        capacity: int = 256,
+    ):
+        self.window = window
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self.alpha = 2.0 / (ewma_span + 1.0)
+        self._slots: Dict[Hashable, int] = {}
+        self._since_refresh = 0
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        m = len(self.metrics)
+        old = getattr(self, "_values", None)
+        values = np.zeros((capacity, self.window, m))
+        pos = np.zeros(capacity, dtype=np.int64)
+        count = np.zeros(capacity, dtype=np.int64)
+        sums = np.zeros((capacity, m))
+        sumsq = np.zeros((capacity, m))
+        ewma = np.zeros((capacity, m))
+        ewvar = np.zeros((capacity, m))
+        if old is not None:
+            used = len(old)
+            values[:used] = old
+            pos[:used], count[:used] = self._pos, self._count
+            sums[:used], sumsq[:used] = self._sum, self._sumsq
+            ewma[:used], ewvar[:used] = self._ewma, self._ewvar
+        self._values, self._pos, self._count = values, pos, count
+        self._sum, self._sumsq, self._ewma, self._ewvar = sums, sumsq, ewma, ewvar
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def slot(self, key: Hashable) -> int:
+        """Returns the array slot of a sensor key, allocating (and growing) on first sight."""
+        index = self._slots.get(key)
+        if index is None:
+            index = len(self._slots)
+            if index >= len(self._values):
+                self._allocate(2 * len(self._values))
+            self._slots[key] = index
+        return index
+
+    def push_batch(self, slots: np.ndarray, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Applies ``rows`` (shape ``(n, len(metrics))``, arrival order) to their sensor slots.
+
+        Returns:
+            Dict[str, np.ndarray]: Per-row ``previous`` value (NaN for a sensor's first
+            reading), window ``std`` after the push, and a ``full`` window flag.
+        """
+        n = len(slots)
+        previous = np.full((n, len(self.metrics)), np.nan)
+        std = np.zeros((n, len(self.metrics)))
+        full = np.zeros(n, dtype=bool)
+        if n == 0:
+            return {"previous": previous, "std": std, "full": full}
+
+        rank = occurrence_rank(slots)
+        w = self.window
+        for r in range(int(rank.max()) + 1):
+            sel = np.flatnonzero(rank == r)
+            s = slots[sel]
+            new = rows[sel]
+            p = self._pos[s]
+            seen = self._count[s] > 0
+            previous[sel[seen]] = self._values[s[seen], (p[seen] - 1) % w]
+
+            old = self._values[s, p]
+            self._sum[s] += new - old
+            self._sumsq[s] += new * new - old * old
+            self._values[s, p] = new
+            self._pos[s] = (p + 1) % w
+            counts = np.minimum(self._count[s] + 1, w)
+            self._count[s] = counts
+
+            mean = self._sum[s] / counts[:, None]
+            var = np.maximum(self._sumsq[s] / counts[:, None] - mean * mean, 0.0)
+            std[sel] = np.sqrt(var)
+            full[sel] = counts == w
+
+            delta = new - self._ewma[s]
+            first = ~seen
+            self._ewma[s] = np.where(first[:, None], new, self._ewma[s] + self.alpha * delta)
+            self._ewvar[s] = np.where(
+                first[:, None],
+                0.0,
+                (1.0 - self.alpha) * (self._ewvar[s] + self.alpha * delta * delta),
+            )
+
+        self._since_refresh += n
+        if self._since_refresh >= self.REFRESH_INTERVAL:
+            self._sum = self._values.sum(axis=1)
+            self._sumsq = (self._values * self._values).sum(axis=1)
+            self._since_refresh = 0
+        return {"previous": previous, "std": std, "full": full}
+
+    def window_values(self, key: Hashable, metric: str) -> np.ndarray:
+        """Returns a sensor's current window for one metric, oldest first."""
+        index = self._slots.get(key)
+        if index is None:
+            return np.empty(0)
+        count = int(self._count[index])
+        column = np.roll(self._values[index, :, self.metrics.index(metric)], -self._pos[index])
+        return column[self.window - count :]
+
+    def summary(self, key: Hashable, metric: str) -> Dict[str, float]:
+        """
+        Returns the same JSON-ready snapshot as ``RollingStats.summary`` for one sensor.
+        """
+        values = self.window_values(key, metric)
+        if not len(values):
+            return {}
+        index = self._slots[key]
+        return {
+            "mean": round(float(values.mean()), 2),
+            "std": round(float(values.std()), 2),
+            "min": round(float(values.min()), 2),
+            "max": round(float(values.max()), 2),
+            "p50": round(float(np.quantile(values, 0.5)), 2),
+            "p95": round(float(np.quantile(values, 0.95)), 2),
+            "ewma": round(float(self._ewma[index, self.metrics.index(metric)]), 2),
+        }
@@ -0,0 +1,489 @@
+"""
+EcoPulse AI Alert Rule Engine.
+Declarative threshold rules compiled once from ``config.THRESHOLDS``: every metric and
+level, peak-hour threshold adjustments and sustain durations. Rules classify a single
+record or whole NumPy columns in one ``searchsorted`` pass per metric, and the
+``AlertTracker`` adds per-sensor hysteresis and debouncing so sensors hovering around
+a threshold do not flap between levels.
+"""
+
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.analytics.rolling import occurrence_rank
+from ecopulse_ai.config import (
+    ALERT_CLEAR_SECONDS,
+    ALERT_HYSTERESIS,
+    ALERT_PEAK_FACTORS,
+    ALERT_PEAK_HOURS,
+    ALERT_SUSTAIN_SECONDS,
+    THRESHOLDS,
+)
+
+logger = logging.getLogger("Analytics-Rules")
+
+# Row-metric steps of the scalar tracker path costing about as much as one vectorized round
+ROUND_COST = 32
+
+# Severity ladder; a level's index is its code (0 = no alert)
+LEVELS: Tuple[str, ...] = ("Optimal", "Warning", "Critical", "Emergency")
+SEVERITY_LEVELS = np.array(LEVELS, dtype=object)
+THRESHOLD_KEYS: Tuple[str, ...] = ("warning", "critical", "emergency")
+
+TEMPLATE: Tuple[str, ...] = ("type", "level", "msg")
+# Scalar-path rule of one metric: (metric, field, ladder, (type, level, msg) per code)
+ScalarRule = Tuple[str, str, Tuple[float, ...], Tuple[Tuple[str, ...], ...]]
+
+# Advisory text per THRESHOLDS metric and level
+ALERT_MESSAGES: Dict[str, Dict[str, str]] = {
+    "AQI": {
+        "Warning": "Air quality is deteriorating. Moderate health risks for sensitive individuals.",
+        "Critical": "Very unhealthy air levels detected. High-risk groups should remain indoors.",
+        "Emergency": "Hazardous air quality! Immediate shelter advised. Cease all outdoor activities.",
+    },
+    "PM25": {
+        "Warning": "Fine particulate levels rising. Sensitive groups should limit exertion.",
+        "Critical": "Heavy PM2.5 load detected. Wear N95 masks outdoors.",
+        "Emergency": "Severe PM2.5 episode! Keep windows shut and run air purifiers.",
+    },
+    "CO2": {
+        "Warning": "High carbon dioxide levels detected. Ventilation and air circulation required.",
+        "Critical": "Carbon dioxide is critically high. Increase ventilation immediately.",
+        "Emergency": "Dangerous carbon dioxide concentration! Evacuate enclosed spaces.",
+    },
+}
+
+
+def is_peak_hour(hour: int, windows: Sequence[Tuple[int, int]] = ALERT_PEAK_HOURS) -> bool:
+    """Peak transit windows during which the peak-hour threshold factors apply."""
+    return any(start <= hour <= end for start, end in windows)
+
+
+_hour_cache: List[float] = [0.0, 0.0]  # [monotonic expiry, local hour]
+
+
+def local_hour() -> int:
+    """The current local hour, re-read from the clock only when the hour rolls over."""
+    now = time.monotonic()
+    if now >= _hour_cache[0]:
+        wall = datetime.now()
+        elapsed = wall.minute * 60 + wall.second + wall.microsecond / 1e6
+        _hour_cache[:] = [now + 3600 - elapsed, wall.hour]
+    return int(_hour_cache[1])
+
+
+class AlertRule:
+    """
+    One compiled threshold: ``field >= threshold`` (times ``peak_factor`` in peak hours)
+    raises ``level`` once it has held for ``sustain`` seconds.
+    """
+
+    __slots__ = ("metric", "field", "level", "code", "threshold", "peak_factor", "sustain")
+
+    def __init__(
+        self,
+        metric: str,
+        level: str,
+        threshold: float,
+        peak_factor: float = 1.0,
+        sustain: float = 0.0,
+    ):
+        self.metric = metric
+        self.field = metric.lower()
+        self.level = level
+        self.code = LEVELS.index(level)
+        self.threshold = float(threshold)
+        self.peak_factor = peak_factor
+        self.sustain = sustain
+
+    def __repr__(self) -> str:
+        return f"AlertRule({self.metric} {self.level} >= {self.threshold:g})"
+
+
+class RuleSet:
+    """
+    The compiled rules grouped per metric, with precomputed threshold ladders (off-peak
+    and peak) and alert payload templates.
+    """
+
+    def __init__(self, rules: Sequence[AlertRule]):
+        self.rules = list(rules)
+        self.metrics: Tuple[str, ...] = tuple(dict.fromkeys(r.metric for r in self.rules))
+        self.fields: Tuple[str, ...] = tuple(m.lower() for m in self.metrics)
+        n = len(LEVELS) - 1
+        self._ladders: Dict[bool, np.ndarray] = {}
+        for peak in (False, True):
+            ladder = np.full((len(self.metrics), n), np.inf)
+            for rule in self.rules:
+                factor = rule.peak_factor if peak else 1.0
+                ladder[self.metrics.index(rule.metric), rule.code - 1] = rule.threshold * factor
+            # A tightened/relaxed level never drops below the one beneath it
+            self._ladders[peak] = np.maximum.accumulate(ladder, axis=1)
+        self.sustain = np.zeros((len(self.metrics), len(LEVELS)))
+        self._templates: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for rule in self.rules:
+            self.sustain[self.metrics.index(rule.metric), rule.code] = rule.sustain
+            self._templates[(rule.metric, rule.code)] = {
+                "type": rule.metric,
+                "level": rule.level,
+                "msg": ALERT_MESSAGES.get(rule.metric, {}).get(
+                    rule.level, f"{rule.metric} {rule.level} threshold exceeded."
+                ),
+            }
+        # Plain-tuple copies for the scalar path (bisect beats NumPy on single values),
+        # with each level's (type, level, msg) indexed by code
+        self._scalar: Dict[bool, List[ScalarRule]] = {
+            peak: [
+                (
+                    metric,
+                    field,
+                    tuple(ladder.tolist()),
+                    tuple(
+                        tuple(self._templates.get((metric, code), {}).get(k) for k in TEMPLATE)
+                        for code in range(len(LEVELS))
+                    ),
+                )
+                for metric, field, ladder in zip(self.metrics, self.fields, self._ladders[peak])
+            ]
+            for peak in (False, True)
+        }
+
+    @classmethod
+    def from_config(
+        cls,
+        thresholds: Mapping[str, Mapping[str, float]] = THRESHOLDS,
+        peak_factors: Mapping[str, float] = ALERT_PEAK_FACTORS,
+        sustain: Mapping[str, float] = ALERT_SUSTAIN_SECONDS,
+    ) -> "RuleSet":
+        """Compiles one rule per metric and threshold level of the configuration."""
+        rules = []
+        for metric, levels in thresholds.items():
+            for key in THRESHOLD_KEYS:
+                if key in levels:
+                    rules.append(
+                        AlertRule(
+                            metric,
+                            key.capitalize(),
+                            levels[key],
+                            peak_factor=peak_factors.get(f"{metric}.{key}", 1.0),
+                            sustain=sustain.get(metric, 0.0),
+                        )
+                    )
+        return cls(rules)
+
+    def ladder(self, hour: Optional[int] = None) -> np.ndarray:
+        """Thresholds per metric (rows) and level (columns) in effect at ``hour``."""
+        return self._ladders[hour is not None and is_peak_hour(hour)]
+
+    def metric_codes(
+        self, metric: str, values: np.ndarray, hour: Optional[int] = None
+    ) -> np.ndarray:
+        """Level code (0-3) of each value of one metric."""
+        ladder = self.ladder(hour)[self.metrics.index(metric)]
+        codes = np.searchsorted(ladder, values, side="right").astype(np.int8)
+        codes[np.isnan(values)] = 0
+        return codes
+
+    def codes(self, columns: Mapping[str, np.ndarray], hour: Optional[int] = None) -> np.ndarray:
+        """
+        Level codes for a batch in one vectorized pass.
+
+        Returns:
+            np.ndarray: ``(n, len(metrics))`` int8 codes; metrics absent from
+            ``columns`` are 0.
+        """
+        size = len(next(iter(columns.values()))) if columns else 0
+        codes = np.zeros((size, len(self.metrics)), dtype=np.int8)
+        for j, (metric, field) in enumerate(zip(self.metrics, self.fields)):
+            if field in columns:
+                codes[:, j] = self.metric_codes(metric, columns[field], hour)
+        return codes
+
+    def alert(self, metric: str, code: int, value: float) -> Dict[str, Any]:
+        """Alert payload for a metric at a level (built from the cached template)."""
+        return {**self._templates[(metric, code)], "value": value}
+
+    def evaluate(
+        self, record: Mapping[str, Any], hour: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Stateless alerts of one record: the highest level reached by each metric."""
+        alerts = []
+        for _, field, ladder, templates in self._scalar[hour is not None and is_peak_hour(hour)]:
+            value = record.get(field, 0)
+            if value.__class__ is not float:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+            code = bisect.bisect_right(ladder, value) if value == value else 0
+            if code:
+                kind, level, msg = templates[code]
+                alerts.append({"type": kind, "level": level, "value": value, "msg": msg})
+        return alerts
+
+    def level(self, metric: str, value: float, hour: Optional[int] = None) -> str:
+        """Level name reached by a single value of one metric."""
+        _, _, ladder, _ = self._scalar[hour is not None and is_peak_hour(hour)][
+            self.metrics.index(metric)
+        ]
+        return LEVELS[bisect.bisect_right(ladder, value) if value == value else 0]
+
+
+RULES = RuleSet.from_config()
+
+
+class AlertTracker:
+    """
+    Per-sensor alert levels with hysteresis and debouncing, updated a batch at a time.
+
+    A sensor escalates to a level only after exceeding it for the rule's sustain time,
+    and de-escalates only once its value has stayed below ``(1 - hysteresis)`` of the
+    active threshold for ``clear_after`` seconds. State lives in NumPy arrays indexed by
+    sensor slot (allocated on first sight, as in ``RollingTable``); like its windows, a
+    batch is applied in rounds in which each sensor occurs once, or row by row when a
+    few sensors make up most of the batch.
+
+    Args:
+        rules (RuleSet): Compiled rules (defaults to the configured ones).
+        hysteresis (float): Fraction below the active threshold required to clear.
+        clear_after (float): Seconds the lower level must persist before de-escalating.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[RuleSet] = None,
+        hysteresis: float = ALERT_HYSTERESIS,
+        clear_after: float = ALERT_CLEAR_SECONDS,
+        capacity: int = 256,
+    ):
+        self.rules = rules or RULES
+        self.hysteresis = hysteresis
+        self.clear_after = clear_after
+        self._slots: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        m = len(self.rules.metrics)
+        old = getattr(self, "_active", None)
+        active = np.zeros((capacity, m), dtype=np.int8)
+        since, up, down, value = (np.full((capacity, m), np.nan) for _ in range(4))
+        if old is not None:
+            used = len(old)
+            active[:used], since[:used] = self._active, self._since
+            up[:used], down[:used], value[:used] = self._up, self._down, self._value
+        self._active, self._since, self._value = active, since, value
+        self._up, self._down = up, down  # when the pending escalation / clearing began
+
+    def slot(self, key: Hashable) -> int:
+        """Returns the array slot of a sensor key, allocating (and growing) on first sight."""
+        index = self._slots.get(key)
+        if index is None:
+            index = len(self._keys)
+            if index >= len(self._active):
+                self._allocate(2 * len(self._active))
+            self._slots[key] = index
+            self._keys.append(key)
+        return index
+
+    def update(
+        self,
+        keys: Sequence[Hashable],
+        columns: Mapping[str, np.ndarray],
+        times: np.ndarray,
+        hour: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Applies a batch (arrival order) and returns the level transitions it caused.
+
+        Args:
+            keys (Sequence[Hashable]): Sensor key of each row.
+            columns (Mapping[str, np.ndarray]): Metric columns of the rows.
+            times (np.ndarray): Event time of each row (epoch seconds).
+            hour (Optional[int]): Local hour for peak adjustments.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"row", "sensor", "metric", "from", "to", "value",
+            "time"}`` per transition (levels as names), in arrival order.
+        """
+        fired = self.advance(keys, columns, times, hour)
+        if fired is None:
+            return []
+        metrics = self.rules.metrics
+        return [
+            {
+                "row": row,
+                "sensor": keys[row],
+                "metric": metrics[j],
+                "from": LEVELS[a],
+                "to": LEVELS[b],
+                "value": value,
+                "time": when,
+            }
+            for row, j, a, b, value, when in zip(*fired)
+        ]
+
+    def advance(
+        self,
+        keys: Sequence[Hashable],
+        columns: Mapping[str, np.ndarray],
+        times: np.ndarray,
+        hour: Optional[int] = None,
+    ) -> Optional[Tuple[List[Any], ...]]:
+        """
+        ``update`` without the per-transition payloads, for callers that build their own.
+
+        Returns:
+            Optional[Tuple[List[Any], ...]]: Parallel lists of row, metric index, old
+            and new level code, value and time per transition (arrival order), or None
+            when nothing fired.
+        """
+        n = len(keys)
+        if n == 0:
+            return None
+        slots = np.fromiter(map(self.slot, keys), np.int64, n)
+
+        ladder = self.rules.ladder(hour)
+        raw = self.rules.codes(columns, hour)
+        values = np.column_stack(
+            [columns.get(f, np.full(n, np.nan)) for f in self.rules.fields]
+        ).astype(np.float64)
+        # Level each value still holds within the hysteresis band below its thresholds
+        lowered = ladder * (1.0 - self.hysteresis)
+        hold = np.stack(
+            [np.searchsorted(lowered[j], values[:, j], side="right") for j in range(len(ladder))],
+            axis=1,
+        ).astype(np.int8)
+
+        rank = occurrence_rank(slots)
+        rounds = int(rank.max()) + 1
+        # A round costs a fixed set of array operations; when a few sensors dominate the
+        # batch (e.g. replaying a single-sensor capture), stepping through rows is cheaper
+        if rounds * ROUND_COST > n * len(self.rules.metrics):
+            fired = self._advance_rows(slots, raw, hold, values, times)
+        else:
+            fired = self._advance_rounds(slots, rank, rounds, raw, hold, values, times)
+        if fired is None:
+            return None
+        rows, cols, old, new = fired
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+        return (
+            rows.tolist(),
+            cols.tolist(),
+            old[order].tolist(),
+            new[order].tolist(),
+            values[rows, cols].tolist(),
+            times[rows].tolist(),
+        )
+
+    def _advance_rounds(
+        self,
+        slots: np.ndarray,
+        rank: np.ndarray,
+        rounds: int,
+        raw: np.ndarray,
+        hold: np.ndarray,
+        values: np.ndarray,
+        times: np.ndarray,
+    ) -> Optional[Tuple[np.ndarray, ...]]:
+        """Applies the batch in rounds of distinct sensors; returns the fired transitions."""
+        columns_idx = np.arange(len(self.rules.metrics))
+        fired: List[Tuple[np.ndarray, ...]] = []  # (rows, metrics, old, new) per round
+        for r in range(rounds):
+            sel = np.flatnonzero(rank == r)
+            s, t = slots[sel], times[sel][:, None]
+            active = self._active[s]
+            target = np.maximum(raw[sel], np.minimum(active, hold[sel]))
+            target = np.where(np.isnan(values[sel]), active, target)  # no reading: no change
+            up, down = target > active, target < active
+
+            self._up[s] = np.where(up, np.where(np.isnan(self._up[s]), t, self._up[s]), np.nan)
+            self._down[s] = np.where(
+                down, np.where(np.isnan(self._down[s]), t, self._down[s]), np.nan
+            )
+            required = self.rules.sustain[columns_idx, target]
+            fire = (up & (t - self._up[s] >= required)) | (
+                down & (t - self._down[s] >= self.clear_after)
+            )
+            self._value[s] = values[sel]
+            if not fire.any():
+                continue
+
+            i, j = np.nonzero(fire)
+            fired.append((sel[i], j, active[i, j], target[i, j]))
+            self._active[s] = np.where(fire, target, active)
+            self._since[s] = np.where(fire, t, self._since[s])
+            self._up[s] = np.where(fire, np.nan, self._up[s])
+            self._down[s] = np.where(fire, np.nan, self._down[s])
+
+        if not fired:
+            return None
+        return tuple(np.concatenate(parts) for parts in zip(*fired))
+
+    def _advance_rows(
+        self,
+        slots: np.ndarray,
+        raw: np.ndarray,
+        hold: np.ndarray,
+        values: np.ndarray,
+        times: np.ndarray,
+    ) -> Optional[Tuple[np.ndarray, ...]]:
+        """Row-at-a-time equivalent of ``_advance_rounds`` over the batch's sensors."""
+        sensors, local = np.unique(slots, return_inverse=True)
+        active = self._active[sensors].tolist()
+        since, up, down = (a[sensors].tolist() for a in (self._since, self._up, self._down))
+        value = self._value[sensors].tolist()
+        sustain, clear_after, nan = self.rules.sustain.tolist(), self.clear_after, np.nan
+
+        fired = []
+        for row, (u, t, raw_row, hold_row, value_row) in enumerate(
+            zip(local.tolist(), times.tolist(), raw.tolist(), hold.tolist(), values.tolist())
+        ):
+            levels, ups, downs = active[u], up[u], down[u]
+            for j, v in enumerate(value_row):
+                a = levels[j]
+                target = a if v != v else max(raw_row[j], min(a, hold_row[j]))
+                if target > a:
+                    if ups[j] != ups[j]:
+                        ups[j] = t
+                    downs[j] = nan
+                    fire = t - ups[j] >= sustain[j][target]
+                elif target < a:
+                    if downs[j] != downs[j]:
+                        downs[j] = t
+                    ups[j] = nan
+                    fire = t - downs[j] >= clear_after
+                else:
+                    ups[j] = downs[j] = nan
+                    fire = False
+                if fire:
+                    fired.append((row, j, a, target))
+                    levels[j], since[u][j], ups[j], downs[j] = target, t, nan, nan
+            value[u] = value_row
+
+        self._active[sensors], self._since[sensors] = active, since
+        self._up[sensors], self._down[sensors], self._value[sensors] = up, down, value
+        if not fired:
+            return None
+        return tuple(np.array(column, dtype=np.int64) for column in zip(*fired))
+
+    def active(self) -> List[Dict[str, Any]]:
+        """Every sensor/metric currently above ``Optimal``, with its level and since-time."""
+        alerts = []
+        for slot, j in zip(*np.nonzero(self._active)):
+            metric = self.rules.metrics[j]
+            code = int(self._active[slot, j])
+            alerts.append(
+                {
+                    "sensor": self._keys[slot],
+                    **self.rules.alert(metric, code, float(self._value[slot, j])),
+                    "since": float(self._since[slot, j]),
+                }
+            )
+        return alerts
@@ -0,0 +1,193 @@
+"""
+EcoPulse AI What-if Simulation.
+Evaluates whole grids of policy scenarios (traffic reduction x industrial restriction x
+green cover) against a sensor's recent AQI window in one broadcast NumPy pass, returning
+response surfaces instead of a single simulated reading. Scenario axes are quantized so
+that nearby slider positions share memoized results for the same data version.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    SIMULATION_CACHE_SIZE,
+    SIMULATION_MAX_SCENARIOS,
+    SIMULATION_STEP,
+    SIMULATION_WEIGHTS,
+    THRESHOLDS,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+logger = logging.getLogger("Analytics-Simulation")
+
+SIMULATION_CACHE = REGISTRY.counter(
+    "ecopulse_simulation_cache_total", "What-if scenario grid lookups", ("outcome",)
+)
+
+# Policy levers in axis order of every surface
+LEVERS: Tuple[str, ...] = tuple(SIMULATION_WEIGHTS)
+SURFACES: Tuple[str, ...] = ("aqi", "mean", "p95", "exceedance", "health_score")
+
+
+def parse_axis(spec: Optional[str], step: float = SIMULATION_STEP) -> np.ndarray:
+    """
+    Parses one scenario axis: ``"start:stop:step"`` (inclusive), ``"a,b,c"`` or a
+    single value (percent). Values are snapped to ``step``, clipped to 0-100 and deduped.
+
+    Raises:
+        ValueError: If the spec is malformed, holds a non-finite value, or the range is
+            empty or its step is not positive or too fine.
+    """
+    if spec is None or not spec.strip():
+        return np.zeros(1)
+    if ":" in spec:
+        start, stop, *rest = (float(part) for part in spec.split(":"))
+        stride = rest[0] if rest else step
+        if (
+            not np.isfinite([start, stop, stride]).all()
+            or stride <= 0
+            or len(rest) > 1
+            or (stop - start) / stride > SIMULATION_MAX_SCENARIOS
+        ):
+            raise ValueError(f"Invalid scenario range: {spec}")
+        values = np.arange(start, stop + stride / 2, stride)
+        if values.size == 0:
+            raise ValueError(f"Empty scenario range: {spec}")
+    else:
+        values = np.array([float(part) for part in spec.split(",")])
+        if not np.isfinite(values).all():
+            raise ValueError(f"Non-finite scenario value: {spec}")
+    return np.unique(np.clip(np.round(values / step) * step, 0.0, 100.0))
+
+
+def parse_surfaces(spec: Optional[str]) -> Tuple[str, ...]:
+    """Requested surface names (``"aqi,p95"``; all of ``SURFACES`` by default)."""
+    if not spec:
+        return SURFACES
+    names = tuple(name.strip() for name in spec.split(",") if name.strip())
+    unknown = set(names) - set(SURFACES)
+    if unknown:
+        raise ValueError(f"Unknown simulation surfaces: {', '.join(sorted(unknown))}")
+    return names
+
+
+def scenario_factors(axes: Mapping[str, np.ndarray]) -> np.ndarray:
+    """
+    Multiplicative AQI factor of every scenario, shaped ``(len(axis) for each lever)``:
+    the outer product of ``1 - level / 100 * weight`` over the levers.
+    """
+    factors = np.ones(())
+    for lever in LEVERS:
+        levels = np.asarray(axes.get(lever, np.zeros(1)), dtype=np.float64)
+        factors = np.multiply.outer(factors, 1.0 - levels / 100.0 * SIMULATION_WEIGHTS[lever])
+    return factors
+
+
+def simulate_window(
+    window: np.ndarray,
+    factors: np.ndarray,
+    co2: float = 0.0,
+    pm25: float = 0.0,
+    surfaces: Sequence[str] = SURFACES,
+) -> Dict[str, np.ndarray]:
+    """
+    Scales an AQI history window by every scenario factor at once.
+
+    Args:
+        window (np.ndarray): Recent AQI readings, oldest first (NaNs ignored).
+        factors (np.ndarray): Scenario factors (see ``scenario_factors``).
+        co2 (float): Latest CO2, held fixed for the health score.
+        pm25 (float): Latest PM2.5, held fixed for the health score.
+        surfaces (Sequence[str]): Which of ``SURFACES`` to compute.
+
+    Returns:
+        Dict[str, np.ndarray]: Per-scenario latest AQI, window mean and p95, share of
+        readings at or above the AQI warning threshold, and the latest health score.
+    """
+    window = np.asarray(window, dtype=np.float64)
+    window = window[~np.isnan(window)]
+    if not len(window):
+        return {name: np.full(factors.shape, np.nan) for name in surfaces}
+    output: Dict[str, np.ndarray] = {}
+    latest = factors * window[-1]
+    if "aqi" in surfaces:
+        output["aqi"] = latest
+    if "mean" in surfaces:
+        output["mean"] = factors * window.mean()
+    if "p95" in surfaces:
+        output["p95"] = factors * np.percentile(window, 95)
+    if "exceedance" in surfaces:
+        # a reading x exceeds under factor f iff x >= warning / f (scaling preserves order)
+        ordered = np.sort(window)
+        bounds = THRESHOLDS["AQI"]["warning"] / np.maximum(factors, 1e-12)
+        above = len(ordered) - np.searchsorted(ordered, bounds, side="left")
+        output["exceedance"] = above / len(ordered)
+    if "health_score" in surfaces:
+        output["health_score"] = np.maximum(0.0, 100.0 - (latest / 5 + co2 / 50 + pm25 / 2))
+    return output
+
+
+def scenario_grid(
+    window: np.ndarray,
+    axes: Mapping[str, np.ndarray],
+    co2: float = 0.0,
+    pm25: float = 0.0,
+    surfaces: Sequence[str] = SURFACES,
+    max_scenarios: int = SIMULATION_MAX_SCENARIOS,
+) -> Dict[str, Any]:
+    """
+    JSON-ready response surfaces of a scenario grid plus the no-policy baseline.
+
+    Raises:
+        ValueError: If the grid holds more than ``max_scenarios`` scenarios.
+    """
+    factors = scenario_factors(axes)
+    if factors.size > max_scenarios:
+        raise ValueError(f"{factors.size} scenarios requested (limit {max_scenarios})")
+    grid = simulate_window(window, factors, co2, pm25, surfaces)
+    baseline = simulate_window(window, np.ones(()), co2, pm25, surfaces)
+    return {
+        "axes": {lever: axes[lever].tolist() for lever in LEVERS},
+        "baseline": {name: _json(value) for name, value in baseline.items()},
+        "surfaces": {name: _json(value) for name, value in grid.items()},
+        "window": int(np.count_nonzero(~np.isnan(np.asarray(window, dtype=np.float64)))),
+    }
+
+
+def _json(values: np.ndarray) -> Any:
+    """Rounded nested lists (NaN becomes None)."""
+    rounded = np.round(values, 4)
+    if rounded.ndim == 0:
+        value = float(rounded)
+        return None if value != value else value
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+class ScenarioCache:
+    """
+    LRU memo of scenario grids. Keys combine the data version with the quantized axes,
+    so repeated or nearby slider positions are free until new telemetry arrives.
+    """
+
+    def __init__(self, capacity: int = SIMULATION_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                SIMULATION_CACHE.labels("hit").inc()
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        SIMULATION_CACHE.labels("miss").inc()
+        return value
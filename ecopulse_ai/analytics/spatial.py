@@ -0,0 +1,414 @@
+"""
+EcoPulse AI Spatial Aggregation.
+A uniform lat/lon grid index over the sensor fleet plus per-district and per-state
+aggregates (sensor count, mean, p95 and trend of the latest AQI of every sensor) that
+are maintained incrementally: each batch retracts a sensor's previous reading from its
+regions and adds the new one, so a regional summary costs O(regions x histogram bins)
+no matter how many sensors report.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    DEFAULT_STATE,
+    DISTRICT_REGISTRY,
+    SPATIAL_AQI_BIN,
+    SPATIAL_AQI_MAX,
+    SPATIAL_CELL_DEGREES,
+    SPATIAL_TREND_FAST,
+    SPATIAL_TREND_SLOW,
+    SPATIAL_TREND_THRESHOLD,
+)
+
+logger = logging.getLogger("Analytics-Spatial")
+
+SensorKey = Tuple[str, str]  # (district, sensor_id)
+Position = Tuple[float, float]  # (lat, lon)
+BBox = Tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+Cell = Tuple[int, int]
+
+REGION_LEVELS: Tuple[str, ...] = ("district", "state")
+PERCENTILE = 0.95
+
+
+def parse_bbox(text: str) -> BBox:
+    """
+    Parses ``"min_lat,min_lon,max_lat,max_lon"`` into a bounding box.
+
+    Raises:
+        ValueError: If the text does not hold four numbers with min <= max.
+    """
+    parts = [float(p) for p in text.split(",")]
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be 'min_lat,min_lon,max_lat,max_lon'")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+class SpatialIndex:
+    """
+    Uniform grid of ``cell`` x ``cell`` degree buckets mapping positions to keys.
+
+    Sensors are effectively static, so placement is a dict update on first sight (or on
+    a move), and a bounding-box query visits only the cells it overlaps (or the occupied
+    cells, when there are fewer of those).
+    """
+
+    def __init__(self, cell: float = SPATIAL_CELL_DEGREES):
+        if cell <= 0:
+            raise ValueError("Spatial index cell size must be positive.")
+        self.cell = cell
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._positions: Dict[Hashable, Position] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def cell_of(self, lat: float, lon: float) -> Cell:
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def position(self, key: Hashable) -> Optional[Position]:
+        return self._positions.get(key)
+
+    def place(self, key: Hashable, lat: float, lon: float) -> None:
+        """Inserts ``key`` at a position, moving it if it was indexed elsewhere."""
+        previous = self._positions.get(key)
+        if previous is not None:
+            if previous == (lat, lon):
+                return
+            self.remove(key)
+        self._positions[key] = (lat, lon)
+        self._cells.setdefault(self.cell_of(lat, lon), set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        cell = self.cell_of(*position)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+
+    def within(self, bbox: BBox) -> List[Hashable]:
+        """Keys positioned inside ``bbox`` (edges inclusive)."""
+        min_lat, min_lon, max_lat, max_lon = bbox
+        (i0, j0), (i1, j1) = self.cell_of(min_lat, min_lon), self.cell_of(max_lat, max_lon)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) <= len(self._cells):
+            cells = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+        else:
+            cells = [(i, j) for i, j in self._cells if i0 <= i <= i1 and j0 <= j <= j1]
+        keys = []
+        for cell in cells:
+            for key in self._cells.get(cell, ()):
+                lat, lon = self._positions[key]
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                    keys.append(key)
+        return keys
+
+
+class RegionStats:
+    """
+    Running aggregates of one region level (e.g. all districts), one row per region.
+
+    Holds the sensor count, the sum of the sensors' latest values and a fixed-width
+    histogram of them (for percentiles), plus fast/slow EWMAs of the regional mean
+    whose gap is the trend. Rows are allocated on first sight of a region name.
+    """
+
+    def __init__(self, bin_width: float = SPATIAL_AQI_BIN, upper: float = SPATIAL_AQI_MAX):
+        self.bin_width = bin_width
+        self.bins = int(math.ceil(upper / bin_width))
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.count = np.zeros(0)
+        self.total = np.zeros(0)
+        self.hist = np.zeros((0, self.bins))
+        self.fast = np.zeros(0)
+        self.slow = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def region(self, name: str) -> int:
+        """Row of a region, allocating it on first sight."""
+        row = self._ids.get(name)
+        if row is None:
+            row = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.count = np.append(self.count, 0.0)
+            self.total = np.append(self.total, 0.0)
+            self.hist = np.vstack([self.hist, np.zeros((1, self.bins))])
+            self.fast = np.append(self.fast, np.nan)
+            self.slow = np.append(self.slow, np.nan)
+        return row
+
+    def bin_of(self, values: np.ndarray) -> np.ndarray:
+        bins = (values // self.bin_width).astype(np.intp)
+        return np.minimum(np.maximum(bins, 0, out=bins), self.bins - 1, out=bins)
+
+    def _accumulate(self, rows: np.ndarray, values: np.ndarray, signs: np.ndarray) -> None:
+        n = len(self.names)
+        self.count += np.bincount(rows, weights=signs, minlength=n)
+        self.total += np.bincount(rows, weights=signs * values, minlength=n)
+        cells = rows * self.bins + self.bin_of(values)
+        self.hist += np.bincount(cells, weights=signs, minlength=n * self.bins).reshape(
+            n, self.bins
+        )
+
+    def shift(self, rows: np.ndarray, old: np.ndarray, new: np.ndarray) -> None:
+        """
+        Replaces each sensor's previous value ``old`` (NaN if it had none) with ``new``
+        (NaN if it has none) in region ``rows``, then advances the touched regions' trend.
+        """
+        known, fresh = ~np.isnan(old), ~np.isnan(new)
+        removed, added = int(known.sum()), int(fresh.sum())
+        if removed or added:
+            # Retract the old values and add the new ones in a single pass
+            self._accumulate(
+                np.concatenate([rows[known], rows[fresh]]),
+                np.concatenate([old[known], new[fresh]]),
+                np.repeat([-1.0, 1.0], [removed, added]),
+            )
+
+        touched = np.unique(rows)
+        touched = touched[self.count[touched] > 0]
+        mean = self.total[touched] / self.count[touched]
+        for ewma, alpha in ((self.fast, SPATIAL_TREND_FAST), (self.slow, SPATIAL_TREND_SLOW)):
+            current = ewma[touched]
+            ewma[touched] = np.where(np.isnan(current), mean, current + alpha * (mean - current))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-region ``sensors``, ``aqi`` (mean), ``p95``, ``trend`` and ``trend_rate``."""
+        live = np.flatnonzero(self.count > 0)
+        if not len(live):
+            return []
+        count = self.count[live]
+        cumulative = np.cumsum(self.hist[live], axis=1)
+        target = PERCENTILE * count
+        top = (cumulative < target[:, None] - 1e-9).sum(axis=1)
+        top = np.minimum(top, self.bins - 1)
+        below = np.where(top > 0, cumulative[np.arange(len(live)), top - 1], 0.0)
+        inside = self.hist[live, top]
+        fraction = np.where(inside > 0, (target - below) / np.maximum(inside, 1.0), 1.0)
+        p95 = (top + np.clip(fraction, 0.0, 1.0)) * self.bin_width
+        mean = self.total[live] / count
+        gap = self.fast[live] - self.slow[live]
+
+        regions = []
+        for i, row in enumerate(live.tolist()):
+            rate = float(gap[i])
+            if rate > SPATIAL_TREND_THRESHOLD:
+                trend = "Rising"
+            elif rate < -SPATIAL_TREND_THRESHOLD:
+                trend = "Falling"
+            else:
+                trend = "Stable"
+            regions.append(
+                {
+                    "name": self.names[row],
+                    "sensors": int(round(count[i])),
+                    "aqi": round(float(mean[i]), 2),
+                    "p95": round(float(p95[i]), 2),
+                    "trend": trend,
+                    "trend_rate": round(rate, 2),
+                }
+            )
+        return regions
+
+
+class SpatialAggregator:
+    """
+    Latest AQI of every sensor, its grid position and its district/state aggregates.
+
+    Fed once per micro-batch with the last reading of each sensor in the batch. Sensors
+    without coordinates are placed at their district's registry centroid; the state comes
+    from the reading or the district registry (``DEFAULT_STATE`` otherwise). Positions
+    are mirrored into slot-aligned arrays for vectorized consumers (see ``points``), and
+    ``layout_version`` changes whenever a sensor is placed or moves.
+
+    Args:
+        registry (Mapping[str, Mapping[str, Any]]): District -> state/centroid/risk.
+        cell (float): Grid cell edge of the spatial index, in degrees.
+    """
+
+    def __init__(
+        self,
+        registry: Mapping[str, Mapping[str, Any]] = DISTRICT_REGISTRY,
+        cell: float = SPATIAL_CELL_DEGREES,
+    ):
+        self.registry = registry
+        self.index = SpatialIndex(cell)
+        self.levels: Dict[str, RegionStats] = {level: RegionStats() for level in REGION_LEVELS}
+        self._slots: Dict[SensorKey, int] = {}
+        self._keys: List[SensorKey] = []
+        self._values = np.full(64, np.nan)
+        self._lat = np.full(64, np.nan)
+        self._lon = np.full(64, np.nan)
+        self._regions = {level: np.zeros(64, dtype=np.intp) for level in REGION_LEVELS}
+        self.layout_version = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _slot(self, key: SensorKey, state: Optional[str]) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        slot = self._slots[key] = len(self._keys)
+        self._keys.append(key)
+        if slot == len(self._values):
+            self._values = np.concatenate([self._values, np.full(slot, np.nan)])
+            self._lat = np.concatenate([self._lat, np.full(slot, np.nan)])
+            self._lon = np.concatenate([self._lon, np.full(slot, np.nan)])
+            for level, rows in self._regions.items():
+                self._regions[level] = np.concatenate([rows, np.zeros(slot, dtype=np.intp)])
+        district = key[0]
+        state = state or self.registry.get(district, {}).get("state", DEFAULT_STATE)
+        self._regions["district"][slot] = self.levels["district"].region(district)
+        self._regions["state"][slot] = self.levels["state"].region(state)
+        entry = self.registry.get(district)
+        if entry is not None:
+            self._place(slot, float(entry["lat"]), float(entry["lon"]))
+        return slot
+
+    def _place(self, slot: int, lat: float, lon: float) -> Optional[Position]:
+        """Moves a sensor; returns its previous position if it had one and moved."""
+        before = self._lat[slot], self._lon[slot]
+        if before == (lat, lon):
+            return None
+        self.index.place(self._keys[slot], lat, lon)
+        self._lat[slot], self._lon[slot] = lat, lon
+        self.layout_version += 1
+        return None if np.isnan(before[0]) else (float(before[0]), float(before[1]))
+
+    def update(
+        self,
+        keys: Sequence[SensorKey],
+        values: Iterable[float],
+        positions: Optional[Sequence[Optional[Position]]] = None,
+        states: Optional[Sequence[Optional[str]]] = None,
+    ) -> np.ndarray:
+        """
+        Applies the latest reading of each sensor in a batch.
+
+        Args:
+            keys (Sequence[SensorKey]): Distinct ``(district, sensor_id)`` keys.
+            values (Iterable[float]): Latest AQI of each sensor (NaN when absent).
+            positions (Optional[Sequence[Optional[Position]]]): Reported ``(lat, lon)``.
+            states (Optional[Sequence[Optional[str]]]): Reported state code.
+
+        Returns:
+            np.ndarray: ``(m, 2)`` lat/lon of every sensor whose value or position
+            changed (moved sensors contribute their old position too).
+        """
+        if not keys:
+            return np.zeros((0, 2))
+        found = [self._slots.get(key) for key in keys]
+        if None in found:
+            found = [self._slot(key, states[i] if states else None) for i, key in enumerate(keys)]
+        slots = np.array(found, dtype=np.intp)
+        vacated: List[Position] = []
+        moved = np.zeros(len(keys), dtype=bool)
+        if positions:
+            for i, (slot, position) in enumerate(zip(slots.tolist(), positions)):
+                if position is not None and (self._lat[slot], self._lon[slot]) != position:
+                    previous = self._place(slot, *position)
+                    moved[i] = True
+                    if previous is not None:
+                        vacated.append(previous)
+        new = np.fromiter(values, dtype=np.float64, count=len(keys))
+        old = self._values[slots]
+        self._values[slots] = new
+        for level, stats in self.levels.items():
+            stats.shift(self._regions[level][slots], old, new)
+
+        changed = slots[moved | ((new != old) & ~(np.isnan(new) & np.isnan(old)))]
+        touched = np.column_stack([self._lat[changed], self._lon[changed]])
+        if vacated:
+            touched = np.vstack([touched, np.array(vacated)])
+        return touched[~np.isnan(touched[:, 0])]
+
+    def update_records(
+        self, records: Iterable[Mapping[str, Any]], keys: Sequence[SensorKey]
+    ) -> np.ndarray:
+        """``update`` from enriched records (the last record of each key wins)."""
+        latest: Dict[SensorKey, Mapping[str, Any]] = {}
+        for key, record in zip(keys, records):
+            latest[key] = record
+        distinct = list(latest)
+        rows = [latest[key] for key in distinct]
+        return self.update(
+            distinct,
+            (_as_float(r.get("aqi")) for r in rows),
+            [record_position(r) for r in rows],
+            [r.get("state") for r in rows],
+        )
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positioned sensors as ``(n, 2)`` lat/lon and their latest values (NaN when
+        unknown), in slot order: stable until ``layout_version`` changes.
+        """
+        n = len(self._keys)
+        placed = np.flatnonzero(~np.isnan(self._lat[:n]))
+        positions = np.column_stack([self._lat[placed], self._lon[placed]])
+        return positions, self._values[placed]
+
+    def extent(self) -> Optional[BBox]:
+        """Bounding box of all positioned sensors, or None before any is placed."""
+        lat, lon = self._lat[: len(self._keys)], self._lon[: len(self._keys)]
+        if not len(lat) or np.isnan(lat).all():
+            return None
+        return (
+            float(np.nanmin(lat)),
+            float(np.nanmin(lon)),
+            float(np.nanmax(lat)),
+            float(np.nanmax(lon)),
+        )
+
+    def summary(self, level: str = "district") -> List[Dict[str, Any]]:
+        """Aggregates of every region of ``level`` with at least one reporting sensor."""
+        return self.levels[level].summary()
+
+    def sensors(self, bbox: Optional[BBox] = None) -> List[Dict[str, Any]]:
+        """Indexed sensors (inside ``bbox`` if given) with their position and latest AQI."""
+        keys = self.index.within(bbox) if bbox is not None else list(self._keys)
+        output = []
+        for key in keys:
+            position = self.index.position(key)
+            if position is None:
+                continue
+            value = self._values[self._slots[key]]
+            output.append(
+                {
+                    "district": key[0],
+                    "sensor_id": key[1],
+                    "lat": position[0],
+                    "lon": position[1],
+                    "aqi": None if np.isnan(value) else round(float(value), 2),
+                }
+            )
+        return output
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def record_position(record: Mapping[str, Any]) -> Optional[Position]:
+    """``(lat, lon)`` reported by a record, or None when it carries no valid coordinates."""
+    lat, lon = record.get("lat"), record.get("lon")
+    if lat is None or lon is None:
+        return None
+    lat, lon = _as_float(lat), _as_float(lon)
+    if lat != lat or lon != lon:
+        return None
+    return lat, lon
@@ -0,0 +1,221 @@
+"""
+EcoPulse AI Action Plan Snapshots.
+Keeps the municipal action plan precomputed: a background planner watches telemetry and
+regenerates the plan only when its inputs cross a meaningful boundary (severity, forecast
+bucket, alert set), storing each result as a versioned snapshot that pages render as-is.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ecopulse_ai.analytics.planner import generate_action_plan, plan_trigger
+from ecopulse_ai.config import (
+    ALERT_CONTEXT_LIMIT,
+    PLAN_HISTORY,
+    PLAN_MAX_AGE,
+    PLAN_REFRESH_SECONDS,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+from .engine_client import EngineRejected, get_engine_client
+
+# Configure module-level logging
+logger = logging.getLogger("Web-ActionPlans")
+
+PLAN_REFRESHES = REGISTRY.counter(
+    "ecopulse_plan_refresh_total", "Action plan refresh checks by outcome", ("reason",)
+)
+PLAN_SECONDS = REGISTRY.histogram("ecopulse_plan_generate_seconds", "Action plan generation time")
+
+# (latest metrics, forecast, active alerts)
+PlanInputs = Tuple[Dict[str, Any], Any, List[Dict[str, Any]]]
+
+# Position of each trigger component -> reason reported when it changes
+TRIGGER_REASONS: Tuple[str, ...] = ("severity", "forecast", "alerts")
+
+
+def collect_plan_inputs() -> Optional[PlanInputs]:
+    """
+    Latest record, the engine's incremental next-step forecast for its sensor and the
+    active alerts (through the shared client), or ``None`` while telemetry is offline.
+    """
+    client = get_engine_client()
+    data = client.fetch("environmental_metrics")
+    if not data:
+        return None
+    latest = data[-1]
+    params = {k: latest[k] for k in ("sensor_id", "district") if latest.get(k) is not None}
+    try:
+        forecast = client.fetch("forecast", params=params, default={})
+    except EngineRejected:  # sensor unknown to the engine's forecasters
+        forecast = {}
+    payload = client.fetch("alerts", params={"limit": ALERT_CONTEXT_LIMIT}, default={})
+    alerts = payload.get("active", []) if isinstance(payload, dict) else []
+    next_value = forecast.get("next") if isinstance(forecast, dict) else None
+    return latest, next_value if next_value is not None else "Insufficient data", alerts
+
+
+class PlanSnapshot:
+    """One generated action plan and the inputs it was generated for."""
+
+    def __init__(self, version: int, plan: Dict[str, Any], trigger: Tuple[Any, ...], reason: str):
+        self.version = version
+        self.plan = plan
+        self.trigger = trigger
+        self.reason = reason
+        self.created = time.time()
+
+    @property
+    def as_of(self) -> str:
+        return datetime.fromtimestamp(self.created).isoformat(timespec="seconds")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "as_of": self.as_of,
+            "reason": self.reason,
+            "plan": self.plan,
+        }
+
+
+class ActionPlanner:
+    """
+    Background regeneration of action plan snapshots.
+
+    Every ``interval`` seconds the current inputs are reduced to a ``plan_trigger``; a new
+    plan is generated only if that differs from the latest snapshot's (or the snapshot
+    is older than ``max_age``), so the LLM is called on change rather than per page view.
+
+    Args:
+        inputs (Optional[Callable[[], Optional[PlanInputs]]]): Source of plan inputs
+            (defaults to the engine; overridden by tests).
+        interval (float): Seconds between refresh checks.
+        max_age (float): Seconds after which an unchanged plan is regenerated (0 = never).
+        history (int): Number of versioned snapshots retained.
+    """
+
+    def __init__(
+        self,
+        inputs: Optional[Callable[[], Optional[PlanInputs]]] = None,
+        interval: float = PLAN_REFRESH_SECONDS,
+        max_age: float = PLAN_MAX_AGE,
+        history: int = PLAN_HISTORY,
+    ):
+        self.inputs = inputs or collect_plan_inputs
+        self.interval = interval
+        self.max_age = max_age
+        self.version = 0
+        self.snapshots: Deque[PlanSnapshot] = deque(maxlen=max(1, history))
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def latest(self) -> Optional[PlanSnapshot]:
+        with self._lock:
+            return self.snapshots[-1] if self.snapshots else None
+
+    def get(self, version: int) -> Optional[PlanSnapshot]:
+        with self._lock:
+            return next((s for s in self.snapshots if s.version == version), None)
+
+    def history(self) -> List[PlanSnapshot]:
+        """Retained snapshots, newest first."""
+        with self._lock:
+            return list(reversed(self.snapshots))
+
+    def _reason(self, trigger: Tuple[Any, ...], force: bool) -> Optional[str]:
+        latest = self.latest()
+        if latest is None:
+            return "initial"
+        if force:
+            return "forced"
+        for reason, before, after in zip(TRIGGER_REASONS, latest.trigger, trigger):
+            if before != after:
+                return reason
+        if self.max_age > 0 and time.time() - latest.created >= self.max_age:
+            return "expired"
+        return None
+
+    def refresh(self, force: bool = False) -> Optional[PlanSnapshot]:
+        """
+        Checks the inputs once and regenerates the plan if they crossed a boundary.
+
+        Returns:
+            Optional[PlanSnapshot]: The new snapshot, or ``None`` if the plan was kept
+            (inputs unchanged or telemetry offline).
+        """
+        with self._refresh_lock:
+            inputs = self.inputs()
+            if inputs is None:
+                PLAN_REFRESHES.labels("offline").inc()
+                return None
+            latest_metrics, forecast, alerts = inputs
+            trigger = plan_trigger(latest_metrics, forecast, alerts)
+            reason = self._reason(trigger, force)
+            if reason is None:
+                PLAN_REFRESHES.labels("unchanged").inc()
+                return None
+
+            started = time.perf_counter()
+            # Forced and expired refreshes exist to get a new plan, not the cached one
+            refresh = reason in ("forced", "expired")
+            plan = generate_action_plan(latest_metrics, forecast, alerts, refresh=refresh)
+            PLAN_SECONDS.observe(time.perf_counter() - started)
+            PLAN_REFRESHES.labels(reason).inc()
+            with self._lock:
+                self.version += 1
+                snapshot = PlanSnapshot(self.version, plan, trigger, reason)
+                self.snapshots.append(snapshot)
+        logger.info(f"Action plan v{snapshot.version} generated ({reason}).")
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Action plan refresh failed: {e}")
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def current(self) -> Optional[PlanSnapshot]:
+        """
+        The latest snapshot, starting the background planner on first use. Only the
+        very first call (no snapshot yet) generates a plan synchronously.
+        """
+        self.ensure_started()
+        latest = self.latest()
+        if latest is None:
+            self.refresh()
+            latest = self.latest()
+        return latest
+
+
+_planner: Optional[ActionPlanner] = None
+_planner_lock = threading.Lock()
+
+
+def get_action_planner() -> ActionPlanner:
+    """Returns the process-wide background action planner."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = ActionPlanner()
+        return _planner
@@ -0,0 +1,412 @@
+"""
+EcoPulse AI Engine Client.
+Shared, connection-pooled access to the streaming analytics engine for the web tier:
+a short-TTL response cache with single-flight coalescing (N concurrent identical
+requests cause one upstream fetch), a circuit breaker that fails fast while the engine
+is down, and an asyncio variant for ASGI deployments.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ecopulse_ai.config import (
+    ENGINE_BREAKER_RESET,
+    ENGINE_BREAKER_THRESHOLD,
+    ENGINE_CACHE_SIZE,
+    ENGINE_CACHE_TTL,
+    ENGINE_POOL_SIZE,
+    ENGINE_STALE_MAX_AGE,
+    ENGINE_TIMEOUT,
+    STREAM_HOST,
+    STREAM_PORT,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+try:
+    import aiohttp
+except ImportError:  # optional: async fetches then run the pooled sync client in a thread
+    aiohttp = None
+
+# Configure module-level logging
+logger = logging.getLogger("Web-EngineClient")
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+FETCH_SECONDS = REGISTRY.histogram(
+    "ecopulse_engine_fetch_seconds", "Upstream engine fetch latency", ("endpoint", "outcome")
+)
+CACHE_RESULTS = REGISTRY.counter(
+    "ecopulse_engine_cache_total",
+    "Engine client lookups by result (hit, miss, coalesced, stale, default)",
+    ("result",),
+)
+BREAKER_OPEN = REGISTRY.gauge(
+    "ecopulse_engine_breaker_open", "1 while the engine circuit is open or half-open"
+)
+
+
+def cache_key(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> CacheKey:
+    """Normalizes an endpoint and query parameters into a hashable cache key."""
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return endpoint.strip("/"), items
+
+
+class EngineUnavailable(RuntimeError):
+    """Raised internally when the breaker is open or an upstream fetch fails."""
+
+
+class EngineRejected(Exception):
+    """
+    The engine answered with a 4xx (e.g. invalid query parameters). The engine is
+    healthy, so this is neither a breaker failure nor cached; it is raised to the caller
+    with the engine's status and JSON body.
+    """
+
+    def __init__(self, status: int, payload: Any):
+        super().__init__(f"engine rejected request ({status})")
+        self.status = status
+        self.payload = payload
+
+
+def _error_payload(response: requests.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return {"error": response.text or response.reason}
+
+
+class ResponseCache:
+    """
+    Bounded TTL cache that keeps expired entries as a stale fallback for outages.
+
+    Keys include client-supplied query strings, so the cache is an LRU of at most
+    ``capacity`` entries, and an entry older than ``max_stale`` is dropped rather than
+    served stale.
+    """
+
+    def __init__(
+        self,
+        ttl: float = ENGINE_CACHE_TTL,
+        capacity: int = ENGINE_CACHE_SIZE,
+        max_stale: float = ENGINE_STALE_MAX_AGE,
+    ):
+        self.ttl = ttl
+        self.capacity = max(1, capacity)
+        self.max_stale = max(ttl, max_stale)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            stored_at, value = entry
+            age = now - stored_at
+            if age >= self.max_stale:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        if allow_stale or age < self.ttl:
+            return True, value
+        return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    After ``threshold`` consecutive failures the breaker opens and every call fails fast
+    for ``reset_timeout`` seconds; then a single probe is let through, and its outcome
+    closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self, threshold: int = ENGINE_BREAKER_THRESHOLD, reset_timeout: float = ENGINE_BREAKER_RESET
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("Engine reachable again; closing circuit.")
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                if self.opened_at is None or self._probing:
+                    logger.warning(f"Opening engine circuit for {self.reset_timeout}s.")
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class _Flight:
+    """An upstream fetch in progress that concurrent callers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class EngineClient:
+    """
+    Thread-safe engine client shared by all Flask worker threads.
+
+    Args:
+        base_url (Optional[str]): Engine root URL (defaults to STREAM_HOST/STREAM_PORT).
+        ttl (float): Seconds a response is served from cache.
+        timeout (float): Upstream read timeout in seconds.
+        pool_size (int): Keep-alive connections held open to the engine.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        ttl: float = ENGINE_CACHE_TTL,
+        timeout: float = ENGINE_TIMEOUT,
+        pool_size: int = ENGINE_POOL_SIZE,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.base_url = (base_url or f"http://{STREAM_HOST}:{STREAM_PORT}").rstrip("/")
+        self.timeout = timeout
+        self.cache = ResponseCache(ttl)
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._flights: Dict[CacheKey, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}/{endpoint.strip('/')}"
+
+    def _get(self, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
+        response = self.session.get(
+            self.url(endpoint), params=params, timeout=(min(1.0, self.timeout), self.timeout)
+        )
+        if 400 <= response.status_code < 500:
+            raise EngineRejected(response.status_code, _error_payload(response))
+        response.raise_for_status()
+        return response.json()
+
+    def _upstream(self, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
+        if not self.breaker.allow():
+            raise EngineUnavailable("engine circuit open")
+        started = time.perf_counter()
+        try:
+            value = self._get(endpoint, params)
+        except EngineRejected:
+            self.record_fetch(endpoint, "rejected", started)
+            raise
+        except Exception as e:
+            self.record_fetch(endpoint, "error", started)
+            raise EngineUnavailable(str(e)) from e
+        self.record_fetch(endpoint, "ok", started)
+        return value
+
+    def record_fetch(self, endpoint: str, outcome: str, started: float) -> None:
+        """
+        Feeds one upstream outcome to the breaker and the fetch-latency metrics. Only
+        ``error`` (connection failures, timeouts, 5xx) counts against the breaker; a
+        ``rejected`` 4xx still proves the engine is reachable.
+        """
+        FETCH_SECONDS.labels(endpoint.strip("/"), outcome).observe(time.perf_counter() - started)
+        if outcome == "error":
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        BREAKER_OPEN.set(self.breaker.state != "closed")
+
+    def _fallback(self, key: CacheKey, endpoint: str, error: BaseException, default: Any) -> Any:
+        hit, stale = self.cache.get(key, allow_stale=True)
+        CACHE_RESULTS.labels("stale" if hit else "default").inc()
+        logger.error(f"Failed telemetry fetch from {endpoint}: {error}")
+        return stale if hit else default
+
+    def fetch(
+        self, endpoint: str, params: Optional[Mapping[str, Any]] = None, default: Any = None
+    ) -> Any:
+        """
+        Returns the engine's JSON for an endpoint, coalescing concurrent identical calls.
+
+        On failure (or while the circuit is open) the last known response is served
+        if one exists, otherwise ``default`` (an empty list unless given).
+
+        Raises:
+            EngineRejected: If the engine answered with a 4xx for these parameters.
+        """
+        default = [] if default is None else default
+        key = cache_key(endpoint, params)
+        hit, value = self.cache.get(key)
+        if hit:
+            CACHE_RESULTS.labels("hit").inc()
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait(self.timeout * 2)
+            if isinstance(flight.error, EngineRejected):
+                raise flight.error
+            if flight.error is None and flight.done.is_set():
+                CACHE_RESULTS.labels("coalesced").inc()
+                return flight.value
+            return self._fallback(key, endpoint, flight.error or TimeoutError(), default)
+
+        try:
+            flight.value = self._upstream(endpoint, params)
+            self.cache.put(key, flight.value)
+            CACHE_RESULTS.labels("miss").inc()
+            return flight.value
+        except EngineRejected as e:
+            flight.error = e
+            raise
+        except EngineUnavailable as e:
+            flight.error = e
+            return self._fallback(key, endpoint, e, default)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+class AsyncEngineClient:
+    """
+    asyncio counterpart of ``EngineClient`` for ASGI deployments.
+
+    Shares the cache and circuit breaker of a sync client so both front ends see the
+    same engine health. Uses ``aiohttp`` when installed; otherwise the pooled sync
+    request runs in the default executor without blocking the event loop.
+    """
+
+    def __init__(self, client: Optional[EngineClient] = None):
+        self.client = client or get_engine_client()
+        self._flights: Dict[CacheKey, "asyncio.Future[Any]"] = {}
+        self._session: Any = None
+
+    async def _get(self, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.client._get, endpoint, params)
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=ENGINE_POOL_SIZE)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.client.timeout)
+            )
+        query = {str(k): str(v) for k, v in (params or {}).items()}
+        async with self._session.get(self.client.url(endpoint), params=query) as response:
+            if 400 <= response.status < 500:
+                try:
+                    payload = await response.json(content_type=None)
+                except ValueError:
+                    payload = {"error": response.reason}
+                raise EngineRejected(response.status, payload)
+            response.raise_for_status()
+            return await response.json()
+
+    async def _upstream(self, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
+        if not self.client.breaker.allow():
+            raise EngineUnavailable("engine circuit open")
+        started = time.perf_counter()
+        try:
+            value = await self._get(endpoint, params)
+        except EngineRejected:
+            self.client.record_fetch(endpoint, "rejected", started)
+            raise
+        except Exception as e:
+            self.client.record_fetch(endpoint, "error", started)
+            raise EngineUnavailable(str(e)) from e
+        self.client.record_fetch(endpoint, "ok", started)
+        return value
+
+    async def fetch(
+        self, endpoint: str, params: Optional[Mapping[str, Any]] = None, default: Any = None
+    ) -> Any:
+        """Async ``EngineClient.fetch`` with the same caching and fallback semantics."""
+        default = [] if default is None else default
+        key = cache_key(endpoint, params)
+        hit, value = self.client.cache.get(key)
+        if hit:
+            CACHE_RESULTS.labels("hit").inc()
+            return value
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._upstream(endpoint, params))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        try:
+            value = await asyncio.shield(flight)
+        except EngineUnavailable as e:
+            return self.client._fallback(key, endpoint, e, default)
+        self.client.cache.put(key, value)
+        return value
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_client: Optional[EngineClient] = None
+_client_lock = threading.Lock()
+
+
+def get_engine_client() -> EngineClient:
+    """Returns the process-wide engine client (one connection pool per web process)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = EngineClient()
+        return _client
@@ -0,0 +1,154 @@
+"""
+EcoPulse AI Live Update Relay.
+Holds a single SSE subscription to the streaming engine and fans its deltas out to every
+open dashboard, so browser count no longer multiplies upstream engine requests.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import requests
+
+from ecopulse_ai.analytics.rules import LEVELS
+from ecopulse_ai.config import LIVE_HEARTBEAT_SECONDS, LIVE_HISTORY, STREAM_HOST, STREAM_PORT
+from ecopulse_ai.streaming.broadcast import Event, EventHub, iter_sse
+
+# Configure module-level logging
+logger = logging.getLogger("Web-Live")
+
+
+class LiveRelay:
+    """
+    Web-tier mirror of the engine's live state.
+
+    Upstream ``snapshot``/``records`` events are de-duplicated by feed sequence number,
+    folded into a short history, and re-published to browsers as ``records`` deltas.
+    Alerts follow the engine's lifecycle feed the same way: the ``alerts`` snapshot
+    seeds the active set and ``alert_events`` (open/escalate/deescalate/resolve) are
+    folded into it and forwarded, so alerts are never re-derived per record.
+    """
+
+    def __init__(self, url: Optional[str] = None, history: int = LIVE_HISTORY):
+        self.url = url or f"http://{STREAM_HOST}:{STREAM_PORT}/stream"
+        self.hub = EventHub()
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.sequence = 0
+        self.alert_sequence = 0
+        self.active: Dict[str, Dict[str, Any]] = {}
+        self.views: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        """Active alerts, most severe (then most recently updated) first."""
+        return sorted(
+            self.active.values(),
+            key=lambda a: (LEVELS.index(a.get("level", LEVELS[0])), a.get("updated", "")),
+            reverse=True,
+        )
+
+    def _apply_alert_events(self, data: Dict[str, Any]) -> None:
+        fresh = [e for e in data.get("events", []) if e.get("seq", 0) > self.alert_sequence]
+        if not fresh:
+            return
+        self.alert_sequence = data.get("sequence", fresh[-1]["seq"])
+        for event in fresh:
+            if event.get("event") == "resolve":
+                self.active.pop(event.get("id"), None)
+                continue
+            current = self.active.get(event.get("id"), {})
+            self.active[event["id"]] = {
+                **current,
+                **{k: v for k, v in event.items() if k not in ("event", "previous", "seq")},
+                "opened": current.get("opened", event.get("time")),
+                "updated": event.get("time"),
+            }
+        self.hub.publish("alert_events", {"sequence": self.alert_sequence, "events": fresh})
+
+    def handle(self, event: str, data: Any) -> None:
+        """Applies one upstream event and republishes the resulting delta."""
+        with self._lock:
+            if event == "snapshot":
+                self.sequence = data.get("sequence", 0)
+                self.history.clear()
+                self.history.extend(data.get("records", []))
+                self.hub.publish("snapshot", self._snapshot_payload())
+            elif event == "records":
+                fresh = data.get("sequence", 0) - self.sequence
+                if fresh <= 0:
+                    return
+                records = data.get("records", [])[-fresh:]
+                self.sequence = data["sequence"]
+                self.history.extend(records)
+                self.hub.publish("records", {"sequence": self.sequence, "records": records})
+            elif event == "alerts":
+                self.alert_sequence = data.get("sequence", 0)
+                self.active = {alert["id"]: alert for alert in data.get("active", [])}
+                self.hub.publish("alerts", self.alerts)
+            elif event == "alert_events":
+                self._apply_alert_events(data)
+            else:
+                self.views[event] = data
+                self.hub.publish(event, data)
+
+    def _snapshot_payload(self) -> Dict[str, Any]:
+        history = list(self.history)
+        return {
+            "sequence": self.sequence,
+            "latest": history[-1] if history else None,
+            "history": history,
+            "alerts": self.alerts,
+        }
+
+    def snapshot_events(self) -> List[Event]:
+        with self._lock:
+            events: List[Event] = [("snapshot", self._snapshot_payload())]
+            if self.active:
+                events.append(("alerts", self.alerts))
+            events.extend(self.views.items())
+        return events
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                with requests.get(
+                    self.url, stream=True, timeout=(5, LIVE_HEARTBEAT_SECONDS * 3)
+                ) as response:
+                    response.raise_for_status()
+                    logger.info("Subscribed to engine live updates.")
+                    backoff = 1.0
+                    for event, data in iter_sse(response.iter_lines()):
+                        self.handle(event, data)
+            except Exception as e:
+                logger.error(f"Engine live stream interrupted: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stream(self) -> Iterator[bytes]:
+        """Browser stream: current snapshot and views, then deltas as they arrive."""
+        self.ensure_started()
+        return self.hub.stream(initial=self.snapshot_events)
+
+
+_relay: Optional[LiveRelay] = None
+_relay_lock = threading.Lock()
+
+
+def get_live_relay() -> LiveRelay:
+    """Returns the process-wide relay (one upstream subscription per web process)."""
+    global _relay
+    with _relay_lock:
+        if _relay is None:
+            _relay = LiveRelay()
+        return _relay
@@ -6,14 +6,15 @@ and the AI reasoning services.
 
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-import requests
 from flask import (
     Blueprint,
     Response,
     flash,
+    g,
     jsonify,
     redirect,
     render_template,
@@ -24,10 +25,17 @@ from flask import (
 from flask_login import current_user, login_required, login_user, logout_user
 
 from ecopulse_ai.analytics.alerts import get_alert_status
-from ecopulse_ai.analytics.prediction import get_aqi_forecast
-from ecopulse_ai.config import REPORT_DIR, STREAM_HOST, STREAM_PORT
-from ecopulse_ai.rag.copilot import ask_copilot
-
+from ecopulse_ai.config import ALERT_CONTEXT_LIMIT, REPORT_WAIT_SECONDS, THRESHOLDS
+from ecopulse_ai.observability.metrics import REGISTRY, metrics_response
+from ecopulse_ai.rag.copilot import ask_copilot, stream_copilot
+from ecopulse_ai.reports.jobs import REPORT_KINDS, get_report_queue
+from ecopulse_ai.storage.epoch import from_epoch
+from ecopulse_ai.storage.timeseries import TimeSeriesStore
+from ecopulse_ai.streaming.broadcast import SSE_HEADERS, format_sse
+
+from .action_plans import get_action_planner
+from .engine_client import EngineRejected, get_engine_client
+from .live import get_live_relay
 from .models import User
 
 # Configure module-level logging
@@ -35,6 +43,16 @@ logger = logging.getLogger("Web-Routes")
 
 main_bp = Blueprint("main", __name__)
 
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ecopulse_http_request_seconds", "Web request latency", ("endpoint", "method", "status")
+)
+
+
+@main_bp.errorhandler(EngineRejected)
+def engine_rejected(error: EngineRejected) -> Response:
+    """Relays the engine's 4xx (e.g. invalid ``/simulate`` parameters) to the client."""
+    return jsonify(error.payload), error.status
+
 
 # --- Helper Utilities (Modular Design) ---
 
@@ -44,35 +62,79 @@ def _fetch_streaming_data(
 ) -> List[Dict[str, Any]]:
     """
     Modular abstraction for fetching telemetry from the Pathway Analytics Engine.
+    Goes through the shared pooled client (cached, coalesced and circuit-broken).
+    """
+    return get_engine_client().fetch(endpoint, params=params)
+
+
+def _active_alerts(limit: int = ALERT_CONTEXT_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Open alerts from the engine's lifecycle store, most severe first. Alerts are
+    maintained incrementally by the engine, so requests read them instead of
+    re-evaluating thresholds against the latest record.
+    """
+    payload = get_engine_client().fetch("alerts", params={"limit": limit}, default={})
+    return payload.get("active", []) if isinstance(payload, dict) else []
+
+
+def _engine_forecast(latest: Dict[str, Any], n_steps: int = 5) -> Dict[str, Any]:
+    """
+    The engine's incremental forecast for the sensor of ``latest`` (read from its
+    per-sensor state, never refitted per request); empty if the engine has none.
     """
-    url = f"http://{STREAM_HOST}:{STREAM_PORT}/{endpoint}"
+    params = {"n_steps": n_steps}
+    params.update({k: latest[k] for k in ("sensor_id", "district") if latest.get(k) is not None})
     try:
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        logger.error(f"Failed telemetry fetch from {endpoint}: {e}")
-        return []
+        payload = get_engine_client().fetch("forecast", params=params, default={})
+    except EngineRejected:
+        return {}
+    return payload if isinstance(payload, dict) else {}
 
 
 def _generate_metric_package(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Enriches raw telemetry with forecasts and alert classifications for the UI.
+    Enriches raw telemetry with the engine's forecast and active alerts for the UI.
     """
     if not data:
         return {"error": "Telemetry stream unavailable"}
 
     latest = data[-1]
-    history = [d.get("aqi", 0) for d in data[-20:]]
+    forecast = _engine_forecast(latest)
 
     return {
         "latest": latest,
-        "alerts": get_alert_status(latest),
-        "forecast": get_aqi_forecast(history),
+        "alerts": _active_alerts(),
+        "forecast": forecast.get("next", "Insufficient data"),
+        "forecast_horizon": forecast.get("horizon", {"method": "holt", "points": []}),
         "history": data[-50:],
     }
 
 
+# --- Observability ---
+
+
+@main_bp.before_app_request
+def _start_timer() -> None:
+    g.request_started = time.perf_counter()
+
+
+@main_bp.after_app_request
+def _record_latency(response: Response) -> Response:
+    """Observes request latency by route (streaming responses count until headers)."""
+    started = g.pop("request_started", None)
+    if started is not None:
+        REQUEST_SECONDS.labels(
+            request.endpoint or "unmatched", request.method, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+@main_bp.route("/metrics")
+def metrics() -> Response:
+    """Prometheus scrape endpoint for the web process (unauthenticated for scrapers)."""
+    return metrics_response()
+
+
 # --- Authentication Routes ---
 
 
@@ -148,25 +210,22 @@ def reports() -> str:
     return render_template("reports.html")
 
 
+@main_bp.route("/archives")
+@login_required
+def archives() -> str:
+    return render_template("archives.html")
+
+
 @main_bp.route("/action-plan")
 @login_required
 def action_plan() -> Union[Response, str]:
-    """Generates an AI-optimized municipal action plan."""
-    data = _fetch_streaming_data("environmental_metrics")
-    if not data:
+    """Renders the latest precomputed municipal action plan snapshot."""
+    snapshot = get_action_planner().current()
+    if snapshot is None:
         flash("Unable to generate plan: Real-time telemetry currently offline.")
         return redirect(url_for("main.dashboard"))
 
-    latest = data[-1]
-    history = [d.get("aqi", 0) for d in data[-20:]]
-    forecast = get_aqi_forecast(history)
-    alerts = get_alert_status(latest)
-
-    from ecopulse_ai.analytics.planner import generate_action_plan
-
-    plan = generate_action_plan(latest, forecast, alerts)
-
-    return render_template("action_plan.html", plan=plan)
+    return render_template("action_plan.html", plan=snapshot.plan, snapshot=snapshot)
 
 
 # --- Data & Proxy API Endpoints ---
@@ -184,6 +243,13 @@ def get_metrics() -> Response:
     return jsonify(package)
 
 
+@main_bp.route("/api/stream")
+@login_required
+def stream_updates() -> Response:
+    """Server-Sent Events feed of live deltas (replaces per-dashboard polling)."""
+    return Response(get_live_relay().stream(), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+
 @main_bp.route("/api/national")
 @login_required
 def get_national() -> Response:
@@ -196,10 +262,166 @@ def get_districts() -> Response:
     return jsonify(_fetch_streaming_data("district_comparison"))
 
 
+@main_bp.route("/api/sensors")
+@login_required
+def get_sensors() -> Response:
+    """Positioned sensors with their latest AQI (``bbox=min_lat,min_lon,max_lat,max_lon``)."""
+    return jsonify(_fetch_streaming_data("sensors", params=request.args))
+
+
+@main_bp.route("/api/heatmap")
+@login_required
+def get_heatmap() -> Response:
+    """Interpolated AQI tiles from the engine (``bbox``, ``method=idw|kriging``)."""
+    return jsonify(get_engine_client().fetch("heatmap", params=request.args, default={}))
+
+
+@main_bp.route("/api/simulate")
+@login_required
+def get_simulation() -> Response:
+    """What-if response surfaces for a grid of policy scenarios (memoized by the engine)."""
+    return jsonify(get_engine_client().fetch("simulate", params=request.args, default={}))
+
+
+@main_bp.route("/api/alerts")
+@login_required
+def get_alerts() -> Response:
+    """Active alert snapshot from the engine (``limit``, ``district``, ``sensor_id``)."""
+    return jsonify(get_engine_client().fetch("alerts", params=request.args, default={}))
+
+
+@main_bp.route("/api/action-plan")
+@login_required
+def get_action_plan() -> Response:
+    """Latest action plan snapshot, or a retained one by ``version``."""
+    planner = get_action_planner()
+    version = request.args.get("version", type=int)
+    snapshot = planner.get(version) if version is not None else planner.current()
+    if snapshot is None:
+        return jsonify({"error": "Action plan unavailable"}), 404 if version is not None else 503
+    return jsonify(snapshot.to_dict())
+
+
+# --- Historical Archive API ---
+
+
+def _archive_store() -> TimeSeriesStore:
+    return TimeSeriesStore(writer_id="web")
+
+
+def _json_series(columns: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Converts NumPy columns to JSON lists (NaN becomes null)."""
+    return {
+        name: [None if isinstance(v, float) and v != v else v for v in values.tolist()]
+        for name, values in columns.items()
+    }
+
+
+def _health_grade(score: float) -> str:
+    for floor, grade in ((80, "Optimal"), (65, "Steady"), (50, "Moderate"), (35, "Vulnerable")):
+        if score >= floor:
+            return grade
+    return "Critical"
+
+
+@main_bp.route("/api/archives/days")
+@login_required
+def archive_days() -> Response:
+    """Days of a month (``?month=YYYY-MM``, default current) that hold archived data."""
+    month = request.args.get("month") or datetime.now().strftime("%Y-%m")
+    try:
+        first = datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        return jsonify({"error": "month must be formatted YYYY-MM"}), 400
+    following = (first + timedelta(days=32)).replace(day=1)
+
+    store = _archive_store()
+    daily = store.rollup("1d", first, following)
+    days = [
+        {"day": from_epoch(bucket).day, "avg_aqi": round(aqi, 1)}
+        for bucket, count, aqi in zip(
+            daily["bucket"].tolist(), daily["count"].tolist(), daily["aqi_mean"].tolist()
+        )
+        if count
+    ]
+    return jsonify({"month": month, "days": days, "size_bytes": store.size_bytes()})
+
+
+@main_bp.route("/api/archives/day")
+@login_required
+def archive_day() -> Response:
+    """Daily intelligence summary (``?date=YYYY-MM-DD``) built from archive rollups."""
+    try:
+        day = datetime.strptime(request.args.get("date", ""), "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "date must be formatted YYYY-MM-DD"}), 400
+    district = request.args.get("district")
+
+    store = _archive_store()
+    daily = store.rollup("1d", day, day + timedelta(days=1), district=district)
+    if not len(daily["count"]) or not daily["count"][0]:
+        return jsonify({"date": day.date().isoformat(), "readings": 0}), 404
+
+    hourly = store.rollup("1h", day, day + timedelta(days=1), district=district)
+    hours: List[Optional[float]] = [None] * 24
+    incidents = []
+    warning = THRESHOLDS["AQI"]["warning"]
+    for bucket, mean, peak in zip(
+        hourly["bucket"].tolist(), hourly["aqi_mean"].tolist(), hourly["aqi_max"].tolist()
+    ):
+        hour = from_epoch(bucket).hour
+        hours[hour] = round(mean, 1)
+        alerts = get_alert_status({"aqi": peak}) if peak >= warning else []
+        if alerts:
+            incidents.append(
+                {"time": f"{hour:02d}:00", "peak_aqi": round(peak, 1), "level": alerts[0]["level"]}
+            )
+
+    peak_hour = max((h for h in range(24) if hours[h] is not None), key=lambda h: hours[h])
+    health = float(daily["health_score_mean"][0])
+    return jsonify(
+        {
+            "date": day.date().isoformat(),
+            "readings": int(daily["count"][0]),
+            "avg_aqi": round(float(daily["aqi_mean"][0]), 1),
+            "peak_aqi": round(float(daily["aqi_max"][0]), 1),
+            "peak_co2": round(float(daily["co2_max"][0]), 1),
+            "avg_health": round(health, 1),
+            "health_grade": _health_grade(health),
+            "peak_hour": f"{peak_hour:02d}:00",
+            "hourly_aqi": hours,
+            "incidents": incidents,
+        }
+    )
+
+
+@main_bp.route("/api/archives/series")
+@login_required
+def archive_series() -> Response:
+    """
+    Rollup series for reports and charts:
+    ``?resolution=1m|1h|1d&start=ISO&end=ISO[&sensor_id=..][&district=..]``.
+    """
+    try:
+        columns = _archive_store().rollup(
+            request.args.get("resolution", "1h"),
+            request.args.get("start"),
+            request.args.get("end"),
+            sensor_id=request.args.get("sensor_id"),
+            district=request.args.get("district"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(_json_series(columns))
+
+
 @main_bp.route("/api/chat", methods=["POST"])
 @login_required
 def chat() -> Response:
-    """Context-aware Copilot integration endpoint."""
+    """
+    Context-aware Copilot integration endpoint. With ``"stream": true`` the answer is
+    served as SSE ``token`` events followed by ``done``, instead of one JSON body.
+    """
     body = request.json or {}
     query = body.get("query")
 
@@ -208,7 +430,16 @@ def chat() -> Response:
 
     data = _fetch_streaming_data("environmental_metrics")
     latest = data[-1] if data else {}
-    alerts = get_alert_status(latest)
+    alerts = _active_alerts()
+
+    if body.get("stream"):
+
+        def events() -> Iterator[bytes]:
+            for token in stream_copilot(query, latest, alerts):
+                yield format_sse("token", {"text": token})
+            yield format_sse("done", {})
+
+        return Response(events(), mimetype="text/event-stream", headers=SSE_HEADERS)
 
     response_text = ask_copilot(query, latest, alerts)
     return jsonify({"response": response_text})
@@ -217,33 +448,68 @@ def chat() -> Response:
 # --- Document Generation & Exports ---
 
 
-@main_bp.route("/reports/export")
-@login_required
-def export_report() -> Response:
-    """Orchestrates the generation of a high-fidelity environmental audit."""
+def _submit_report(kind: str) -> Any:
     data = _fetch_streaming_data("environmental_metrics")
+    return get_report_queue().submit(kind, data)
 
-    filename = f"ecopulse_audit_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-    report_path = os.path.join(REPORT_DIR, filename)
 
-    from ecopulse_ai.reports.generator import generate_full_report
+def _job_links(job: Any) -> Dict[str, Any]:
+    return {
+        **job.to_dict(),
+        "status_url": url_for("main.report_status", job_id=job.id),
+        "download_url": url_for("main.report_download", job_id=job.id),
+    }
 
-    generate_full_report(data, report_path)
 
-    return send_file(report_path, as_attachment=True)
+def _send_report_when_ready(kind: str) -> Response:
+    """Legacy download links: wait briefly for the job, else hand back its status."""
+    job = _submit_report(kind)
+    if job.wait(REPORT_WAIT_SECONDS) and job.status == "done":
+        return send_file(job.path, as_attachment=True, download_name=job.filename)
+    if job.status == "failed":
+        return jsonify({**_job_links(job), "error": job.error}), 500
+    return jsonify(_job_links(job)), 202
 
 
-@main_bp.route("/reports/mayor-brief")
+@main_bp.route("/api/reports", methods=["POST"])
 @login_required
-def export_mayor_brief() -> Response:
-    """Orchestrates the generation of a strategic executive briefing."""
-    data = _fetch_streaming_data("environmental_metrics")
+def create_report_job() -> Response:
+    """Queues a report rendering job (``kind``: ``full`` or ``mayor``)."""
+    kind = (request.json or {}).get("kind", "full") if request.is_json else "full"
+    if kind not in REPORT_KINDS:
+        return jsonify({"error": f"Unknown report kind: {kind}"}), 400
+    return jsonify(_job_links(_submit_report(kind))), 202
+
+
+@main_bp.route("/api/reports/<job_id>")
+@login_required
+def report_status(job_id: str) -> Response:
+    job = get_report_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired report job"}), 404
+    return jsonify(_job_links(job))
+
+
+@main_bp.route("/api/reports/<job_id>/download")
+@login_required
+def report_download(job_id: str) -> Response:
+    job = get_report_queue().get(job_id)
+    if job is None or (job.status == "done" and not os.path.exists(job.path)):
+        return jsonify({"error": "Unknown or expired report job"}), 404
+    if job.status != "done":
+        return jsonify(_job_links(job)), 409
+    return send_file(job.path, as_attachment=True, download_name=job.filename)
 
-    filename = f"mayor_briefing_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-    report_path = os.path.join(REPORT_DIR, filename)
 
-    from ecopulse_ai.reports.generator import generate_mayor_briefing
+@main_bp.route("/reports/export")
+@login_required
+def export_report() -> Response:
+    """Orchestrates the generation of a high-fidelity environmental audit."""
+    return _send_report_when_ready("full")
 
-    generate_mayor_briefing(data, report_path)
 
-    return send_file(report_path, as_attachment=True)
+@main_bp.route("/reports/mayor-brief")
+@login_required
+def export_mayor_brief() -> Response:
+    """Orchestrates the generation of a strategic executive briefing."""
+    return _send_report_when_ready("mayor")
@@ -4,7 +4,7 @@ This module handles environment variables, system constants, and directory initi
 """
 
 import os
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
@@ -20,20 +20,204 @@ DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
 KAFKA_BOOTSTRAP_SERVERS: str = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
 KAFKA_TOPIC: str = "environmental_stream"
 
+# --- Producer Tuning & Load Generation ---
+# Client-side batching: wait up to linger.ms to fill batches of up to batch.size bytes
+PRODUCER_LINGER_MS: int = int(os.getenv("PRODUCER_LINGER_MS", "20"))
+PRODUCER_BATCH_BYTES: int = int(os.getenv("PRODUCER_BATCH_BYTES", str(1 << 20)))
+PRODUCER_COMPRESSION: str = os.getenv("PRODUCER_COMPRESSION", "lz4")
+# Payload encoding: "json" or "binary" (fixed-layout records; read by the shim consumers,
+# which accept both formats side by side via a message header)
+WIRE_FORMAT: str = os.getenv("WIRE_FORMAT", "json")
+# Load mode: simulated sensors, target publish rate (msgs/s), run length and report cadence
+LOAD_SENSORS: int = int(os.getenv("LOAD_SENSORS", "2000"))
+LOAD_TARGET_RATE: float = float(os.getenv("LOAD_TARGET_RATE", "10000"))
+LOAD_DURATION_SECONDS: float = float(os.getenv("LOAD_DURATION_SECONDS", "60"))
+LOAD_REPORT_SECONDS: float = float(os.getenv("LOAD_REPORT_SECONDS", "5"))
+SIMULATOR_DISTRICTS: Tuple[str, ...] = (
+    "Central Business District",
+    "Industrial North",
+    "Residential South",
+    "Green Belt West",
+)
+
 # --- Pathway & Streaming Engine ---
 # Host and port for the sub-second analytics engine
 STREAM_HOST: str = "127.0.0.1"
 STREAM_PORT: int = 8080
 SIMULATOR_INTERVAL: float = 1.0  # Seconds between sensor readings
+# Micro-batching: max messages per consume() call and how long to wait filling a batch
+CONSUMER_BATCH_SIZE: int = int(os.getenv("CONSUMER_BATCH_SIZE", "500"))
+CONSUMER_BATCH_TIMEOUT: float = float(os.getenv("CONSUMER_BATCH_TIMEOUT", "0.5"))
+# Consumer processes; >1 enables the worker pool. "group" lets Kafka balance partitions,
+# "partition" pins partition p to worker p % STREAM_WORKERS.
+STREAM_WORKERS: int = int(os.getenv("STREAM_WORKERS", "1"))
+STREAM_WORKER_ASSIGNMENT: str = os.getenv("STREAM_WORKER_ASSIGNMENT", "group")
+# "shim" runs the Flask consumer; "pathway" runs the Pathway dataflow (pathway_graph)
+STREAM_ENGINE: str = os.getenv("STREAM_ENGINE", "shim")
+# Event-time windows used by the Pathway dataflow (seconds)
+MOMENTUM_WINDOW_SECONDS: int = int(os.getenv("MOMENTUM_WINDOW_SECONDS", "10"))
+VOLATILITY_WINDOW_SECONDS: int = int(os.getenv("VOLATILITY_WINDOW_SECONDS", "11"))
+VOLATILITY_HOP_SECONDS: int = int(os.getenv("VOLATILITY_HOP_SECONDS", "1"))
+
+# --- Streaming State Store ---
+# Per-sensor ring buffer depth and the size of the city-wide feed served over HTTP
+STATE_RETENTION: int = int(os.getenv("STATE_RETENTION", "128"))
+STATE_FEED_RETENTION: int = int(os.getenv("STATE_FEED_RETENTION", "100"))
+# Sensors whose latest row each consumer-pool worker publishes beside its feed ring
+STATE_FEED_SENSORS: int = int(os.getenv("STATE_FEED_SENSORS", "4096"))
+# Partition key used for legacy records that carry no sensor/district identity
+DEFAULT_SENSOR_ID: str = "SENSOR-001"
+DEFAULT_DISTRICT: str = "Central Business District"
+
+# --- Rolling Statistics ---
+# Window covers the 10 prior readings plus the current one (momentum/volatility baseline)
+ROLLING_WINDOW: int = int(os.getenv("ROLLING_WINDOW", "11"))
+ROLLING_EWMA_SPAN: float = float(os.getenv("ROLLING_EWMA_SPAN", "20"))
+
+# --- Forecasting ---
+# Sliding least-squares window and Holt/Holt-Winters smoothing coefficients
+FORECAST_WINDOW: int = int(os.getenv("FORECAST_WINDOW", "20"))
+FORECAST_CONFIDENCE_Z: float = 1.96  # ~95% prediction band
+HOLT_ALPHA: float = 0.5
+HOLT_BETA: float = 0.3
+HOLT_GAMMA: float = 0.1
+HOLT_SEASON_LENGTH: int = int(os.getenv("HOLT_SEASON_LENGTH", "0"))  # 0 disables seasonality
+
+# --- Spatial Aggregation ---
+# Districts served by the engine: owning state (ISO 3166-2), centroid used for sensors
+# that report no coordinates, and the dominant pollution source shown on dashboards
+DISTRICT_REGISTRY: Dict[str, Dict[str, Any]] = {
+    "Central Business District": {
+        "state": "IN-MH",
+        "lat": 19.0760,
+        "lon": 72.8777,
+        "risk": "Traffic",
+    },
+    "Industrial North": {"state": "IN-MH", "lat": 19.2183, "lon": 72.9781, "risk": "Industrial"},
+    "Residential South": {"state": "IN-MH", "lat": 18.9220, "lon": 72.8347, "risk": "Dust"},
+    "Green Belt West": {"state": "IN-MH", "lat": 19.1136, "lon": 72.8697, "risk": "None"},
+}
+DEFAULT_STATE: str = os.getenv("DEFAULT_STATE", "IN-MH")  # for districts outside the registry
+STATE_NAMES: Dict[str, str] = {
+    "IN-MH": "Maharashtra",
+    "IN-DL": "Delhi",
+    "IN-KA": "Karnataka",
+    "IN-TN": "Tamil Nadu",
+    "IN-WB": "West Bengal",
+    "IN-UP": "Uttar Pradesh",
+    "IN-GJ": "Gujarat",
+    "IN-RJ": "Rajasthan",
+    "IN-TG": "Telangana",
+    "IN-KL": "Kerala",
+}
+# Grid cell edge (degrees, ~5.5 km) of the sensor index, and AQI histogram bin width
+# used for per-region percentiles
+SPATIAL_CELL_DEGREES: float = float(os.getenv("SPATIAL_CELL_DEGREES", "0.05"))
+SPATIAL_AQI_BIN: float = 5.0
+SPATIAL_AQI_MAX: float = 500.0
+# Region trend: fast/slow EWMAs of the regional mean; a gap beyond the threshold (AQI)
+# reads as Rising/Falling
+SPATIAL_TREND_FAST: float = 0.3
+SPATIAL_TREND_SLOW: float = 0.05
+SPATIAL_TREND_THRESHOLD: float = float(os.getenv("SPATIAL_TREND_THRESHOLD", "2.0"))
+
+# --- Heatmap Tiles ---
+# Interpolated AQI surface served as square tiles of HEATMAP_TILE_DEGREES, each sampled
+# on a HEATMAP_TILE_CELLS x HEATMAP_TILE_CELLS grid from the nearest sensors in range
+HEATMAP_TILE_DEGREES: float = float(os.getenv("HEATMAP_TILE_DEGREES", "0.05"))
+HEATMAP_TILE_CELLS: int = int(os.getenv("HEATMAP_TILE_CELLS", "16"))
+HEATMAP_NEIGHBORS: int = int(os.getenv("HEATMAP_NEIGHBORS", "8"))
+HEATMAP_RADIUS_DEGREES: float = float(os.getenv("HEATMAP_RADIUS_DEGREES", "0.1"))
+HEATMAP_IDW_POWER: float = 2.0
+# Kriging-lite: ordinary kriging with a fixed exponential variogram (practical range in
+# degrees, nugget as a fraction of the sill)
+HEATMAP_KRIGING_RANGE: float = float(os.getenv("HEATMAP_KRIGING_RANGE", "0.05"))
+HEATMAP_KRIGING_NUGGET: float = 0.05
+# A dirty tile is still served from cache if it was computed within this many seconds;
+# the cache keeps up to HEATMAP_CACHE_TILES tiles and a request may ask for HEATMAP_MAX_TILES
+HEATMAP_REFRESH_SECONDS: float = float(os.getenv("HEATMAP_REFRESH_SECONDS", "1.0"))
+HEATMAP_CACHE_TILES: int = int(os.getenv("HEATMAP_CACHE_TILES", "4096"))
+HEATMAP_MAX_TILES: int = int(os.getenv("HEATMAP_MAX_TILES", "400"))
+
+# --- What-if Simulation ---
+# Fractional AQI reduction per unit of each policy lever (a 100% traffic reduction
+# removes 40% of AQI); the levers compound multiplicatively
+SIMULATION_WEIGHTS: Dict[str, float] = {
+    "traffic_reduction": 0.4,
+    "industrial_restriction": 0.5,
+    "green_cover": 0.2,
+}
+# Scenario grids are quantized to this step (percent) and memoized per data version
+SIMULATION_STEP: float = float(os.getenv("SIMULATION_STEP", "5"))
+SIMULATION_MAX_SCENARIOS: int = int(os.getenv("SIMULATION_MAX_SCENARIOS", "10000"))
+SIMULATION_CACHE_SIZE: int = int(os.getenv("SIMULATION_CACHE_SIZE", "256"))
 
 # --- Presentation Layer (Flask API) ---
 API_HOST: str = "0.0.0.0"
 API_PORT: int = 5000
 
+# --- Engine Client (web tier -> analytics engine) ---
+ENGINE_TIMEOUT: float = float(os.getenv("ENGINE_TIMEOUT", "5"))
+ENGINE_POOL_SIZE: int = int(os.getenv("ENGINE_POOL_SIZE", "32"))  # keep-alive connections
+# Responses are shared between concurrent users for this long (engine ticks ~1 Hz)
+ENGINE_CACHE_TTL: float = float(os.getenv("ENGINE_CACHE_TTL", "1.0"))
+# Distinct responses kept (LRU), and how long an expired one may still be served while the
+# engine is down
+ENGINE_CACHE_SIZE: int = int(os.getenv("ENGINE_CACHE_SIZE", "1024"))
+ENGINE_STALE_MAX_AGE: float = float(os.getenv("ENGINE_STALE_MAX_AGE", "300"))
+# Consecutive failures before failing fast, and seconds before a recovery probe
+ENGINE_BREAKER_THRESHOLD: int = int(os.getenv("ENGINE_BREAKER_THRESHOLD", "3"))
+ENGINE_BREAKER_RESET: float = float(os.getenv("ENGINE_BREAKER_RESET", "10"))
+
+# --- Live Updates (Server-Sent Events) ---
+# How often the engine checks its state for new records to push
+LIVE_PUSH_INTERVAL: float = float(os.getenv("LIVE_PUSH_INTERVAL", "0.25"))
+# Comment frames keep idle connections open through proxies and detect dead clients
+LIVE_HEARTBEAT_SECONDS: float = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+# Pending events per subscriber before a slow client is dropped (it reconnects with a snapshot)
+LIVE_CLIENT_QUEUE: int = int(os.getenv("LIVE_CLIENT_QUEUE", "256"))
+LIVE_HISTORY: int = 50  # Records kept by the web tier to seed new dashboards
+
+# --- Observability ---
+# Fraction of records traced stage-by-stage through calculate_analytics (0 disables)
+TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_BUFFER: int = int(os.getenv("TRACE_BUFFER", "200"))  # Recent traces kept for /traces
+
 # --- AI Intelligence (OpenAI) ---
 # SECURE: Always use environment variables for keys.
 # Do not hardcode secret keys in version control.
 OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "SECURE_KEY_PLACEHOLDER")
+# OpenAI-compatible endpoint (self-hosted gateway, local model server, test double)
+OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None
+# "openai", "local" (deterministic offline templates) or "auto" (OpenAI when a key or
+# base URL is configured, local otherwise)
+LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "auto")
+LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o")
+# Concurrent completions per process; callers beyond that queue (at most LLM_MAX_QUEUE
+# of them, for up to LLM_QUEUE_TIMEOUT seconds) and then degrade to the local provider
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "32"))
+LLM_QUEUE_TIMEOUT: float = float(os.getenv("LLM_QUEUE_TIMEOUT", "5"))
+
+# --- LLM Gateway ---
+# Copilot/planner answers are reused for LLM_CACHE_TTL seconds for the same normalized
+# question under the same telemetry fingerprint (severity, AQI bucket, alert set), or a
+# question at least LLM_SEMANTIC_THRESHOLD cosine-similar to a cached one
+LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "300"))
+LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "512"))
+LLM_SEMANTIC_THRESHOLD: float = float(os.getenv("LLM_SEMANTIC_THRESHOLD", "0.85"))
+LLM_AQI_BUCKET: float = float(os.getenv("LLM_AQI_BUCKET", "25"))
+# How long coalesced callers wait on an identical in-flight completion
+LLM_COALESCE_TIMEOUT: float = float(os.getenv("LLM_COALESCE_TIMEOUT", "30"))
+
+# --- Action Plan Snapshots ---
+# The background planner re-checks telemetry every PLAN_REFRESH_SECONDS and regenerates the
+# plan only when severity, the PLAN_FORECAST_BUCKET-wide forecast band or the alert set
+# changes, or the latest plan is older than PLAN_MAX_AGE seconds (0 = never expires)
+PLAN_REFRESH_SECONDS: float = float(os.getenv("PLAN_REFRESH_SECONDS", "15"))
+PLAN_FORECAST_BUCKET: float = float(os.getenv("PLAN_FORECAST_BUCKET", "25"))
+PLAN_MAX_AGE: float = float(os.getenv("PLAN_MAX_AGE", "3600"))
+PLAN_HISTORY: int = int(os.getenv("PLAN_HISTORY", "20"))  # Versioned snapshots kept
 
 # --- Environmental Thresholds ---
 # Defines the safety boundaries for city-wide alerts
@@ -43,11 +227,85 @@ THRESHOLDS: Dict[str, Dict[str, int]] = {
     "CO2": {"warning": 1000, "critical": 2000, "emergency": 5000},
 }
 
+# --- Alert Rules (compiled from THRESHOLDS) ---
+# Local-hour windows (inclusive) of peak transit, and per-rule threshold multipliers
+# applied inside them ("METRIC.level" -> factor)
+ALERT_PEAK_HOURS: Tuple[Tuple[int, int], ...] = ((8, 10), (17, 19))
+ALERT_PEAK_FACTORS: Dict[str, float] = {"AQI.warning": 1.2}
+# Seconds a level must be exceeded before a sensor escalates to it ("above X for N s")
+ALERT_SUSTAIN_SECONDS: Dict[str, float] = {"AQI": 0.0, "PM25": 60.0, "CO2": 300.0}
+# Hysteresis: an active level clears only below (1 - ALERT_HYSTERESIS) x its threshold,
+# and only after staying there for ALERT_CLEAR_SECONDS (debounce)
+ALERT_HYSTERESIS: float = float(os.getenv("ALERT_HYSTERESIS", "0.1"))
+ALERT_CLEAR_SECONDS: float = float(os.getenv("ALERT_CLEAR_SECONDS", "60"))
+# Lifecycle change feed: open/escalate/deescalate/resolve events kept for incremental
+# readers. Mirroring them to a Kafka topic (for notification services, and for the
+# consumer pool's API process when STREAM_WORKERS > 1) is opt-in
+ALERT_EVENT_RETENTION: int = int(os.getenv("ALERT_EVENT_RETENTION", "1000"))
+ALERT_TOPIC: str = os.getenv("ALERT_TOPIC", "environmental_alerts")
+ALERT_KAFKA_ENABLED: bool = os.getenv("ALERT_KAFKA_ENABLED", "0") == "1"
+# Most severe active alerts attached to dashboard packages and Copilot prompts
+ALERT_CONTEXT_LIMIT: int = int(os.getenv("ALERT_CONTEXT_LIMIT", "20"))
+
+# --- Report Jobs ---
+REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))  # PDF rendering processes
+# Identical report requests within this many seconds share one rendered artifact
+REPORT_DEDUPE_WINDOW: float = float(os.getenv("REPORT_DEDUPE_WINDOW", "60"))
+# Artifact retention in REPORT_DIR: max age (seconds) and max number of PDFs kept
+REPORT_RETENTION_SECONDS: float = float(os.getenv("REPORT_RETENTION_SECONDS", str(7 * 86400)))
+REPORT_MAX_FILES: int = int(os.getenv("REPORT_MAX_FILES", "200"))
+# How long the legacy export links wait for a job before answering with its status
+REPORT_WAIT_SECONDS: float = float(os.getenv("REPORT_WAIT_SECONDS", "20"))
+
 # --- Filesystem Path Configuration ---
 BASE_DIR: str = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR: str = os.path.join(BASE_DIR, "data")
 REPORT_DIR: str = os.path.join(BASE_DIR, "reports_output")
 
+# --- Capture Replay ---
+# Recorded JSONL telemetry streamed through the analytics pipeline without Kafka
+REPLAY_FILE: str = os.getenv(
+    "REPLAY_FILE", os.path.join(os.path.dirname(BASE_DIR), "data", "sensor_stream.jsonl")
+)
+# 0 replays as fast as possible; N replays N seconds of event time per wall-clock second
+REPLAY_SPEED: float = float(os.getenv("REPLAY_SPEED", "0"))
+REPLAY_BATCH_SIZE: int = int(os.getenv("REPLAY_BATCH_SIZE", "1000"))
+REPLAY_CHUNK_BYTES: int = int(os.getenv("REPLAY_CHUNK_BYTES", str(1 << 20)))  # mmap scan step
+
+# --- Time-Series Archive ---
+# Append-only per-sensor segments plus 1-minute/1-hour/1-day rollups (off unless enabled)
+TIMESERIES_DIR: str = os.getenv("TIMESERIES_DIR", os.path.join(DATA_DIR, "timeseries"))
+TIMESERIES_ENABLED: bool = os.getenv("TIMESERIES_ENABLED", "0") == "1"
+TIMESERIES_SEGMENT_ROWS: int = int(os.getenv("TIMESERIES_SEGMENT_ROWS", "65536"))
+# Buffered rows are written when either limit is reached
+TIMESERIES_FLUSH_ROWS: int = int(os.getenv("TIMESERIES_FLUSH_ROWS", "2048"))
+TIMESERIES_FLUSH_SECONDS: float = float(os.getenv("TIMESERIES_FLUSH_SECONDS", "5"))
+TIMESERIES_COMPACT_SECONDS: float = float(os.getenv("TIMESERIES_COMPACT_SECONDS", "300"))
+# Raw rows older than this are dropped at compaction; rollups are kept
+TIMESERIES_RAW_RETENTION_DAYS: float = float(os.getenv("TIMESERIES_RAW_RETENTION_DAYS", "30"))
+ROLLUP_RESOLUTIONS: Dict[str, int] = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# --- Retrieval (RAG) ---
+# Guideline/policy documents indexed for the Copilot: files or directories of .md/.txt
+# separated by os.pathsep
+RAG_SOURCES: Tuple[str, ...] = tuple(
+    path
+    for path in os.getenv(
+        "RAG_SOURCES", os.path.join(os.path.dirname(BASE_DIR), "data", "guidelines.md")
+    ).split(os.pathsep)
+    if path
+)
+RAG_INDEX_DIR: str = os.getenv("RAG_INDEX_DIR", os.path.join(DATA_DIR, "rag_index"))
+# Local sentence-transformers model (CPU); hashed TF-IDF is used when unset or unavailable
+RAG_EMBED_MODEL: str = os.getenv("RAG_EMBED_MODEL", "")
+RAG_HASH_DIM: int = int(os.getenv("RAG_HASH_DIM", "4096"))
+RAG_CHUNK_CHARS: int = int(os.getenv("RAG_CHUNK_CHARS", "600"))
+# Chunks injected per Copilot query, and the minimum cosine similarity to qualify
+RAG_TOP_K: int = int(os.getenv("RAG_TOP_K", "4"))
+RAG_MIN_SCORE: float = float(os.getenv("RAG_MIN_SCORE", "0.05"))
+# Seconds between checks of the sources for changes that require a rebuild
+RAG_REFRESH_SECONDS: float = float(os.getenv("RAG_REFRESH_SECONDS", "30"))
+
 # Ensure critical directories exist on startup
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(REPORT_DIR, exist_ok=True)
@@ -0,0 +1,96 @@
+"""
+EcoPulse AI Alert Topic Bridge.
+Publishes the engine's alert lifecycle events to a compact Kafka topic (keyed by sensor,
+so every alert's events stay ordered on one partition) for notification services, and
+mirrors that topic into an ``AlertStore`` for processes that do not evaluate alerts
+themselves, such as the worker-pool parent serving the engine API.
+"""
+
+import json
+import logging
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from confluent_kafka import Consumer, KafkaError, Producer
+
+from ecopulse_ai.config import ALERT_TOPIC, KAFKA_BOOTSTRAP_SERVERS
+from ecopulse_ai.streaming.alert_feed import AlertStore
+
+# Configure module-level logging
+logger = logging.getLogger("Kafka-Alerts")
+
+
+class KafkaAlertSink:
+    """
+    ``AlertStore`` listener producing each lifecycle event as one JSON message.
+
+    Args:
+        topic (str): Destination topic.
+        producer (Optional[Producer]): Shared producer (created on first use otherwise).
+    """
+
+    def __init__(self, topic: str = ALERT_TOPIC, producer: Optional[Producer] = None):
+        self.topic = topic
+        self._producer = producer
+
+    def _get_producer(self) -> Producer:
+        if self._producer is None:
+            self._producer = Producer(
+                {"bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS, "linger.ms": 20}
+            )
+        return self._producer
+
+    def __call__(self, events: List[Dict[str, Any]]) -> None:
+        producer = self._get_producer()
+        for event in events:
+            key = str(event.get("sensor_id", ""))
+            value = json.dumps(event, default=str).encode("utf-8")
+            try:
+                producer.produce(self.topic, key=key, value=value)
+            except BufferError:
+                logger.warning("Alert producer queue full; waiting for deliveries.")
+                producer.poll(1.0)
+                producer.produce(self.topic, key=key, value=value)
+        producer.poll(0)
+
+
+def mirror_alerts(store: AlertStore, topic: str = ALERT_TOPIC) -> None:
+    """
+    Replays the alert topic from the beginning into ``store`` and then follows it.
+    Runs forever; start it on a daemon thread (see ``start_alert_mirror``).
+    """
+    conf = {
+        "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
+        "group.id": f"ecopulse-alert-mirror-{uuid.uuid4().hex[:8]}",
+        "auto.offset.reset": "earliest",
+        "enable.auto.commit": False,
+    }
+    try:
+        consumer = Consumer(conf)
+        consumer.subscribe([topic])
+        logger.info(f"Mirroring alert events from '{topic}'.")
+    except Exception as e:
+        logger.critical(f"Failed to initialize alert mirror consumer: {e}")
+        return
+
+    while True:
+        events = []
+        for msg in consumer.consume(500, 0.5):
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    logger.error(f"Alert topic transport error: {msg.error()}")
+                continue
+            try:
+                events.append(json.loads(msg.value()))
+            except ValueError:
+                logger.error("Discarding malformed alert event.")
+        if events:
+            store.apply(events)
+
+
+def start_alert_mirror(store: AlertStore, topic: str = ALERT_TOPIC) -> threading.Thread:
+    """Starts ``mirror_alerts`` on a daemon thread."""
+    thread = threading.Thread(target=mirror_alerts, args=(store, topic), daemon=True)
+    thread.start()
+    return thread
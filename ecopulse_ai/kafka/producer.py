@@ -1,19 +1,47 @@
 """
 EcoPulse AI Sensor Stream Simulator (Kafka Producer).
 Simulates a multi-sensor environmental telemetry mesh and publishes high-fidelity
-JSON data to the Apache Kafka broker.
+JSON data to the Apache Kafka broker. A load mode random-walks thousands of sensors
+at a target message rate and reports throughput and delivery latency, for sizing
+brokers and consumers.
 """
 
+import argparse
 import json
 import logging
 import random
 import time
 from datetime import datetime
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Dict, Generator, List, Optional, Sequence
 
+import numpy as np
 from confluent_kafka import Message, Producer
 
-from ecopulse_ai.config import KAFKA_BOOTSTRAP_SERVERS, KAFKA_TOPIC, SIMULATOR_INTERVAL
+from ecopulse_ai.config import (
+    DEFAULT_DISTRICT,
+    DEFAULT_SENSOR_ID,
+    DISTRICT_REGISTRY,
+    KAFKA_BOOTSTRAP_SERVERS,
+    KAFKA_TOPIC,
+    LOAD_DURATION_SECONDS,
+    LOAD_REPORT_SECONDS,
+    LOAD_SENSORS,
+    LOAD_TARGET_RATE,
+    PRODUCER_BATCH_BYTES,
+    PRODUCER_COMPRESSION,
+    PRODUCER_LINGER_MS,
+    SIMULATOR_DISTRICTS,
+    SIMULATOR_INTERVAL,
+    WIRE_FORMAT,
+)
+from ecopulse_ai.kafka.wire import (
+    FORMAT_BINARY,
+    FORMAT_JSON,
+    encode_binary,
+    format_headers,
+    pack_telemetry,
+)
+from ecopulse_ai.storage.epoch import to_epoch
 
 # Configure module-level logging
 logging.basicConfig(
@@ -75,6 +103,10 @@ def generate_sensor_data() -> Generator[Dict[str, Any], None, None]:
 
         data = {
             "timestamp": datetime.now().isoformat(),
+            "sensor_id": DEFAULT_SENSOR_ID,
+            "district": DEFAULT_DISTRICT,
+            "lat": DISTRICT_REGISTRY[DEFAULT_DISTRICT]["lat"],
+            "lon": DISTRICT_REGISTRY[DEFAULT_DISTRICT]["lon"],
             "aqi": round(aqi, 2),
             "pm25": round(pm25, 2),
             "co2": round(co2, 2),
@@ -88,26 +120,286 @@ def generate_sensor_data() -> Generator[Dict[str, Any], None, None]:
         time.sleep(SIMULATOR_INTERVAL)
 
 
-def run_producer() -> None:
+def producer_config(**overrides: Any) -> Dict[str, Any]:
+    """
+    Producer settings tuned for throughput: batches linger briefly to fill up and are
+    compressed as a whole, so per-message broker overhead stays small.
+    """
+    conf: Dict[str, Any] = {
+        "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
+        "linger.ms": PRODUCER_LINGER_MS,
+        "batch.size": PRODUCER_BATCH_BYTES,
+        "compression.type": PRODUCER_COMPRESSION,
+        "queue.buffering.max.messages": 500000,
+    }
+    conf.update(overrides)
+    return conf
+
+
+class SensorFleet:
+    """
+    Vectorized random walk over many independent sensors spread across districts.
+
+    Each ``step`` advances every sensor at once with NumPy; readings drift, spike
+    occasionally (as in ``generate_sensor_data``) and relax back towards each sensor's
+    own baseline so long runs stay in a realistic range.
+
+    Args:
+        n_sensors (int): Number of simulated sensors.
+        districts (Sequence[str]): Districts the sensors are assigned to round-robin.
+        seed (Optional[int]): Seed for reproducible fleets.
+    """
+
+    # metric -> (initial low, initial high, step, lower bound, upper bound)
+    WALKS: Dict[str, tuple] = {
+        "aqi": (40, 60, 2.0, 10, 500),
+        "pm25": (10, 25, 1.0, 1, 300),
+        "co2": (380, 450, 5.0, 300, 2000),
+        "temperature": (22, 28, 0.1, -10, 55),
+        "humidity": (40, 60, 0.5, 5, 100),
+        "wind_speed": (5, 15, 0.3, 0, 60),
+        "traffic_density": (20, 40, 2.0, 0, 100),
+        "industrial_index": (10, 30, 1.0, 0, 100),
+    }
+    SPIKE_PROBABILITY = 0.05
+    REVERSION = 0.02
+    POSITION_SPREAD = 0.02  # degrees (~2 km) around the district centroid
+
+    def __init__(
+        self,
+        n_sensors: int = LOAD_SENSORS,
+        districts: Sequence[str] = SIMULATOR_DISTRICTS,
+        seed: Optional[int] = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.size = n_sensors
+        self.sensor_ids = [f"SENSOR-{i + 1:05d}" for i in range(n_sensors)]
+        self.districts = [districts[i % len(districts)] for i in range(n_sensors)]
+        self.baseline = {
+            name: self.rng.uniform(low, high, n_sensors)
+            for name, (low, high, *_rest) in self.WALKS.items()
+        }
+        self.values = {name: base.copy() for name, base in self.baseline.items()}
+        # Sensors of registered districts are scattered around the district centroid
+        # (own generator, so positions do not perturb the seeded readings)
+        scatter = np.random.default_rng(None if seed is None else seed + 1)
+        offsets = scatter.normal(0.0, self.POSITION_SPREAD, (n_sensors, 2)).round(5)
+        self.positions: List[Optional[tuple]] = []
+        for district, (dlat, dlon) in zip(self.districts, offsets.tolist()):
+            entry = DISTRICT_REGISTRY.get(district)
+            self.positions.append(
+                None
+                if entry is None
+                else (round(entry["lat"] + dlat, 5), round(entry["lon"] + dlon, 5))
+            )
+        # Binary-wire coordinate columns (NaN for sensors outside the registry)
+        self._coordinates = np.array(
+            [position or (np.nan, np.nan) for position in self.positions], dtype=np.float64
+        ).T.reshape(2, n_sensors)
+        # Static part of each message, JSON-escaped once
+        self._prefixes = [
+            f'{{"sensor_id":{json.dumps(sid)},"district":{json.dumps(district)},'
+            + ("" if position is None else f'"lat":{position[0]},"lon":{position[1]},')
+            for sid, district, position in zip(self.sensor_ids, self.districts, self.positions)
+        ]
+
+    def step(self) -> None:
+        """Advances every sensor by one reading."""
+        spikes = self.rng.random(self.size) < self.SPIKE_PROBABILITY
+        for name, (_, _, step, low, high) in self.WALKS.items():
+            values = self.values[name]
+            values += self.rng.uniform(-step, step, self.size)
+            values += (self.baseline[name] - values) * self.REVERSION
+            if name == "aqi":
+                values[spikes] += self.rng.uniform(30, 70, int(spikes.sum()))
+            elif name == "pm25":
+                values[spikes] += self.rng.uniform(20, 50, int(spikes.sum()))
+            np.clip(values, low, high, out=values)
+
+    def encode(self, indices: Sequence[int], timestamp: str) -> List[bytes]:
+        """Serializes the current readings of the given sensors as JSON payloads."""
+        columns = {name: np.round(v[indices], 2).tolist() for name, v in self.values.items()}
+        stamp = f'"timestamp":"{timestamp}"'
+        payloads = []
+        for row, i in enumerate(indices):
+            fields = ",".join(f'"{name}":{columns[name][row]}' for name in self.WALKS)
+            payloads.append(f"{self._prefixes[i]}{stamp},{fields}}}".encode("utf-8"))
+        return payloads
+
+    def encode_binary(self, indices: Sequence[int], epoch: float) -> List[bytes]:
+        """Binary-wire counterpart of ``encode`` (``epoch`` is the reading time)."""
+        columns: Dict[str, Any] = {name: v[indices] for name, v in self.values.items()}
+        columns["ts"] = epoch
+        columns["sensor_id"] = [self.sensor_ids[i] for i in indices]
+        columns["district"] = [self.districts[i] for i in indices]
+        columns["lat"], columns["lon"] = self._coordinates[:, indices]
+        blob = pack_telemetry(columns, len(indices)).tobytes()
+        step = len(blob) // max(1, len(indices))
+        return [blob[k : k + step] for k in range(0, len(blob), step)]
+
+
+class DeliveryStats:
+    """Delivery callback target accumulating acknowledgement counts and latencies."""
+
+    def __init__(self) -> None:
+        self.delivered = 0
+        self.failed = 0
+        self.latencies: List[float] = []
+
+    def __call__(self, err: Optional[Exception], msg: Message) -> None:
+        if err is not None:
+            self.failed += 1
+            logger.debug(f"Message delivery failed: {err}")
+            return
+        self.delivered += 1
+        latency = msg.latency()
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def percentiles(self) -> Dict[str, float]:
+        """Delivery latency percentiles in milliseconds (produce() call to broker ack)."""
+        if not self.latencies:
+            return {}
+        p50, p95, p99, top = np.percentile(np.array(self.latencies) * 1000, [50, 95, 99, 100])
+        return {
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(top), 2),
+        }
+
+
+def run_load_test(
+    rate: float = LOAD_TARGET_RATE,
+    duration: float = LOAD_DURATION_SECONDS,
+    n_sensors: int = LOAD_SENSORS,
+    report_every: float = LOAD_REPORT_SECONDS,
+    producer: Optional[Any] = None,
+    fleet: Optional[SensorFleet] = None,
+    clock: Any = time.monotonic,
+    wire_format: str = WIRE_FORMAT,
+) -> Dict[str, Any]:
+    """
+    Publishes simulated fleet telemetry at a target rate and measures the broker.
+
+    Messages are keyed by sensor id, so each sensor sticks to one partition (and one
+    consumer worker). Production is paced by a token bucket and issued in batches,
+    each followed by a non-blocking ``poll`` to serve delivery callbacks.
+
+    Args:
+        rate (float): Target messages per second.
+        duration (float): Seconds to run.
+        n_sensors (int): Size of the simulated fleet.
+        report_every (float): Seconds between progress log lines.
+        producer (Optional[Any]): Pre-built producer (defaults to ``producer_config()``).
+        wire_format (str): ``"json"`` or ``"binary"`` payloads.
+
+    Returns:
+        Dict[str, Any]: Sent/delivered/failed counts, achieved throughput and
+        delivery latency percentiles.
+    """
+    fleet = fleet or SensorFleet(n_sensors)
+    producer = producer or Producer(producer_config())
+    stats = DeliveryStats()
+    binary = wire_format == "binary"
+    headers = format_headers(FORMAT_BINARY if binary else FORMAT_JSON)
+    chunk = max(1, min(fleet.size, int(rate / 100) or 1))
+    sent = cursor = last_sent = 0
+    started = last_report = clock()
+
+    logger.info(f"Load test: {fleet.size} sensors at {rate:.0f} msgs/s for {duration:.0f}s")
+    while True:
+        now = clock()
+        elapsed = now - started
+        if elapsed >= duration:
+            break
+        due = min(int(elapsed * rate), int(duration * rate)) - sent
+        if due <= 0:
+            producer.poll(min(0.005, max(0.001, (sent + 1) / rate - elapsed)))
+            continue
+
+        stamp = datetime.now()
+        while due > 0:
+            count = min(chunk, due, fleet.size - cursor)
+            indices = list(range(cursor, cursor + count))
+            if binary:
+                payloads = fleet.encode_binary(indices, to_epoch(stamp, 0.0))
+            else:
+                payloads = fleet.encode(indices, stamp.isoformat())
+            for i, payload in zip(indices, payloads):
+                while True:
+                    try:
+                        producer.produce(
+                            KAFKA_TOPIC,
+                            key=fleet.sensor_ids[i],
+                            value=payload,
+                            headers=headers,
+                            callback=stats,
+                        )
+                        break
+                    except BufferError:
+                        producer.poll(0.05)  # local queue full: let deliveries drain
+            sent += count
+            due -= count
+            cursor += count
+            if cursor == fleet.size:
+                cursor = 0
+                fleet.step()
+            producer.poll(0)
+
+        if now - last_report >= report_every:
+            window = now - last_report
+            logger.info(
+                f"Sent {sent} ({(sent - last_sent) / window:.0f} msgs/s), "
+                f"delivered {stats.delivered}, failed {stats.failed}"
+            )
+            last_sent, last_report = sent, now
+
+    remaining = producer.flush(30)
+    elapsed = max(clock() - started, 1e-9)
+    summary = {
+        "sensors": fleet.size,
+        "wire_format": wire_format,
+        "target_rate": rate,
+        "sent": sent,
+        "delivered": stats.delivered,
+        "failed": stats.failed,
+        "undelivered": remaining,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput": round(stats.delivered / elapsed, 1),
+        "latency": stats.percentiles(),
+    }
+    logger.info(f"Load test complete: {summary}")
+    return summary
+
+
+def run_producer(wire_format: str = WIRE_FORMAT) -> None:
     """
     Connects to the Kafka broker and publishes simulated telemetry data.
+
+    Args:
+        wire_format (str): ``"json"`` or ``"binary"`` payloads.
     """
     logger.info(f"Initializing Kafka producer for topic: {KAFKA_TOPIC}")
-    conf = {"bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS}
-
     try:
-        producer = Producer(conf)
+        producer = Producer(producer_config(**{"linger.ms": 5}))
     except Exception as e:
         logger.critical(f"Failed to connect to Kafka at {KAFKA_BOOTSTRAP_SERVERS}: {e}")
         return
 
+    binary = wire_format == "binary"
+    headers = format_headers(FORMAT_BINARY if binary else FORMAT_JSON)
     try:
         for data in generate_sensor_data():
             producer.produce(
-                KAFKA_TOPIC, key=str(time.time()), value=json.dumps(data), callback=delivery_report
+                KAFKA_TOPIC,
+                key=DEFAULT_SENSOR_ID,
+                value=encode_binary([data])[0] if binary else json.dumps(data),
+                headers=headers,
+                callback=delivery_report,
             )
             producer.poll(0)
-            logger.info(f"Sent Telemetry -> AQI: {data['aqi']} | CO2: {data['co2']}")
+            logger.debug(f"Sent Telemetry -> AQI: {data['aqi']} | CO2: {data['co2']}")
     except KeyboardInterrupt:
         logger.info("Producer shutting down by user request.")
     except Exception as e:
@@ -118,4 +410,14 @@ def run_producer() -> None:
 
 
 if __name__ == "__main__":
-    run_producer()
+    parser = argparse.ArgumentParser(description="EcoPulse AI sensor stream simulator.")
+    parser.add_argument("--load", action="store_true", help="run the load generator")
+    parser.add_argument("--rate", type=float, default=LOAD_TARGET_RATE)
+    parser.add_argument("--sensors", type=int, default=LOAD_SENSORS)
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION_SECONDS)
+    parser.add_argument("--format", choices=("json", "binary"), default=WIRE_FORMAT)
+    args = parser.parse_args()
+    if args.load:
+        run_load_test(args.rate, args.duration, args.sensors, wire_format=args.format)
+    else:
+        run_producer(args.format)
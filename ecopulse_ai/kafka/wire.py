@@ -0,0 +1,241 @@
+"""
+EcoPulse AI Telemetry Wire Formats.
+Encoders and decoders for ``environmental_stream`` payloads. Besides JSON, telemetry
+can travel as a compact fixed-layout binary record (one NumPy structured row per
+message). Producers stamp every message with a format header and consumers dispatch
+on it, so both encodings can share the topic during a rollout; a batch of binary
+messages is decoded straight into NumPy columns with a single ``frombuffer`` call.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import DEFAULT_DISTRICT, DEFAULT_SENSOR_ID
+from ecopulse_ai.storage.epoch import parse_timestamps
+from ecopulse_ai.streaming.vectorized import INPUT_FIELDS, Columns, decode_batch
+
+# Configure module-level logging
+logger = logging.getLogger("Kafka-Wire")
+
+# Message header naming the payload encoding; messages without it are JSON
+FORMAT_HEADER = "ecopulse-format"
+FORMAT_JSON = "json"
+FORMAT_BINARY_V1 = "telemetry-v1"
+FORMAT_BINARY_V2 = "telemetry-v2"
+FORMAT_BINARY = FORMAT_BINARY_V2  # layout written by producers
+
+# Binary layout, version 1 (little-endian, 145 bytes): version tag, event time as
+# epoch seconds (naive wall clock), NUL-padded UTF-8 identity and the raw metrics
+# (NaN when absent). New layouts get a new version and header value.
+TELEMETRY_DTYPE_V1 = np.dtype(
+    [("version", "u1"), ("ts", "<f8"), ("sensor_id", "S24"), ("district", "S48")]
+    + [(name, "<f8") for name in INPUT_FIELDS]
+)
+# Version 2 (177 bytes) appends the sensor's state code and position (NaN when absent)
+TELEMETRY_DTYPE_V2 = np.dtype(
+    TELEMETRY_DTYPE_V1.descr + [("state", "S16"), ("lat", "<f8"), ("lon", "<f8")]
+)
+BINARY_VERSION = 2
+BINARY_SCHEMAS: Dict[str, np.dtype] = {
+    FORMAT_BINARY_V1: TELEMETRY_DTYPE_V1,
+    FORMAT_BINARY_V2: TELEMETRY_DTYPE_V2,
+}
+BINARY_VERSIONS: Dict[str, int] = {FORMAT_BINARY_V1: 1, FORMAT_BINARY_V2: 2}
+
+Headers = Optional[Sequence[Tuple[str, Any]]]
+
+
+def message_format(headers: Headers) -> str:
+    """Reads the payload encoding from Kafka message headers (JSON when absent)."""
+    for key, value in headers or ():
+        if key == FORMAT_HEADER:
+            return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+    return FORMAT_JSON
+
+
+def format_headers(fmt: str) -> List[Tuple[str, bytes]]:
+    """Header list announcing ``fmt`` on a produced message."""
+    return [(FORMAT_HEADER, fmt.encode("utf-8"))]
+
+
+def pack_telemetry(columns: Dict[str, Any], size: int) -> np.ndarray:
+    """
+    Builds version-2 binary rows from columns.
+
+    Args:
+        columns (Dict[str, Any]): ``ts`` (epoch seconds), ``sensor_id``, ``district`` and
+            any of ``state``, ``lat``, ``lon`` and ``INPUT_FIELDS``; absent values are
+            encoded as empty strings or NaN.
+        size (int): Number of rows.
+
+    Raises:
+        ValueError: If an identity string does not fit its fixed-width field.
+    """
+    rows = np.zeros(size, dtype=TELEMETRY_DTYPE_V2)
+    rows["version"] = BINARY_VERSION
+    rows["ts"] = columns["ts"]
+    for field in ("sensor_id", "district", "state"):
+        if field not in columns:
+            continue
+        encoded = [str(v if v is not None else "").encode("utf-8") for v in columns[field]]
+        width = TELEMETRY_DTYPE_V2[field].itemsize
+        if any(len(v) > width for v in encoded):
+            raise ValueError(f"{field} longer than {width} bytes cannot be binary-encoded")
+        rows[field] = encoded
+    for name in ("lat", "lon") + INPUT_FIELDS:
+        rows[name] = columns.get(name, np.nan)
+    return rows
+
+
+def encode_binary(records: Sequence[Dict[str, Any]]) -> List[bytes]:
+    """
+    Encodes telemetry dicts as version-2 binary payloads (one per record).
+
+    Raises:
+        ValueError: If a record cannot be represented (over-long identity or a
+            non-numeric metric); callers fall back to JSON.
+    """
+    columns: Dict[str, Any] = {
+        "ts": parse_timestamps([r.get("timestamp") for r in records]),
+        "sensor_id": [r.get("sensor_id", DEFAULT_SENSOR_ID) for r in records],
+        "district": [r.get("district", DEFAULT_DISTRICT) for r in records],
+        "state": [r.get("state") for r in records],
+    }
+    for name in ("lat", "lon") + INPUT_FIELDS:
+        try:
+            columns[name] = np.array([r.get(name, np.nan) for r in records], dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"non-numeric {name} cannot be binary-encoded") from e
+    blob = pack_telemetry(columns, len(records)).tobytes()
+    step = TELEMETRY_DTYPE_V2.itemsize
+    return [blob[i : i + step] for i in range(0, len(blob), step)]
+
+
+def decode_binary(payloads: Sequence[bytes], fmt: str = FORMAT_BINARY) -> Tuple[Columns, int]:
+    """
+    Decodes binary payloads into columns with one buffer join and ``frombuffer``.
+
+    Payloads of the wrong size or version are dropped.
+
+    Returns:
+        Tuple[Columns, int]: Float64 metric, ``lat`` and ``lon`` columns plus ``ts``,
+        ``sensor_id``, ``district`` and ``state`` (NaN / empty for version-1 rows); and
+        the number of rows decoded.
+    """
+    dtype, version = BINARY_SCHEMAS[fmt], BINARY_VERSIONS[fmt]
+    good = [p for p in payloads if len(p) == dtype.itemsize]
+    rows = np.frombuffer(b"".join(good), dtype=dtype)
+    if len(good) != len(payloads) or (rows["version"] != version).any():
+        rows = rows[rows["version"] == version]
+        logger.error(f"Dropped {len(payloads) - len(rows)} malformed binary telemetry payload(s)")
+
+    columns: Columns = {name: rows[name].astype(np.float64) for name in INPUT_FIELDS}
+    columns["ts"] = rows["ts"].astype(np.float64)
+    text = (
+        ("sensor_id", "district", "state") if "state" in dtype.names else ("sensor_id", "district")
+    )
+    for field in text:
+        columns[field] = np.array([v.decode("utf-8") for v in rows[field].tolist()], dtype=object)
+    for name in ("lat", "lon"):
+        columns[name] = (
+            rows[name].astype(np.float64) if name in dtype.names else np.full(len(rows), np.nan)
+        )
+    return columns, len(rows)
+
+
+def _add_location(records: List[Dict[str, Any]], columns: Columns) -> List[Dict[str, Any]]:
+    """Adds the state code and coordinates carried by version-2 rows to their records."""
+    if "state" in columns and any(columns["state"]):
+        for record, state in zip(records, columns["state"].tolist()):
+            if state:
+                record["state"] = state
+    if "lat" in columns and not np.isnan(columns["lat"]).all():
+        for record, lat, lon in zip(records, columns["lat"].tolist(), columns["lon"].tolist()):
+            if lat == lat and lon == lon:
+                record["lat"], record["lon"] = lat, lon
+    return records
+
+
+def columns_to_records(columns: Columns, size: int) -> List[Dict[str, Any]]:
+    """Materializes decoded binary columns as telemetry dicts (NaN metrics omitted)."""
+    stamps = (columns["ts"] * 1e6).astype("datetime64[us]").astype(str).tolist()
+    lists = {name: columns[name].tolist() for name in INPUT_FIELDS}
+    sensors = columns["sensor_id"].tolist()
+    districts = columns["district"].tolist()
+    if not any(np.isnan(columns[name]).any() for name in INPUT_FIELDS):
+        # Complete rows (the common case): literal dicts are the fastest to build
+        rows = zip(stamps, sensors, districts, *(lists[name] for name in INPUT_FIELDS))
+        return _add_location(
+            [
+                {
+                    "timestamp": r[0],
+                    "sensor_id": r[1],
+                    "district": r[2],
+                    "aqi": r[3],
+                    "pm25": r[4],
+                    "co2": r[5],
+                    "temperature": r[6],
+                    "humidity": r[7],
+                    "wind_speed": r[8],
+                    "traffic_density": r[9],
+                    "industrial_index": r[10],
+                }
+                for r in rows
+            ],
+            columns,
+        )
+
+    records = []
+    for i in range(size):
+        record = {"timestamp": stamps[i], "sensor_id": sensors[i], "district": districts[i]}
+        for name in INPUT_FIELDS:
+            value = lists[name][i]
+            if value == value:
+                record[name] = value
+        records.append(record)
+    return _add_location(records, columns)
+
+
+def analytics_columns(columns: Columns) -> Tuple[Columns, np.ndarray]:
+    """
+    Decoded binary columns in the shape of ``vectorized.to_columns`` (missing metrics
+    count as 0), so the analytics kernels can skip the dict-to-column transpose.
+    """
+    size = len(columns["ts"])
+    inputs = {name: np.nan_to_num(columns[name], nan=0.0) for name in INPUT_FIELDS}
+    return inputs, np.ones(size, dtype=bool)
+
+
+def decode_messages(
+    payloads: Sequence[bytes], formats: Sequence[str]
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Columns, np.ndarray]]]:
+    """
+    Decodes a consumed micro-batch whose messages may use different encodings.
+
+    Contiguous runs of one format are decoded together, preserving arrival order.
+    When the whole batch is binary its columns are returned as well.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[Tuple[Columns, np.ndarray]]]: The records,
+        and ``(columns, valid)`` ready for ``calculate_analytics_batch`` or None.
+    """
+    records: List[Dict[str, Any]] = []
+    columns = None
+    start = 0
+    for end in range(1, len(payloads) + 1):
+        if end < len(payloads) and formats[end] == formats[start]:
+            continue
+        fmt, run = formats[start], payloads[start:end]
+        if fmt in BINARY_SCHEMAS:
+            decoded, size = decode_binary(run, fmt)
+            records.extend(columns_to_records(decoded, size))
+            if start == 0 and end == len(payloads):
+                columns = analytics_columns(decoded)
+        elif fmt == FORMAT_JSON:
+            records.extend(decode_batch(run))
+        else:
+            logger.error(f"Dropping {len(run)} message(s) in unsupported format '{fmt}'")
+        start = end
+    return records, columns
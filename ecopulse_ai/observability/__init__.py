@@ -0,0 +1 @@
+"""Initializes the observability package."""
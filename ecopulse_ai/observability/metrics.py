@@ -0,0 +1,280 @@
+"""
+EcoPulse AI Metrics Registry.
+Dependency-free counters, gauges and histograms rendered in the Prometheus text
+exposition format, shared by the streaming engine and the web tier. Each process
+keeps one registry and serves it on ``/metrics``.
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds: 0.1 ms .. 30 s, suited to per-batch decode/analytics and HTTP/LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.documentation)
+
+    def labels(self, *values: str, **kwargs: str) -> "_Metric":
+        """Child series for one combination of label values."""
+        key = tuple(map(str, values)) if values else tuple(str(kwargs[n]) for n in self.labelnames)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _series(self) -> List[Tuple[LabelValues, "_Metric"]]:
+        if self.labelnames:
+            with self._lock:
+                return list(self._children.items())
+        return [((), self)]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, series in self._series():
+            lines.extend(series._samples_for(self.name, self.labelnames, labels))
+        return lines
+
+    def _samples_for(self, name: str, names: Sequence[str], labels: LabelValues) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def _samples_for(self, name: str, names: Sequence[str], labels: LabelValues) -> List[str]:
+        return [f"{name}{_label_text(names, labels)} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    """Current value; either set explicitly or computed at scrape time by a callback."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Evaluates ``function`` on every scrape instead of storing a value."""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is None:
+            return self.value
+        try:
+            return float(self._function())
+        except Exception:
+            return math.nan
+
+    def _samples_for(self, name: str, names: Sequence[str], labels: LabelValues) -> List[str]:
+        return [f"{name}{_label_text(names, labels)} {_format_value(self.get())}"]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency distribution with a running sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "_Metric":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observes the wall-clock duration of the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def _samples_for(self, name: str, names: Sequence[str], labels: LabelValues) -> List[str]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines, cumulative = [], 0
+        for bound, n in zip((*self.buckets, math.inf), counts):
+            cumulative += n
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_label_text(names, labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_label_text(names, labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_label_text(names, labels)} {count}")
+        return lines
+
+
+class Meter:
+    """
+    Events per second over a trailing window (for dashboards without PromQL ``rate``).
+    """
+
+    def __init__(self, window: float = 10.0):
+        self.window = window
+        self._events: Deque[Tuple[float, float]] = deque()
+        self._lock = threading.Lock()
+
+    def mark(self, n: float = 1.0) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, n))
+            self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._events and now - self._events[0][0] > self.window:
+            self._events.popleft()
+
+    def rate(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return sum(n for _, n in self._events) / self.window
+
+
+class Registry:
+    """Named collection of metrics; get-or-create so modules can declare them freely."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, documentation: str, **kwargs: object) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames=labelnames)  # type: ignore
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames=labelnames)  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(  # type: ignore
+            Histogram, name, documentation, labelnames=labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """The whole registry in Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def metrics_response(registry: Registry = REGISTRY) -> Response:
+    """Flask response serving a registry to a Prometheus scraper."""
+    return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
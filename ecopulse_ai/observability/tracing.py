@@ -0,0 +1,109 @@
+"""
+EcoPulse AI Stage Tracing.
+Sampled per-stage timing spans for the analytics hot path. A sampled call records
+cheap checkpoints (``trace.mark(stage)``); unsampled calls get a shared no-op trace,
+so tracing costs one comparison per record when disabled. Finished traces feed the
+``ecopulse_stage_seconds`` histogram and a ring buffer served on ``/traces``.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ecopulse_ai.config import TRACE_BUFFER, TRACE_SAMPLE_RATE
+from ecopulse_ai.observability.metrics import REGISTRY, Registry
+
+STAGE_BUCKETS = (1e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05)
+
+
+class Trace:
+    """Timing of one sampled call: consecutive stage durations measured between marks."""
+
+    __slots__ = ("name", "started", "attributes", "stages", "_last")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.stages: List[Tuple[str, float]] = []
+        self.started = time.time()
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """Closes ``stage``: the time since the previous mark (or the start)."""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started": self.started,
+            "attributes": self.attributes,
+            "stages_us": {stage: round(seconds * 1e6, 2) for stage, seconds in self.stages},
+            "total_us": round(sum(seconds for _, seconds in self.stages) * 1e6, 2),
+        }
+
+
+class _NullTrace:
+    """Stand-in for unsampled calls; every operation is a no-op."""
+
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    """
+    Samples calls at ``sample_rate`` and keeps the ``capacity`` most recent traces.
+
+    Args:
+        sample_rate (float): Probability in [0, 1] that a call is traced.
+        capacity (int): Finished traces retained for inspection.
+        registry (Registry): Where stage durations are exported.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        capacity: int = TRACE_BUFFER,
+        registry: Registry = REGISTRY,
+    ):
+        self.sample_rate = sample_rate
+        self._traces: Deque[Trace] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stages = registry.histogram(
+            "ecopulse_stage_seconds",
+            "Per-stage duration of sampled analytics calls",
+            ("span", "stage"),
+            buckets=STAGE_BUCKETS,
+        )
+
+    def start(self, name: str, **attributes: Any) -> Any:
+        """A new ``Trace`` when this call is sampled, else the shared no-op trace."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return NULL_TRACE
+        return Trace(name, attributes)
+
+    def finish(self, trace: Any) -> None:
+        """Records a sampled trace (no-op traces are ignored)."""
+        if trace is NULL_TRACE:
+            return
+        for stage, seconds in trace.stages:
+            self._stages.labels(trace.name, stage).observe(seconds)
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The most recent finished traces, newest first."""
+        with self._lock:
+            traces = list(self._traces)[::-1]
+        return [t.to_dict() for t in traces[:limit]]
+
+
+TRACER = Tracer()
@@ -1,20 +1,73 @@
 import logging
-from typing import Dict, Any, List
-from openai import OpenAI
-from ecopulse_ai.config import OPENAI_API_KEY
+from typing import Dict, Any, Iterator, List, Tuple
+from .gateway import get_gateway, telemetry_fingerprint
 from .prompts import SYSTEM_PROMPT
+from .providers import LOCAL_PROVIDER, LLMBusy, get_provider
+from .retrieval import format_context, get_retriever
 
 logger = logging.getLogger("RAG-Copilot")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+def retrieve_guidelines(query: str) -> List[Dict[str, Any]]:
+    """Top-k guideline passages for a question (empty when retrieval is unavailable)."""
+    try:
+        return get_retriever().retrieve(query)
+    except Exception as e:
+        logger.warning(f"Guideline retrieval failed: {e}")
+        return []
+
+
+def _prepare(
+    query: str, current_metrics: Dict[str, Any], active_alerts: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Retrieved guidelines and the chat messages for a question."""
+    guidelines = retrieve_guidelines(f"{query} {current_metrics.get('severity', '')}")
+    context = f"""
+    Current Telemetry: {current_metrics}
+    Active System Alerts: {active_alerts}
+    Reference Guidelines:
+    {format_context(guidelines) or "None retrieved."}
+    """
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Context: {context}\n\nUser Question: {query}"},
+    ]
+    return guidelines, messages
+
+
+def _facts(
+    query: str, current_metrics: Dict[str, Any], guidelines: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Structured context for providers that answer without a model (local templates)."""
+    return {
+        "query": query,
+        "aqi": current_metrics.get("aqi", "Unknown"),
+        "severity": current_metrics.get("severity", "Stable"),
+        "traffic": current_metrics.get("attribution", {}).get("traffic", "N/A"),
+        "guidelines": [g["text"] for g in guidelines],
+    }
+
+
+def _fallback(error: Exception, facts: Dict[str, Any]) -> str:
+    """Degraded answer after a failed or refused completion."""
+    err_msg = str(error)
+    logger.error(f"Copilot API interaction failed: {err_msg}")
+
+    # Quota exhaustion (common in project demos) or a saturated LLM pool
+    if isinstance(error, LLMBusy) or "429" in err_msg or "insufficient_quota" in err_msg:
+        logger.warning("LLM unavailable - using deterministic local provider.")
+        return LOCAL_PROVIDER.complete("copilot", [], facts)
+
+    return f"Service Temporary Unavailable: {err_msg}"
 
 
 def ask_copilot(
     query: str, current_metrics: Dict[str, Any], active_alerts: List[Dict[str, Any]]
 ) -> str:
     """
-    Interfaces with the OpenAI GPT-4o model to provide context-aware environmental insights.
+    Interfaces with the configured LLM provider to provide context-aware environmental insights.
+    Answers are served through the LLM gateway, so repeated questions under the same
+    telemetry fingerprint reuse a cached (or in-flight) completion.
 
     Args:
         query (str): The user's natural language question.
@@ -24,39 +77,54 @@ def ask_copilot(
     Returns:
         str: The AI's generated response or a graceful fallback message.
     """
-    context = f"""
-    Current Telemetry: {current_metrics}
-    Active System Alerts: {active_alerts}
-    """
-
+    guidelines, messages = _prepare(query, current_metrics, active_alerts)
+    facts = _facts(query, current_metrics, guidelines)
     try:
         logger.info(f"Querying AI Copilot: '{query}'")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"Context: {context}\n\nUser Question: {query}"},
-            ],
-            temperature=0.7,
-            timeout=15.0,
+        return str(
+            get_gateway().call(
+                "copilot",
+                query,
+                telemetry_fingerprint(current_metrics, active_alerts),
+                lambda: get_provider().complete("copilot", messages, facts, timeout=15.0),
+            )
         )
-        return str(response.choices[0].message.content)
-
     except Exception as e:
-        err_msg = str(e)
-        logger.error(f"Copilot API interaction failed: {err_msg}")
-
-        # Specific fallback for quota issues (common in project demos)
-        if "429" in err_msg or "insufficient_quota" in err_msg:
-            logger.warning("Quota exceeded - using deterministic data-driven fallback.")
-            aqi = current_metrics.get("aqi", "Unknown")
-            severity = current_metrics.get("severity", "Stable")
-            traffic_impact = current_metrics.get("attribution", {}).get("traffic", "N/A")
-
-            return (
-                f"[SIMULATION MODE] Based on real-time data (AQI: {aqi}), "
-                f"the environmental state is '{severity}'. High traffic ({traffic_impact}%) is a major contributor. "
-                "I recommend limiting travel in high-congestion zones."
-            )
+        return _fallback(e, facts)
+
+
+def stream_copilot(
+    query: str, current_metrics: Dict[str, Any], active_alerts: List[Dict[str, Any]]
+) -> Iterator[str]:
+    """
+    Streaming variant of ``ask_copilot``: yields answer tokens as they are generated (a
+    cached answer arrives as one piece). If the model fails before the first token the
+    fallback message is yielded instead; a failure mid-answer ends it with a notice.
 
-        return f"Service Temporary Unavailable: {err_msg}"
+    Args:
+        query (str): The user's natural language question.
+        current_metrics (Dict[str, Any]): The latest sensor data state.
+        active_alerts (List[Dict[str, Any]]): Currently triggered system alerts.
+
+    Yields:
+        str: Successive pieces of the answer.
+    """
+    guidelines, messages = _prepare(query, current_metrics, active_alerts)
+    facts = _facts(query, current_metrics, guidelines)
+    started = False
+    try:
+        logger.info(f"Streaming AI Copilot answer: '{query}'")
+        for piece in get_gateway().stream(
+            "copilot",
+            query,
+            telemetry_fingerprint(current_metrics, active_alerts),
+            lambda: get_provider().stream("copilot", messages, facts, timeout=15.0),
+        ):
+            started = True
+            yield piece
+    except Exception as e:
+        if started:
+            logger.error(f"Copilot stream interrupted: {e}")
+            yield "\n\n[Response interrupted. Please retry.]"
+        else:
+            yield _fallback(e, facts)
@@ -1,3 +1,19 @@
+"""
+EcoPulse AI Document Store.
+Loads guideline and policy documents and splits them into heading-scoped chunks for the
+Copilot's retrieval index.
+"""
+
+import os
+import textwrap
+from typing import Dict, Iterable, List
+
+from ecopulse_ai.config import RAG_CHUNK_CHARS
+
+Chunk = Dict[str, str]
+
+DOCUMENT_EXTENSIONS = (".md", ".txt")
+
 # Simple knowledge base for environmental guidelines
 GUIDELINES = {
     "AQI_MODERATE": "Keep windows closed if possible. Use air purifiers.",
@@ -9,3 +25,73 @@ GUIDELINES = {
 
 def get_guideline(key):
     return GUIDELINES.get(key, "Follow standard safety protocols.")
+
+
+def chunk_markdown(text: str, source: str, max_chars: int = RAG_CHUNK_CHARS) -> List[Chunk]:
+    """
+    Splits a markdown/plain-text document into chunks of at most ``max_chars``, never
+    crossing a heading; each chunk records its source and nearest heading.
+
+    Args:
+        text (str): Document contents.
+        source (str): Name reported with each chunk (usually the file name).
+        max_chars (int): Chunk size limit; longer lines are wrapped.
+
+    Returns:
+        List[Chunk]: ``{"source", "section", "text"}`` dicts in document order.
+    """
+    chunks: List[Chunk] = []
+    section = ""
+    block: List[str] = []
+    size = 0
+
+    def flush() -> None:
+        nonlocal size
+        if block:
+            chunks.append({"source": source, "section": section, "text": "\n".join(block)})
+        block.clear()
+        size = 0
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if line.startswith("#"):
+            flush()
+            section = line.lstrip("#").strip()
+            continue
+        for piece in textwrap.wrap(line, max_chars) if line else []:
+            if block and size + len(piece) + 1 > max_chars:
+                flush()
+            block.append(piece)
+            size += len(piece) + 1
+    flush()
+    return chunks
+
+
+def document_paths(sources: Iterable[str]) -> List[str]:
+    """Expands source files and directories into the sorted document files they contain."""
+    paths: List[str] = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                paths.extend(
+                    os.path.join(root, name)
+                    for name in files
+                    if name.lower().endswith(DOCUMENT_EXTENSIONS)
+                )
+        elif os.path.isfile(source):
+            paths.append(source)
+    return sorted(paths)
+
+
+def load_documents(sources: Iterable[str], max_chars: int = RAG_CHUNK_CHARS) -> List[Chunk]:
+    """
+    Chunks every document under ``sources`` plus the built-in ``GUIDELINES``.
+    """
+    chunks = [
+        {"source": "document_store", "section": key, "text": text}
+        for key, text in GUIDELINES.items()
+    ]
+    for path in document_paths(sources):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            chunks.extend(chunk_markdown(f.read(), os.path.basename(path), max_chars))
+    return chunks
@@ -0,0 +1,250 @@
+"""
+EcoPulse AI LLM Gateway.
+Sits in front of the Copilot and planner completions: answers are cached per telemetry
+fingerprint (severity, AQI bucket, alert set) under an exact normalized-question key and
+a semantic (cosine) match, with TTL and LRU eviction, and concurrent identical requests
+share one upstream call.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    LLM_AQI_BUCKET,
+    LLM_CACHE_SIZE,
+    LLM_CACHE_TTL,
+    LLM_COALESCE_TIMEOUT,
+    LLM_SEMANTIC_THRESHOLD,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+from ecopulse_ai.rag.retrieval import TOKEN, HashingEmbedder
+
+logger = logging.getLogger("RAG-Gateway")
+
+LLM_CACHE = REGISTRY.counter(
+    "ecopulse_llm_cache_total",
+    "LLM gateway lookups by result (hit, semantic, coalesced, miss)",
+    ("operation", "outcome"),
+)
+
+Scope = Tuple[str, Hashable]
+
+
+def normalize_query(text: str) -> str:
+    """Lower-cased words without punctuation or repeated whitespace."""
+    return " ".join(TOKEN.findall(text.lower()))
+
+
+def aqi_bucket(value: Any, width: float = LLM_AQI_BUCKET) -> Optional[int]:
+    """Index of the ``width``-wide AQI band containing ``value`` (``None`` if not numeric)."""
+    try:
+        return int(float(value) // width)
+    except (TypeError, ValueError):
+        return None
+
+
+def telemetry_fingerprint(metrics: Dict[str, Any], alerts: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """
+    Quantized view of the context an answer depends on: the severity band, the AQI
+    bucket and the set of active alert (type, level, district) triples.
+    """
+    alert_set = tuple(
+        sorted({(a.get("type"), a.get("level"), a.get("district")) for a in alerts}, key=str)
+    )
+    return metrics.get("severity"), aqi_bucket(metrics.get("aqi")), alert_set
+
+
+class SemanticCache:
+    """
+    TTL + LRU cache of completions. Entries are grouped by scope (operation and telemetry
+    fingerprint); a lookup first tries the exact normalized question, then the most
+    similar cached question in the same scope.
+    """
+
+    def __init__(
+        self,
+        ttl: float = LLM_CACHE_TTL,
+        capacity: int = LLM_CACHE_SIZE,
+        threshold: float = LLM_SEMANTIC_THRESHOLD,
+    ):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.threshold = threshold
+        self._embedder = HashingEmbedder(dim=1024)
+        self._entries: "OrderedDict[Tuple[Scope, str], Tuple[float, np.ndarray, Any]]" = (
+            OrderedDict()
+        )
+        self._scopes: Dict[Scope, Set[Tuple[Scope, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Tuple[Scope, str]) -> None:
+        self._entries.pop(key, None)
+        members = self._scopes.get(key[0])
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._scopes[key[0]]
+
+    def lookup(self, scope: Scope, query: str) -> Tuple[Optional[str], Any]:
+        """
+        Returns ``("hit" | "semantic", value)`` for a fresh cached answer, else
+        ``(None, None)``.
+        """
+        key = (scope, normalize_query(query))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return "hit", entry[2]
+            members = list(self._scopes.get(scope, ()))
+        if not members:
+            return None, None
+        vector = self._embedder.embed([key[1]])[0]
+        with self._lock:
+            best, best_score = None, self.threshold
+            for member in members:
+                entry = self._entries.get(member)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    self._drop(member)
+                    continue
+                score = float(entry[1] @ vector)
+                if score >= best_score:
+                    best, best_score = member, score
+            if best is None:
+                return None, None
+            self._entries.move_to_end(best)
+            return "semantic", self._entries[best][2]
+
+    def store(self, scope: Scope, query: str, value: Any) -> None:
+        key = (scope, normalize_query(query))
+        vector = self._embedder.embed([key[1]])[0]
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, vector, value)
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(scope, set()).add(key)
+            while len(self._entries) > self.capacity:
+                self._drop(next(iter(self._entries)))
+
+
+class _Flight:
+    """A completion in progress that identical concurrent requests wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMGateway:
+    """
+    Cache-then-coalesce front for LLM completions. Failures are not cached: the caller's
+    ``complete`` raises and each caller applies its own fallback.
+    """
+
+    def __init__(
+        self, cache: Optional[SemanticCache] = None, timeout: float = LLM_COALESCE_TIMEOUT
+    ):
+        self.cache = cache or SemanticCache()
+        self.timeout = timeout
+        self._flights: Dict[Tuple[Scope, str], _Flight] = {}
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        operation: str,
+        query: str,
+        fingerprint: Hashable,
+        complete: Callable[[], Any],
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Returns a cached answer for (``operation``, ``fingerprint``, ``query``), or the
+        result of ``complete()``, shared with identical requests already in flight.
+        ``refresh`` skips the cache lookup (the fresh result still replaces the entry).
+
+        Raises:
+            Exception: Whatever ``complete`` raised (also re-raised to coalesced callers),
+                or ``TimeoutError`` if the shared call outlives ``timeout``.
+        """
+        scope = (operation, fingerprint)
+        outcome, value = (None, None) if refresh else self.cache.lookup(scope, query)
+        if outcome is not None:
+            LLM_CACHE.labels(operation, outcome).inc()
+            return value
+
+        key = (scope, normalize_query(query))
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(self.timeout):
+                raise TimeoutError(f"Coalesced {operation} completion timed out")
+            if flight.error is not None:
+                raise flight.error
+            LLM_CACHE.labels(operation, "coalesced").inc()
+            return flight.value
+
+        try:
+            flight.value = complete()
+            self.cache.store(scope, query, flight.value)
+            LLM_CACHE.labels(operation, "miss").inc()
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stream(
+        self,
+        operation: str,
+        query: str,
+        fingerprint: Hashable,
+        open_stream: Callable[[], Iterator[str]],
+    ) -> Iterator[str]:
+        """
+        Yields a cached answer as a single piece, or the tokens of ``open_stream()`` as
+        they arrive; a stream that completes is cached for later (streaming or not)
+        calls. Streams are not coalesced: each caller needs its own token feed.
+        """
+        scope = (operation, fingerprint)
+        outcome, value = self.cache.lookup(scope, query)
+        if outcome is not None:
+            LLM_CACHE.labels(operation, outcome).inc()
+            yield value
+            return
+        pieces: List[str] = []
+        for piece in open_stream():
+            pieces.append(piece)
+            yield piece
+        self.cache.store(scope, query, "".join(pieces))
+        LLM_CACHE.labels(operation, "miss").inc()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Returns the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
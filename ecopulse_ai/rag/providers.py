@@ -0,0 +1,297 @@
+"""
+EcoPulse AI LLM Providers.
+Completion backends behind a common interface: OpenAI (or any OpenAI-compatible server),
+created lazily on first use, and a deterministic local provider that renders template
+answers from the request's facts for offline or degraded operation. Calls go through a
+bounded pool that caps concurrent completions and queued callers.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from ecopulse_ai.config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_QUEUE,
+    LLM_MODEL,
+    LLM_PROVIDER,
+    LLM_QUEUE_TIMEOUT,
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+logger = logging.getLogger("RAG-Providers")
+
+LLM_SECONDS = REGISTRY.histogram(
+    "ecopulse_llm_call_seconds", "LLM completion latency", ("operation", "outcome")
+)
+FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "ecopulse_llm_first_token_seconds", "Streaming LLM time to first token", ("operation",)
+)
+QUEUE_SECONDS = REGISTRY.histogram("ecopulse_llm_queue_seconds", "Wait for an LLM call slot")
+REJECTED = REGISTRY.counter(
+    "ecopulse_llm_rejected_total", "LLM calls refused by the pool", ("operation", "reason")
+)
+
+Messages = List[Dict[str, str]]
+Facts = Dict[str, Any]
+
+PLACEHOLDER_KEY = "SECURE_KEY_PLACEHOLDER"
+
+
+class LLMBusy(RuntimeError):
+    """Raised when the pool's queue is full or no slot frees up within the timeout."""
+
+
+class OpenAIProvider:
+    """Chat completions from OpenAI or an OpenAI-compatible server (client built lazily)."""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        api_key: str = OPENAI_API_KEY,
+        base_url: Optional[str] = OPENAI_BASE_URL,
+        **client_options: Any,
+    ):
+        self.model = model
+        self._options = {"api_key": api_key, "base_url": base_url, **client_options}
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+
+                self._client = OpenAI(**self._options)
+            return self._client
+
+    def complete(
+        self,
+        task: str,
+        messages: Messages,
+        facts: Optional[Facts] = None,
+        temperature: float = 0.7,
+        timeout: float = 15.0,
+        json_mode: bool = False,
+    ) -> str:
+        options: Dict[str, Any] = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            timeout=timeout,
+            **options,
+        )
+        return str(response.choices[0].message.content)
+
+    def stream(
+        self,
+        task: str,
+        messages: Messages,
+        facts: Optional[Facts] = None,
+        temperature: float = 0.7,
+        timeout: float = 15.0,
+    ) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            timeout=timeout,
+            stream=True,
+        )
+        for chunk in response:
+            token = chunk.choices[0].delta.content if chunk.choices else None
+            if token:
+                yield token
+
+
+def _copilot_answer(facts: Facts) -> str:
+    guidelines = facts.get("guidelines") or []
+    return (
+        f"[SIMULATION MODE] Based on real-time data (AQI: {facts.get('aqi', 'Unknown')}), "
+        f"the environmental state is '{facts.get('severity', 'Stable')}'. "
+        f"High traffic ({facts.get('traffic', 'N/A')}%) is a major contributor. "
+        "I recommend limiting travel in high-congestion zones."
+        + (f" Guideline: {' '.join(guidelines[0].split())}" if guidelines else "")
+    )
+
+
+def _action_plan(facts: Facts) -> str:
+    return json.dumps(
+        {
+            "summary": "Air quality is deteriorating; proactive measures required.",
+            "recommendations": [
+                {
+                    "title": "Commute Advisory",
+                    "description": "Encourage remote work for non-essential sectors to reduce peak traffic emissions.",
+                    "impact": "High",
+                },
+                {
+                    "title": "Industrial Regulation",
+                    "description": "Implement Stage 1 output reduction for high-emission plants in the industrial belt.",
+                    "impact": "Medium",
+                },
+                {
+                    "title": "Public Safety",
+                    "description": "Postpone all outdoor school activities and city marathons.",
+                    "impact": "High",
+                },
+            ],
+            "projected_impacts": [
+                {"metric": "Expected AQI Reduction", "value": "12-18%"},
+                {"metric": "Health Risk Improvement", "value": "25%"},
+            ],
+            "operational_readiness": "Partial",
+        }
+    )
+
+
+class LocalProvider:
+    """
+    Deterministic offline answers rendered from the caller's facts (no model, no
+    network); streams split the answer into word tokens.
+    """
+
+    name = "local"
+    TEMPLATES = {"copilot": _copilot_answer, "action_plan": _action_plan}
+
+    def complete(
+        self,
+        task: str,
+        messages: Messages,
+        facts: Optional[Facts] = None,
+        temperature: float = 0.7,
+        timeout: float = 15.0,
+        json_mode: bool = False,
+    ) -> str:
+        return self.TEMPLATES[task](facts or {})
+
+    def stream(
+        self,
+        task: str,
+        messages: Messages,
+        facts: Optional[Facts] = None,
+        temperature: float = 0.7,
+        timeout: float = 15.0,
+    ) -> Iterator[str]:
+        yield from re.findall(r"\S+\s*", self.complete(task, messages, facts))
+
+
+class BoundedProvider:
+    """
+    Caps concurrent completions at ``max_concurrency``. Up to ``max_queue`` further
+    callers wait at most ``queue_timeout`` seconds for a slot; anyone beyond that, or
+    still waiting at the deadline, gets ``LLMBusy`` instead of a blocked thread.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_queue: int = LLM_MAX_QUEUE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+    ):
+        self.provider = provider
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    @contextmanager
+    def _slot(self, task: str) -> Iterator[None]:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    REJECTED.labels(task, "queue_full").inc()
+                    raise LLMBusy(f"LLM queue full ({self.max_queue} waiting)")
+                self.waiting += 1
+            started = time.perf_counter()
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            QUEUE_SECONDS.observe(time.perf_counter() - started)
+            if not acquired:
+                REJECTED.labels(task, "timeout").inc()
+                raise LLMBusy(f"No LLM slot within {self.queue_timeout}s")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def complete(self, task: str, messages: Messages, facts: Optional[Facts] = None, **options):
+        with self._slot(task):
+            started = time.perf_counter()
+            try:
+                text = self.provider.complete(task, messages, facts, **options)
+            except Exception:
+                LLM_SECONDS.labels(task, "error").observe(time.perf_counter() - started)
+                raise
+            LLM_SECONDS.labels(task, "ok").observe(time.perf_counter() - started)
+            return text
+
+    def stream(
+        self, task: str, messages: Messages, facts: Optional[Facts] = None, **options
+    ) -> Iterator[str]:
+        """Yields tokens while holding a slot until the stream ends or is closed."""
+        with self._slot(task):
+            started = time.perf_counter()
+            first = True
+            try:
+                for token in self.provider.stream(task, messages, facts, **options):
+                    if first:
+                        FIRST_TOKEN_SECONDS.labels(task).observe(time.perf_counter() - started)
+                        first = False
+                    yield token
+            except Exception:
+                LLM_SECONDS.labels(task, "error").observe(time.perf_counter() - started)
+                raise
+            LLM_SECONDS.labels(task, "ok").observe(time.perf_counter() - started)
+
+
+def make_provider(name: str = LLM_PROVIDER) -> Any:
+    """
+    Builds the configured backend (``openai``, ``local`` or ``auto``).
+
+    Raises:
+        ValueError: If the provider name is unknown.
+    """
+    if name == "auto":
+        configured = OPENAI_BASE_URL or OPENAI_API_KEY not in ("", PLACEHOLDER_KEY)
+        name = "openai" if configured else "local"
+    if name == "openai":
+        return OpenAIProvider()
+    if name == "local":
+        return LocalProvider()
+    raise ValueError(f"Unknown LLM provider: {name}")
+
+
+LOCAL_PROVIDER = LocalProvider()
+
+_provider: Optional[BoundedProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> BoundedProvider:
+    """Returns the process-wide bounded provider (backend built on first use)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = BoundedProvider(make_provider())
+            logger.info(f"LLM provider: {_provider.name}")
+        return _provider
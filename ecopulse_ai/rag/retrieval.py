@@ -0,0 +1,335 @@
+"""
+EcoPulse AI Guideline Retrieval.
+Embeds document chunks (local sentence-transformers model when configured, hashed TF-IDF
+otherwise) into a memory-mapped vector index on disk and serves top-k cosine search, so
+the Copilot prompt carries only the guideline passages relevant to each question.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    RAG_CHUNK_CHARS,
+    RAG_EMBED_MODEL,
+    RAG_HASH_DIM,
+    RAG_INDEX_DIR,
+    RAG_MIN_SCORE,
+    RAG_REFRESH_SECONDS,
+    RAG_SOURCES,
+    RAG_TOP_K,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+from ecopulse_ai.rag.document_store import Chunk, document_paths, load_documents
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional: local CPU embeddings, hashed TF-IDF otherwise
+    SentenceTransformer = None
+
+logger = logging.getLogger("RAG-Retrieval")
+
+RETRIEVAL_SECONDS = REGISTRY.histogram("ecopulse_rag_retrieval_seconds", "Top-k guideline search")
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it of on or should the this to what when "
+    "which with".split()
+)
+# Rows scored per matrix product while building and searching the index
+_BLOCK_ROWS = 8192
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word unigrams (stopwords dropped) plus adjacent-word bigrams."""
+    words = [w for w in TOKEN.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class HashingEmbedder:
+    """
+    TF-IDF over hashed features: tokens are bucketed with CRC32 (stable across processes),
+    term counts are log-damped and weighted by the fitted IDF, then L2-normalized.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = RAG_HASH_DIM):
+        self.dim = dim
+        self.weights: np.ndarray = np.ones(dim, dtype=np.float32)
+
+    def _buckets(self, text: str) -> np.ndarray:
+        return np.fromiter(
+            (zlib.crc32(token.encode()) % self.dim for token in tokenize(text)), dtype=np.int64
+        )
+
+    def fit(self, texts: Iterable[str]) -> None:
+        """Learns IDF weights (smoothed) from the corpus."""
+        df = np.zeros(self.dim, dtype=np.float64)
+        n = 0
+        for text in texts:
+            df[np.unique(self._buckets(text))] += 1
+            n += 1
+        self.weights = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = np.bincount(self._buckets(text), minlength=self.dim)
+            hit = counts > 0
+            vectors[row, hit] = (1 + np.log(counts[hit])) * self.weights[hit]
+        return _normalize(vectors)
+
+
+class ModelEmbedder:
+    """Dense embeddings from a local sentence-transformers model on the CPU."""
+
+    weights: Optional[np.ndarray] = None
+
+    def __init__(self, model: str):
+        self.name = model
+        self.model = SentenceTransformer(model, device="cpu")
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+
+    def fit(self, texts: Iterable[str]) -> None:
+        return None
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), convert_to_numpy=True)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def make_embedder(model: str = RAG_EMBED_MODEL) -> Any:
+    """The configured local model, or the hashed TF-IDF embedder when unset/unavailable."""
+    if model:
+        if SentenceTransformer is None:
+            logger.warning("sentence-transformers not installed; using hashed TF-IDF")
+        else:
+            try:
+                return ModelEmbedder(model)
+            except Exception as e:
+                logger.warning(f"Embedding model '{model}' unavailable ({e}); using TF-IDF")
+    return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def _chunk_text(chunk: Chunk) -> str:
+    return f"{chunk['section']}\n{chunk['text']}"
+
+
+class VectorIndex:
+    """
+    Unit-normalized chunk vectors in a memory-mapped ``.npy`` matrix plus JSONL chunk
+    metadata. Searches stream the matrix in blocks, so only the pages touched by the
+    scan are resident regardless of corpus size.
+    """
+
+    VECTORS = "vectors.npy"
+    CHUNKS = "chunks.jsonl"
+    WEIGHTS = "weights.npy"
+    META = "meta.json"
+
+    def __init__(self, vectors: np.ndarray, chunks: List[Chunk], meta: Dict[str, Any]):
+        self.vectors = vectors
+        self.chunks = chunks
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @classmethod
+    def build(
+        cls, path: str, chunks: List[Chunk], embedder: Any, meta: Dict[str, Any]
+    ) -> "VectorIndex":
+        """
+        Embeds ``chunks`` into a new index at ``path`` (fitting the embedder first). Files
+        are written beside the old ones and swapped in with ``os.replace`` (open maps keep
+        the previous matrix); the meta file goes last, so a partial build is redone.
+        """
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, cls.META)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        texts = [_chunk_text(chunk) for chunk in chunks]
+        embedder.fit(texts)
+        staged = os.path.join(path, f"{cls.VECTORS}.tmp")
+        vectors = np.lib.format.open_memmap(
+            staged, mode="w+", dtype=np.float32, shape=(len(texts), embedder.dim)
+        )
+        for start in range(0, len(texts), _BLOCK_ROWS):
+            vectors[start : start + _BLOCK_ROWS] = embedder.embed(
+                texts[start : start + _BLOCK_ROWS]
+            )
+        vectors.flush()
+        del vectors
+        os.replace(staged, os.path.join(path, cls.VECTORS))
+        with open(os.path.join(path, cls.CHUNKS), "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(chunk) + "\n" for chunk in chunks)
+        weights = os.path.join(path, cls.WEIGHTS)
+        if embedder.weights is not None:
+            np.save(weights, embedder.weights)
+        elif os.path.exists(weights):
+            os.remove(weights)
+        meta = {**meta, "embedder": embedder.name, "dim": embedder.dim, "count": len(chunks)}
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return cls.open(path)
+
+    @classmethod
+    def meta_of(cls, path: str) -> Optional[Dict[str, Any]]:
+        """The committed index's meta, or ``None`` when absent or unreadable."""
+        try:
+            with open(os.path.join(path, cls.META), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def open(cls, path: str) -> "VectorIndex":
+        """
+        Maps an existing index read-only.
+
+        Raises:
+            FileNotFoundError: If no committed index exists at ``path``.
+        """
+        meta = cls.meta_of(path)
+        if meta is None:
+            raise FileNotFoundError(f"No vector index at {path}")
+        vectors = np.load(os.path.join(path, cls.VECTORS), mmap_mode="r")
+        with open(os.path.join(path, cls.CHUNKS), encoding="utf-8") as f:
+            chunks = [json.loads(line) for line in f]
+        return cls(vectors, chunks, meta)
+
+    def load_weights(self, path: str) -> Optional[np.ndarray]:
+        weights = os.path.join(path, self.WEIGHTS)
+        return np.load(weights) if os.path.exists(weights) else None
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[float, int]]:
+        """Top-``k`` ``(cosine, row)`` pairs for a unit query vector, best first."""
+        if not len(self) or k <= 0:
+            return []
+        scores: List[np.ndarray] = []
+        rows: List[np.ndarray] = []
+        for start in range(0, len(self), _BLOCK_ROWS):
+            block = np.asarray(self.vectors[start : start + _BLOCK_ROWS]) @ query
+            top = np.argpartition(-block, k - 1)[:k] if len(block) > k else np.arange(len(block))
+            scores.append(block[top])
+            rows.append(top + start)
+        score, row = np.concatenate(scores), np.concatenate(rows)
+        order = np.argsort(-score, kind="stable")[:k]
+        return [(float(score[i]), int(row[i])) for i in order]
+
+
+def source_fingerprint(sources: Iterable[str]) -> List[List[Any]]:
+    """``[path, size, mtime_ns]`` of every document; any change triggers a rebuild."""
+    fingerprint = []
+    for path in document_paths(sources):
+        stat = os.stat(path)
+        fingerprint.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+class GuidelineRetriever:
+    """
+    Lazily opens (or builds) the vector index over ``sources`` and answers top-k queries.
+    Sources are re-checked at most every ``refresh`` seconds and the index rebuilt when
+    they, the embedder or the chunk size change.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[str] = RAG_SOURCES,
+        index_dir: str = RAG_INDEX_DIR,
+        embedder: Optional[Any] = None,
+        chunk_chars: int = RAG_CHUNK_CHARS,
+        refresh: float = RAG_REFRESH_SECONDS,
+    ):
+        self.sources = tuple(sources)
+        self.index_dir = index_dir
+        self.chunk_chars = chunk_chars
+        self.refresh = refresh
+        self._embedder = embedder
+        self._index: Optional[VectorIndex] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self) -> VectorIndex:
+        with self._lock:
+            now = time.monotonic()
+            if self._index is not None and now - self._checked < self.refresh:
+                return self._index
+            if self._embedder is None:
+                self._embedder = make_embedder()
+            self._checked = now
+            meta = {
+                "sources": source_fingerprint(self.sources),
+                "chunk_chars": self.chunk_chars,
+            }
+            committed = VectorIndex.meta_of(self.index_dir)
+            expected = {**meta, "embedder": self._embedder.name, "dim": self._embedder.dim}
+            if committed and all(committed.get(k) == v for k, v in expected.items()):
+                if self._index is None or self._index.meta != committed:
+                    self._index = VectorIndex.open(self.index_dir)
+                    weights = self._index.load_weights(self.index_dir)
+                    if weights is not None:
+                        self._embedder.weights = weights
+                return self._index
+            started = time.perf_counter()
+            chunks = load_documents(self.sources, self.chunk_chars)
+            self._index = VectorIndex.build(self.index_dir, chunks, self._embedder, meta)
+            logger.info(
+                f"Indexed {len(chunks)} guideline chunks in {time.perf_counter() - started:.2f}s"
+            )
+            return self._index
+
+    def retrieve(
+        self, query: str, k: int = RAG_TOP_K, min_score: float = RAG_MIN_SCORE
+    ) -> List[Dict[str, Any]]:
+        """
+        The ``k`` chunks most similar to ``query`` scoring at least ``min_score``.
+
+        Returns:
+            List[Dict[str, Any]]: Chunks (``source``, ``section``, ``text``) with ``score``.
+        """
+        index = self._current()
+        started = time.perf_counter()
+        query_vector = self._embedder.embed([query])[0]
+        hits = [
+            {**index.chunks[row], "score": round(score, 4)}
+            for score, row in index.search(query_vector, k)
+            if score >= min_score
+        ]
+        RETRIEVAL_SECONDS.observe(time.perf_counter() - started)
+        return hits
+
+
+def format_context(chunks: List[Dict[str, Any]]) -> str:
+    """Numbered guideline passages for the prompt (``[n] source > section: text``)."""
+    return "\n".join(
+        f"[{i}] {chunk['source']} > {chunk['section']}: {' '.join(chunk['text'].split())}"
+        for i, chunk in enumerate(chunks, 1)
+    )
+
+
+_retriever: Optional[GuidelineRetriever] = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever() -> GuidelineRetriever:
+    """Returns the process-wide guideline retriever."""
+    global _retriever
+    with _retriever_lock:
+        if _retriever is None:
+            _retriever = GuidelineRetriever()
+        return _retriever
@@ -168,9 +168,9 @@ def generate_mayor_briefing(data: List[Dict[str, Any]], output_path: str) -> str
     pdf.cell(0, 10, "Primary Driver Attribution:", 0, 1)
     pdf.set_font("Arial", "", 11)
     drivers = (
-        f"• Traffic Systems: {attr.get('traffic', 0)}% impact\n"
-        f"• Industrial Clusters: {attr.get('industrial', 0)}% impact\n"
-        f"• Meteorological Stagnation: {attr.get('wind_impact', 0)}% impact"
+        f"- Traffic Systems: {attr.get('traffic', 0)}% impact\n"
+        f"- Industrial Clusters: {attr.get('industrial', 0)}% impact\n"
+        f"- Meteorological Stagnation: {attr.get('wind_impact', 0)}% impact"
     )
     pdf.multi_cell(0, 7, drivers)
 
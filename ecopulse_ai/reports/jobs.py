@@ -0,0 +1,274 @@
+"""
+EcoPulse AI Report Job Queue.
+Renders PDF reports in a background process pool so request threads never block on
+FPDF. Each job gets an ID for status polling and download; identical requests inside
+the same data window share one job and its cached artifact, and the output folder is
+pruned by age and count.
+"""
+
+import glob
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ecopulse_ai.config import (
+    REPORT_DEDUPE_WINDOW,
+    REPORT_DIR,
+    REPORT_MAX_FILES,
+    REPORT_RETENTION_SECONDS,
+    REPORT_WORKERS,
+)
+from ecopulse_ai.observability.metrics import REGISTRY
+
+# Configure module-level logging
+logger = logging.getLogger("Report-Jobs")
+
+RENDER_SECONDS = REGISTRY.histogram(
+    "ecopulse_report_render_seconds", "PDF rendering time inside the pool", ("kind",)
+)
+JOB_SECONDS = REGISTRY.histogram(
+    "ecopulse_report_job_seconds", "Report job time from submission to settlement", ("status",)
+)
+
+# Report kind -> artifact filename prefix
+REPORT_KINDS: Dict[str, str] = {
+    "full": "ecopulse_audit",
+    "mayor": "mayor_briefing",
+}
+
+
+def render_report(kind: str, data: List[Dict[str, Any]], output_path: str) -> Tuple[str, float]:
+    """
+    Process-pool entry point: renders one report atomically.
+
+    The PDF is written to a temporary sibling and renamed into place, so a partially
+    written file is never visible to downloads or to the artifact cache.
+
+    Returns:
+        Tuple[str, float]: The artifact path and the rendering time in seconds.
+    """
+    from ecopulse_ai.reports.generator import generate_full_report, generate_mayor_briefing
+
+    renderer = generate_mayor_briefing if kind == "mayor" else generate_full_report
+    partial = f"{output_path}.partial"
+    started = time.perf_counter()
+    renderer(data, partial)
+    os.replace(partial, output_path)
+    return output_path, time.perf_counter() - started
+
+
+class ReportJob:
+    """State of one report rendering request."""
+
+    def __init__(self, kind: str, key: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.path = path
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the job settles; returns True if it finished (either way)."""
+        return self._done.wait(timeout)
+
+    def settle(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished = time.time()
+        self._done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "filename": self.filename,
+            "error": self.error,
+            "created": datetime.fromtimestamp(self.created).isoformat(),
+            "finished": (
+                datetime.fromtimestamp(self.finished).isoformat() if self.finished else None
+            ),
+        }
+
+
+class ReportJobQueue:
+    """
+    Deduplicating job front-end over a process pool.
+
+    Args:
+        report_dir (str): Folder receiving the rendered PDFs.
+        workers (int): Size of the rendering process pool.
+        dedupe_window (float): Seconds during which identical requests share one job.
+        executor_factory (Optional[Callable[[], Executor]]): Overrides the process pool
+            (used by tests).
+    """
+
+    def __init__(
+        self,
+        report_dir: str = REPORT_DIR,
+        workers: int = REPORT_WORKERS,
+        dedupe_window: float = REPORT_DEDUPE_WINDOW,
+        retention_seconds: float = REPORT_RETENTION_SECONDS,
+        max_files: int = REPORT_MAX_FILES,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+    ):
+        self.report_dir = report_dir
+        self.dedupe_window = dedupe_window
+        self.retention_seconds = retention_seconds
+        self.max_files = max_files
+        self._executor_factory = executor_factory or (
+            lambda: ProcessPoolExecutor(max_workers=workers)
+        )
+        self._executor: Optional[Executor] = None
+        self._jobs: Dict[str, ReportJob] = {}
+        self._by_key: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        os.makedirs(report_dir, exist_ok=True)
+
+    def _window_key(self, kind: str, now: float) -> str:
+        bucket = int(now // self.dedupe_window) if self.dedupe_window > 0 else uuid.uuid4().hex
+        return f"{kind}:{bucket}"
+
+    def _reusable(self, job: Optional[ReportJob]) -> bool:
+        if job is None or job.status == "failed":
+            return False
+        return job.status != "done" or os.path.exists(job.path)
+
+    def submit(self, kind: str, data: List[Dict[str, Any]]) -> ReportJob:
+        """
+        Queues a report, or returns the job already covering this kind and data window.
+
+        Raises:
+            ValueError: If ``kind`` is not a known report type.
+        """
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report kind: {kind}")
+        now = time.time()
+        key = self._window_key(kind, now)
+
+        with self._lock:
+            existing = self._by_key.get(key)
+            if self._reusable(existing):
+                logger.debug(f"Serving {kind} report from job {existing.id}")
+                return existing
+
+            stamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(
+                self.report_dir, f"{REPORT_KINDS[kind]}_{stamp}_{uuid.uuid4().hex[:8]}.pdf"
+            )
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            try:
+                future = self._executor.submit(render_report, kind, data, path)
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.error(f"Report pool unavailable, restarting it: {e}")
+                self._executor = self._executor_factory()
+                future = self._executor.submit(render_report, kind, data, path)
+            # Registered only once a worker owns it, so a failed submit leaves no
+            # orphaned "queued" job for the dedupe window to hand out
+            job = ReportJob(kind, key, path)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+
+        job.status = "running"
+        future.add_done_callback(lambda f: self._complete(job, f))
+        logger.info(f"Queued {kind} report job {job.id}")
+        return job
+
+    def _complete(self, job: ReportJob, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Report job {job.id} failed: {error}")
+            job.settle("failed", str(error))
+            if isinstance(error, BrokenProcessPool):
+                with self._lock:
+                    self._executor = None
+        else:
+            RENDER_SECONDS.labels(job.kind).observe(future.result()[1])
+            job.settle("done")
+        JOB_SECONDS.labels(job.status).observe(job.finished - job.created)
+        self.evict()
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self._jobs.get(job_id)
+
+    def evict(self) -> List[str]:
+        """
+        Applies retention to the report folder: removes artifacts older than the
+        retention period, then the oldest beyond ``max_files``. Files belonging to
+        queued or running jobs are never touched.
+
+        Returns:
+            List[str]: Paths that were deleted.
+        """
+        with self._lock:
+            active = {
+                job.path for job in self._jobs.values() if job.status in ("queued", "running")
+            }
+        now = time.time()
+        artifacts = []
+        for path in glob.glob(os.path.join(self.report_dir, "*.pdf")):
+            if path in active:
+                continue
+            try:
+                artifacts.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        artifacts.sort(reverse=True)
+
+        removed = []
+        for rank, (mtime, path) in enumerate(artifacts):
+            if rank >= self.max_files or now - mtime > self.retention_seconds:
+                try:
+                    os.remove(path)
+                    removed.append(path)
+                except OSError as e:
+                    logger.warning(f"Could not evict report {path}: {e}")
+
+        gone = set(removed)
+        with self._lock:
+            stale = [
+                job
+                for job in self._jobs.values()
+                if job.path in gone
+                or (job.finished and now - job.finished > self.retention_seconds)
+            ]
+            for job in stale:
+                del self._jobs[job.id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+        if removed:
+            logger.info(f"Evicted {len(removed)} expired report artifacts.")
+        return removed
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_queue: Optional[ReportJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_report_queue() -> ReportJobQueue:
+    """Returns the process-wide report job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportJobQueue()
+        return _queue
@@ -0,0 +1 @@
+"""Initializes the storage package."""
@@ -0,0 +1,49 @@
+"""
+EcoPulse AI Epoch Time Helpers.
+Conversions between telemetry timestamps (ISO-8601 strings, naive wall-clock datetimes)
+and float epoch seconds, shared by the wire format, the producer, the streaming state
+store, capture replay and the time-series archive. Depends on nothing in the package so
+any layer can import it at module level.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Sequence, Union
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+TimeLike = Union[float, int, str, datetime, None]
+
+
+def to_epoch(value: TimeLike, default: float) -> float:
+    """Normalizes a bound (epoch seconds, ISO string or naive datetime) to epoch seconds."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value.replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
+def from_epoch(seconds: float) -> datetime:
+    """Inverse of ``to_epoch``: naive wall-clock datetime for epoch seconds."""
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def parse_timestamps(values: Sequence[Any]) -> np.ndarray:
+    """
+    Vectorized ISO-8601 parsing to epoch seconds (naive wall-clock time, like the
+    sensor feed). Unparseable or missing timestamps fall back to the ingest time.
+    """
+    try:
+        return np.array(values, dtype="datetime64[us]").astype(np.int64) / 1e6
+    except (TypeError, ValueError):
+        now = to_epoch(datetime.now(), 0.0)
+        out = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = to_epoch(value, now)
+            except (TypeError, ValueError):
+                out[i] = now
+        return out
@@ -0,0 +1,560 @@
+"""
+EcoPulse AI Time-Series Archive.
+Append-only, columnar history of enriched telemetry on local disk. Each sensor owns a
+partition directory of fixed-layout binary segments (read back as read-only NumPy
+memmaps) and mergeable 1-minute/1-hour/1-day rollups, so archives and reports can
+query weeks of data without replaying raw JSON.
+
+Layout (one directory per ``(district, sensor_id)`` partition)::
+
+    MANIFEST                             live sealed files, and the appended files
+                                         compaction has absorbed (retired)
+    active-<writer>-<token>.bin          raw rows appended by one writer
+    rollup-<res>-<writer>-<token>.bin    partial rollup rows appended by one writer
+    seg-<t0>-<t1>-<token>.bin            sealed, time-sorted segments covering [t0, t1]
+    rollup-<res>.<token>.bin             compacted rollup rows (one per bucket)
+
+Compaction writes its output under fresh names and publishes it with a single atomic
+replace of ``MANIFEST``: readers only use sealed files the manifest lists and skip the
+appended files it retires, so a query never sees rows both before and after a merge.
+"""
+
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    ROLLUP_RESOLUTIONS,
+    TIMESERIES_COMPACT_SECONDS,
+    TIMESERIES_DIR,
+    TIMESERIES_FLUSH_ROWS,
+    TIMESERIES_FLUSH_SECONDS,
+    TIMESERIES_RAW_RETENTION_DAYS,
+    TIMESERIES_SEGMENT_ROWS,
+)
+from ecopulse_ai.storage.epoch import TimeLike, parse_timestamps, to_epoch
+from ecopulse_ai.streaming.state_store import METRIC_FIELDS, SensorKey, pack_records, sensor_key
+
+# Configure module-level logging
+logger = logging.getLogger("Storage-TimeSeries")
+
+SEVERITY_CODES: Dict[str, float] = {
+    "Optimal": 0.0,
+    "Warning": 1.0,
+    "Critical": 2.0,
+    "Emergency": 3.0,
+}
+SEVERITY_NAMES: Tuple[str, ...] = tuple(SEVERITY_CODES)
+
+# Raw rows: event time (epoch seconds, wall clock) + every metric + severity code
+RAW_DTYPE = np.dtype(
+    [("ts", "f8")] + [(name, "f8") for name in METRIC_FIELDS] + [("severity", "f8")]
+)
+
+# Rollup rows are mergeable partial aggregates: rows sharing a bucket combine exactly.
+# ``count`` is readings per bucket; ``<metric>_n`` counts the readings carrying that metric
+ROLLUP_DTYPE = np.dtype(
+    [("bucket", "f8"), ("count", "f8")]
+    + [(f"{name}_{agg}", "f8") for name in METRIC_FIELDS for agg in ("n", "sum", "min", "max")]
+)
+
+
+def _load(path: str, dtype: np.dtype) -> np.ndarray:
+    """Read-only memmap of a row file (a torn trailing row from a live writer is ignored)."""
+    rows = os.path.getsize(path) // dtype.itemsize
+    if rows == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+def _write_atomic(path: str, rows: np.ndarray) -> None:
+    partial = f"{path}.{uuid.uuid4().hex[:6]}.tmp"
+    with open(partial, "wb") as f:
+        f.write(rows.tobytes())
+    os.replace(partial, path)
+
+
+def aggregate(rows: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    Computes rollup rows (count, sum, min, max per metric) for raw rows.
+
+    Enriched records carry every metric; a missing value contributes nothing to its
+    count, sum, minimum or maximum.
+    """
+    if not len(rows):
+        return np.zeros(0, dtype=ROLLUP_DTYPE)
+    buckets = np.floor(rows["ts"] / resolution) * resolution
+    order = np.argsort(buckets, kind="stable")
+    buckets = buckets[order]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+
+    out = np.zeros(len(starts), dtype=ROLLUP_DTYPE)
+    out["bucket"] = buckets[starts]
+    out["count"] = np.diff(np.r_[starts, len(buckets)])
+    for name in METRIC_FIELDS:
+        values = rows[name][order]
+        missing = np.isnan(values)
+        out[f"{name}_n"] = np.add.reduceat((~missing).astype(np.float64), starts)
+        out[f"{name}_sum"] = np.add.reduceat(np.where(missing, 0.0, values), starts)
+        out[f"{name}_min"] = np.minimum.reduceat(np.where(missing, np.inf, values), starts)
+        out[f"{name}_max"] = np.maximum.reduceat(np.where(missing, -np.inf, values), starts)
+    return out
+
+
+def merge_rollups(rows: np.ndarray) -> np.ndarray:
+    """Combines rollup rows that share a bucket (partial flushes, several sensors)."""
+    if not len(rows):
+        return np.zeros(0, dtype=ROLLUP_DTYPE)
+    order = np.argsort(rows["bucket"], kind="stable")
+    rows = rows[order]
+    starts = np.flatnonzero(np.r_[True, rows["bucket"][1:] != rows["bucket"][:-1]])
+    if len(starts) == len(rows):
+        return np.ascontiguousarray(rows)
+
+    out = np.zeros(len(starts), dtype=ROLLUP_DTYPE)
+    out["bucket"] = rows["bucket"][starts]
+    out["count"] = np.add.reduceat(rows["count"], starts)
+    for name in METRIC_FIELDS:
+        out[f"{name}_n"] = np.add.reduceat(rows[f"{name}_n"], starts)
+        out[f"{name}_sum"] = np.add.reduceat(rows[f"{name}_sum"], starts)
+        out[f"{name}_min"] = np.minimum.reduceat(rows[f"{name}_min"], starts)
+        out[f"{name}_max"] = np.maximum.reduceat(rows[f"{name}_max"], starts)
+    return out
+
+
+class Partition:
+    """
+    Files of one sensor partition. Only the owning ``writer`` appends to its files, and
+    only the writer holding the partition's compaction lock replaces ``MANIFEST``.
+    """
+
+    def __init__(self, root: str, key: SensorKey, writer: str):
+        self.key = key
+        self.writer = writer
+        self.path = os.path.join(root, f"{quote(key[0], safe='')}+{quote(key[1], safe='')}")
+        self._active: Optional[str] = None  # file this writer is appending raw rows to
+        self._rollups: Dict[str, str] = {}  # resolution -> partial file being appended to
+
+    @staticmethod
+    def key_from_dirname(name: str) -> Optional[SensorKey]:
+        district, sep, sensor = name.partition("+")
+        return (unquote(district), unquote(sensor)) if sep else None
+
+    def _new_file(self, prefix: str) -> str:
+        return os.path.join(self.path, f"{prefix}-{uuid.uuid4().hex[:8]}.bin")
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _glob(self, pattern: str) -> List[str]:
+        return glob.glob(os.path.join(self.path, pattern))
+
+    def _owned(self, prefix: str) -> List[str]:
+        """Appended files of this writer named ``<prefix>-<writer>-<token>.bin``."""
+        stem = f"{prefix}-{self.writer}"
+        return [
+            path
+            for path in self._glob(f"{stem}-*.bin")
+            if os.path.basename(path)[:-4].rsplit("-", 1)[0] == stem
+        ]
+
+    def manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._file("MANIFEST"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        manifest.setdefault("segments", [])
+        manifest.setdefault("rollups", {})
+        manifest.setdefault("retired", [])
+        return manifest
+
+    def _commit(self, manifest: Dict[str, Any]) -> None:
+        """Publishes a new manifest with one atomic replace."""
+        partial = self._file(f"MANIFEST.{uuid.uuid4().hex[:6]}.tmp")
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(partial, self._file("MANIFEST"))
+
+    @staticmethod
+    def segment_bounds(name: str) -> Optional[Tuple[float, float]]:
+        parts = name[4:-4].split("-")
+        try:
+            return float(parts[0]), float(parts[1])
+        except (IndexError, ValueError):
+            logger.warning(f"Ignoring unrecognized segment file {name}")
+            return None
+
+    def segments(self, manifest: Optional[Dict[str, Any]] = None) -> List[Tuple[float, float, str]]:
+        """Live sealed segments as ``(t0, t1, path)`` sorted by start time."""
+        found = []
+        for name in (manifest or self.manifest())["segments"]:
+            bounds = self.segment_bounds(name)
+            if bounds is not None:
+                found.append((*bounds, os.path.join(self.path, name)))
+        return sorted(found)
+
+    def _seal(self, rows: np.ndarray) -> str:
+        rows = np.sort(rows, order="ts", kind="stable")
+        t0, t1 = math.floor(rows["ts"][0]), math.ceil(rows["ts"][-1])
+        path = os.path.join(self.path, f"seg-{t0}-{t1}-{uuid.uuid4().hex[:8]}.bin")
+        _write_atomic(path, rows)
+        return os.path.basename(path)
+
+    def append(self, rows: np.ndarray, segment_rows: int) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if self._active is None:
+            self._active = self._new_file(f"active-{self.writer}")
+        with open(self._active, "ab") as f:
+            f.write(rows.tobytes())
+        if os.path.getsize(self._active) >= segment_rows * RAW_DTYPE.itemsize:
+            self._active = None  # full: later rows start a new file; compaction seals it
+
+    def append_rollup(self, resolution: str, rows: np.ndarray) -> None:
+        path = self._rollups.get(resolution)
+        if path is None:
+            path = self._rollups[resolution] = self._new_file(f"rollup-{resolution}-{self.writer}")
+        with open(path, "ab") as f:
+            f.write(rows.tobytes())
+
+    def read_raw(self, start: float, end: float) -> np.ndarray:
+        # Appended files are listed before the manifest is read: a file absorbed in
+        # between is then already retired, so its rows are counted exactly once
+        appended = self._glob("active-*.bin")
+        manifest = self.manifest()
+        retired = set(manifest["retired"])
+        parts = []
+        for t0, t1, path in self.segments(manifest):
+            if t1 < start or t0 >= end:
+                continue
+            rows = _load(path, RAW_DTYPE)
+            lo, hi = np.searchsorted(rows["ts"], [start, end], side="left")
+            parts.append(np.array(rows[lo:hi]))
+        for path in appended:
+            if os.path.basename(path) in retired:
+                continue
+            rows = _load(path, RAW_DTYPE)
+            parts.append(np.array(rows[(rows["ts"] >= start) & (rows["ts"] < end)]))
+        if not parts:
+            return np.zeros(0, dtype=RAW_DTYPE)
+        return np.sort(np.concatenate(parts), order="ts", kind="stable")
+
+    def read_rollup(self, resolution: str, start: float, end: float) -> np.ndarray:
+        appended = self._glob(f"rollup-{resolution}-*.bin")
+        manifest = self.manifest()
+        retired = set(manifest["retired"])
+        paths = [p for p in appended if os.path.basename(p) not in retired]
+        compacted = manifest["rollups"].get(resolution)
+        if compacted:
+            paths.append(os.path.join(self.path, compacted))
+        if not paths:
+            return np.zeros(0, dtype=ROLLUP_DTYPE)
+        rows = np.concatenate([_load(path, ROLLUP_DTYPE) for path in paths])
+        return merge_rollups(rows[(rows["bucket"] >= start) & (rows["bucket"] < end)])
+
+    def compact(self, segment_rows: int, raw_cutoff: float, resolutions: Iterable[str]) -> None:
+        """
+        Seals this writer's appended rows, merges small segments into full ones, drops
+        raw segments older than ``raw_cutoff`` and folds this writer's partial rollups
+        into the compacted rollup files. The result is published by one manifest commit;
+        replaced files are deleted only afterwards.
+        """
+        lock_path = os.path.join(self.path, ".compact.lock")
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.time() - os.path.getmtime(lock_path) < 600:
+                return  # another writer is compacting this partition
+            os.remove(lock_path)
+            return
+        try:
+            self._active, self._rollups = None, {}  # later appends go to new files
+            manifest = self.manifest()
+            # Retired files deleted by an earlier compaction no longer need listing
+            retired = [n for n in manifest["retired"] if os.path.exists(self._file(n))]
+            obsolete: List[str] = []
+
+            absorbed = self._owned("active")
+            keep, small = [], []
+            for t0, t1, path in self.segments(manifest):
+                name = os.path.basename(path)
+                if t1 < raw_cutoff:
+                    obsolete.append(name)
+                elif os.path.getsize(path) < segment_rows * RAW_DTYPE.itemsize // 2:
+                    small.append(name)
+                else:
+                    keep.append(name)
+            if len(small) < 2 and not absorbed:
+                keep += small
+                small = []
+            sources = [self._file(n) for n in small] + absorbed
+            if sources:
+                rows = np.concatenate([np.array(_load(p, RAW_DTYPE)) for p in sources])
+                rows = np.sort(rows[rows["ts"] >= raw_cutoff], order="ts", kind="stable")
+                for offset in range(0, len(rows), segment_rows):
+                    keep.append(self._seal(rows[offset : offset + segment_rows]))
+            obsolete += small
+
+            rollups = dict(manifest["rollups"])
+            for resolution in resolutions:
+                partials = self._owned(f"rollup-{resolution}")
+                if not partials:
+                    continue
+                absorbed += partials
+                parts = [np.array(_load(p, ROLLUP_DTYPE)) for p in partials]
+                if rollups.get(resolution):
+                    obsolete.append(rollups[resolution])
+                    parts.append(np.array(_load(self._file(rollups[resolution]), ROLLUP_DTYPE)))
+                path = os.path.join(self.path, f"rollup-{resolution}.{uuid.uuid4().hex[:8]}.bin")
+                _write_atomic(path, merge_rollups(np.concatenate(parts)))
+                rollups[resolution] = os.path.basename(path)
+
+            if not absorbed and not obsolete:
+                return
+            absorbed_names = [os.path.basename(p) for p in absorbed]
+            self._commit(
+                {"segments": sorted(keep), "rollups": rollups, "retired": retired + absorbed_names}
+            )
+            for name in obsolete + absorbed_names:
+                os.remove(self._file(name))
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+
+class TimeSeriesStore:
+    """
+    Writer and query front-end of the archive.
+
+    Writers buffer enriched records and flush them per partition in batches; readers
+    (e.g. the web tier in another process) only ever open files read-only.
+
+    Args:
+        root (str): Archive directory.
+        writer_id (str): Unique per concurrently-writing process (worker index).
+    """
+
+    def __init__(
+        self,
+        root: str = TIMESERIES_DIR,
+        writer_id: str = "0",
+        segment_rows: int = TIMESERIES_SEGMENT_ROWS,
+        flush_rows: int = TIMESERIES_FLUSH_ROWS,
+        flush_seconds: float = TIMESERIES_FLUSH_SECONDS,
+        compact_seconds: float = TIMESERIES_COMPACT_SECONDS,
+        raw_retention_days: float = TIMESERIES_RAW_RETENTION_DAYS,
+        resolutions: Optional[Dict[str, int]] = None,
+    ):
+        self.root = root
+        self.writer_id = writer_id
+        self.segment_rows = segment_rows
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.compact_seconds = compact_seconds
+        self.raw_retention = raw_retention_days * 86400
+        self.resolutions = dict(resolutions or ROLLUP_RESOLUTIONS)
+        self._pending: Dict[SensorKey, List[np.ndarray]] = {}
+        self._partitions: Dict[SensorKey, Partition] = {}
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        self._last_compact = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _partition(self, key: SensorKey) -> Partition:
+        # Cached: a partition remembers the files this writer is appending to
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = Partition(self.root, key, self.writer_id)
+        return partition
+
+    # --- Writing ---
+
+    def append_batch(
+        self, records: List[Dict[str, Any]], keys: Optional[List[SensorKey]] = None
+    ) -> None:
+        """Buffers enriched records; flushes (and periodically compacts) when due."""
+        if not records:
+            return
+        metrics, _ = pack_records(records)
+        rows = np.zeros(len(records), dtype=RAW_DTYPE)
+        rows["ts"] = parse_timestamps([r.get("timestamp") for r in records])
+        for i, name in enumerate(METRIC_FIELDS):
+            rows[name] = metrics[:, i]
+        rows["severity"] = [SEVERITY_CODES.get(r.get("severity"), np.nan) for r in records]
+
+        groups: Dict[SensorKey, List[int]] = {}
+        for i, key in enumerate(keys or map(sensor_key, records)):
+            groups.setdefault(key, []).append(i)
+        with self._lock:
+            for key, idx in groups.items():
+                self._pending.setdefault(key, []).append(rows[idx])
+            self._pending_rows += len(records)
+        self.maybe_flush()
+
+    def maybe_flush(self) -> None:
+        now = time.monotonic()
+        if self._pending_rows >= self.flush_rows or now - self._last_flush >= self.flush_seconds:
+            self.flush()
+        if now - self._last_compact >= self.compact_seconds:
+            self.compact()
+
+    def flush(self) -> None:
+        """Writes buffered rows and their partial rollups to disk."""
+        with self._lock:
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+            self._last_flush = time.monotonic()
+            for key, chunks in pending.items():
+                rows = np.concatenate(chunks)
+                partition = self._partition(key)
+                try:
+                    partition.append(rows, self.segment_rows)
+                    for name, seconds in self.resolutions.items():
+                        partition.append_rollup(name, aggregate(rows, seconds))
+                except OSError as e:
+                    logger.error(f"Archive write failed for sensor {key[1]} in {key[0]}: {e}")
+
+    def compact(self) -> None:
+        """Compacts every partition (skipping any another writer is compacting)."""
+        with self._lock:
+            self._last_compact = time.monotonic()
+            cutoff = to_epoch(datetime.now(), 0.0) - self.raw_retention
+            for key in self.partitions():
+                try:
+                    self._partition(key).compact(self.segment_rows, cutoff, self.resolutions)
+                except OSError as e:
+                    logger.error(f"Archive compaction failed for sensor {key[1]}: {e}")
+
+    def close(self) -> None:
+        self.flush()
+
+    def size_bytes(self) -> int:
+        """Total on-disk size of the archive."""
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    continue
+        return total
+
+    # --- Querying ---
+
+    def partitions(self, district: Optional[str] = None) -> List[SensorKey]:
+        if not os.path.isdir(self.root):
+            return []
+        keys = [Partition.key_from_dirname(name) for name in sorted(os.listdir(self.root))]
+        return [k for k in keys if k and (district is None or k[0] == district)]
+
+    def _select(self, sensor_id: Optional[str], district: Optional[str]) -> List[Partition]:
+        return [
+            self._partition(key)
+            for key in self.partitions(district)
+            if sensor_id is None or key[1] == sensor_id
+        ]
+
+    @staticmethod
+    def _retrying(read):
+        # Compaction may swap files between listing and opening them; re-list and retry
+        for attempt in range(3):
+            try:
+                return read()
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+
+    def scan(
+        self,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        sensor_id: Optional[str] = None,
+        district: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Time-range scan of raw rows across the selected partitions.
+
+        Args:
+            start (TimeLike): Inclusive lower bound (epoch seconds, ISO string or datetime).
+            end (TimeLike): Exclusive upper bound.
+            sensor_id (Optional[str]): Restrict to one sensor id.
+            district (Optional[str]): Restrict to one district.
+            fields (Optional[Sequence[str]]): Metric columns to return (default: all).
+
+        Returns:
+            Dict[str, np.ndarray]: ``ts``, ``sensor_id``, ``district``, ``severity`` and
+            the metric columns, ordered by time.
+        """
+        lo, hi = to_epoch(start, -np.inf), to_epoch(end, np.inf)
+        parts, owners = [], []
+        for partition in self._select(sensor_id, district):
+            rows = self._retrying(lambda: partition.read_raw(lo, hi))
+            if len(rows):
+                parts.append(rows)
+                owners.append((partition.key, len(rows)))
+
+        rows = np.concatenate(parts) if parts else np.zeros(0, dtype=RAW_DTYPE)
+        counts = [n for _, n in owners]
+        districts = np.repeat(np.array([k[0] for k, _ in owners], dtype=object), counts)
+        sensors = np.repeat(np.array([k[1] for k, _ in owners], dtype=object), counts)
+        order = np.argsort(rows["ts"], kind="stable")
+        codes = rows["severity"][order]
+        severity = np.array(
+            [SEVERITY_NAMES[int(c)] if c == c else None for c in codes.tolist()], dtype=object
+        )
+        columns: Dict[str, np.ndarray] = {
+            "ts": rows["ts"][order],
+            "sensor_id": sensors[order],
+            "district": districts[order],
+            "severity": severity,
+        }
+        for name in fields or METRIC_FIELDS:
+            columns[name] = rows[name][order]
+        return columns
+
+    def rollup(
+        self,
+        resolution: str = "1h",
+        start: TimeLike = None,
+        end: TimeLike = None,
+        sensor_id: Optional[str] = None,
+        district: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Pre-aggregated series at ``resolution`` (``1m``, ``1h`` or ``1d``), combined
+        across the selected partitions.
+
+        Returns:
+            Dict[str, np.ndarray]: ``bucket`` (epoch seconds), ``count`` and
+            ``<metric>_mean`` / ``_min`` / ``_max`` columns.
+        """
+        if resolution not in self.resolutions:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        lo, hi = to_epoch(start, -np.inf), to_epoch(end, np.inf)
+        parts = [
+            self._retrying(lambda: partition.read_rollup(resolution, lo, hi))
+            for partition in self._select(sensor_id, district)
+        ]
+        rows = merge_rollups(np.concatenate(parts)) if parts else np.zeros(0, dtype=ROLLUP_DTYPE)
+        columns: Dict[str, np.ndarray] = {"bucket": rows["bucket"], "count": rows["count"]}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for name in METRIC_FIELDS:
+                columns[f"{name}_mean"] = rows[f"{name}_sum"] / rows[f"{name}_n"]
+                columns[f"{name}_min"] = np.where(
+                    np.isinf(rows[f"{name}_min"]), np.nan, rows[f"{name}_min"]
+                )
+                columns[f"{name}_max"] = np.where(
+                    np.isinf(rows[f"{name}_max"]), np.nan, rows[f"{name}_max"]
+                )
+        return columns
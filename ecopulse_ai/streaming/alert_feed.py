@@ -0,0 +1,255 @@
+"""
+EcoPulse AI Alert Lifecycle Store.
+Stateful alerts maintained inside the streaming engine, keyed per sensor and per rule.
+Debounced level transitions from the ``AlertTracker`` become ``open``, ``escalate``,
+``deescalate`` and ``resolve`` events on a sequence-numbered change feed: in-process
+listeners (the SSE publisher, the Kafka alert sink) receive each batch of events once,
+and readers poll ``changes(since)`` or the ``active()`` snapshot instead of re-deriving
+alerts from the latest record.
+"""
+
+import logging
+import operator
+import itertools
+import threading
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.analytics.rules import ALERT_MESSAGES, LEVELS, AlertTracker
+from ecopulse_ai.config import ALERT_EVENT_RETENTION
+from ecopulse_ai.observability.metrics import REGISTRY
+
+# Configure module-level logging
+logger = logging.getLogger("Streaming-Alerts")
+
+ALERT_TRANSITIONS = REGISTRY.counter(
+    "ecopulse_alert_transitions_total", "Debounced sensor alert level changes", ("metric", "to")
+)
+ALERT_EVENTS = REGISTRY.counter(
+    "ecopulse_alert_events_total", "Alert lifecycle events published", ("event",)
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_RANK: Dict[str, int] = {level: code for code, level in enumerate(LEVELS)}
+_MESSAGES: Dict[Tuple[str, str], str] = {
+    (metric, level): msg for metric, texts in ALERT_MESSAGES.items() for level, msg in texts.items()
+}
+
+EVENT_KINDS: Tuple[str, ...] = ("open", "escalate", "deescalate", "resolve")
+
+AlertKey = Tuple[str, str, str]  # (district, sensor_id, metric)
+ALERT_FIELDS: Tuple[str, ...] = ("id", "district", "sensor_id", "type", "level", "value", "msg")
+_alert_fields = operator.itemgetter(*ALERT_FIELDS)
+AlertListener = Callable[[List[Dict[str, Any]]], None]
+
+
+def lifecycle_event(previous: str, level: str) -> str:
+    """Names the lifecycle step of a level transition (see ``EVENT_KINDS``)."""
+    if previous == LEVELS[0]:
+        return "open"
+    if level == LEVELS[0]:
+        return "resolve"
+    return "escalate" if _RANK[level] > _RANK[previous] else "deescalate"
+
+
+# Lifecycle step of every (previous, new) level code pair
+_KINDS: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(lifecycle_event(previous, level) for level in LEVELS) for previous in LEVELS
+)
+
+
+def _iso(epoch: float) -> str:
+    """Naive ISO-8601 wall-clock time, matching the sensor feed's timestamps."""
+    return (_EPOCH + timedelta(seconds=epoch)).isoformat()
+
+
+_alert_key: Callable[[Mapping[str, Any]], AlertKey] = operator.itemgetter(  # type: ignore
+    "district", "sensor_id", "type"
+)
+
+
+class AlertStore:
+    """
+    Active alerts and their bounded lifecycle event log.
+
+    The engine's store feeds it batches through ``update``; worker-pool parents, which
+    never see the telemetry, mirror another process's events through ``apply``. Events
+    carry the alert's stable ``id`` from open to resolve, and the local ``seq`` orders
+    them for ``changes(since)`` readers.
+
+    Args:
+        tracker (Optional[AlertTracker]): Hysteresis state machine (defaults to the
+            configured rules).
+        retention (int): Events kept for incremental readers.
+    """
+
+    def __init__(
+        self, tracker: Optional[AlertTracker] = None, retention: int = ALERT_EVENT_RETENTION
+    ):
+        self.tracker = tracker or AlertTracker()
+        # Event message per (metric index, level code) of the tracker's rules
+        self._messages = [
+            [
+                _MESSAGES.get((metric, level)) or f"{metric} back within safe limits."
+                for level in LEVELS
+            ]
+            for metric in self.tracker.rules.metrics
+        ]
+        self.sequence = 0
+        self._ids = itertools.count(1)
+        self._id_prefix = uuid.uuid4().hex[:8]  # distinguishes engine processes and restarts
+        self._active: Dict[AlertKey, Dict[str, Any]] = {}
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max(1, retention))
+        self._listeners: List[AlertListener] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def subscribe(self, listener: AlertListener) -> None:
+        """Registers a callback receiving every applied batch of events."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: AlertListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def update(
+        self,
+        keys: Sequence[Tuple[str, str]],
+        columns: Mapping[str, np.ndarray],
+        times: np.ndarray,
+        hour: Optional[int] = None,
+        stamps: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs a batch through the tracker and publishes the resulting lifecycle events.
+
+        Args:
+            keys (Sequence[Tuple[str, str]]): ``(district, sensor_id)`` of each row.
+            columns (Mapping[str, np.ndarray]): Metric columns of the rows.
+            times (np.ndarray): Event time of each row (epoch seconds).
+            hour (Optional[int]): Local hour for peak-time thresholds.
+            stamps (Optional[Sequence[Any]]): Original timestamp of each row, reported
+                as the event time (formatted from ``times`` otherwise).
+
+        Returns:
+            List[Dict[str, Any]]: The published events, in arrival order.
+        """
+        fired = self.tracker.advance(keys, columns, times, hour)
+        if fired is None:
+            return []
+        rows, cols, old, new, values, when = fired
+        metrics = self.tracker.rules.metrics
+        for (j, code), count in Counter(zip(cols, new)).items():
+            ALERT_TRANSITIONS.labels(metrics[j], LEVELS[code]).inc(count)
+        events = []
+        for row, j, a, b, value, t in zip(rows, cols, old, new, values, when):
+            district, sensor_id = keys[row]
+            stamp = stamps[row] if stamps is not None else None
+            events.append(
+                {
+                    "event": _KINDS[a][b],
+                    "district": district,
+                    "sensor_id": sensor_id,
+                    "type": metrics[j],
+                    "level": LEVELS[b],
+                    "previous": LEVELS[a],
+                    "value": round(value, 2),
+                    "msg": self._messages[j][b],
+                    "time": stamp if stamp else _iso(t),
+                }
+            )
+        return self._record(events)
+
+    def apply(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Folds lifecycle events into the active set, appends them to the change feed and
+        notifies listeners. Also used to mirror events produced by another process.
+
+        Returns:
+            List[Dict[str, Any]]: The events as recorded (with ``id`` and ``seq``).
+        """
+        return self._record([dict(event) for event in events])
+
+    def _record(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """``apply`` for events owned by this store (stamped in place, not copied)."""
+        with self._lock:
+            for event in events:
+                key = _alert_key(event)
+                current = self._active.get(key)
+                if current is not None:
+                    event.setdefault("id", current["id"])
+                elif not event.get("id"):
+                    event["id"] = f"{self._id_prefix}-{next(self._ids)}"
+                if event["event"] == "resolve":
+                    self._active.pop(key, None)
+                elif current is None:
+                    self._active[key] = dict(
+                        zip(ALERT_FIELDS, _alert_fields(event)),
+                        opened=event["time"],
+                        updated=event["time"],
+                        peak=event["level"],
+                    )
+                else:
+                    # Same key, so only the id (mirrored events), level, value and msg move
+                    level = event["level"]
+                    if _RANK[level] > _RANK[current["peak"]]:
+                        current["peak"] = level
+                    current["id"], current["level"] = event["id"], level
+                    current["value"], current["msg"] = event["value"], event["msg"]
+                    current["updated"] = event["time"]
+                self.sequence += 1
+                event["seq"] = self.sequence
+                self._events.append(event)
+            listeners = list(self._listeners)
+
+        for kind, count in Counter(e["event"] for e in events).items():
+            ALERT_EVENTS.labels(kind).inc(count)
+        for listener in listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                logger.error(f"Alert listener failed: {e}")
+        return events
+
+    def active(
+        self,
+        limit: Optional[int] = None,
+        district: Optional[str] = None,
+        sensor_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Snapshot of open alerts, most severe (then most recently updated) first.
+
+        Args:
+            limit (Optional[int]): Maximum number of alerts returned.
+            district (Optional[str]): Only alerts of this district.
+            sensor_id (Optional[str]): Only alerts of this sensor.
+        """
+        with self._lock:
+            alerts = [
+                dict(alert)
+                for alert in self._active.values()
+                if (district is None or alert["district"] == district)
+                and (sensor_id is None or alert["sensor_id"] == sensor_id)
+            ]
+        alerts.sort(key=lambda a: (_RANK[a["level"]], a["updated"]), reverse=True)
+        return alerts[:limit]
+
+    def changes(self, since: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Returns the event sequence number and the retained events after ``since``. A
+        reader that fell further behind than the retention should resync from ``active``.
+        """
+        with self._lock:
+            missed = self.sequence - since
+            if missed <= 0:
+                return self.sequence, []
+            return self.sequence, list(self._events)[-missed:]
@@ -0,0 +1,198 @@
+"""
+EcoPulse AI Live Delta Broadcasting.
+Server-Sent Events plumbing shared by the streaming engine and the web tier: the engine
+publishes only what changed (new enriched records, changed aggregate views) and every
+subscriber receives the same pre-serialized frame, so fan-out cost is a queue put.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ecopulse_ai.config import LIVE_CLIENT_QUEUE, LIVE_HEARTBEAT_SECONDS, LIVE_PUSH_INTERVAL
+
+# Configure module-level logging
+logger = logging.getLogger("Live-Broadcast")
+
+Event = Tuple[str, Any]
+
+HEARTBEAT_FRAME = b": keepalive\n\n"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: str, data: Any) -> bytes:
+    """Encodes one event as an SSE frame with a JSON payload."""
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+def iter_sse(lines: Iterable[Any]) -> Iterator[Event]:
+    """
+    Parses an SSE line stream (e.g. ``requests.Response.iter_lines()``) into
+    ``(event, decoded JSON data)`` pairs. Comment frames are ignored.
+    """
+    event, data = "message", []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:
+            if data:
+                try:
+                    yield event, json.loads("\n".join(data))
+                except ValueError:
+                    logger.error(f"Discarding malformed '{event}' event from upstream.")
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+
+
+class EventHub:
+    """
+    Fans pre-serialized SSE frames out to bounded per-subscriber queues.
+
+    A subscriber whose queue fills up is disconnected instead of slowing publishers
+    down; browsers (``EventSource``) and the web relay reconnect and resync from a
+    fresh snapshot.
+    """
+
+    def __init__(
+        self, max_queue: int = LIVE_CLIENT_QUEUE, heartbeat: float = LIVE_HEARTBEAT_SECONDS
+    ):
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self._subscribers: Set["queue.Queue[Optional[bytes]]"] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> "queue.Queue[Optional[bytes]]":
+        q: "queue.Queue[Optional[bytes]]" = queue.Queue(self.max_queue)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Optional[bytes]]") -> None:
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Serializes an event once and enqueues it for every subscriber."""
+        frame = format_sse(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                logger.warning("Dropping slow live-update subscriber (queue full).")
+                self.unsubscribe(q)
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(None)  # end-of-stream marker
+
+    def stream(self, initial: Optional[Callable[[], List[Event]]] = None) -> Iterator[bytes]:
+        """
+        Generator body for a streaming HTTP response.
+
+        Args:
+            initial (Optional[Callable[[], List[Event]]]): Builds the resync events sent
+                right after subscribing (called after registration so no delta is lost).
+        """
+        q = self.subscribe()
+        try:
+            for event, data in initial() if initial else []:
+                yield format_sse(event, data)
+            while True:
+                try:
+                    frame = q.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield HEARTBEAT_FRAME
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(q)
+
+
+class DeltaPublisher:
+    """
+    Engine-side change detector: polls the state backend's feed sequence and publishes
+    new records plus any aggregate view whose payload changed, and forwards new alert
+    lifecycle events from the backend's ``alerts`` store (when it has one).
+
+    Args:
+        state (Any): A backend exposing ``changes(since)`` and ``snapshot()``.
+        views (Dict[str, Callable[[Any], Any]]): Named aggregate builders (e.g. district
+            comparison); each is re-evaluated only when new records arrive.
+    """
+
+    def __init__(
+        self,
+        state: Any,
+        views: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        interval: float = LIVE_PUSH_INTERVAL,
+    ):
+        self.state = state
+        self.views = views or {}
+        self.interval = interval
+        self.hub = EventHub()
+        self.sequence = 0
+        self.alert_sequence = 0
+        self._last_views: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def poll(self) -> None:
+        """Publishes the delta since the previous poll (no-op when nothing changed)."""
+        alerts = getattr(self.state, "alerts", None)
+        if alerts is not None and alerts.sequence != self.alert_sequence:
+            self.alert_sequence, events = alerts.changes(self.alert_sequence)
+            if events:
+                self.hub.publish(
+                    "alert_events", {"sequence": self.alert_sequence, "events": events}
+                )
+        sequence, records = self.state.changes(self.sequence)
+        if sequence == self.sequence:
+            return
+        self.sequence = sequence
+        if records:
+            self.hub.publish("records", {"sequence": sequence, "records": records})
+        for name, build in self.views.items():
+            payload = build(self.state)
+            if payload != self._last_views.get(name):
+                self._last_views[name] = payload
+                self.hub.publish(name, payload)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Delta publisher poll failed: {e}")
+            time.sleep(self.interval)
+
+    def snapshot_events(self) -> List[Event]:
+        sequence, records = self.state.changes(0)
+        events: List[Event] = [("snapshot", {"sequence": sequence, "records": records})]
+        alerts = getattr(self.state, "alerts", None)
+        if alerts is not None:
+            events.append(("alerts", {"sequence": alerts.sequence, "active": alerts.active()}))
+        events.extend((name, build(self.state)) for name, build in self.views.items())
+        return events
+
+    def stream(self) -> Iterator[bytes]:
+        """Starts the poller on first use and streams snapshot-then-deltas."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self.hub.stream(initial=self.snapshot_events)
@@ -0,0 +1,263 @@
+"""
+EcoPulse AI Pathway Dataflow.
+The production counterpart of the Flask shim: Kafka telemetry is keyed by sensor,
+enriched with the same attribution/alert/carbon transforms as table operations, and
+summarized with tumbling (momentum) and sliding (volatility) event-time windows on
+Pathway's incremental engine. Results are pushed into a ``SensorStateStore`` so the
+engine serves the same HTTP endpoints as the shim.
+"""
+
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pathway as pw
+
+from ecopulse_ai.config import (
+    ALERT_KAFKA_ENABLED,
+    DEFAULT_DISTRICT,
+    DEFAULT_SENSOR_ID,
+    KAFKA_BOOTSTRAP_SERVERS,
+    KAFKA_TOPIC,
+    MOMENTUM_WINDOW_SECONDS,
+    STREAM_HOST,
+    STREAM_PORT,
+    TIMESERIES_ENABLED,
+    VOLATILITY_HOP_SECONDS,
+    VOLATILITY_WINDOW_SECONDS,
+)
+from ecopulse_ai.kafka.alerts import KafkaAlertSink
+from ecopulse_ai.streaming.pathway_pipeline import (
+    compute_alerts,
+    compute_attribution,
+    compute_carbon_footprint,
+    create_shim_app,
+)
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+# Configure module-level logging
+logger = logging.getLogger("Pathway-Graph")
+
+# Optional location columns, left off records that do not report them
+LOCATION_FIELDS = ("state", "lat", "lon")
+
+
+class TelemetrySchema(pw.Schema):
+    """Sensor message layout on the ``environmental_stream`` topic."""
+
+    timestamp: str
+    sensor_id: str = pw.column_definition(default_value=DEFAULT_SENSOR_ID)
+    district: str = pw.column_definition(default_value=DEFAULT_DISTRICT)
+    aqi: float = pw.column_definition(default_value=0.0)
+    pm25: float = pw.column_definition(default_value=0.0)
+    co2: float = pw.column_definition(default_value=0.0)
+    temperature: float = pw.column_definition(default_value=0.0)
+    humidity: float = pw.column_definition(default_value=0.0)
+    wind_speed: float = pw.column_definition(default_value=0.0)
+    traffic_density: float = pw.column_definition(default_value=0.0)
+    industrial_index: float = pw.column_definition(default_value=0.0)
+    state: Optional[str] = pw.column_definition(default_value=None)
+    lat: Optional[float] = pw.column_definition(default_value=None)
+    lon: Optional[float] = pw.column_definition(default_value=None)
+
+
+def _parse_timestamp(value: str) -> pw.DateTimeNaive:
+    return datetime.fromisoformat(value)
+
+
+def _sensor_uid(district: str, sensor_id: str) -> str:
+    return f"{district}/{sensor_id}"
+
+
+def _std(mean: float, mean_sq: float) -> float:
+    return round(math.sqrt(max(0.0, mean_sq - mean * mean)), 2)
+
+
+def build_pipeline(telemetry: pw.Table) -> Dict[str, pw.Table]:
+    """
+    Declares the analytics graph over a telemetry table.
+
+    Args:
+        telemetry (pw.Table): Rows following ``TelemetrySchema``.
+
+    Returns:
+        Dict[str, pw.Table]: ``enriched`` per-record analytics, ``momentum`` per sensor
+        and tumbling window, and ``volatility`` per sensor and sliding window.
+    """
+    keyed = telemetry.with_columns(
+        event_time=pw.apply_with_type(_parse_timestamp, pw.DateTimeNaive, pw.this.timestamp),
+        sensor_uid=pw.apply_with_type(_sensor_uid, str, pw.this.district, pw.this.sensor_id),
+    )
+
+    health = 100.0 - (pw.this.aqi / 5.0 + pw.this.co2 / 50.0 + pw.this.pm25 / 2.0)
+    enriched = keyed.with_columns(
+        attribution=pw.apply_with_type(
+            compute_attribution,
+            pw.Json,
+            pw.this.traffic_density,
+            pw.this.industrial_index,
+            pw.this.wind_speed,
+            pw.this.temperature,
+        ),
+        severity=pw.apply_with_type(compute_alerts, str, pw.this.aqi),
+        carbon_footprint=pw.apply_with_type(
+            compute_carbon_footprint, pw.Json, pw.this.traffic_density, pw.this.industrial_index
+        ),
+        heat_pollution_index=pw.apply_with_type(
+            lambda t, a: round(t * a / 100, 2), float, pw.this.temperature, pw.this.aqi
+        ),
+        dispersion_factor=pw.apply_with_type(
+            lambda w: round(10.0 / (w + 1.0), 2), float, pw.this.wind_speed
+        ),
+        health_score=pw.if_else(health > 0.0, health, 0.0),
+    )
+
+    # Momentum: change between the first and last reading of each tumbling window
+    momentum = (
+        keyed.windowby(
+            pw.this.event_time,
+            window=pw.temporal.tumbling(duration=timedelta(seconds=MOMENTUM_WINDOW_SECONDS)),
+            instance=pw.this.sensor_uid,
+        )
+        .reduce(
+            sensor_uid=pw.this._pw_instance,
+            window_end=pw.this._pw_window_end,
+            first=pw.reducers.argmin(pw.this.event_time),
+            last=pw.reducers.argmax(pw.this.event_time),
+        )
+        .select(
+            pw.this.sensor_uid,
+            pw.this.window_end,
+            aqi_momentum=keyed.ix(pw.this.last).aqi - keyed.ix(pw.this.first).aqi,
+        )
+    )
+
+    # Volatility: population std of AQI over an overlapping sliding window
+    volatility = (
+        keyed.windowby(
+            pw.this.event_time,
+            window=pw.temporal.sliding(
+                hop=timedelta(seconds=VOLATILITY_HOP_SECONDS),
+                duration=timedelta(seconds=VOLATILITY_WINDOW_SECONDS),
+            ),
+            instance=pw.this.sensor_uid,
+        )
+        .reduce(
+            sensor_uid=pw.this._pw_instance,
+            window_end=pw.this._pw_window_end,
+            mean=pw.reducers.avg(pw.this.aqi),
+            mean_sq=pw.reducers.avg(pw.this.aqi * pw.this.aqi),
+            readings=pw.reducers.count(),
+        )
+        .select(
+            pw.this.sensor_uid,
+            pw.this.window_end,
+            pw.this.readings,
+            volatility=pw.apply_with_type(_std, float, pw.this.mean, pw.this.mean_sq),
+        )
+    )
+
+    return {"enriched": enriched, "momentum": momentum, "volatility": volatility}
+
+
+class StateSink:
+    """
+    Materializes the Pathway outputs into a ``SensorStateStore``.
+
+    Window results are kept per sensor (latest window wins) and stamped onto each
+    enriched record as it is stored, so the HTTP layer sees the shim's record shape.
+    Records are buffered until Pathway closes the logical time and then stored in
+    event-time order with a single ``append_batch``.
+    """
+
+    def __init__(self, state: SensorStateStore, archive: Optional[Any] = None):
+        self.state = state
+        self.archive = archive
+        self._windows: Dict[str, Dict[str, Tuple[Any, float]]] = {
+            "aqi_momentum": {},
+            "volatility": {},
+        }
+        self._pending: List[Tuple[datetime, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def _window_callback(self, field: str):
+        def on_change(key: Any, row: Dict[str, Any], time: int, is_addition: bool) -> None:
+            if not is_addition:
+                return
+            uid = row["sensor_uid"]
+            with self._lock:
+                current = self._windows[field].get(uid)
+                if current is None or row["window_end"] >= current[0]:
+                    self._windows[field][uid] = (row["window_end"], round(float(row[field]), 2))
+
+        return on_change
+
+    def _on_record(self, key: Any, row: Dict[str, Any], time: int, is_addition: bool) -> None:
+        if not is_addition:
+            return
+        record = {
+            name: (value.value if isinstance(value, pw.Json) else value)
+            for name, value in row.items()
+            if name not in ("event_time", "sensor_uid")
+            and not (value is None and name in LOCATION_FIELDS)
+        }
+        record["_uid"] = row["sensor_uid"]
+        self._pending.append((row["event_time"], record))
+
+    def _flush(self, time: int) -> None:
+        if not self._pending:
+            return
+        self._pending.sort(key=lambda item: item[0])
+        records = [record for _, record in self._pending]
+        self._pending = []
+        with self._lock:
+            for record in records:
+                uid = record.pop("_uid")
+                for field, latest in self._windows.items():
+                    window = latest.get(uid)
+                    record[field] = window[1] if window else 0.0
+        self.state.append_batch(records)
+        if self.archive is not None:
+            self.archive.append_batch(records)
+
+    def attach(self, tables: Dict[str, pw.Table]) -> None:
+        pw.io.subscribe(tables["momentum"], on_change=self._window_callback("aqi_momentum"))
+        pw.io.subscribe(tables["volatility"], on_change=self._window_callback("volatility"))
+        pw.io.subscribe(tables["enriched"], on_change=self._on_record, on_time_end=self._flush)
+
+
+def run_pathway_pipeline(state: Optional[SensorStateStore] = None) -> None:
+    """
+    Runs the Pathway engine against Kafka and serves its state over the engine API.
+    """
+    state = state or SensorStateStore()
+    if ALERT_KAFKA_ENABLED:
+        state.alerts.subscribe(KafkaAlertSink())
+    telemetry = pw.io.kafka.read(
+        {
+            "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
+            "group.id": "pathway-engine-group",
+            "auto.offset.reset": "latest",
+        },
+        topic=KAFKA_TOPIC,
+        schema=TelemetrySchema,
+        format="json",
+        autocommit_duration_ms=500,
+    )
+    archive = None
+    if TIMESERIES_ENABLED:
+        from ecopulse_ai.storage.timeseries import TimeSeriesStore
+
+        archive = TimeSeriesStore()
+    StateSink(state, archive).attach(build_pipeline(telemetry))
+
+    app = create_shim_app(state)
+    threading.Thread(
+        target=app.run,
+        kwargs={"host": STREAM_HOST, "port": STREAM_PORT, "debug": False, "use_reloader": False},
+        daemon=True,
+    ).start()
+    logger.info("Pathway dataflow started. Serving engine API from the materialized state.")
+    pw.run()
@@ -4,27 +4,78 @@ Handles real-time environmental data processing using either Pathway (for produc
 or a lightweight Flask-based Shim (for Windows/local development).
 """
 
-import json
 import logging
-import math
 import threading
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
 
-from confluent_kafka import Consumer, KafkaError
+import numpy as np
+from confluent_kafka import Consumer, KafkaError, TopicPartition
 from flask import Flask, Response, jsonify, request
 
+from ecopulse_ai.analytics.rolling import RollingStats, RollingTable
+from ecopulse_ai.analytics.rules import RULES, local_hour
+from ecopulse_ai.analytics.simulation import (
+    LEVERS,
+    ScenarioCache,
+    parse_axis,
+    parse_surfaces,
+    scenario_grid,
+)
+from ecopulse_ai.analytics.spatial import parse_bbox
 from ecopulse_ai.config import (
+    ALERT_KAFKA_ENABLED,
+    CONSUMER_BATCH_SIZE,
+    CONSUMER_BATCH_TIMEOUT,
+    DISTRICT_REGISTRY,
     KAFKA_BOOTSTRAP_SERVERS,
     KAFKA_TOPIC,
+    ROLLING_WINDOW,
+    SIMULATION_WEIGHTS,
+    STREAM_ENGINE,
     STREAM_HOST,
     STREAM_PORT,
+    STATE_NAMES,
+    STREAM_WORKERS,
     THRESHOLDS,
+    TIMESERIES_ENABLED,
+)
+from ecopulse_ai.kafka.alerts import KafkaAlertSink
+from ecopulse_ai.kafka.wire import decode_messages, message_format
+from ecopulse_ai.observability.metrics import REGISTRY, Meter, metrics_response
+from ecopulse_ai.observability.tracing import TRACER
+from ecopulse_ai.streaming.broadcast import SSE_HEADERS, DeltaPublisher
+from ecopulse_ai.streaming.state_store import RingBuffer, SensorStateStore, sensor_key
+from ecopulse_ai.streaming.vectorized import (
+    Columns,
+    assemble_records,
+    batch_analytics,
+    to_columns,
 )
 
 # Configure module-level logging
 logger = logging.getLogger("Pathway-Pipeline")
 
+# --- Engine Metrics ---
+MESSAGES_CONSUMED = REGISTRY.counter(
+    "ecopulse_messages_consumed_total", "Telemetry messages consumed from Kafka"
+)
+BATCH_ERRORS = REGISTRY.counter(
+    "ecopulse_batch_errors_total", "Micro-batch failures by stage", ("stage",)
+)
+DECODE_SECONDS = REGISTRY.histogram("ecopulse_decode_seconds", "Micro-batch payload decode latency")
+ANALYTICS_SECONDS = REGISTRY.histogram(
+    "ecopulse_analytics_seconds", "Micro-batch analytics and state update latency"
+)
+CONSUMER_LAG = REGISTRY.gauge(
+    "ecopulse_consumer_lag_messages", "Messages behind the partition high watermark", ("partition",)
+)
+INGEST_RATE = Meter()
+REGISTRY.gauge(
+    "ecopulse_messages_per_second", "Consumed messages per second (10 s window)"
+).set_function(INGEST_RATE.rate)
+LAG_REFRESH_SECONDS = 5.0
+
 
 def apply_simulation(aqi: float, params: Dict[str, Any]) -> float:
     """
@@ -37,14 +88,10 @@ def apply_simulation(aqi: float, params: Dict[str, Any]) -> float:
     Returns:
         float: The simulated AQI value.
     """
-    traffic_reduction = float(params.get("traffic_reduction", 0)) / 100
-    industrial_restriction = float(params.get("industrial_restriction", 0)) / 100
-    green_cover_bonus = float(params.get("green_cover", 0)) / 100
-
-    # Business Logic: Weights for predictive AQI improvement
-    impacted_aqi = aqi * (1 - (traffic_reduction * 0.4))
-    impacted_aqi *= 1 - (industrial_restriction * 0.5)
-    impacted_aqi *= 1 - (green_cover_bonus * 0.2)
+    # Business Logic: Weights for predictive AQI improvement (shared with /simulate)
+    impacted_aqi = aqi
+    for lever, weight in SIMULATION_WEIGHTS.items():
+        impacted_aqi *= 1 - (float(params.get(lever, 0)) / 100 * weight)
     return round(impacted_aqi, 2)
 
 
@@ -69,22 +116,12 @@ def compute_attribution(
     }
 
 
-def compute_alerts(aqi: float) -> str:
+def compute_alerts(aqi: float, hour: Optional[int] = None) -> str:
     """
     Determines the safety severity level based on AQI and peak-hour adjustments.
     """
-    hour = datetime.now().hour
-    is_peak = (8 <= hour <= 10) or (17 <= hour <= 19)
-    # Apply a 20% stricter threshold during peak transit hours
-    warning_threshold = THRESHOLDS["AQI"]["warning"] * (1.2 if is_peak else 1.0)
-
-    if aqi >= THRESHOLDS["AQI"]["emergency"]:
-        return "Emergency"
-    if aqi >= THRESHOLDS["AQI"]["critical"]:
-        return "Critical"
-    if aqi >= warning_threshold:
-        return "Warning"
-    return "Optimal"
+    hour = local_hour() if hour is None else hour
+    return RULES.level("AQI", aqi, hour)
 
 
 def compute_carbon_footprint(traffic: float, industrial: float) -> Dict[str, float]:
@@ -98,14 +135,31 @@ def compute_carbon_footprint(traffic: float, industrial: float) -> Dict[str, flo
     }
 
 
+def _seed_stats(history: Optional[Union[RingBuffer, List[Dict[str, Any]]]]) -> RollingStats:
+    """
+    Builds throwaway rolling statistics from the trailing window of a history buffer.
+    Used for ad-hoc calls (tests, simulations) that have no live per-sensor stats.
+    """
+    if not history:
+        return RollingStats()
+    depth = ROLLING_WINDOW - 1
+    recent = history.records(depth) if isinstance(history, RingBuffer) else history[-depth:]
+    return RollingStats.from_history(recent)
+
+
 def calculate_analytics(
     record: Dict[str, Any],
-    history: Optional[List[Dict[str, Any]]] = None,
+    history: Optional[Union[RingBuffer, List[Dict[str, Any]]]] = None,
     simulation_params: Optional[Dict[str, Any]] = None,
+    stats: Optional[RollingStats] = None,
 ) -> Dict[str, Any]:
     """
     Orchestrates the full analytical transformation of a raw sensor record.
+
+    When ``stats`` (the sensor's live rolling statistics) is supplied it is updated in
+    place with this record; otherwise momentum and volatility are derived from ``history``.
     """
+    trace = TRACER.start("calculate_analytics", sensor_id=record.get("sensor_id"))
     # Defensive type conversion
     try:
         aqi = float(record.get("aqi", 0))
@@ -119,154 +173,513 @@ def calculate_analytics(
     except (ValueError, TypeError) as e:
         logger.error(f"Integrity error in sensor record: {e}")
         return record
+    trace.mark("convert")
 
     # Apply Simulation Shifting
     if simulation_params:
         aqi = apply_simulation(aqi, simulation_params)
         record["is_simulated"] = True
         record["aqi"] = aqi
+        trace.mark("simulate")
 
     # Core Analytics
     record["attribution"] = compute_attribution(traffic, industrial, wind, temp)
     record["severity"] = compute_alerts(aqi)
     record["carbon_footprint"] = compute_carbon_footprint(traffic, industrial)
+    trace.mark("indicators")
 
     # Momentum & Spatiotemporal Trends
-    if history and len(history) > 0:
-        record["aqi_momentum"] = round(aqi - history[-1].get("aqi", aqi), 2)
-    else:
-        record["aqi_momentum"] = 0.0
+    if stats is None:
+        stats = _seed_stats(history)
+    previous_aqi = stats.last("aqi")
+    stats.update(record)
+    record["aqi_momentum"] = round(aqi - previous_aqi, 2) if previous_aqi is not None else 0.0
+    trace.mark("rolling")
 
     record["heat_pollution_index"] = round(temp * aqi / 100, 2)
     record["dispersion_factor"] = round(10.0 / (wind + 1.0), 2)
 
-    # Statistical Volatility
-    if history and len(history) >= 10:
-        recent_aqi = [h.get("aqi", 0) for h in history[-10:]] + [aqi]
-        mean = sum(recent_aqi) / len(recent_aqi)
-        var = sum((x - mean) ** 2 for x in recent_aqi) / len(recent_aqi)
-        record["volatility"] = round(math.sqrt(var), 2)
-    else:
-        record["volatility"] = 0.0
+    # Statistical Volatility (population std over the full rolling window)
+    aqi_window = stats["aqi"]
+    record["volatility"] = round(aqi_window.std(), 2) if aqi_window.full else 0.0
 
     # Composite Health Index (EHS)
     record["health_score"] = max(0, 100 - (aqi / 5 + co2 / 50 + pm25 / 2))
+    trace.mark("derived")
+    TRACER.finish(trace)
 
     return record
 
 
-def run_shim_pipeline() -> None:
+def calculate_analytics_batch(
+    records: List[Dict[str, Any]],
+    state: Optional[SensorStateStore] = None,
+    hour: Optional[int] = None,
+    columns: Optional[Tuple[Columns, np.ndarray]] = None,
+) -> List[Dict[str, Any]]:
     """
-    Initializes and starts the Flask-based Windows Shim for the Pathway engine.
+    Vectorized enrichment of a micro-batch of raw sensor records.
+
+    Stateless indicators (attribution, severity, carbon footprint, heat-pollution index,
+    dispersion factor, health score) are computed column-wise in one NumPy pass, and
+    momentum and volatility come from a vectorized update of every sensor's rolling
+    window. Records failing numeric conversion are dropped.
+
+    Args:
+        records (List[Dict[str, Any]]): Decoded telemetry, in arrival order.
+        state (Optional[SensorStateStore]): Live store supplying the rolling-window table;
+            without it, statistics only span the batch itself.
+        hour (Optional[int]): Hour for peak-time thresholds (defaults to the current hour).
+        columns (Optional[Tuple[Columns, np.ndarray]]): Pre-decoded input columns and
+            validity mask (binary wire format); skips transposing the records.
+
+    Returns:
+        List[Dict[str, Any]]: The enriched records (the input dicts, updated in place).
     """
-    app = Flask("Pathway_Shim")
-    state: Dict[str, List[Dict[str, Any]]] = {"data": []}
-
-    def kafka_consumer_worker() -> None:
-        """Background thread for non-blocking Kafka ingestion."""
-        conf = {
-            "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
-            "group.id": "pathway-shim-group",
-            "auto.offset.reset": "latest",
-        }
+    if not records:
+        return []
+    trace = TRACER.start("calculate_analytics_batch", size=len(records))
+    columns, valid = columns if columns is not None else to_columns(records)
+    if not valid.all():
+        logger.error(f"Integrity error in {int((~valid).sum())} sensor record(s) of batch")
+    trace.mark("columns")
+
+    hour = local_hour() if hour is None else hour
+    enriched = assemble_records(records, batch_analytics(columns, hour), valid)
+    trace.mark("indicators")
+
+    # Momentum & volatility: one vectorized pass over each sensor's rolling window
+    rolling = state.rolling if state is not None else RollingTable()
+    keys = [sensor_key(r) for r in enriched]
+    slots = np.fromiter(map(rolling.slot, keys), np.int64, len(enriched))
+    rows = np.column_stack([columns[m] for m in rolling.metrics])[valid]
+    window = rolling.push_batch(slots, rows)
+
+    aqi_col = rolling.metrics.index("aqi")
+    previous = window["previous"][:, aqi_col]
+    momentum = np.round(rows[:, aqi_col] - np.nan_to_num(previous, nan=rows[:, aqi_col]), 2)
+    volatility = np.where(window["full"], np.round(window["std"][:, aqi_col], 2), 0.0)
+    for record, mom, vol in zip(enriched, momentum.tolist(), volatility.tolist()):
+        record["aqi_momentum"] = mom
+        record["volatility"] = vol
+    trace.mark("rolling")
+    TRACER.finish(trace)
+    return enriched
+
+
+BatchHandler = Callable[[List[Dict[str, Any]], Optional[Tuple[Columns, np.ndarray]]], None]
+
+
+def record_consumer_lag(consumer: Consumer, offsets: Dict[Tuple[str, int], int]) -> None:
+    """
+    Publishes per-partition lag: the locally cached high watermark minus the next
+    offset to consume (no broker round trip).
+    """
+    for (topic, partition), offset in offsets.items():
         try:
-            consumer = Consumer(conf)
-            consumer.subscribe([KAFKA_TOPIC])
-            logger.info("Kafka Connection established. Listening for telemetry...")
+            _, high = consumer.get_watermark_offsets(TopicPartition(topic, partition), cached=True)
         except Exception as e:
-            logger.critical(f"Failed to initialize Kafka Consumer: {e}")
-            return
+            logger.debug(f"Watermarks unavailable for {topic}[{partition}]: {e}")
+            continue
+        if high is not None and high >= 0:
+            CONSUMER_LAG.labels(str(partition)).set(max(0, high - offset - 1))
 
-        while True:
-            msg = consumer.poll(1.0)
-            if msg is None:
-                continue
+
+def consume_micro_batches(
+    consumer: Consumer, handle_batch: BatchHandler, stop: Optional[Any] = None
+) -> None:
+    """
+    Drives a Kafka consumer until ``stop`` (a threading or multiprocessing event) is set,
+    handing each decoded micro-batch to ``handle_batch`` as ``(records, columns)``;
+    ``columns`` is set when the batch arrived in the binary wire format. Shared by the
+    in-process consumer thread and the worker-pool processes.
+
+    Consumption, decode and analytics latency and consumer lag are recorded in the
+    process's metrics registry.
+    """
+    offsets: Dict[Tuple[str, int], int] = {}
+    next_lag_refresh = 0.0
+    while stop is None or not stop.is_set():
+        # Micro-batch: block up to CONSUMER_BATCH_TIMEOUT filling CONSUMER_BATCH_SIZE slots
+        messages = consumer.consume(CONSUMER_BATCH_SIZE, CONSUMER_BATCH_TIMEOUT)
+        payloads: List[bytes] = []
+        formats: List[str] = []
+        for msg in messages:
             if msg.error():
                 if msg.error().code() != KafkaError._PARTITION_EOF:
                     logger.error(f"Kafka transport error: {msg.error()}")
                 continue
+            payloads.append(msg.value())
+            formats.append(message_format(msg.headers()))
+            offsets[(msg.topic(), msg.partition())] = msg.offset()
+        if offsets and time.monotonic() >= next_lag_refresh:
+            record_consumer_lag(consumer, offsets)
+            next_lag_refresh = time.monotonic() + LAG_REFRESH_SECONDS
+        if not payloads:
+            continue
+        MESSAGES_CONSUMED.inc(len(payloads))
+        INGEST_RATE.mark(len(payloads))
+
+        try:
+            with DECODE_SECONDS.time():
+                records, columns = decode_messages(payloads, formats)
+        except Exception as e:
+            BATCH_ERRORS.labels("decode").inc()
+            logger.error(f"Telemetry decode failure: {e}")
+            continue
+        try:
+            with ANALYTICS_SECONDS.time():
+                handle_batch(records, columns)
+        except Exception as e:
+            BATCH_ERRORS.labels("analytics").inc()
+            logger.error(f"Analytical processing failure: {e}")
 
-            try:
-                record = json.loads(msg.value().decode("utf-8"))
-                enriched = calculate_analytics(record, history=state["data"])
-                state["data"].append(enriched)
 
-                # Keep state bounded to prevent memory leaks
-                if len(state["data"]) > 100:
-                    state["data"].pop(0)
-            except Exception as e:
-                logger.error(f"Analytical processing failure: {e}")
+def kafka_consumer_worker(
+    state: SensorStateStore, archive: Optional[Any] = None, stop: Optional[Any] = None
+) -> None:
+    """
+    Background thread for non-blocking Kafka ingestion into the in-process store.
+
+    Args:
+        state (SensorStateStore): Live state served over HTTP.
+        archive (Optional[TimeSeriesStore]): Long-horizon store receiving every batch;
+            flushed and closed when the worker exits.
+        stop (Optional[threading.Event]): Ends consumption once set.
+    """
+    conf = {
+        "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
+        "group.id": "pathway-shim-group",
+        "auto.offset.reset": "latest",
+    }
+    try:
+        consumer = Consumer(conf)
+        consumer.subscribe([KAFKA_TOPIC])
+        logger.info("Kafka Connection established. Listening for telemetry...")
+    except Exception as e:
+        logger.critical(f"Failed to initialize Kafka Consumer: {e}")
+        if archive is not None:
+            archive.close()
+        return
+
+    def handle_batch(
+        records: List[Dict[str, Any]], columns: Optional[Tuple[Columns, np.ndarray]] = None
+    ) -> None:
+        enriched = calculate_analytics_batch(records, state=state, columns=columns)
+        state.append_batch(enriched)
+        if archive is not None:
+            archive.append_batch(enriched)
+
+    try:
+        consume_micro_batches(consumer, handle_batch, stop)
+    finally:
+        consumer.close()
+        if archive is not None:
+            archive.close()
+
+
+def vulnerability_class(p95: float) -> str:
+    """
+    Dashboard vulnerability of a region from the 95th percentile of its sensors' AQI:
+    Critical past the critical threshold, High past the warning threshold, Low past half
+    of it, Minimal otherwise.
+    """
+    limits = THRESHOLDS["AQI"]
+    if p95 >= limits["critical"]:
+        return "Critical"
+    if p95 >= limits["warning"]:
+        return "High"
+    if p95 >= limits["warning"] / 2:
+        return "Low"
+    return "Minimal"
+
+
+def district_comparison(state: Any) -> List[Dict[str, Any]]:
+    """
+    District-level comparison view served by the engine, most polluted first (empty
+    until data arrives). Reads the store's incremental aggregates: O(districts).
+    """
+    districts = state.region_summary("district")
+    for district in districts:
+        district["vulnerability"] = vulnerability_class(district["p95"])
+        district["risk"] = DISTRICT_REGISTRY.get(district["name"], {}).get("risk", "Unknown")
+    return sorted(districts, key=lambda d: d["aqi"], reverse=True)
+
+
+def national_metrics(state: Any) -> List[Dict[str, Any]]:
+    """State-level national view served by the engine, most polluted first: O(states)."""
+    states = state.region_summary("state")
+    for region in states:
+        region["id"] = region["name"]
+        region["name"] = STATE_NAMES.get(region["id"], region["id"])
+    return sorted(states, key=lambda s: s["aqi"], reverse=True)
+
+
+def register_state_metrics(state: Any) -> None:
+    """Exports the state backend's buffer occupancy as gauges read at scrape time."""
+    for name, help_text in (
+        ("records_appended", "Enriched records ever appended to the city-wide feed"),
+        ("feed_records", "Records currently held in the city-wide feed buffer"),
+        ("feed_capacity", "Capacity of the city-wide feed buffer"),
+        ("sensors", "Sensors with a live state buffer"),
+        ("active_alerts", "Open sensor alerts held by the alert lifecycle store"),
+    ):
+        if name in state.occupancy():
+            REGISTRY.gauge(f"ecopulse_state_{name}", help_text).set_function(
+                lambda name=name: state.occupancy()[name]
+            )
 
-    @app.route("/")
-    def status() -> str:
-        return "EcoPulse AI Analytics Engine: Active"
+
+def _register_telemetry_routes(app: Flask, state: Any) -> None:
+    """Latest telemetry (optionally simulated) and per-sensor forecasts."""
 
     @app.route("/environmental_metrics")
     def get_metrics() -> Response:
         """Fetches telemetry with optional on-the-fly simulation support."""
-        if request.args.get("traffic_reduction") and state["data"]:
+        latest = state.latest()
+        if request.args.get("traffic_reduction") and latest:
             simulated = calculate_analytics(
-                state["data"][-1].copy(), history=state["data"], simulation_params=request.args
+                latest, history=state.history_for(latest), simulation_params=request.args
             )
             return jsonify([simulated])
-        return jsonify(state["data"])
+        return jsonify(state.snapshot())
+
+    @app.route("/forecast")
+    def get_forecast() -> Response:
+        """Serves the O(1) incremental AQI forecast for a sensor (latest sensor by default)."""
+        latest = state.latest()
+        if not latest:
+            return jsonify({})
+        key = {
+            "sensor_id": request.args.get("sensor_id", latest.get("sensor_id")),
+            "district": request.args.get("district", latest.get("district")),
+        }
+        key = {k: v for k, v in key.items() if v is not None}
+        n_steps = request.args.get("n_steps", 5, type=int)
+        method = request.args.get("method", "holt")
+        forecast = state.forecast(key, max(1, min(n_steps, 60)), method)
+        if forecast is None:
+            return jsonify({"error": "Unknown sensor"}), 404
+        return jsonify(forecast)
+
+
+def _register_simulation_routes(app: Flask, state: Any) -> None:
+    """Memoized what-if response surfaces."""
+    scenarios = ScenarioCache()
+
+    @app.route("/simulate")
+    def get_simulation() -> Response:
+        """
+        What-if response surfaces over a scenario grid (``traffic_reduction``,
+        ``industrial_restriction``, ``green_cover`` as ``start:stop:step`` or lists),
+        memoized per quantized grid and version of the sensor's history.
+        """
+        latest = state.latest()
+        if not latest:
+            return jsonify({})
+        key = {
+            "sensor_id": request.args.get("sensor_id", latest.get("sensor_id")),
+            "district": request.args.get("district", latest.get("district")),
+        }
+        key = {k: v for k, v in key.items() if v is not None}
+        try:
+            axes = {lever: parse_axis(request.args.get(lever)) for lever in LEVERS}
+            surfaces = parse_surfaces(request.args.get("metrics"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        history = state.find_history(key)
+        if history is None:
+            return jsonify({"error": "Unknown sensor"}), 404
+        # Only this sensor's own appends invalidate its surfaces
+        if isinstance(history, RingBuffer):
+            version: Hashable = history.total_appended
+        else:  # pool mode: a copy of the sensor's recent feed rows
+            version = (len(history), history[-1].get("timestamp"))
+        cache_key = (
+            version,
+            tuple(sorted(key.items())),
+            tuple(tuple(axis.tolist()) for axis in axes.values()),
+            surfaces,
+        )
+
+        def evaluate() -> Dict[str, Any]:
+            if isinstance(history, RingBuffer):
+                window = history.column("aqi")
+                current = history.latest() or {}
+            else:
+                window = np.array([float(r.get("aqi", np.nan)) for r in history])
+                current = history[-1] if history else {}
+            grid = scenario_grid(
+                window,
+                axes,
+                float(current.get("co2", 0) or 0),
+                float(current.get("pm25", 0) or 0),
+                surfaces,
+            )
+            return {"version": version, "scope": key, **grid}
+
+        try:
+            return jsonify(scenarios.get_or_compute(cache_key, evaluate))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+
+def _register_spatial_routes(app: Flask, state: Any) -> None:
+    """Regional comparisons, positioned sensors and heatmap tiles."""
 
     @app.route("/district_comparison")
     def get_district_comparison() -> Response:
-        if not state["data"]:
-            return jsonify([])
-        latest = state["data"][-1]
-        base = float(latest.get("aqi", 0))
-        return jsonify(
-            [
-                {
-                    "name": "Central Business District",
-                    "aqi": base,
-                    "vulnerability": "High",
-                    "risk": "Traffic",
-                    "trend": "Rising",
-                },
-                {
-                    "name": "Industrial North",
-                    "aqi": round(base * 1.3, 2),
-                    "vulnerability": "Critical",
-                    "risk": "Industrial",
-                    "trend": "Stable",
-                },
-                {
-                    "name": "Residential South",
-                    "aqi": round(base * 0.7, 2),
-                    "vulnerability": "Low",
-                    "risk": "Dust",
-                    "trend": "Falling",
-                },
-                {
-                    "name": "Green Belt West",
-                    "aqi": round(base * 0.5, 2),
-                    "vulnerability": "Minimal",
-                    "risk": "None",
-                    "trend": "Optimal",
-                },
-            ]
-        )
+        return jsonify(district_comparison(state))
 
     @app.route("/national_metrics")
     def get_national_metrics() -> Response:
-        if not state["data"]:
-            return jsonify([])
-        base = float(state["data"][-1].get("aqi", 0))
+        return jsonify(national_metrics(state))
+
+    @app.route("/sensors")
+    def get_sensors() -> Response:
+        """Positioned sensors with their latest AQI, optionally inside ``bbox``."""
+        bbox = request.args.get("bbox")
+        try:
+            return jsonify(state.sensors(parse_bbox(bbox) if bbox else None))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route("/heatmap")
+    def get_heatmap() -> Response:
+        """Cached interpolated AQI tiles (``bbox``, ``method=idw|kriging``)."""
+        bbox = request.args.get("bbox")
+        try:
+            tiles = state.heatmap(
+                parse_bbox(bbox) if bbox else None, request.args.get("method", "idw")
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"tiles": tiles})
+
+
+def _register_alert_routes(app: Flask, state: Any) -> None:
+    """Active alerts and their lifecycle change feed."""
+
+    @app.route("/alerts")
+    def get_alerts() -> Response:
+        """Active alerts (most severe first), optionally filtered by district or sensor."""
         return jsonify(
-            [
-                {"id": "IN-MH", "name": "Maharashtra", "aqi": round(base * 1.1, 2)},
-                {"id": "IN-DL", "name": "Delhi", "aqi": round(base * 1.8, 2)},
-                {"id": "IN-KA", "name": "Karnataka", "aqi": round(base * 0.8, 2)},
-                {"id": "IN-KL", "name": "Kerala", "aqi": round(base * 0.5, 2)},
-            ]
+            {
+                "sequence": state.alerts.sequence,
+                "active": state.alerts.active(
+                    request.args.get("limit", type=int),
+                    request.args.get("district"),
+                    request.args.get("sensor_id"),
+                ),
+            }
+        )
+
+    @app.route("/alerts/changes")
+    def get_alert_changes() -> Response:
+        """Alert lifecycle events after sequence ``since`` (open/escalate/resolve ...)."""
+        sequence, events = state.alerts.changes(request.args.get("since", 0, type=int))
+        return jsonify({"sequence": sequence, "events": events})
+
+
+def _register_ops_routes(app: Flask, publisher: DeltaPublisher) -> None:
+    """Live SSE deltas, Prometheus metrics and sampled traces."""
+
+    @app.route("/stream")
+    def stream() -> Response:
+        """Server-Sent Events: a snapshot, then only new records and changed views."""
+        return Response(publisher.stream(), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+    @app.route("/metrics")
+    def metrics() -> Response:
+        """Prometheus scrape endpoint for the engine process."""
+        return metrics_response()
+
+    @app.route("/traces")
+    def traces() -> Response:
+        """Most recent sampled stage traces (enable with TRACE_SAMPLE_RATE)."""
+        return jsonify(TRACER.recent(request.args.get("limit", 50, type=int)))
+
+
+def create_shim_app(state: Any) -> Flask:
+    """
+    Builds the engine's HTTP surface over a state backend.
+
+    Args:
+        state (Any): A ``SensorStateStore`` (single consumer thread) or a
+            ``SharedFeedView`` (worker pool); both expose ``latest``, ``snapshot``,
+            ``changes``, ``latest_value``, ``history_for``, ``find_history``, ``forecast``,
+            ``region_summary``, ``sensors``, ``heatmap`` and an ``alerts`` lifecycle
+            store.
+
+    Returns:
+        Flask: The engine application (not yet running).
+    """
+    app = Flask("Pathway_Shim")
+    publisher = DeltaPublisher(
+        state, views={"districts": district_comparison, "national": national_metrics}
+    )
+    register_state_metrics(state)
+
+    @app.route("/")
+    def status() -> str:
+        return "EcoPulse AI Analytics Engine: Active"
+
+    _register_telemetry_routes(app, state)
+    _register_simulation_routes(app, state)
+    _register_spatial_routes(app, state)
+    _register_alert_routes(app, state)
+    _register_ops_routes(app, publisher)
+    return app
+
+
+def run_shim_pipeline(workers: int = STREAM_WORKERS) -> None:
+    """
+    Initializes and starts the Flask-based Windows Shim for the Pathway engine.
+
+    Args:
+        workers (int): Number of consumer processes. ``1`` keeps the single in-process
+            consumer thread; more starts a partition-aware worker pool whose shards
+            are merged through shared memory.
+    """
+    pool = None
+    consumer = None
+    stop = threading.Event()
+    if workers > 1:
+        from ecopulse_ai.streaming.worker_pool import ConsumerPool
+
+        pool = ConsumerPool(workers)
+        pool.start()
+        state: Any = pool.view()
+    else:
+        state = SensorStateStore()
+        if ALERT_KAFKA_ENABLED:
+            state.alerts.subscribe(KafkaAlertSink())
+        archive = None
+        if TIMESERIES_ENABLED:
+            from ecopulse_ai.storage.timeseries import TimeSeriesStore
+
+            archive = TimeSeriesStore()
+        consumer = threading.Thread(
+            target=kafka_consumer_worker, args=(state, archive, stop), daemon=True
         )
+        consumer.start()
 
-    threading.Thread(target=kafka_consumer_worker, daemon=True).start()
-    app.run(host=STREAM_HOST, port=STREAM_PORT, debug=False, use_reloader=False)
+    app = create_shim_app(state)
+    try:
+        app.run(host=STREAM_HOST, port=STREAM_PORT, debug=False, use_reloader=False)
+    finally:
+        if pool is not None:
+            pool.stop()
+        if consumer is not None:
+            # Let the consumer finish its batch and flush the archive buffer
+            stop.set()
+            consumer.join(timeout=CONSUMER_BATCH_TIMEOUT + 10)
 
 
 if __name__ == "__main__":
-    run_shim_pipeline()
+    if STREAM_ENGINE == "pathway":
+        from ecopulse_ai.streaming.pathway_graph import run_pathway_pipeline
+
+        run_pathway_pipeline()
+    else:
+        run_shim_pipeline()
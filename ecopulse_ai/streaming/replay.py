@@ -0,0 +1,271 @@
+"""
+EcoPulse AI Capture Replay.
+Streams recorded JSONL telemetry (e.g. ``data/sensor_stream.jsonl``) through the
+analytics pipeline without Kafka, either as fast as possible (backfills, load tests)
+or time-scaled to the capture's own event clock. Files are scanned through a
+memory map in large chunks and each micro-batch is decoded with one parser call.
+"""
+
+import argparse
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ecopulse_ai.config import (
+    REPLAY_BATCH_SIZE,
+    REPLAY_CHUNK_BYTES,
+    REPLAY_FILE,
+    REPLAY_SPEED,
+    STREAM_HOST,
+    STREAM_PORT,
+    TIMESERIES_ENABLED,
+)
+from ecopulse_ai.storage.epoch import parse_timestamps
+from ecopulse_ai.streaming.vectorized import decode_batch
+
+# Configure module-level logging
+logger = logging.getLogger("Stream-Replay")
+
+# Legacy capture field names -> names expected by calculate_analytics
+FIELD_ALIASES: Dict[str, str] = {
+    "temp": "temperature",
+    "industrial_emission": "industrial_index",
+}
+
+BatchHandler = Callable[[List[Dict[str, Any]], int], None]
+
+
+def normalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Renames legacy capture fields in place. A canonical field already present on the
+    record wins over its alias.
+    """
+    for record in records:
+        for alias, field in FIELD_ALIASES.items():
+            if alias in record:
+                value = record.pop(alias)
+                record.setdefault(field, value)
+    return records
+
+
+def scan_lines(
+    path: str, batch_size: int = REPLAY_BATCH_SIZE, chunk_bytes: int = REPLAY_CHUNK_BYTES
+) -> Iterator[List[bytes]]:
+    """
+    Yields the non-blank lines of a file in lists of ``batch_size``.
+
+    The file is memory-mapped and cut into newline-aligned chunks of roughly
+    ``chunk_bytes``, so splitting runs in C over large blocks rather than per line.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pending: List[bytes] = []
+            pos = 0
+            while pos < size:
+                end = size
+                if pos + chunk_bytes < size:
+                    end = mm.rfind(b"\n", pos, pos + chunk_bytes) + 1
+                    if end <= pos:  # one line longer than a chunk
+                        nl = mm.find(b"\n", pos + chunk_bytes)
+                        end = size if nl < 0 else nl + 1
+                pending.extend(line for line in mm[pos:end].split(b"\n") if line.strip())
+                pos = end
+                while len(pending) >= batch_size:
+                    yield pending[:batch_size]
+                    del pending[:batch_size]
+            if pending:
+                yield pending
+
+
+def event_times(records: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Epoch seconds of each record's timestamp, made non-decreasing so out-of-order
+    captures never schedule a record in the past.
+    """
+    times = parse_timestamps([r.get("timestamp") for r in records])
+    return np.maximum.accumulate(times) if len(times) else times
+
+
+class ReplayStats:
+    """Counters of one replay run."""
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.batches = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Records processed per wall-clock second."""
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "batches": self.batches,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "records_per_second": round(self.rate, 1),
+        }
+
+
+def replay(
+    path: str,
+    handle_batch: BatchHandler,
+    speed: float = REPLAY_SPEED,
+    batch_size: int = REPLAY_BATCH_SIZE,
+    limit: Optional[int] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> ReplayStats:
+    """
+    Replays a JSONL capture into ``handle_batch``.
+
+    Each handed-over batch is contiguous in event time and never spans an hour
+    boundary, so the peak-hour thresholds use the hour the data was recorded in
+    rather than the hour of the replay.
+
+    Args:
+        path (str): JSONL file, one telemetry object per line.
+        handle_batch (BatchHandler): Receives ``(normalized records, event hour)``.
+        speed (float): ``0`` for as fast as possible; otherwise the event-time
+            speed-up (``1`` is real time, ``60`` plays a minute per second).
+        batch_size (int): Lines decoded per parser call.
+        limit (Optional[int]): Stop after this many records.
+
+    Returns:
+        ReplayStats: Record and batch counts and the achieved rate.
+    """
+    stats = ReplayStats()
+    stats.started = clock()
+    origin: Optional[tuple] = None
+
+    def emit(records: List[Dict[str, Any]], times: np.ndarray) -> None:
+        hours = (times // 3600 % 24).astype(np.int64)
+        cuts = [0, *(np.flatnonzero(np.diff(hours)) + 1).tolist(), len(records)]
+        for start, stop in zip(cuts, cuts[1:]):
+            handle_batch(records[start:stop], int(hours[start]))
+            stats.batches += 1
+        stats.records += len(records)
+
+    for lines in scan_lines(path, batch_size):
+        if limit is not None:
+            lines = lines[: max(0, limit - stats.records)]
+            if not lines:
+                break
+        records = normalize_records(decode_batch(lines))
+        if not records:
+            continue
+        times = event_times(records)
+
+        if speed <= 0:
+            emit(records, times)
+            continue
+
+        if origin is None:
+            origin = (times[0], clock())
+        due = origin[1] + (times - origin[0]) / speed
+        start = 0
+        while start < len(records):
+            now = clock()
+            stop = int(np.searchsorted(due, now, side="right"))
+            if stop <= start:
+                sleep(float(due[start] - now))
+                continue
+            emit(records[start:stop], times[start:stop])
+            start = stop
+
+    stats.elapsed = clock() - stats.started
+    logger.info(f"Replay of {path} finished: {stats.to_dict()}")
+    return stats
+
+
+def analytics_sink(state: Any, archive: Optional[Any] = None) -> BatchHandler:
+    """
+    Batch handler running the vectorized analytics into a state store (and archive),
+    the same path taken by Kafka micro-batches.
+    """
+    from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics_batch
+
+    def handle_batch(records: List[Dict[str, Any]], hour: int) -> None:
+        enriched = calculate_analytics_batch(records, state=state, hour=hour)
+        state.append_batch(enriched, hour=hour)
+        if archive is not None:
+            archive.append_batch(enriched)
+
+    return handle_batch
+
+
+def run_replay(
+    path: str = REPLAY_FILE,
+    speed: float = REPLAY_SPEED,
+    batch_size: int = REPLAY_BATCH_SIZE,
+    limit: Optional[int] = None,
+    serve: bool = False,
+    archive: bool = TIMESERIES_ENABLED,
+) -> ReplayStats:
+    """
+    Replays a capture into a fresh state store, optionally serving the engine's HTTP
+    API over it (so dashboards and load tests run against replayed data).
+    """
+    from ecopulse_ai.streaming.state_store import SensorStateStore
+
+    state = SensorStateStore()
+    store = None
+    if archive:
+        from ecopulse_ai.storage.timeseries import TimeSeriesStore
+
+        store = TimeSeriesStore(writer_id="replay")
+
+    if serve:
+        from ecopulse_ai.streaming.pathway_pipeline import create_shim_app
+
+        app = create_shim_app(state)
+        threading.Thread(
+            target=app.run,
+            kwargs={"host": STREAM_HOST, "port": STREAM_PORT, "use_reloader": False},
+            daemon=True,
+        ).start()
+
+    logger.info(f"Replaying {path} (speed={'max' if speed <= 0 else speed})...")
+    try:
+        stats = replay(path, analytics_sink(state, store), speed, batch_size, limit)
+    finally:
+        if store is not None:
+            store.close()
+    if serve:
+        logger.info("Replay complete; engine API stays up until interrupted.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    return stats
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Replay a JSONL telemetry capture.")
+    parser.add_argument("path", nargs="?", default=REPLAY_FILE)
+    parser.add_argument("--speed", type=float, default=REPLAY_SPEED)
+    parser.add_argument("--batch-size", type=int, default=REPLAY_BATCH_SIZE)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--serve", action="store_true", help="serve the engine API")
+    parser.add_argument(
+        "--archive",
+        action=argparse.BooleanOptionalAction,
+        default=TIMESERIES_ENABLED,
+        help="write replayed records to the time-series archive (default: TIMESERIES_ENABLED)",
+    )
+    args = parser.parse_args()
+    run_replay(args.path, args.speed, args.batch_size, args.limit, args.serve, args.archive)
@@ -0,0 +1,425 @@
+"""
+EcoPulse AI Streaming State Store.
+Fixed-capacity, NumPy-backed ring buffers holding enriched telemetry per sensor and
+per district, plus a bounded city-wide feed served by the HTTP endpoints,
+incrementally maintained district/state aggregates and cached heatmap tiles.
+"""
+
+import logging
+import operator
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecopulse_ai.analytics.interpolation import HeatmapTiles
+from ecopulse_ai.analytics.prediction import StreamingForecaster
+from ecopulse_ai.analytics.rolling import RollingTable
+from ecopulse_ai.analytics.rules import RULES, local_hour
+from ecopulse_ai.analytics.spatial import BBox, SpatialAggregator, record_position
+from ecopulse_ai.config import (
+    DEFAULT_DISTRICT,
+    DEFAULT_SENSOR_ID,
+    STATE_FEED_RETENTION,
+    STATE_RETENTION,
+)
+from ecopulse_ai.storage.epoch import parse_timestamps
+from ecopulse_ai.streaming.alert_feed import AlertStore
+
+# Configure module-level logging
+logger = logging.getLogger("Streaming-State")
+
+# Numeric telemetry columns held in the NumPy matrix. Everything else on a record
+# (timestamp, severity, attribution, ...) lives in a parallel object column.
+METRIC_FIELDS: Tuple[str, ...] = (
+    "aqi",
+    "pm25",
+    "co2",
+    "temperature",
+    "humidity",
+    "wind_speed",
+    "traffic_density",
+    "industrial_index",
+    "aqi_momentum",
+    "volatility",
+    "heat_pollution_index",
+    "dispersion_factor",
+    "health_score",
+)
+
+SensorKey = Tuple[str, str]
+
+
+def sensor_key(record: Dict[str, Any]) -> SensorKey:
+    """
+    Resolves the (district, sensor_id) partition key of a telemetry record.
+    """
+    return (
+        str(record.get("district", DEFAULT_DISTRICT)),
+        str(record.get("sensor_id", DEFAULT_SENSOR_ID)),
+    )
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def pack_records(
+    records: Sequence[Dict[str, Any]], fields: Sequence[str] = METRIC_FIELDS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Splits records into a float64 ``(n, len(fields))`` matrix (NaN for absent or
+    non-numeric values) and an object array of the remaining non-metric fields.
+    """
+    extras = np.empty(len(records), dtype=object)
+    try:
+        # Enriched batches carry every metric: one itemgetter call and a copy per record
+        get = operator.itemgetter(*fields)
+        values = [get(record) for record in records]
+        for i, record in enumerate(records):
+            extra = extras[i] = record.copy()
+            for name in fields:
+                del extra[name]
+    except KeyError:
+        field_set = set(fields)
+        values = [[record.get(name, np.nan) for name in fields] for record in records]
+        for i, record in enumerate(records):
+            extras[i] = {k: v for k, v in record.items() if k not in field_set}
+    try:
+        rows = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        rows = np.array(
+            [[_to_float(record.get(name)) for name in fields] for record in records],
+            dtype=np.float64,
+        )
+    return rows.reshape(len(records), len(fields)), extras
+
+
+class RingBuffer:
+    """
+    Fixed-capacity telemetry buffer with O(1) append and zero-copy windowed reads.
+
+    Every row is written twice (at ``slot`` and ``slot + capacity``) so the most recent
+    ``n`` rows always form one contiguous block, and ``window`` can return a plain
+    NumPy view instead of stitching the wrapped halves together.
+    """
+
+    def __init__(self, capacity: int, fields: Sequence[str] = METRIC_FIELDS):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be a positive integer.")
+        self.capacity = capacity
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        self._values = np.full((2 * capacity, len(self.fields)), np.nan, dtype=np.float64)
+        self._extras = np.empty(2 * capacity, dtype=object)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        """Number of records ever appended (monotonic, survives wrap-around)."""
+        return self._count
+
+    def _bounds(self, n: Optional[int]) -> Tuple[int, int]:
+        size = len(self)
+        n = size if n is None else max(0, min(int(n), size))
+        end = self._count % self.capacity + self.capacity
+        return end - n, end
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Appends a record, overwriting the oldest entry once the buffer is full.
+        """
+        rows, extras = pack_records([record], self.fields)
+        slot = self._count % self.capacity
+        self._values[slot] = rows[0]
+        self._values[slot + self.capacity] = rows[0]
+        self._extras[slot] = extras[0]
+        self._extras[slot + self.capacity] = extras[0]
+        self._count += 1
+
+    def extend(self, rows: np.ndarray, extras: np.ndarray) -> None:
+        """
+        Appends a block of pre-packed rows (see ``pack_records``) using slice copies
+        (at most two per half of the buffer). Only the trailing ``capacity`` rows are kept.
+        """
+        k = len(rows)
+        if k == 0:
+            return
+        if k > self.capacity:
+            self._count += k - self.capacity
+            rows, extras = rows[-self.capacity :], extras[-self.capacity :]
+            k = self.capacity
+
+        start = self._count % self.capacity
+        head = min(k, self.capacity - start)
+        for offset in (0, self.capacity):
+            self._values[offset + start : offset + start + head] = rows[:head]
+            self._extras[offset + start : offset + start + head] = extras[:head]
+            if head < k:
+                self._values[offset : offset + k - head] = rows[head:]
+                self._extras[offset : offset + k - head] = extras[head:]
+        self._count += k
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Returns a read-only view over the last ``n`` rows (oldest first).
+
+        Args:
+            n (Optional[int]): Window length; defaults to the full retained history.
+
+        Returns:
+            np.ndarray: A ``(n, len(fields))`` view into the underlying buffer.
+        """
+        start, end = self._bounds(n)
+        view = self._values[start:end]
+        view.flags.writeable = False
+        return view
+
+    def column(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Returns a zero-copy view of a single metric over the last ``n`` rows.
+        """
+        return self.window(n)[:, self._index[field]]
+
+    def last(self, field: str, default: float = 0.0) -> float:
+        """
+        Returns the most recent value of a metric, or ``default`` if the buffer is empty.
+        """
+        if not self._count:
+            return default
+        value = self._values[(self._count - 1) % self.capacity, self._index[field]]
+        return default if np.isnan(value) else float(value)
+
+    def records(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Materializes the last ``n`` rows as JSON-ready dictionaries (oldest first).
+        """
+        start, end = self._bounds(n)
+        values = self._values[start:end].tolist()
+        extras = self._extras[start:end]
+        output: List[Dict[str, Any]] = []
+        for row, extra in zip(values, extras):
+            record = dict(extra)
+            for name, value in zip(self.fields, row):
+                if value == value:  # skip NaN placeholders for absent fields
+                    record[name] = value
+            output.append(record)
+        return output
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Returns the most recent record, or None when the buffer is empty."""
+        records = self.records(1)
+        return records[0] if records else None
+
+
+class SensorStateStore:
+    """
+    Thread-safe registry of per-sensor ring buffers and a city-wide feed buffer.
+
+    The Kafka consumer thread appends enriched records while the HTTP handlers read
+    snapshots; a single lock keeps both buffers consistent for each write.
+    """
+
+    def __init__(
+        self, retention: int = STATE_RETENTION, feed_retention: int = STATE_FEED_RETENTION
+    ):
+        self.retention = retention
+        self.feed = RingBuffer(feed_retention)
+        self._sensors: Dict[SensorKey, RingBuffer] = {}
+        self.rolling = RollingTable()
+        self.alerts = AlertStore()
+        self.regions = SpatialAggregator()
+        self.tiles = HeatmapTiles(self._heatmap_points)
+        self._forecasters: Dict[SensorKey, StreamingForecaster] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sensors)
+
+    def __iter__(self) -> Iterator[Tuple[SensorKey, RingBuffer]]:
+        return iter(list(self._sensors.items()))
+
+    def history_for(self, record: Dict[str, Any]) -> RingBuffer:
+        """
+        Returns (creating on first sight) the ring buffer owning a record's sensor.
+        """
+        return self._buffer(sensor_key(record))
+
+    def find_history(self, record: Dict[str, Any]) -> Optional[RingBuffer]:
+        """
+        Returns the ring buffer of a record's sensor, or None if the sensor has never
+        reported (unlike ``history_for``, request-supplied keys allocate nothing).
+        """
+        return self._sensors.get(sensor_key(record))
+
+    def forecaster_for(self, record: Dict[str, Any]) -> StreamingForecaster:
+        """
+        Returns (creating on first sight) the incremental AQI forecaster of a record's sensor.
+        """
+        return self._forecaster(sensor_key(record))
+
+    def _buffer(self, key: SensorKey) -> RingBuffer:
+        buffer = self._sensors.get(key)
+        if buffer is None:
+            with self._lock:
+                buffer = self._sensors.setdefault(key, RingBuffer(self.retention))
+            logger.debug(f"Allocated state buffer for sensor {key[1]} in {key[0]}")
+        return buffer
+
+    def _forecaster(self, key: SensorKey) -> StreamingForecaster:
+        forecaster = self._forecasters.get(key)
+        if forecaster is None:
+            with self._lock:
+                forecaster = self._forecasters.setdefault(key, StreamingForecaster())
+        return forecaster
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Stores an enriched record in its sensor buffer, the city-wide feed and the
+        regional aggregates, advances the sensor's forecaster and dirties nearby heatmap
+        tiles.
+        """
+        buffer = self.history_for(record)
+        forecaster = self.forecaster_for(record)
+        with self._lock:
+            buffer.append(record)
+            self.feed.append(record)
+            touched = self.regions.update_records([record], [sensor_key(record)])
+            if record.get("aqi") is not None and not record.get("is_simulated"):
+                forecaster.push(float(record["aqi"]))
+        self.tiles.invalidate(touched)
+
+    def append_batch(
+        self,
+        records: List[Dict[str, Any]],
+        keys: Optional[List[SensorKey]] = None,
+        hour: Optional[int] = None,
+    ) -> None:
+        """
+        Stores a micro-batch of enriched records under a single lock acquisition (folding
+        each sensor's last reading into the regional aggregates), marks the heatmap tiles
+        around changed sensors dirty, then advances the per-sensor alert state machine
+        (publishing its lifecycle events).
+
+        Args:
+            records (List[Dict[str, Any]]): Enriched records in arrival order.
+            keys (Optional[List[SensorKey]]): Pre-computed ``sensor_key`` per record.
+            hour (Optional[int]): Hour for peak-time alert thresholds (defaults to now).
+        """
+        if not records:
+            return
+        rows, extras = pack_records(records)
+        keys = keys or [sensor_key(r) for r in records]
+        groups: Dict[SensorKey, List[int]] = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(key, []).append(i)
+        targets = [(self._buffer(key), self._forecaster(key), idx) for key, idx in groups.items()]
+        aqi = rows[:, METRIC_FIELDS.index("aqi")].tolist()
+
+        with self._lock:
+            for buffer, forecaster, idx in targets:
+                if len(idx) == 1:
+                    buffer.extend(rows[idx[0] : idx[0] + 1], extras[idx[0] : idx[0] + 1])
+                else:
+                    buffer.extend(rows[idx], extras[idx])
+                for i in idx:
+                    if aqi[i] == aqi[i] and not records[i].get("is_simulated"):
+                        forecaster.push(aqi[i])
+            tail = -self.feed.capacity
+            self.feed.extend(rows[tail:], extras[tail:])
+            last = [idx[-1] for idx in groups.values()]
+            touched = self.regions.update(
+                list(groups),
+                [aqi[i] for i in last],
+                [record_position(records[i]) for i in last],
+                [records[i].get("state") for i in last],
+            )
+        self.tiles.invalidate(touched)
+
+        metrics = {field: rows[:, METRIC_FIELDS.index(field)] for field in RULES.fields}
+        stamps = [extra.get("timestamp") for extra in extras]
+        times = parse_timestamps(stamps)
+        self.alerts.update(keys, metrics, times, local_hour() if hour is None else hour, stamps)
+
+    def snapshot(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns a consistent copy of the last ``n`` city-wide feed records.
+        """
+        with self._lock:
+            return self.feed.records(n)
+
+    def changes(self, since: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Returns the feed sequence number and the records appended after ``since``
+        (bounded by the feed retention), for delta push to subscribers.
+        """
+        with self._lock:
+            sequence = self.feed.total_appended
+            missed = sequence - since
+            return sequence, self.feed.records(missed) if missed > 0 else []
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Returns the most recent record across all sensors."""
+        with self._lock:
+            return self.feed.latest()
+
+    def latest_value(self, field: str, default: float = 0.0) -> float:
+        """Returns the most recent city-wide value of a metric."""
+        return self.feed.last(field, default)
+
+    def region_summary(self, level: str = "district") -> List[Dict[str, Any]]:
+        """Per-district (or per-state) aggregates of the sensors' latest AQI."""
+        with self._lock:
+            return self.regions.summary(level)
+
+    def sensors(self, bbox: Optional[BBox] = None) -> List[Dict[str, Any]]:
+        """Positioned sensors (inside ``bbox`` if given) with their latest AQI."""
+        with self._lock:
+            return self.regions.sensors(bbox)
+
+    def _heatmap_points(self) -> Tuple[int, np.ndarray, np.ndarray]:
+        with self._lock:
+            positions, values = self.regions.points()
+            return self.regions.layout_version, positions, values
+
+    def heatmap(self, bbox: Optional[BBox] = None, method: str = "idw") -> List[Dict[str, Any]]:
+        """
+        Interpolated AQI tiles over ``bbox`` (default: the extent of all sensors).
+
+        Raises:
+            ValueError: For an unknown method or a bbox spanning too many tiles.
+        """
+        if bbox is None:
+            with self._lock:
+                bbox = self.regions.extent()
+            if bbox is None:
+                return []
+        return self.tiles.tiles(bbox, method)
+
+    def occupancy(self) -> Dict[str, int]:
+        """Buffer fill levels exported as metrics (records ever appended, feed fill, sensors)."""
+        return {
+            "records_appended": self.feed.total_appended,
+            "feed_records": len(self.feed),
+            "feed_capacity": self.feed.capacity,
+            "sensors": len(self._sensors),
+            "active_alerts": len(self.alerts),
+        }
+
+    def forecast(
+        self, record: Dict[str, Any], n_steps: int = 5, method: str = "holt"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reads the incremental AQI forecast of a record's sensor (no refitting), or None
+        if the sensor has never reported.
+        """
+        forecaster = self._forecasters.get(sensor_key(record))
+        if forecaster is None:
+            return None
+        return {"next": forecaster.next_value(), "horizon": forecaster.horizon(n_steps, method)}
@@ -0,0 +1,541 @@
+"""
+EcoPulse AI Partition-Aware Consumer Pool.
+Scales the streaming engine across cores: each worker process owns a disjoint set of
+Kafka partitions (and therefore sensors, since the producer keys messages by sensor id),
+enriches its shard with the vectorized pipeline, and publishes its recent records to a
+shared-memory ring next to a table of each sensor's latest row. The HTTP process merges
+the rings without taking any locks, and falls back to the tables when a ring overran.
+"""
+
+import logging
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ecopulse_ai.analytics.interpolation import HeatmapTiles
+from ecopulse_ai.analytics.prediction import StreamingForecaster
+from ecopulse_ai.analytics.spatial import BBox, SpatialAggregator, record_position
+from ecopulse_ai.config import (
+    ALERT_KAFKA_ENABLED,
+    CONSUMER_BATCH_TIMEOUT,
+    KAFKA_BOOTSTRAP_SERVERS,
+    KAFKA_TOPIC,
+    STATE_FEED_RETENTION,
+    STATE_FEED_SENSORS,
+    STREAM_WORKER_ASSIGNMENT,
+    TIMESERIES_ENABLED,
+)
+from ecopulse_ai.streaming.alert_feed import AlertStore
+from ecopulse_ai.streaming.state_store import (
+    METRIC_FIELDS,
+    SensorKey,
+    SensorStateStore,
+    sensor_key,
+)
+from ecopulse_ai.streaming.vectorized import batch_attribution, batch_carbon_footprint
+
+# Configure module-level logging
+logger = logging.getLogger("Streaming-WorkerPool")
+
+# Fixed-layout record published by each shard. Attribution and carbon footprint are not
+# stored: they are pure functions of the raw columns and are recomputed on read.
+FEED_DTYPE = np.dtype(
+    [
+        ("ingest", "f8"),
+        ("timestamp", "S32"),
+        ("sensor_id", "S32"),
+        ("district", "S48"),
+        ("severity", "S10"),
+        ("state", "S16"),
+        ("lat", "f8"),  # NaN when the record carries no coordinates
+        ("lon", "f8"),
+    ]
+    + [(name, "f8") for name in METRIC_FIELDS]
+)
+# int64 seqlock version, write count and sensor count, padded to a cache line
+_HEADER_BYTES = 64
+_TEXT_FIELDS = ("timestamp", "sensor_id", "district", "severity", "state")
+
+
+def _encode(value: Any, width: int) -> bytes:
+    return str(value if value is not None else "").encode("utf-8")[:width]
+
+
+class SharedFeed:
+    """
+    Single-writer ring of ``FEED_DTYPE`` rows in a named shared-memory block, followed
+    by a table holding the latest row of up to ``sensors`` sensors.
+
+    Writers bump a version counter to an odd value before touching rows and back to
+    even afterwards (a seqlock); readers copy the ring and retry if the version moved,
+    so neither side ever blocks the other. The table lets a reader that fell more than
+    ``capacity`` rows behind still recover every sensor's current value.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        capacity: int,
+        owner: bool,
+        sensors: int = STATE_FEED_SENSORS,
+    ):
+        self.shm = shm
+        self.capacity = capacity
+        self.sensors = sensors
+        self.owner = owner
+        self._header = np.ndarray((3,), dtype=np.int64, buffer=shm.buf)
+        self._rows = np.ndarray((capacity,), dtype=FEED_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+        self._latest = np.ndarray(
+            (sensors,),
+            dtype=FEED_DTYPE,
+            buffer=shm.buf,
+            offset=_HEADER_BYTES + capacity * FEED_DTYPE.itemsize,
+        )
+        # Writer side: table slot of each (district, sensor_id) as stored in the rows
+        table = self._latest[: int(self._header[2])]
+        self._slots: Dict[Tuple[bytes, bytes], int] = {
+            key: slot for slot, key in enumerate(zip(table["district"], table["sensor_id"]))
+        }
+        self._table_full = False
+
+    @classmethod
+    def create(
+        cls, capacity: int = STATE_FEED_RETENTION, sensors: int = STATE_FEED_SENSORS
+    ) -> "SharedFeed":
+        size = _HEADER_BYTES + (capacity + sensors) * FEED_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray((3,), dtype=np.int64, buffer=shm.buf)[:] = 0
+        return cls(shm, capacity, owner=True, sensors=sensors)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int, sensors: int = STATE_FEED_SENSORS) -> "SharedFeed":
+        # Workers inherit the parent's resource tracker, so attaching does not hand
+        # ownership (unlinking) of the block to the worker process. A restarted worker
+        # picks up the sensor table its predecessor left behind.
+        return cls(shared_memory.SharedMemory(name=name), capacity, owner=False, sensors=sensors)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def count(self) -> int:
+        """Rows ever written by the shard (monotonic)."""
+        return int(self._header[1])
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Publishes enriched records (only the trailing ``capacity`` are kept).
+        """
+        records = records[-self.capacity :]
+        k = len(records)
+        if not k:
+            return
+        block = np.zeros(k, dtype=FEED_DTYPE)
+        block["ingest"] = time.time()
+        for field in _TEXT_FIELDS:
+            width = FEED_DTYPE[field].itemsize
+            block[field] = [_encode(r.get(field), width) for r in records]
+        positions = [record_position(r) or (np.nan, np.nan) for r in records]
+        block["lat"], block["lon"] = zip(*positions)
+        for name in METRIC_FIELDS:
+            block[name] = [r.get(name, np.nan) for r in records]
+        table_slots, latest = self._table_slots(block)
+
+        count = int(self._header[1])
+        slots = (count + np.arange(k)) % self.capacity
+        self._header[0] += 1  # odd: write in progress
+        self._rows[slots] = block
+        self._latest[table_slots] = block[latest]
+        self._header[1] = count + k
+        self._header[2] = len(self._slots)
+        self._header[0] += 1  # even: consistent
+
+    def _table_slots(self, block: np.ndarray) -> Tuple[List[int], List[int]]:
+        """Table slots and block rows of the last row of each sensor in ``block``."""
+        last: Dict[Tuple[bytes, bytes], int] = {}
+        for i, key in enumerate(zip(block["district"].tolist(), block["sensor_id"].tolist())):
+            last[key] = i
+        slots, rows = [], []
+        for key, i in last.items():
+            slot = self._slots.get(key)
+            if slot is None:
+                if len(self._slots) >= self.sensors:
+                    if not self._table_full:
+                        logger.warning(
+                            f"Shared feed sensor table is full ({self.sensors}); raise "
+                            "STATE_FEED_SENSORS or lagging readers may miss new sensors."
+                        )
+                        self._table_full = True
+                    continue
+                slot = self._slots[key] = len(self._slots)
+            slots.append(slot)
+            rows.append(i)
+        return slots, rows
+
+    def _copy(self, *arrays: np.ndarray, retries: int = 100) -> Tuple[np.ndarray, ...]:
+        """Consistent copies of the header and ``arrays`` (seqlock read)."""
+        for _ in range(retries):
+            version = int(self._header[0])
+            copies = (self._header.copy(), *(array.copy() for array in arrays))
+            if not version & 1 and int(self._header[0]) == version:
+                break
+        else:
+            logger.warning("Shared feed read raced the writer repeatedly; serving last copy.")
+        return copies
+
+    @staticmethod
+    def _last(rows: np.ndarray, count: int, n: Optional[int] = None) -> np.ndarray:
+        size = min(count, len(rows))
+        size = size if n is None else min(size, n)
+        return rows[(count - size + np.arange(size)) % len(rows)]
+
+    def read(self, n: Optional[int] = None, retries: int = 100) -> np.ndarray:
+        """
+        Returns a consistent copy of the last ``n`` rows (oldest first).
+        """
+        header, rows = self._copy(self._rows, retries=retries)
+        return self._last(rows, int(header[1]), n)
+
+    def read_since(self, seen: int) -> Tuple[int, np.ndarray, Optional[np.ndarray]]:
+        """
+        Rows written after the first ``seen``, as of one consistent read.
+
+        Returns:
+            Tuple[int, np.ndarray, Optional[np.ndarray]]: The new write count, the
+            retained new rows (oldest first) and, when some new rows were already
+            overwritten, the latest row of every sensor in the table (else None).
+        """
+        header, rows, table = self._copy(self._rows, self._latest)
+        count = int(header[1])
+        missed = count - seen
+        if missed <= 0:
+            return count, rows[:0], None
+        overran = missed > self.capacity
+        return count, self._last(rows, count, missed), table[: header[2]] if overran else None
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def rows_to_records(rows: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Rebuilds JSON-ready enriched records from shared feed rows.
+    """
+    if not len(rows):
+        return []
+    columns = {name: rows[name] for name in METRIC_FIELDS}
+    attribution = {k: v.tolist() for k, v in batch_attribution(columns).items()}
+    carbon = {k: v.tolist() for k, v in batch_carbon_footprint(columns).items()}
+    text = {field: [v.decode("utf-8") for v in rows[field].tolist()] for field in _TEXT_FIELDS}
+    metrics = {name: rows[name].tolist() for name in METRIC_FIELDS}
+    lats, lons = rows["lat"].tolist(), rows["lon"].tolist()
+
+    records: List[Dict[str, Any]] = []
+    for i in range(len(rows)):
+        record: Dict[str, Any] = {f: text[f][i] for f in _TEXT_FIELDS if text[f][i]}
+        if lats[i] == lats[i]:
+            record["lat"], record["lon"] = lats[i], lons[i]
+        for name in METRIC_FIELDS:
+            value = metrics[name][i]
+            if value == value:
+                record[name] = value
+        record["attribution"] = {k: v[i] for k, v in attribution.items()}
+        record["carbon_footprint"] = {k: v[i] for k, v in carbon.items()}
+        records.append(record)
+    return records
+
+
+def _worker_main(
+    index: int, workers: int, shm_name: str, capacity: int, assignment: str, stop: Any
+) -> None:
+    """
+    Worker-process entry point: consume an exclusive partition share and publish it
+    until the pool's ``stop`` event is set, then flush the archive and detach.
+    """
+    from confluent_kafka import Consumer, TopicPartition
+
+    from ecopulse_ai.streaming.pathway_pipeline import (
+        calculate_analytics_batch,
+        consume_micro_batches,
+    )
+
+    feed = SharedFeed.attach(shm_name, capacity)
+    state = SensorStateStore(feed_retention=capacity)
+    if ALERT_KAFKA_ENABLED:
+        from ecopulse_ai.kafka.alerts import KafkaAlertSink
+
+        # The parent serves alerts from its mirror of the alert topic
+        state.alerts.subscribe(KafkaAlertSink())
+    archive = None
+    if TIMESERIES_ENABLED:
+        from ecopulse_ai.storage.timeseries import TimeSeriesStore
+
+        # One writer id per worker: each process appends only to its own files
+        archive = TimeSeriesStore(writer_id=f"w{index}")
+    conf = {
+        "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
+        "group.id": "pathway-shim-group",
+        "auto.offset.reset": "latest",
+    }
+    try:
+        consumer = Consumer(conf)
+        if assignment == "partition":
+            metadata = consumer.list_topics(KAFKA_TOPIC, timeout=10)
+            partitions = sorted(metadata.topics[KAFKA_TOPIC].partitions)
+            owned = [p for p in partitions if p % workers == index]
+            consumer.assign([TopicPartition(KAFKA_TOPIC, p) for p in owned])
+            logger.info(f"Worker {index} pinned to partitions {owned}")
+        else:
+            consumer.subscribe([KAFKA_TOPIC])
+            logger.info(f"Worker {index} joined consumer group for {KAFKA_TOPIC}")
+    except Exception as e:
+        logger.critical(f"Worker {index} failed to initialize Kafka Consumer: {e}")
+        feed.close()
+        if archive is not None:
+            archive.close()
+        return
+
+    def handle_batch(records: List[Dict[str, Any]], columns: Any = None) -> None:
+        enriched = calculate_analytics_batch(records, state=state, columns=columns)
+        state.append_batch(enriched)
+        feed.write(enriched)
+        if archive is not None:
+            archive.append_batch(enriched)
+
+    try:
+        consume_micro_batches(consumer, handle_batch, stop)
+    finally:
+        consumer.close()
+        feed.close()
+        if archive is not None:
+            archive.close()
+
+
+class SharedFeedView:
+    """
+    Lock-free, read-only merge of every shard's shared feed for the HTTP layer.
+    Mirrors the read API of ``SensorStateStore`` used by the engine endpoints; alerts
+    come from an ``AlertStore`` mirroring the workers' alert topic, and the regional
+    aggregates and per-sensor forecasters catch up on the merged feed whenever they are
+    read (each record is folded in once, so reads never refit).
+    """
+
+    def __init__(self, feeds: List[SharedFeed], alerts: Optional[AlertStore] = None):
+        self.feeds = feeds
+        self.alerts = alerts if alerts is not None else AlertStore()
+        self.regions = SpatialAggregator()
+        self.tiles = HeatmapTiles(self._heatmap_points)
+        self._forecasters: Dict[SensorKey, StreamingForecaster] = {}
+        self._seen = [0] * len(feeds)
+        self._region_lock = threading.Lock()
+
+    def _rows(self, n: Optional[int] = None) -> np.ndarray:
+        parts = [feed.read(n) for feed in self.feeds]
+        rows = np.concatenate(parts) if parts else np.zeros(0, dtype=FEED_DTYPE)
+        rows = rows[np.argsort(rows["ingest"], kind="stable")]
+        return rows if n is None else rows[-n:]
+
+    def snapshot(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        return rows_to_records(self._rows(n))
+
+    def changes(self, since: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Merged records published after sequence ``since`` (sum of shard write counts)."""
+        sequence = sum(feed.count for feed in self.feeds)
+        missed = sequence - since
+        return sequence, self.snapshot(missed) if missed > 0 else []
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        records = self.snapshot(1)
+        return records[0] if records else None
+
+    def latest_value(self, field: str, default: float = 0.0) -> float:
+        rows = self._rows(1)
+        if not len(rows) or np.isnan(rows[field][-1]):
+            return default
+        return float(rows[field][-1])
+
+    def _catch_up_regions(self) -> None:
+        """
+        Folds records published since the last read into the regional aggregates and
+        the per-sensor forecasters.
+
+        A shard whose ring overran since the last read is resynced: its sensors'
+        forecasters restart from the rows still retained, and the aggregates take
+        every sensor's latest row from the shard's table, so no sensor is left stale.
+        """
+        parts, tables = [], []
+        for i, feed in enumerate(self.feeds):
+            count, rows, table = feed.read_since(self._seen[i])
+            if table is not None:
+                logger.warning(
+                    f"Shared feed {i} overran by {count - self._seen[i] - feed.capacity} "
+                    "records between reads; resyncing from its sensor table."
+                )
+                tables.append(table)
+            self._seen[i] = count
+            parts.append(rows)
+
+        latest = rows_to_records(np.concatenate(tables)) if tables else []
+        latest_keys = [sensor_key(r) for r in latest]
+        for key in latest_keys:
+            self._forecasters.pop(key, None)
+
+        rows = np.concatenate(parts) if parts else np.zeros(0, dtype=FEED_DTYPE)
+        records = rows_to_records(rows[np.argsort(rows["ingest"], kind="stable")])
+        if records:
+            keys = [sensor_key(r) for r in records]
+            touched = self.regions.update_records(records, keys)
+            self.tiles.invalidate(touched)
+            for key, record in zip(keys, records):
+                aqi = record.get("aqi")
+                if aqi is not None and aqi == aqi:
+                    forecaster = self._forecasters.get(key)
+                    if forecaster is None:
+                        forecaster = self._forecasters[key] = StreamingForecaster()
+                    forecaster.push(float(aqi))
+        if latest:
+            self.tiles.invalidate(self.regions.update_records(latest, latest_keys))
+
+    def region_summary(self, level: str = "district") -> List[Dict[str, Any]]:
+        with self._region_lock:
+            self._catch_up_regions()
+            return self.regions.summary(level)
+
+    def sensors(self, bbox: Optional[BBox] = None) -> List[Dict[str, Any]]:
+        with self._region_lock:
+            self._catch_up_regions()
+            return self.regions.sensors(bbox)
+
+    def _heatmap_points(self) -> Tuple[int, np.ndarray, np.ndarray]:
+        with self._region_lock:
+            positions, values = self.regions.points()
+            return self.regions.layout_version, positions, values
+
+    def heatmap(self, bbox: Optional[BBox] = None, method: str = "idw") -> List[Dict[str, Any]]:
+        with self._region_lock:
+            self._catch_up_regions()
+            bbox = bbox or self.regions.extent()
+        return self.tiles.tiles(bbox, method) if bbox is not None else []
+
+    def occupancy(self) -> Dict[str, int]:
+        """Fill levels summed over the shards (per-sensor buffers live in the workers)."""
+        return {
+            "records_appended": sum(feed.count for feed in self.feeds),
+            "feed_records": sum(min(feed.count, feed.capacity) for feed in self.feeds),
+            "feed_capacity": sum(feed.capacity for feed in self.feeds),
+            "active_alerts": len(self.alerts),
+        }
+
+    def history_for(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Merged feed records belonging to the record's sensor (oldest first)."""
+        key = sensor_key(record)
+        return [r for r in self.snapshot() if sensor_key(r) == key]
+
+    def find_history(self, record: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """``history_for``, or None if the merged feed holds no record of the sensor."""
+        return self.history_for(record) or None
+
+    def forecast(
+        self, record: Dict[str, Any], n_steps: int = 5, method: str = "holt"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Incremental AQI forecast of the record's sensor, or None if the merged feed has
+        never carried the sensor.
+        """
+        with self._region_lock:
+            self._catch_up_regions()
+            forecaster = self._forecasters.get(sensor_key(record))
+            if forecaster is None:
+                return None
+            return {"next": forecaster.next_value(), "horizon": forecaster.horizon(n_steps, method)}
+
+
+class ConsumerPool:
+    """
+    Supervises ``workers`` consumer processes and owns their shared-memory feeds.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        capacity: int = STATE_FEED_RETENTION,
+        assignment: str = STREAM_WORKER_ASSIGNMENT,
+    ):
+        self.workers = workers
+        self.capacity = capacity
+        self.assignment = assignment
+        self.feeds: List[SharedFeed] = []
+        self.processes: List[mp.Process] = []
+        self.alerts = AlertStore()
+        # Shared with the workers: set on stop so they drain and close their archives
+        self._stopping = mp.Event()
+
+    def _spawn(self, index: int) -> mp.Process:
+        process = mp.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self.workers,
+                self.feeds[index].name,
+                self.capacity,
+                self.assignment,
+                self._stopping,
+            ),
+            name=f"ecopulse-consumer-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def start(self) -> None:
+        logger.info(f"Starting {self.workers} consumer workers ({self.assignment} assignment)")
+        self.feeds = [SharedFeed.create(self.capacity) for _ in range(self.workers)]
+        self.processes = [self._spawn(i) for i in range(self.workers)]
+        threading.Thread(target=self._supervise, daemon=True).start()
+        if ALERT_KAFKA_ENABLED:
+            from ecopulse_ai.kafka.alerts import start_alert_mirror
+
+            start_alert_mirror(self.alerts)
+        else:
+            logger.warning("ALERT_KAFKA_ENABLED=0: worker alerts are not mirrored to the API.")
+
+    def _supervise(self, interval: float = 5.0) -> None:
+        while not self._stopping.wait(interval):
+            self.ensure_alive()
+
+    def ensure_alive(self) -> None:
+        """Restarts any worker that has exited (its shard state is rebuilt from Kafka)."""
+        for i, process in enumerate(self.processes):
+            if self._stopping.is_set():
+                return
+            if not process.is_alive():
+                logger.error(f"Consumer worker {i} exited ({process.exitcode}); restarting.")
+                self.processes[i] = self._spawn(i)
+
+    def view(self) -> SharedFeedView:
+        return SharedFeedView(self.feeds, self.alerts)
+
+    def stop(self, timeout: float = CONSUMER_BATCH_TIMEOUT + 10) -> None:
+        """
+        Signals the workers to finish their current batch and flush their archives,
+        terminating only those still running after ``timeout`` seconds.
+        """
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+        for i, process in enumerate(self.processes):
+            if process.is_alive():
+                logger.warning(f"Consumer worker {i} did not stop in time; terminating.")
+                process.terminate()
+                process.join(timeout=5)
+        for feed in self.feeds:
+            feed.close()
+        logger.info("Consumer pool stopped.")
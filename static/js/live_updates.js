@@ -5,11 +5,26 @@
 
 let trendChart = null;
 
+// Live state mirrored from the server-push channel (see startLiveUpdates)
+const LIVE_HISTORY = 50;
+const LIVE_EVENTS = ['snapshot', 'records', 'alerts', 'alert_events', 'districts', 'national'];
+const liveHandlers = {};
+let liveSequence = 0;
+let liveHistory = [];
+let liveAlerts = [];
+let renderPending = false;
+
 async function updateDashboard() {
     try {
         const response = await fetch('/api/metrics');
-        const rootData = await response.json();
+        renderDashboard(await response.json());
+    } catch (error) {
+        console.error("Pulse sync failure:", error);
+    }
+}
 
+function renderDashboard(rootData) {
+    try {
         if (rootData.latest) {
             const latest = rootData.latest;
             const history = rootData.history || [];
@@ -85,7 +100,7 @@ async function updateDashboard() {
             updateIncidentLog(rootData.alerts);
         }
     } catch (error) {
-        console.error("Pulse sync failure:", error);
+        console.error("Pulse render failure:", error);
     }
 }
 
@@ -95,7 +110,8 @@ function updateIncidentLog(alerts) {
 
     // Check if alert already displayed (simple deduplication)
     alerts.forEach(alert => {
-        const id = `alert-${alert.type}-${alert.level}`;
+        // Engine alerts carry a lifecycle id: one row per alert and level reached
+        const id = alert.id ? `alert-${alert.id}-${alert.level}` : `alert-${alert.type}-${alert.level}`;
         if (document.getElementById(id)) return;
 
         const row = document.createElement('tr');
@@ -103,7 +119,7 @@ function updateIncidentLog(alerts) {
         row.className = "border-b border-slate-50 bg-red-50/50 animate-pulse";
         row.innerHTML = `
             <td class="py-6 text-slate-600 font-medium">${new Date().toLocaleTimeString()}</td>
-            <td class="py-6 font-bold">${alert.type} Surge</td>
+            <td class="py-6 font-bold">${alert.type} Surge${alert.sensor_id ? ` · ${alert.sensor_id}` : ''}</td>
             <td class="py-6"><span class="px-3 py-1 bg-red-100 text-red-600 rounded-full text-[10px] font-bold uppercase">${alert.level}</span></td>
             <td class="py-6 text-slate-500">Value: ${alert.value}</td>
             <td class="py-6 text-red-500 font-bold">LIVE ALERT</td>
@@ -191,6 +207,121 @@ function updateTrendChart(history) {
     }
 }
 
-// Start polling
-setInterval(updateDashboard, 2000);
-document.addEventListener('DOMContentLoaded', updateDashboard);
+/**
+ * Server-push channel: the web tier relays engine deltas over Server-Sent Events.
+ * Pages register handlers with onLiveEvent(); browsers without EventSource fall back
+ * to polling through subscribeOrPoll().
+ */
+function onLiveEvent(name, handler) {
+    (liveHandlers[name] = liveHandlers[name] || []).push(handler);
+}
+
+function subscribeOrPoll(name, handler, poll, intervalMs) {
+    if (window.EventSource) {
+        onLiveEvent(name, handler);
+    } else {
+        setInterval(poll, intervalMs);
+    }
+}
+
+function scheduleRender() {
+    // Coalesce bursts of deltas into one render per animation frame
+    if (renderPending) return;
+    renderPending = true;
+    requestAnimationFrame(() => {
+        renderPending = false;
+        renderDashboard({
+            latest: liveHistory[liveHistory.length - 1],
+            history: liveHistory,
+            alerts: liveAlerts
+        });
+    });
+}
+
+onLiveEvent('snapshot', snapshot => {
+    liveSequence = snapshot.sequence || 0;
+    liveHistory = snapshot.history || [];
+    liveAlerts = snapshot.alerts || [];
+    scheduleRender();
+});
+
+onLiveEvent('records', delta => {
+    // Deltas may overlap the snapshot taken at subscribe time; keep only unseen records
+    const fresh = delta.sequence - liveSequence;
+    if (fresh <= 0) return;
+    liveSequence = delta.sequence;
+    liveHistory = liveHistory.concat(delta.records.slice(-fresh)).slice(-LIVE_HISTORY);
+    scheduleRender();
+});
+
+onLiveEvent('alerts', alerts => {
+    liveAlerts = alerts;
+    updateIncidentLog(alerts);
+});
+
+onLiveEvent('alert_events', delta => {
+    // Lifecycle events (open/escalate/deescalate/resolve) patch the active set by id;
+    // the web relay has already dropped events replayed across reconnects
+    delta.events.forEach(event => {
+        liveAlerts = liveAlerts.filter(alert => alert.id !== event.id);
+        if (event.event !== 'resolve') liveAlerts.push(event);
+    });
+    updateIncidentLog(delta.events.filter(event => event.event === 'open' || event.event === 'escalate'));
+});
+
+function startLiveUpdates() {
+    if (!window.EventSource) {
+        setInterval(updateDashboard, 2000);
+        updateDashboard();
+        return;
+    }
+    // EventSource reconnects on its own; the server resends a snapshot each time
+    const source = new EventSource('/api/stream');
+    LIVE_EVENTS.forEach(name => {
+        source.addEventListener(name, event => {
+            const data = JSON.parse(event.data);
+            (liveHandlers[name] || []).forEach(handler => handler(data));
+        });
+    });
+}
+
+document.addEventListener('DOMContentLoaded', startLiveUpdates);
+
+/**
+ * Report exports: queue a background rendering job, poll its status, then download.
+ * Links keep their plain href as a fallback (the server waits briefly for the job).
+ */
+async function requestReport(kind, link) {
+    const label = link.innerHTML;
+    link.classList.add('opacity-60', 'pointer-events-none');
+    try {
+        const resp = await fetch('/api/reports', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ kind: kind })
+        });
+        let job = await resp.json();
+        while (job.status === 'queued' || job.status === 'running') {
+            link.innerText = 'Rendering report...';
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            job = await (await fetch(job.status_url)).json();
+        }
+        if (job.status === 'done') {
+            window.location = job.download_url;
+        } else {
+            console.error("Report generation failed:", job.error);
+        }
+    } catch (error) {
+        console.error("Report request failure:", error);
+    } finally {
+        link.innerHTML = label;
+        link.classList.remove('opacity-60', 'pointer-events-none');
+    }
+}
+
+document.addEventListener('click', event => {
+    const link = event.target.closest('[data-report]');
+    if (!link) return;
+    event.preventDefault();
+    requestReport(link.dataset.report, link);
+});
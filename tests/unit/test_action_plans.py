@@ -0,0 +1,150 @@
+"""
+Unit tests for the EcoPulse AI action plan snapshots.
+Validates change-driven regeneration (severity, forecast bucket, alert set, expiry),
+versioned snapshot history, the risk heuristic on non-numeric forecasts, and the
+snapshot-backed action plan routes.
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from ecopulse_ai.analytics import planner
+from ecopulse_ai.api import action_plans, routes
+from ecopulse_ai.api.action_plans import ActionPlanner, collect_plan_inputs
+from ecopulse_ai.api.app import create_app
+
+WARNING = {"aqi": 150, "severity": "Warning"}
+ALERT = {"type": "AQI", "level": "Warning", "district": "North"}
+
+
+class PlanInputs:
+    """Mutable stand-in for the engine inputs."""
+
+    def __init__(self):
+        self.value = (dict(WARNING), 160.0, [])
+
+    def __call__(self):
+        return self.value
+
+
+class ActionPlanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.generate = mock.Mock(side_effect=lambda m, f, a, **kw: {"summary": f"AQI {m['aqi']}"})
+        patch = mock.patch.object(action_plans, "generate_action_plan", self.generate)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.inputs = PlanInputs()
+
+
+class TestActionPlanner(ActionPlanTestCase):
+    def test_regenerates_only_on_meaningful_change(self):
+        plans = ActionPlanner(self.inputs, max_age=0)
+        first = plans.refresh()
+        self.assertEqual((first.version, first.reason), (1, "initial"))
+
+        # AQI drift inside the same severity and forecast bucket keeps the plan
+        self.inputs.value = ({**WARNING, "aqi": 155}, 170.0, [])
+        self.assertIsNone(plans.refresh())
+        self.assertEqual(self.generate.call_count, 1)
+
+        changes = [
+            (({**WARNING, "severity": "Critical"}, 170.0, []), "severity"),
+            (({**WARNING, "severity": "Critical"}, 240.0, []), "forecast"),
+            (({**WARNING, "severity": "Critical"}, 240.0, [ALERT]), "alerts"),
+        ]
+        for value, reason in changes:
+            self.inputs.value = value
+            self.assertEqual(plans.refresh().reason, reason)
+        self.assertEqual(plans.latest().version, 4)
+        self.assertEqual([s.version for s in plans.history()], [4, 3, 2, 1])
+        self.assertEqual(plans.get(2).reason, "severity")
+
+    def test_expiry_force_and_offline(self):
+        plans = ActionPlanner(self.inputs, max_age=60, history=2)
+        plans.refresh()
+        self.assertFalse(self.generate.call_args.kwargs["refresh"])
+        self.assertEqual(plans.refresh(force=True).reason, "forced")
+        self.assertTrue(self.generate.call_args.kwargs["refresh"])
+        plans.latest().created = time.time() - 61
+        self.assertEqual(plans.refresh().reason, "expired")
+        self.assertTrue(self.generate.call_args.kwargs["refresh"])
+        self.assertIsNone(plans.get(1))  # beyond the retained history
+
+        self.inputs.value = None
+        self.assertIsNone(plans.refresh())
+        self.assertEqual(plans.latest().version, 3)
+
+    def test_background_thread_refreshes(self):
+        plans = ActionPlanner(self.inputs, interval=0.01)
+        self.addCleanup(plans.stop)
+        self.assertEqual(plans.current().version, 1)
+        self.inputs.value = ({**WARNING, "severity": "Critical"}, 160.0, [])
+        deadline = time.time() + 5
+        while plans.latest().version < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(plans.latest().reason, "severity")
+
+    def test_snapshot_payload_has_as_of(self):
+        snapshot = ActionPlanner(self.inputs).refresh()
+        payload = snapshot.to_dict()
+        self.assertEqual(payload["plan"]["summary"], "AQI 150")
+        self.assertEqual(payload["as_of"], snapshot.as_of)
+
+
+class TestPlanInputs(unittest.TestCase):
+    def test_forecast_comes_from_engine_state(self):
+        engine = mock.Mock()
+        engine.fetch.side_effect = lambda endpoint, params=None, default=None: {
+            "environmental_metrics": [{"sensor_id": "S1", "district": "North", "aqi": 150}],
+            "forecast": {"next": 172.5, "horizon": {"method": "holt", "points": []}},
+            "alerts": {"active": [ALERT]},
+        }[endpoint]
+        with mock.patch.object(action_plans, "get_engine_client", return_value=engine):
+            latest, forecast, alerts = collect_plan_inputs()
+        self.assertEqual((latest["aqi"], forecast, alerts), (150, 172.5, [ALERT]))
+        engine.fetch.assert_any_call(
+            "forecast", params={"sensor_id": "S1", "district": "North"}, default={}
+        )
+
+
+class TestPlannerHeuristics(unittest.TestCase):
+    def test_risk_tolerates_status_forecast(self):
+        self.assertEqual(planner.risk_probability(150, 170.0), 60.0)
+        self.assertEqual(planner.risk_probability(150, "Insufficient data"), 45.0)
+        self.assertEqual(planner.risk_probability(0, None), 5)
+
+    def test_trigger_buckets_forecast(self):
+        trigger = planner.plan_trigger(WARNING, 160.0, [ALERT])
+        self.assertEqual(trigger, planner.plan_trigger({**WARNING, "aqi": 90}, 170.0, [ALERT]))
+        self.assertNotEqual(trigger, planner.plan_trigger(WARNING, 260.0, [ALERT]))
+        self.assertIsNone(planner.plan_trigger(WARNING, "Prediction Error", [])[1])
+
+
+class TestActionPlanRoutes(ActionPlanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.plans = ActionPlanner(self.inputs)
+        self.addCleanup(self.plans.stop)
+        patch = mock.patch.object(routes, "get_action_planner", return_value=self.plans)
+        patch.start()
+        self.addCleanup(patch.stop)
+        app = create_app()
+        app.config.update(LOGIN_DISABLED=True)
+        self.client = app.test_client()
+
+    def test_api_serves_latest_and_versions(self):
+        latest = self.client.get("/api/action-plan").json
+        self.assertEqual((latest["version"], latest["plan"]["summary"]), (1, "AQI 150"))
+        self.assertEqual(self.client.get("/api/action-plan").json["version"], 1)
+        self.assertEqual(self.generate.call_count, 1)
+        self.assertEqual(self.client.get("/api/action-plan?version=7").status_code, 404)
+
+    def test_offline_without_snapshot(self):
+        self.inputs.value = None
+        self.assertEqual(self.client.get("/api/action-plan").status_code, 503)
+        self.assertEqual(self.client.get("/action-plan").status_code, 302)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for the EcoPulse AI alert lifecycle store.
+Validates open/escalate/resolve events with stable ids, the incremental change feed,
+listener fan-out, mirroring through ``apply``, and the engine's alert endpoints.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ecopulse_ai.analytics.rules import AlertTracker, RuleSet
+from ecopulse_ai.streaming.alert_feed import AlertStore, lifecycle_event
+from ecopulse_ai.streaming.pathway_pipeline import create_shim_app
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+T0 = datetime(2026, 1, 5, 13, 0, 0)
+
+
+def _store(**kwargs):
+    tracker = AlertTracker(RuleSet.from_config(), hysteresis=0.1, clear_after=60.0)
+    return AlertStore(tracker, **kwargs)
+
+
+def _push(store, seconds, aqi, sensor="S1"):
+    keys = [("Central Business District", sensor)] * len(seconds)
+    columns = {"aqi": np.array(aqi, dtype=float)}
+    return store.update(keys, columns, np.array(seconds, dtype=float), hour=13)
+
+
+class TestAlertStore(unittest.TestCase):
+    def test_lifecycle_events_share_an_id(self):
+        store = _store()
+        events = _push(store, [0, 10], [160, 220])
+        events += _push(store, [20, 100], [50, 50])
+        self.assertEqual(
+            [(e["event"], e["level"]) for e in events],
+            [("open", "Warning"), ("escalate", "Critical"), ("resolve", "Optimal")],
+        )
+        self.assertEqual(len({e["id"] for e in events}), 1)
+        self.assertEqual([e["seq"] for e in events], [1, 2, 3])
+        self.assertEqual(store.active(), [])
+
+    def test_active_snapshot_and_changes(self):
+        store = _store(retention=2)
+        _push(store, [0], [160], sensor="S1")
+        _push(store, [0], [320], sensor="S2")
+        _push(store, [5], [170], sensor="S1")  # same level: no event
+
+        active = store.active()
+        levels = [(a["sensor_id"], a["level"]) for a in active]
+        self.assertEqual(levels, [("S2", "Emergency"), ("S1", "Warning")])
+        self.assertEqual(active[1]["value"], 160.0)  # value of the last transition
+        self.assertEqual(store.active(sensor_id="S1")[0]["type"], "AQI")
+
+        self.assertEqual(store.changes(2), (2, []))
+        sequence, events = store.changes(0)  # beyond retention: what is still kept
+        self.assertEqual((sequence, [e["seq"] for e in events]), (2, [1, 2]))
+        _push(store, [1], [50], sensor="S3")
+        self.assertEqual(store.changes(2)[1], [])
+
+    def test_listeners_and_mirroring(self):
+        source, mirror = _store(), AlertStore()
+        received = []
+        source.subscribe(received.append)
+        source.subscribe(mirror.apply)
+        source.subscribe(lambda events: 1 / 0)  # a failing listener is isolated
+
+        _push(source, [0, 10], [160, 220])
+        self.assertEqual([len(batch) for batch in received], [2])
+        self.assertEqual(mirror.active()[0]["id"], source.active()[0]["id"])
+        self.assertEqual(mirror.active()[0]["peak"], "Critical")
+        self.assertEqual(mirror.active()[0]["opened"], source.active()[0]["opened"])
+
+    def test_lifecycle_event_names(self):
+        self.assertEqual(lifecycle_event("Optimal", "Critical"), "open")
+        self.assertEqual(lifecycle_event("Warning", "Emergency"), "escalate")
+        self.assertEqual(lifecycle_event("Emergency", "Warning"), "deescalate")
+        self.assertEqual(lifecycle_event("Critical", "Optimal"), "resolve")
+
+
+class TestEngineAlertEndpoints(unittest.TestCase):
+    def test_store_batches_feed_the_alert_routes(self):
+        state = SensorStateStore()
+        records = [
+            {
+                "sensor_id": "S1",
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "aqi": aqi,
+                "co2": 400.0,
+            }
+            for i, aqi in enumerate((90.0, 330.0))
+        ]
+        state.append_batch(records, hour=13)
+        client = create_shim_app(state).test_client()
+
+        snapshot = client.get("/alerts").json
+        self.assertEqual(snapshot["sequence"], 1)
+        self.assertEqual(snapshot["active"][0]["level"], "Emergency")
+        self.assertEqual(snapshot["active"][0]["opened"], records[1]["timestamp"])
+
+        changes = client.get("/alerts/changes?since=0").json
+        self.assertEqual([e["event"] for e in changes["events"]], ["open"])
+        self.assertEqual(client.get("/alerts/changes?since=1").json["events"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,11 @@
 import unittest
+from unittest import mock
+
+import numpy as np
+
 from ecopulse_ai.analytics.alerts import get_alert_status
+from ecopulse_ai.analytics.rules import AlertTracker, RuleSet
+from ecopulse_ai.streaming.pathway_pipeline import compute_alerts
 
 
 class TestAlertSystem(unittest.TestCase):
@@ -21,6 +27,74 @@ class TestAlertSystem(unittest.TestCase):
         alerts = get_alert_status(data)
         self.assertTrue(any(a["type"] == "CO2" and a["level"] == "Warning" for a in alerts))
 
+    def test_pm25_rules(self):
+        """PM2.5 thresholds raise alerts at the highest level reached."""
+        alerts = get_alert_status({"aqi": 50, "pm25": 80})
+        self.assertEqual([(a["type"], a["level"]) for a in alerts], [("PM25", "Critical")])
+
+    def test_peak_hour_adjustment(self):
+        """The AQI warning threshold is scaled inside the configured peak windows."""
+        self.assertEqual(get_alert_status({"aqi": 110}, hour=9), [])
+        self.assertEqual(get_alert_status({"aqi": 110}, hour=13)[0]["level"], "Warning")
+        self.assertEqual(compute_alerts(110, hour=9), "Optimal")
+        self.assertEqual(compute_alerts(110, hour=13), "Warning")
+
+
+class TestAlertTracker(unittest.TestCase):
+    def setUp(self):
+        rules = RuleSet.from_config(sustain={"CO2": 300.0})
+        self.tracker = AlertTracker(rules, hysteresis=0.1, clear_after=60.0)
+
+    def _push(self, times, aqi, co2=None, sensors=None):
+        n = len(times)
+        columns = {"aqi": np.array(aqi, dtype=float)}
+        columns["co2"] = np.array(co2 if co2 is not None else [400.0] * n, dtype=float)
+        keys = sensors if sensors is not None else ["S1"] * n
+        return self.tracker.update(keys, columns, np.array(times, dtype=float), hour=13)
+
+    def test_hysteresis_and_clear_debounce(self):
+        """Dipping just below a threshold does not clear it; a sustained drop does."""
+        changes = self._push([0, 10, 20], [205, 195, 210])
+        self.assertEqual([(c["from"], c["to"]) for c in changes], [("Optimal", "Critical")])
+
+        self.assertEqual(self._push([30, 60], [150, 150]), [])  # below the band < 60 s
+        changes = self._push([95], [150])
+        self.assertEqual([(c["from"], c["to"]) for c in changes], [("Critical", "Warning")])
+        self.assertEqual(self.tracker.active()[0]["level"], "Warning")
+
+    def test_sustain_duration(self):
+        """CO2 must stay above its threshold for the sustain time before alerting."""
+        self.assertEqual(self._push([0, 200], [50, 50], co2=[1100, 1150]), [])
+        changes = self._push([301], [50], co2=[1200])
+        self.assertEqual([(c["metric"], c["to"]) for c in changes], [("CO2", "Warning")])
+
+    def test_batch_preserves_per_sensor_order(self):
+        """Repeated sensors in one batch are applied in arrival order, others in parallel."""
+        changes = self._push([0, 0, 1, 1], [310, 40, 40, 320], sensors=["S1", "S2", "S1", "S2"])
+        self.assertEqual(
+            [(c["sensor"], c["to"]) for c in changes], [("S1", "Emergency"), ("S2", "Emergency")]
+        )
+        self.assertEqual(len(self.tracker.active()), 2)
+
+    def test_row_and_round_paths_agree(self):
+        """The row-by-row path (few sensors) matches the vectorized rounds."""
+        rng = np.random.default_rng(7)
+        n = 400
+        keys = [f"S{i}" for i in rng.integers(0, 3, n)]
+        columns = {
+            "aqi": rng.uniform(50, 350, n),
+            "co2": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(600, 1400, n)),
+        }
+        times = np.arange(n) * 20.0
+        results = []
+        for cost in (0, 10**6):
+            tracker = AlertTracker(RuleSet.from_config(sustain={"CO2": 300.0}), 0.1, 60.0)
+            with mock.patch("ecopulse_ai.analytics.rules.ROUND_COST", cost):
+                changes = tracker.update(keys, columns, times, hour=13)
+            results.append((changes, tracker.active()))
+        self.assertTrue(results[0][0])
+        self.assertEqual(results[0], results[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,34 @@
+"""
+Unit tests for the EcoPulse AI benchmark harness.
+Validates metric direction handling and regression detection against a baseline.
+"""
+
+import unittest
+
+from benchmarks.harness import compare, latency_stats
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_compare_flags_regressions_by_direction(self):
+        baseline = {"results": {"a": {"records_per_sec": 1000.0, "p50_ms": 10.0, "max_ms": 1.0}}}
+        current = {"results": {"a": {"records_per_sec": 700.0, "p50_ms": 9.0, "max_ms": 50.0}}}
+        rows = {row["metric"]: row for row in compare(current, baseline, tolerance=0.25)}
+
+        self.assertTrue(rows["records_per_sec"]["regression"])
+        self.assertAlmostEqual(rows["records_per_sec"]["change"], -0.3)
+        self.assertFalse(rows["p50_ms"]["regression"])
+        self.assertAlmostEqual(rows["p50_ms"]["change"], 0.1)
+        self.assertNotIn("max_ms", rows)  # recorded, not gated
+
+    def test_new_benchmarks_are_not_compared(self):
+        rows = compare({"results": {"new": {"p50_ms": 1.0}}}, {"results": {}})
+        self.assertEqual(rows, [])
+
+    def test_latency_stats_in_milliseconds(self):
+        stats = latency_stats([0.001] * 19 + [0.1], prefix="x_")
+        self.assertEqual(stats["x_p50_ms"], 1.0)
+        self.assertEqual(stats["x_max_ms"], 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Unit tests for EcoPulse AI live delta broadcasting.
+Validates SSE framing, slow-subscriber eviction, engine delta detection, and the
+web relay's sequence-based de-duplication.
+"""
+
+import unittest
+
+from ecopulse_ai.api.live import LiveRelay
+from ecopulse_ai.streaming.broadcast import DeltaPublisher, EventHub, format_sse, iter_sse
+from ecopulse_ai.streaming.pathway_pipeline import create_shim_app
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+
+def _frames(q):
+    frames = []
+    while not q.empty():
+        frames.append(q.get_nowait())
+    return list(iter_sse(b"".join(frames).split(b"\n")))
+
+
+class TestEventHub(unittest.TestCase):
+    def test_sse_round_trip(self):
+        frame = format_sse("records", {"sequence": 3, "records": [{"aqi": 42.0}]})
+        self.assertEqual(
+            list(iter_sse(frame.split(b"\n"))),
+            [("records", {"sequence": 3, "records": [{"aqi": 42.0}]})],
+        )
+
+    def test_slow_subscriber_is_dropped(self):
+        """A full queue disconnects its subscriber instead of blocking the publisher."""
+        hub = EventHub(max_queue=2)
+        slow = hub.subscribe()
+        for i in range(3):
+            hub.publish("records", {"sequence": i})
+        self.assertEqual(len(hub), 0)
+        self.assertIsNone(slow.get_nowait())
+
+
+class TestDeltaPublisher(unittest.TestCase):
+    def test_publishes_only_new_records_and_changed_views(self):
+        state = SensorStateStore()
+        publisher = DeltaPublisher(state, views={"peak": lambda s: s.latest_value("aqi")})
+        q = publisher.hub.subscribe()
+
+        state.append({"aqi": 80.0, "timestamp": "t0"})
+        state.append({"aqi": 90.0, "timestamp": "t1"})
+        publisher.poll()
+        publisher.poll()  # nothing new: no events
+        state.append({"aqi": 90.0, "timestamp": "t2"})
+        publisher.poll()
+
+        events = _frames(q)
+        self.assertEqual([name for name, _ in events], ["records", "peak", "records"])
+        self.assertEqual([r["timestamp"] for r in events[0][1]["records"]], ["t0", "t1"])
+        self.assertEqual(events[2][1]["sequence"], 3)
+        self.assertEqual([r["timestamp"] for r in events[2][1]["records"]], ["t2"])
+
+    def test_engine_stream_starts_with_snapshot(self):
+        state = SensorStateStore()
+        state.append({"aqi": 120.0, "timestamp": "t0"})
+        client = create_shim_app(state).test_client()
+        response = client.get("/stream")
+        self.assertEqual(response.mimetype, "text/event-stream")
+        first = next(response.response)
+        response.close()
+        event, data = next(iter_sse(first.split(b"\n")))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["sequence"], 1)
+
+
+class TestLiveRelay(unittest.TestCase):
+    def test_overlapping_deltas_are_deduplicated(self):
+        relay = LiveRelay(url="http://unused")
+        q = relay.hub.subscribe()
+        relay.handle("snapshot", {"sequence": 2, "records": [{"aqi": 50.0}, {"aqi": 60.0}]})
+        relay.handle("records", {"sequence": 2, "records": [{"aqi": 60.0}]})
+        relay.handle(
+            "records", {"sequence": 4, "records": [{"aqi": 60.0}, {"aqi": 450.0}, {"aqi": 455.0}]}
+        )
+
+        self.assertEqual([r["aqi"] for r in relay.history], [50.0, 60.0, 450.0, 455.0])
+        events = _frames(q)
+        self.assertEqual([name for name, _ in events], ["snapshot", "records"])
+        self.assertEqual([r["aqi"] for r in events[1][1]["records"]], [450.0, 455.0])
+
+    def test_alert_events_fold_into_active_set(self):
+        """Alerts follow the engine's lifecycle feed; replayed events are ignored."""
+        relay = LiveRelay(url="http://unused")
+        q = relay.hub.subscribe()
+        opened = {"id": "a1", "type": "AQI", "level": "Warning", "time": "t0"}
+        relay.handle("alerts", {"sequence": 1, "active": [{**opened, "updated": "t0"}]})
+        relay.handle("alert_events", {"sequence": 1, "events": [{**opened, "seq": 1}]})
+        relay.handle(
+            "alert_events",
+            {
+                "sequence": 3,
+                "events": [
+                    {"id": "a1", "event": "escalate", "level": "Critical", "seq": 2, "time": "t1"},
+                    {"id": "b2", "event": "open", "level": "Warning", "seq": 3, "time": "t1"},
+                ],
+            },
+        )
+        self.assertEqual([a["level"] for a in relay.alerts], ["Critical", "Warning"])
+        relay.handle(
+            "alert_events", {"sequence": 4, "events": [{"id": "a1", "event": "resolve", "seq": 4}]}
+        )
+        self.assertEqual([a["id"] for a in relay.alerts], ["b2"])
+
+        events = _frames(q)
+        self.assertEqual([name for name, _ in events], ["alerts", "alert_events", "alert_events"])
+        self.assertEqual(len(events[1][1]["events"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit tests for the EcoPulse AI streaming Copilot.
+Runs the OpenAI provider against a local fake OpenAI-compatible server to validate token
+streaming, caching of completed streams, the fallback path, and the SSE chat route.
+"""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from ecopulse_ai.api import routes
+from ecopulse_ai.api.app import create_app
+from ecopulse_ai.rag import copilot
+from ecopulse_ai.rag.gateway import LLMGateway, SemanticCache
+from ecopulse_ai.rag.providers import BoundedProvider, OpenAIProvider
+from ecopulse_ai.streaming.broadcast import iter_sse
+
+TOKENS = ["Keep ", "windows ", "closed", "."]
+METRICS = {"aqi": 180, "severity": "Warning"}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """Minimal ``/v1/chat/completions`` speaking the OpenAI JSON and SSE formats."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": {"message": "insufficient_quota"}}')
+            return
+        if not body.get("stream"):
+            self._json({"message": {"role": "assistant", "content": "".join(TOKENS)}})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for token in TOKENS:
+            self._frame({"delta": {"content": token}, "finish_reason": None})
+        self._frame({"delta": {}, "finish_reason": "stop"})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _choice(self, choice, kind):
+        return {
+            "id": "fake",
+            "object": kind,
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [{"index": 0, **choice}],
+        }
+
+    def _json(self, choice):
+        payload = json.dumps(self._choice({**choice, "finish_reason": "stop"}, "chat.completion"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def _frame(self, choice):
+        chunk = self._choice(choice, "chat.completion.chunk")
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+
+class FakeLLMTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+        self.server.requests = []
+        self.server.status = 200
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        fake = OpenAIProvider(
+            api_key="test",
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            max_retries=0,
+        )
+        patches = [
+            mock.patch.object(copilot, "get_provider", return_value=BoundedProvider(fake)),
+            mock.patch.object(copilot, "get_gateway", return_value=LLMGateway(SemanticCache())),
+            mock.patch.object(copilot, "retrieve_guidelines", return_value=[]),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestStreamCopilot(FakeLLMTestCase):
+    def test_tokens_stream_then_cached_answer(self):
+        pieces = list(copilot.stream_copilot("Open the windows?", METRICS, []))
+        self.assertEqual(pieces, TOKENS)
+        self.assertTrue(self.server.requests[0]["stream"])
+
+        # the completed stream is cached for both streaming and blocking callers
+        self.assertEqual(
+            list(copilot.stream_copilot("open the windows", METRICS, [])), ["".join(TOKENS)]
+        )
+        self.assertEqual(copilot.ask_copilot("Open the windows?", METRICS, []), "".join(TOKENS))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_failure_before_first_token_yields_fallback(self):
+        self.server.status = 429
+        (message,) = copilot.stream_copilot("Open the windows?", METRICS, [])
+        self.assertTrue(message.startswith("[SIMULATION MODE]"))
+        self.server.status = 200
+        self.assertEqual(list(copilot.stream_copilot("Open the windows?", METRICS, [])), TOKENS)
+
+
+class TestChatRoute(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        app = create_app()
+        app.config.update(LOGIN_DISABLED=True)
+        self.client = app.test_client()
+        for name, value in (("_fetch_streaming_data", [METRICS]), ("_active_alerts", [])):
+            patch = mock.patch.object(routes, name, return_value=value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_sse_chat(self):
+        response = self.client.post("/api/chat", json={"query": "Jog today?", "stream": True})
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = list(iter_sse(response.get_data().splitlines()))
+        self.assertEqual(events[:-1], [("token", {"text": t}) for t in TOKENS])
+        self.assertEqual(events[-1], ("done", {}))
+
+    def test_blocking_chat_still_returns_json(self):
+        response = self.client.post("/api/chat", json={"query": "Jog today?"})
+        self.assertEqual(response.json, {"response": "".join(TOKENS)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Unit tests for the EcoPulse AI engine client.
+Validates response caching and its bounds, single-flight coalescing, the circuit
+breaker, stale fallback during outages, 4xx pass-through, and the asyncio variant.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ecopulse_ai.api import routes
+from ecopulse_ai.api.app import create_app
+from ecopulse_ai.api.engine_client import (
+    AsyncEngineClient,
+    CircuitBreaker,
+    EngineClient,
+    EngineRejected,
+    ResponseCache,
+)
+
+
+class _FakeEngine:
+    """Stands in for the HTTP call: counts fetches and can be switched off."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.up = True
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, params):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if not self.up:
+            raise ConnectionError("engine down")
+        if (params or {}).get("bad"):
+            raise EngineRejected(400, {"error": "bad parameter"})
+        return [{"endpoint": endpoint, "aqi": 120.0}]
+
+
+def _client(engine, **kwargs):
+    client = EngineClient(base_url="http://engine.invalid", **kwargs)
+    client._get = engine
+    return client
+
+
+class TestEngineClient(unittest.TestCase):
+    def test_concurrent_requests_share_one_fetch(self):
+        engine = _FakeEngine(delay=0.1)
+        client = _client(engine)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.fetch("environmental_metrics")))
+            for _ in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(engine.calls, 1)
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(r == results[0] for r in results))
+
+    def test_cache_expires_and_keys_on_params(self):
+        engine = _FakeEngine()
+        client = _client(engine, ttl=0.05)
+        client.fetch("environmental_metrics")
+        client.fetch("environmental_metrics")
+        client.fetch("environmental_metrics", params={"traffic_reduction": "20"})
+        self.assertEqual(engine.calls, 2)
+        time.sleep(0.06)
+        client.fetch("environmental_metrics")
+        self.assertEqual(engine.calls, 3)
+
+    def test_breaker_fails_fast_and_serves_stale(self):
+        engine = _FakeEngine()
+        client = _client(engine, ttl=0.0, breaker=CircuitBreaker(threshold=2, reset_timeout=60))
+        fresh = client.fetch("environmental_metrics")
+
+        engine.up = False
+        for _ in range(5):
+            self.assertEqual(client.fetch("environmental_metrics"), fresh)
+        self.assertEqual(engine.calls, 3)  # two failures open the circuit
+        self.assertEqual(client.breaker.state, "open")
+        self.assertEqual(client.fetch("national_metrics"), [])
+
+    def test_half_open_probe_closes_circuit(self):
+        engine = _FakeEngine()
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.05)
+        client = _client(engine, ttl=0.0, breaker=breaker)
+        engine.up = False
+        client.fetch("environmental_metrics")
+        self.assertEqual(breaker.state, "open")
+
+        time.sleep(0.06)
+        engine.up = True
+        self.assertTrue(client.fetch("environmental_metrics"))
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestEngineRejections(unittest.TestCase):
+    def test_client_errors_do_not_open_the_circuit(self):
+        engine = _FakeEngine()
+        client = _client(engine, breaker=CircuitBreaker(threshold=2, reset_timeout=60))
+        for _ in range(5):
+            with self.assertRaises(EngineRejected) as raised:
+                client.fetch("simulate", params={"bad": "1"})
+            self.assertEqual(raised.exception.payload, {"error": "bad parameter"})
+        self.assertEqual(engine.calls, 5)  # rejections are not cached
+        self.assertEqual(client.breaker.state, "closed")
+        self.assertTrue(client.fetch("simulate"))
+
+    def test_route_relays_engine_status_and_body(self):
+        client = _client(_FakeEngine())
+        app = create_app()
+        app.config.update(LOGIN_DISABLED=True)
+        with mock.patch.object(routes, "get_engine_client", return_value=client):
+            response = app.test_client().get("/api/simulate?bad=1")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"error": "bad parameter"})
+
+
+class TestMetricPackage(unittest.TestCase):
+    def test_forecast_is_read_from_the_engine(self):
+        horizon = {"method": "holt", "points": [{"step": 1, "value": 131.0}]}
+        engine = mock.Mock()
+        engine.fetch.side_effect = lambda endpoint, params=None, default=None: {
+            "environmental_metrics": [{"sensor_id": "S1", "aqi": 120.0}],
+            "forecast": {"next": 130.0, "horizon": horizon},
+            "alerts": {"active": []},
+        }[endpoint]
+        app = create_app()
+        app.config.update(LOGIN_DISABLED=True)
+        with mock.patch.object(routes, "get_engine_client", return_value=engine):
+            package = app.test_client().get("/api/metrics").json
+        self.assertEqual((package["forecast"], package["forecast_horizon"]), (130.0, horizon))
+        engine.fetch.assert_any_call(
+            "forecast", params={"n_steps": 5, "sensor_id": "S1"}, default={}
+        )
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_lru_capacity_bounds_distinct_queries(self):
+        cache = ResponseCache(ttl=60, capacity=3)
+        for i in range(10):
+            cache.put(("heatmap", (("x", str(i)),)), i)
+            cache.get(("heatmap", (("x", "0"),)))  # keep the first entry recently used
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.get(("heatmap", (("x", "0"),))), (True, 0))
+        self.assertEqual(cache.get(("heatmap", (("x", "1"),))), (False, None))
+
+    def test_stale_entries_expire_after_max_age(self):
+        cache = ResponseCache(ttl=0.0, max_stale=0.05)
+        cache.put("k", 1)
+        self.assertEqual(cache.get("k", allow_stale=True), (True, 1))
+        time.sleep(0.06)
+        self.assertEqual(cache.get("k", allow_stale=True), (False, None))
+        self.assertEqual(len(cache), 0)
+
+
+class TestAsyncEngineClient(unittest.TestCase):
+    def test_async_fetches_coalesce(self):
+        engine = _FakeEngine(delay=0.05)
+        client = AsyncEngineClient(_client(engine))
+
+        async def fake_get(endpoint, params):
+            await asyncio.sleep(0.05)
+            return engine(endpoint, params)
+
+        client._get = fake_get
+
+        async def run():
+            return await asyncio.gather(*(client.fetch("forecast") for _ in range(10)))
+
+        results = asyncio.run(run())
+        self.assertEqual(engine.calls, 1)
+        self.assertEqual(len(results), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
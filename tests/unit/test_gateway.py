@@ -0,0 +1,156 @@
+"""
+Unit tests for the EcoPulse AI LLM gateway.
+Validates telemetry fingerprints, exact and semantic cache hits with TTL/LRU eviction,
+coalescing of concurrent identical requests, and the Copilot and planner integration.
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ecopulse_ai.analytics import planner
+from ecopulse_ai.rag import copilot
+from ecopulse_ai.rag.gateway import (
+    LLMGateway,
+    SemanticCache,
+    normalize_query,
+    telemetry_fingerprint,
+)
+
+SCOPE = ("copilot", ("Critical", 8, ()))
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_quantizes_context(self):
+        alerts = [
+            {"type": "AQI", "level": "critical", "district": "Industrial North", "sensor_id": "a"},
+            {"type": "AQI", "level": "critical", "district": "Industrial North", "sensor_id": "b"},
+        ]
+        first = telemetry_fingerprint({"severity": "Critical", "aqi": 210}, alerts)
+        self.assertEqual(first, telemetry_fingerprint({"severity": "Critical", "aqi": 224}, alerts))
+        self.assertNotEqual(first, telemetry_fingerprint({"severity": "Critical", "aqi": 226}, []))
+        self.assertEqual(normalize_query("  Should schools CLOSE?! "), "should schools close")
+
+
+class TestSemanticCache(unittest.TestCase):
+    def test_exact_and_semantic_hits(self):
+        cache = SemanticCache(ttl=60, capacity=8, threshold=0.7)
+        cache.store(SCOPE, "Should schools in the industrial north close today?", "Close them.")
+        self.assertEqual(
+            cache.lookup(SCOPE, "should schools in the Industrial North close today"),
+            ("hit", "Close them."),
+        )
+        self.assertEqual(
+            cache.lookup(SCOPE, "Should the schools in industrial north close today?"),
+            ("semantic", "Close them."),
+        )
+        self.assertEqual(cache.lookup(SCOPE, "Is jogging safe?"), (None, None))
+        other = ("copilot", ("Good", 1, ()))
+        self.assertEqual(cache.lookup(other, "Should schools close today?"), (None, None))
+
+    def test_ttl_and_lru_eviction(self):
+        cache = SemanticCache(ttl=0.05, capacity=2)
+        cache.store(SCOPE, "a b", 1)
+        time.sleep(0.06)
+        self.assertEqual(cache.lookup(SCOPE, "a b"), (None, None))
+
+        cache.ttl = 60
+        for i, question in enumerate(["first question", "second question", "third question"]):
+            cache.store(SCOPE, question, i)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.lookup(SCOPE, "first question"), (None, None))
+        self.assertEqual(cache.lookup(SCOPE, "third question"), ("hit", 2))
+
+
+class TestLLMGateway(unittest.TestCase):
+    def test_concurrent_identical_requests_share_one_call(self):
+        gateway = LLMGateway(SemanticCache(ttl=60))
+        release = threading.Event()
+        calls = []
+
+        def complete():
+            calls.append(1)
+            release.wait(2)
+            return "answer"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(gateway.call("copilot", "Why?", "fp", complete))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual((len(calls), results), (1, ["answer"] * 8))
+        self.assertEqual(gateway.call("copilot", "why", "fp", complete), "answer")
+        self.assertEqual(len(calls), 1)
+
+    def test_failures_are_not_cached(self):
+        gateway = LLMGateway(SemanticCache(ttl=60))
+        with self.assertRaises(RuntimeError):
+            gateway.call("copilot", "q", "fp", mock.Mock(side_effect=RuntimeError("429")))
+        self.assertEqual(gateway.call("copilot", "q", "fp", lambda: "ok"), "ok")
+
+
+class TestCallers(unittest.TestCase):
+    def setUp(self):
+        self.gateway = LLMGateway(SemanticCache(ttl=60))
+
+    def test_copilot_reuses_answers_within_fingerprint(self):
+        metrics = {"aqi": 210, "severity": "Critical"}
+        with (
+            mock.patch.object(copilot, "get_gateway", return_value=self.gateway),
+            mock.patch.object(copilot, "retrieve_guidelines", return_value=[]),
+            mock.patch.object(copilot, "get_provider") as get_provider,
+        ):
+            provider = get_provider.return_value
+            provider.complete.return_value = "Stay indoors."
+            self.assertEqual(
+                copilot.ask_copilot("Is it safe outside?", metrics, []), "Stay indoors."
+            )
+            self.assertEqual(
+                copilot.ask_copilot("is it safe outside", metrics, []), "Stay indoors."
+            )
+            self.assertEqual(provider.complete.call_count, 1)
+            copilot.ask_copilot("is it safe outside", {"aqi": 40, "severity": "Good"}, [])
+            self.assertEqual(provider.complete.call_count, 2)
+
+    def test_planner_refreshes_live_fields_on_cached_plan(self):
+        with (
+            mock.patch.object(planner, "get_gateway", return_value=self.gateway),
+            mock.patch.object(planner, "get_provider") as get_provider,
+        ):
+            provider = get_provider.return_value
+            provider.complete.return_value = '{"summary": "Act now."}'
+            first = planner.generate_action_plan({"aqi": 210}, 220.0, [])
+            second = planner.generate_action_plan({"aqi": 205}, 215.0, [])
+        self.assertEqual(provider.complete.call_count, 1)
+        self.assertEqual(second["summary"], "Act now.")
+        self.assertEqual(second["metrics"], {"aqi": 205})
+        self.assertNotEqual(first["risk_prob"], second["risk_prob"])
+
+    def test_planner_is_keyed_on_plan_trigger_and_refresh_bypasses_cache(self):
+        with (
+            mock.patch.object(planner, "get_gateway", return_value=self.gateway),
+            mock.patch.object(planner, "get_provider") as get_provider,
+        ):
+            provider = get_provider.return_value
+            provider.complete.return_value = '{"summary": "Act now."}'
+            # Current AQI moves across bands; severity, forecast bucket and alerts do not
+            planner.generate_action_plan({"aqi": 150}, 205.0, [])
+            planner.generate_action_plan({"aqi": 230}, 215.0, [])
+            self.assertEqual(provider.complete.call_count, 1)
+            planner.generate_action_plan({"aqi": 230}, 215.0, [], refresh=True)
+            self.assertEqual(provider.complete.call_count, 2)
+            planner.generate_action_plan({"aqi": 230}, 215.0, [])
+            self.assertEqual(provider.complete.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
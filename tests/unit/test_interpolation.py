@@ -0,0 +1,148 @@
+"""
+Unit tests for the EcoPulse AI spatial interpolation.
+Validates the neighbour search (KD-tree and NumPy fallback), IDW and kriging-lite
+estimates, dirty-tile recomputation in the tile cache, and the engine heatmap route.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ecopulse_ai.analytics.interpolation import (
+    HEATMAP_TILES,
+    HeatmapTiles,
+    NeighborIndex,
+    idw,
+    kriging,
+)
+from ecopulse_ai.streaming.pathway_pipeline import create_shim_app
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+T0 = datetime(2026, 1, 5, 13, 0, 0)
+
+# Two sensors 0.02 degrees of latitude apart
+PAIR = np.array([[19.00, 72.90], [19.02, 72.90]])
+
+
+class TestNeighborIndex(unittest.TestCase):
+    def test_fallback_matches_exhaustive_search(self):
+        rng = np.random.default_rng(5)
+        points = rng.uniform([19.0, 72.8], [19.3, 73.0], (200, 2))
+        targets = rng.uniform([19.0, 72.8], [19.3, 73.0], (50, 2))
+        index = NeighborIndex(points)
+        index._tree = None  # exercise the NumPy path even when SciPy is installed
+        d, idx = index.query(targets, 4, 0.05)
+
+        projected = index.project(points)
+        for row, target in enumerate(index.project(targets)):
+            dist = np.linalg.norm(projected - target, axis=1)
+            expected = [i for i in np.argsort(dist)[:4] if dist[i] < 0.05]
+            self.assertEqual(idx[row, : len(expected)].tolist(), expected)
+            self.assertTrue(np.all(idx[row, len(expected) :] == len(points)))
+            self.assertTrue(np.all(np.isinf(d[row, len(expected) :])))
+
+    def test_fewer_points_than_neighbours(self):
+        index = NeighborIndex(PAIR)
+        index._tree = None
+        d, idx = index.query(np.array([[19.0, 72.9]]), 4, 1.0)
+        self.assertEqual(idx.tolist(), [[0, 1, 2, 2]])
+        self.assertEqual(d[0, 0], 0.0)
+
+
+class TestInterpolators(unittest.TestCase):
+    def setUp(self):
+        self.index = NeighborIndex(PAIR)
+        self.values = np.array([100.0, 200.0])
+        self.targets = np.array([[19.00, 72.90], [19.01, 72.90], [19.005, 72.90], [25.0, 80.0]])
+
+    def test_idw(self):
+        field = idw(self.index, self.values, self.targets, radius=0.1)
+        self.assertAlmostEqual(field[0], 100.0)
+        self.assertAlmostEqual(field[1], 150.0)
+        self.assertAlmostEqual(field[2], 110.0)  # weights 1/d^2: 9:1 towards sensor 0
+        self.assertTrue(np.isnan(field[3]))
+
+    def test_kriging(self):
+        field = kriging(self.index, self.values, self.targets, radius=0.1)
+        self.assertAlmostEqual(field[0], 100.0)
+        self.assertAlmostEqual(field[1], 150.0)
+        self.assertTrue(100.0 < field[2] < 150.0)
+        self.assertTrue(np.isnan(field[3]))
+
+    def test_missing_values_are_ignored(self):
+        values = np.array([100.0, np.nan])
+        self.assertAlmostEqual(idw(self.index, values, self.targets[1:2], radius=0.1)[0], 100.0)
+        self.assertAlmostEqual(kriging(self.index, values, self.targets[1:2], radius=0.1)[0], 100.0)
+
+
+class TestHeatmapTiles(unittest.TestCase):
+    def setUp(self):
+        self.values = np.array([100.0, 200.0, 50.0])
+        self.positions = np.array([[19.01, 72.91], [19.03, 72.93], [19.49, 73.49]])
+        self.calls = 0
+        self.tiles = HeatmapTiles(self._source, tile=0.05, cells=4, radius=0.06, refresh=0.0)
+
+    def _source(self):
+        self.calls += 1
+        return 1, self.positions, self.values
+
+    def _computed(self):
+        return HEATMAP_TILES.labels("computed").value
+
+    def test_only_dirty_tiles_are_recomputed(self):
+        bbox = (19.0, 72.9, 19.5, 73.5)
+        first = self.tiles.tiles(bbox)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(first[0]["values"]), 4)
+        self.assertTrue(all(len(tile["values"][0]) == 4 for tile in first))
+
+        before = self._computed()
+        self.assertEqual(self.tiles.tiles(bbox), first)  # served from cache
+        self.assertEqual((self.calls, self._computed()), (1, before))
+
+        self.values = np.array([100.0, 200.0, 400.0])
+        self.tiles.invalidate(self.positions[2:])
+        updated = self.tiles.tiles(bbox)
+        self.assertEqual(self.calls, 2)
+        # tiles within two of the sensor, clipped to the bbox: rows 387-390, cols 1467-1470
+        self.assertEqual(self._computed() - before, 16)
+        changed = {tuple(t["tile"]) for t in updated if t not in first}
+        self.assertIn((389, 1469), changed)
+        self.assertTrue(all(387 <= i <= 390 and 1467 <= j <= 1470 for i, j in changed))
+        self.assertEqual(updated[0], first[0])  # tiles around the other sensors kept
+
+    def test_rejects_bad_requests(self):
+        with self.assertRaises(ValueError):
+            self.tiles.tiles((19.0, 72.9, 19.1, 73.0), method="spline")
+        with self.assertRaises(ValueError):
+            self.tiles.tiles((0.0, 0.0, 10.0, 10.0))
+
+
+class TestEngineHeatmap(unittest.TestCase):
+    def test_heatmap_route(self):
+        state = SensorStateStore()
+        client = create_shim_app(state).test_client()
+        self.assertEqual(client.get("/heatmap").json, {"tiles": []})
+
+        records = [
+            {
+                "sensor_id": f"S{i}",
+                "district": "Industrial North",
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "aqi": 100.0 + 50 * i,
+                "lat": 19.21 + 0.01 * i,
+                "lon": 72.97,
+            }
+            for i in range(3)
+        ]
+        state.append_batch(records, hour=13)
+        tiles = client.get("/heatmap?method=kriging").json["tiles"]
+        self.assertTrue(tiles)
+        cells = [v for tile in tiles for row in tile["values"] for v in row if v is not None]
+        self.assertTrue(min(cells) >= 0 and max(cells) <= 250.0 + 1e-6)
+        self.assertEqual(client.get("/heatmap?method=spline").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
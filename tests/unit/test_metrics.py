@@ -0,0 +1,95 @@
+"""
+Unit tests for the EcoPulse AI metrics registry and stage tracing.
+Validates the Prometheus text exposition (labels, cumulative histogram buckets,
+scrape-time gauges), sampled tracing, and the engine's /metrics and /traces routes.
+"""
+
+import unittest
+
+from ecopulse_ai.observability.metrics import Registry
+from ecopulse_ai.observability.tracing import NULL_TRACE, Tracer
+from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics, create_shim_app
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+
+class TestRegistry(unittest.TestCase):
+    def test_counter_and_gauge_exposition(self):
+        registry = Registry()
+        errors = registry.counter("errors_total", "Errors by stage", ("stage",))
+        errors.labels("decode").inc()
+        errors.labels(stage="decode").inc(2)
+        registry.gauge("queue_depth", "Depth").set_function(lambda: 7)
+
+        text = registry.render()
+        self.assertIn("# TYPE errors_total counter", text)
+        self.assertIn('errors_total{stage="decode"} 3', text)
+        self.assertIn("queue_depth 7", text)
+        self.assertIs(registry.counter("errors_total", "again", ("stage",)), errors)
+        with self.assertRaises(ValueError):
+            registry.gauge("errors_total", "clash")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("latency_seconds_sum 6.05", lines)
+        self.assertIn("latency_seconds_count 4", lines)
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.counter("calls_total", "Calls", ("endpoint",)).labels('a"b').inc()
+        self.assertIn('calls_total{endpoint="a\\"b"} 1', registry.render())
+
+
+class TestTracing(unittest.TestCase):
+    def test_unsampled_calls_get_the_null_trace(self):
+        tracer = Tracer(sample_rate=0.0, registry=Registry())
+        trace = tracer.start("span")
+        self.assertIs(trace, NULL_TRACE)
+        trace.mark("stage")
+        tracer.finish(trace)
+        self.assertEqual(tracer.recent(), [])
+
+    def test_sampled_trace_records_stages(self):
+        registry = Registry()
+        tracer = Tracer(sample_rate=1.0, capacity=2, registry=registry)
+        for i in range(3):
+            trace = tracer.start("span", i=i)
+            trace.mark("first")
+            trace.mark("second")
+            tracer.finish(trace)
+
+        recent = tracer.recent()
+        self.assertEqual([t["attributes"]["i"] for t in recent], [2, 1])
+        self.assertEqual(set(recent[0]["stages_us"]), {"first", "second"})
+        self.assertIn(
+            'ecopulse_stage_seconds_count{span="span",stage="second"} 3', registry.render()
+        )
+
+
+class TestEngineEndpoints(unittest.TestCase):
+    def test_metrics_and_traces_routes(self):
+        state = SensorStateStore(feed_retention=10)
+        for aqi in (90, 120):
+            state.append(calculate_analytics({"sensor_id": "S1", "aqi": aqi}))
+        client = create_shim_app(state).test_client()
+
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        body = response.data.decode()
+        self.assertIn("ecopulse_state_feed_records 2", body)
+        self.assertIn("ecopulse_state_feed_capacity 10", body)
+        self.assertIn("ecopulse_state_sensors 1", body)
+        self.assertIn("# TYPE ecopulse_decode_seconds histogram", body)
+        self.assertIsInstance(client.get("/traces").json, list)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from ecopulse_ai.analytics.prediction import (
+    HoltForecaster,
+    StreamingTrend,
+    get_aqi_forecast,
+    get_forecast_horizon,
+)
+
+
+class TestStreamingTrend(unittest.TestCase):
+    def test_sliding_fit_matches_polyfit(self):
+        """Incremental sufficient statistics reproduce a full least-squares refit."""
+        values = np.random.default_rng(3).normal(100, 10, size=60) + np.arange(60) * 0.8
+        trend = StreamingTrend(window=20)
+        for i, value in enumerate(values):
+            trend.push(value)
+            if i >= 1:
+                recent = values[max(0, i - 19) : i + 1]
+                slope, intercept = np.polyfit(np.arange(len(recent)), recent, 1)
+                predicted = trend.predict(1)["value"]
+                self.assertAlmostEqual(predicted, intercept + slope * len(recent), places=6)
+
+    def test_band_contains_point(self):
+        trend = StreamingTrend(window=10)
+        for value in [50, 52, 55, 53, 58, 60, 61, 65]:
+            trend.push(value)
+        prediction = trend.predict(3)
+        self.assertLess(prediction["lower"], prediction["value"])
+        self.assertGreater(prediction["upper"], prediction["value"])
+
+
+class TestForecastApi(unittest.TestCase):
+    def test_linear_series(self):
+        self.assertEqual(get_aqi_forecast([10, 20, 30, 40, 50]), 60.0)
+
+    def test_insufficient_data(self):
+        self.assertEqual(get_aqi_forecast([10, 20]), "Insufficient data")
+        self.assertEqual(get_forecast_horizon([10, 20])["points"], [])
+
+    def test_holt_horizon_widens(self):
+        history = [100 + 2 * i + (3 if i % 2 else -3) for i in range(30)]
+        points = get_forecast_horizon(history, n_steps=6)["points"]
+        self.assertEqual(len(points), 6)
+        self.assertGreater(points[-1]["value"], history[-1])
+        widths = [p["upper"] - p["lower"] for p in points]
+        self.assertEqual(widths, sorted(widths))
+
+    def test_holt_winters_tracks_season(self):
+        forecaster = HoltForecaster(alpha=0.3, beta=0.05, gamma=0.5, season_length=4)
+        pattern = [10, 30, 10, -10]
+        for i in range(200):
+            forecaster.push(100 + pattern[i % 4])
+        values = [p["value"] for p in forecaster.forecast(4)]
+        np.testing.assert_allclose(values, [100 + p for p in pattern], atol=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
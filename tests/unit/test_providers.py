@@ -0,0 +1,126 @@
+"""
+Unit tests for the EcoPulse AI LLM providers.
+Validates lazy client construction, the deterministic local provider, provider selection,
+and the bounded call pool's queue limits and Copilot degradation under load.
+"""
+
+import subprocess
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from ecopulse_ai.rag import copilot, providers
+from ecopulse_ai.rag.gateway import LLMGateway, SemanticCache
+from ecopulse_ai.rag.providers import (
+    BoundedProvider,
+    LLMBusy,
+    LocalProvider,
+    OpenAIProvider,
+    make_provider,
+)
+
+FACTS = {"aqi": 240, "severity": "Critical", "traffic": 61, "guidelines": ["Close  schools."]}
+
+
+class BlockingProvider:
+    """Holds every call until released, to fill the pool deterministically."""
+
+    name = "blocking"
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def complete(self, task, messages, facts=None, **options):
+        self.entered.set()
+        self.release.wait(5)
+        return "done"
+
+
+class TestOpenAIProvider(unittest.TestCase):
+    def test_client_is_built_on_first_use(self):
+        provider = OpenAIProvider(api_key="test", base_url=None)
+        self.assertIsNone(provider._client)
+        with mock.patch("openai.OpenAI") as factory:
+            self.assertIs(provider.client, provider.client)
+        factory.assert_called_once_with(api_key="test", base_url=None)
+
+    def test_importing_the_web_app_builds_no_client(self):
+        script = (
+            "import openai, sys\n"
+            "openai.OpenAI = lambda *a, **k: sys.exit('client built at import')\n"
+            "import ecopulse_ai.api.routes, ecopulse_ai.analytics.planner\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class TestLocalProvider(unittest.TestCase):
+    def test_answers_are_deterministic_and_use_facts(self):
+        local = LocalProvider()
+        answer = local.complete("copilot", [], FACTS)
+        self.assertEqual(answer, local.complete("copilot", [], FACTS))
+        self.assertIn("AQI: 240", answer)
+        self.assertIn("Guideline: Close schools.", answer)
+        self.assertEqual("".join(local.stream("copilot", [], FACTS)), answer)
+
+    def test_selection(self):
+        self.assertIsInstance(make_provider("local"), LocalProvider)
+        self.assertIsInstance(make_provider("openai"), OpenAIProvider)
+        with (
+            mock.patch.object(providers, "OPENAI_API_KEY", providers.PLACEHOLDER_KEY),
+            mock.patch.object(providers, "OPENAI_BASE_URL", None),
+        ):
+            self.assertIsInstance(make_provider("auto"), LocalProvider)
+        with mock.patch.object(providers, "OPENAI_BASE_URL", "http://localhost:8000/v1"):
+            self.assertIsInstance(make_provider("auto"), OpenAIProvider)
+        with self.assertRaises(ValueError):
+            make_provider("bard")
+
+
+class TestBoundedProvider(unittest.TestCase):
+    def _saturate(self, pool):
+        backend = pool.provider
+        worker = threading.Thread(target=pool.complete, args=("copilot", []))
+        worker.start()
+        self.assertTrue(backend.entered.wait(5))
+        self.addCleanup(worker.join)
+        self.addCleanup(backend.release.set)
+
+    def test_full_queue_is_refused_immediately(self):
+        pool = BoundedProvider(BlockingProvider(), max_concurrency=1, max_queue=0)
+        self._saturate(pool)
+        with self.assertRaisesRegex(LLMBusy, "queue full"):
+            pool.complete("copilot", [])
+
+    def test_queued_caller_times_out(self):
+        pool = BoundedProvider(
+            BlockingProvider(), max_concurrency=1, max_queue=1, queue_timeout=0.05
+        )
+        self._saturate(pool)
+        with self.assertRaisesRegex(LLMBusy, "No LLM slot"):
+            pool.complete("copilot", [])
+        self.assertEqual(pool.waiting, 0)
+
+    def test_slot_is_released_after_stream_and_errors(self):
+        pool = BoundedProvider(LocalProvider(), max_concurrency=1, max_queue=0)
+        self.assertTrue(list(pool.stream("copilot", [], FACTS)))
+        with self.assertRaises(KeyError):
+            pool.complete("unknown", [])
+        self.assertTrue(pool.complete("copilot", [], FACTS))
+
+    def test_copilot_degrades_to_local_answer_when_busy(self):
+        busy = mock.Mock(complete=mock.Mock(side_effect=LLMBusy("queue full")))
+        with (
+            mock.patch.object(copilot, "get_provider", return_value=busy),
+            mock.patch.object(copilot, "get_gateway", return_value=LLMGateway(SemanticCache())),
+            mock.patch.object(copilot, "retrieve_guidelines", return_value=[]),
+        ):
+            answer = copilot.ask_copilot("Jog today?", {"aqi": 240, "severity": "Critical"}, [])
+        self.assertTrue(answer.startswith("[SIMULATION MODE]"))
+        self.assertIn("AQI: 240", answer)
+
+
+if __name__ == "__main__":
+    unittest.main()
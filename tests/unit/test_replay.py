@@ -0,0 +1,93 @@
+"""
+Unit tests for the EcoPulse AI capture replay.
+Validates schema normalization, chunked mmap line scanning, hour-aligned batching and
+time-scaled pacing against a simulated clock.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from ecopulse_ai.streaming.replay import analytics_sink, normalize_records, replay, scan_lines
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+START = datetime(2026, 2, 25, 9, 59, 50)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "capture.jsonl")
+        with open(self.path, "w") as f:
+            for i in range(20):
+                record = {
+                    "timestamp": (START + timedelta(seconds=i)).isoformat(),
+                    "aqi": 50.0 + i,
+                    "temp": 25.0,
+                    "industrial_emission": 10.0 + i,
+                }
+                f.write(json.dumps(record) + "\n")
+                if i == 4:
+                    f.write("\n")  # blank lines are skipped
+
+    def test_normalize_renames_legacy_fields(self):
+        records = normalize_records([{"temp": 1.0, "industrial_emission": 2.0}])
+        self.assertEqual(records, [{"temperature": 1.0, "industrial_index": 2.0}])
+        kept = normalize_records([{"temp": 1.0, "temperature": 3.0}])
+        self.assertEqual(kept, [{"temperature": 3.0}])
+
+    def test_scan_lines_across_small_chunks(self):
+        batches = list(scan_lines(self.path, batch_size=6, chunk_bytes=64))
+        self.assertEqual([len(b) for b in batches], [6, 6, 6, 2])
+        self.assertEqual(json.loads(batches[-1][-1])["aqi"], 69.0)
+
+    def test_max_speed_splits_batches_on_event_hour(self):
+        seen = []
+        stats = replay(self.path, lambda records, hour: seen.append((len(records), hour)))
+        self.assertEqual(stats.records, 20)
+        self.assertEqual(seen, [(10, 9), (10, 10)])
+
+    def test_time_scaled_replay_follows_event_clock(self):
+        clock = FakeClock()
+        emitted = []
+        replay(
+            self.path,
+            lambda records, hour: emitted.append((clock.now, len(records))),
+            speed=2.0,
+            batch_size=8,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+        self.assertEqual(sum(n for _, n in emitted), 20)
+        # 19 seconds of event time at 2x speed take 9.5 simulated seconds
+        self.assertAlmostEqual(clock.now - 1000.0, 9.5)
+        self.assertTrue(all(s > 0 for s in clock.sleeps))
+
+    def test_limit_and_analytics_sink(self):
+        state = SensorStateStore()
+        stats = replay(self.path, analytics_sink(state), limit=7)
+        self.assertEqual(stats.records, 7)
+        latest = state.latest()
+        self.assertEqual(latest["temperature"], 25.0)
+        self.assertEqual(latest["industrial_index"], 16.0)
+        self.assertIn("severity", latest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the EcoPulse AI report job queue.
+Validates background rendering, window de-duplication, unique artifact paths, failed
+submissions and report folder retention.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from ecopulse_ai.reports.jobs import ReportJobQueue
+
+SAMPLE = [
+    {
+        "timestamp": "2026-02-25T14:20:01",
+        "aqi": 142.0,
+        "health_score": 61.0,
+        "severity": "Warning",
+        "attribution": {"traffic": 40.0, "industrial": 30.0, "wind_impact": 20.0},
+        "carbon_footprint": {"total_equivalent": 1800.0},
+    }
+]
+
+
+class TestReportJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _queue(self, **kwargs):
+        queue = ReportJobQueue(
+            report_dir=self.tmp.name,
+            executor_factory=lambda: ThreadPoolExecutor(max_workers=2),
+            **kwargs,
+        )
+        self.addCleanup(queue.shutdown)
+        return queue
+
+    def test_job_renders_pdf_in_background(self):
+        queue = self._queue()
+        job = queue.submit("mayor", SAMPLE)
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.status, "done")
+        self.assertTrue(os.path.exists(job.path))
+        self.assertFalse(os.path.exists(job.path + ".partial"))
+        self.assertIs(queue.get(job.id), job)
+
+    def test_identical_requests_share_one_artifact(self):
+        queue = self._queue(dedupe_window=3600)
+        first = queue.submit("full", SAMPLE)
+        second = queue.submit("full", SAMPLE)
+        other = queue.submit("mayor", SAMPLE)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertNotEqual(first.path, other.path)
+
+    def test_without_window_every_request_gets_a_unique_path(self):
+        queue = self._queue(dedupe_window=0)
+        jobs = [queue.submit("full", SAMPLE) for _ in range(3)]
+        for job in jobs:
+            job.wait(30)
+        self.assertEqual(len({job.path for job in jobs}), 3)
+
+    def test_failed_submit_registers_no_job(self):
+        broken = mock.Mock(submit=mock.Mock(side_effect=RuntimeError("pool broken")))
+        pools = [ThreadPoolExecutor(max_workers=1), broken, broken]  # popped from the end
+        queue = ReportJobQueue(
+            report_dir=self.tmp.name, dedupe_window=3600, executor_factory=pools.pop
+        )
+        self.addCleanup(queue.shutdown)
+        with self.assertRaises(RuntimeError):
+            queue.submit("full", SAMPLE)
+        self.assertEqual(queue._by_key, {})
+        job = queue.submit("full", SAMPLE)
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.status, "done")
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._queue().submit("quarterly", SAMPLE)
+
+    def test_retention_evicts_oldest_and_expired(self):
+        queue = self._queue(max_files=2, retention_seconds=3600)
+        now = time.time()
+        for i, age in enumerate([10, 20, 30, 7200]):
+            path = os.path.join(self.tmp.name, f"old_{i}.pdf")
+            open(path, "wb").close()
+            os.utime(path, (now - age, now - age))
+
+        removed = {os.path.basename(p) for p in queue.evict()}
+        self.assertEqual(removed, {"old_2.pdf", "old_3.pdf"})
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["old_0.pdf", "old_1.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
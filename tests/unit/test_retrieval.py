@@ -0,0 +1,100 @@
+"""
+Unit tests for the EcoPulse AI guideline retrieval.
+Validates document chunking, the hashed TF-IDF embedder, the memory-mapped index and
+its rebuild on source changes, and injection of retrieved passages into Copilot prompts.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from ecopulse_ai.rag import copilot
+from ecopulse_ai.rag.document_store import chunk_markdown, load_documents
+from ecopulse_ai.rag.retrieval import GuidelineRetriever, HashingEmbedder, VectorIndex
+
+GUIDE = """# Safety
+## Schools
+- Close schools when AQI is Severe for two consecutive days.
+## Indoor Air
+- Ventilate offices when CO2 exceeds 1000 ppm.
+"""
+
+
+class TestDocuments(unittest.TestCase):
+    def test_chunks_follow_headings_and_size(self):
+        chunks = chunk_markdown(GUIDE, "guide.md")
+        self.assertEqual([c["section"] for c in chunks], ["Schools", "Indoor Air"])
+        long = chunk_markdown("## Long\n" + "word " * 200, "long.md", max_chars=100)
+        self.assertGreater(len(long), 5)
+        self.assertTrue(all(len(c["text"]) <= 100 for c in long))
+
+    def test_builtin_guidelines_are_loaded(self):
+        chunks = load_documents([])
+        self.assertIn("CO2_HIGH", [c["section"] for c in chunks])
+
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "guide.md")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(GUIDE)
+        self.index_dir = os.path.join(self.tmp.name, "index")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_embedder_is_deterministic_and_normalized(self):
+        a, b = HashingEmbedder(dim=256), HashingEmbedder(dim=256)
+        vectors = a.embed(["school closure", ""])
+        np.testing.assert_array_equal(vectors, b.embed(["school closure", ""]))
+        self.assertAlmostEqual(float(np.linalg.norm(vectors[0])), 1.0, places=5)
+        self.assertEqual(float(np.abs(vectors[1]).sum()), 0.0)
+
+    def test_top_k_search_over_memmap(self):
+        retriever = GuidelineRetriever([self.source], self.index_dir, refresh=0.0)
+        hits = retriever.retrieve("Should schools stay open if AQI is severe?", k=2)
+        self.assertEqual(hits[0]["section"], "Schools")
+        self.assertGreaterEqual(hits[0]["score"], hits[-1]["score"])
+        self.assertIsInstance(VectorIndex.open(self.index_dir).vectors, np.memmap)
+
+        # a fresh process reuses the committed index and its IDF weights
+        reopened = GuidelineRetriever([self.source], self.index_dir)
+        with mock.patch.object(VectorIndex, "build") as build:
+            self.assertEqual(reopened.retrieve("schools severe AQI", k=2)[0]["section"], "Schools")
+        build.assert_not_called()
+
+    def test_rebuilds_when_sources_change(self):
+        retriever = GuidelineRetriever([self.source], self.index_dir, refresh=0.0)
+        self.assertEqual(len(retriever._current()), 6)
+        with open(self.source, "a", encoding="utf-8") as f:
+            f.write("## Heat\n- Open cooling centres during heat waves.\n")
+        hits = retriever.retrieve("cooling centres heat", k=1)
+        self.assertEqual(hits[0]["section"], "Heat")
+        self.assertEqual(len(retriever._current()), 7)
+
+
+class TestCopilotContext(unittest.TestCase):
+    def test_prompt_carries_retrieved_guidelines(self):
+        passage = {"source": "guide.md", "section": "Schools", "text": "Close schools.", "score": 1}
+        retriever = mock.Mock(retrieve=mock.Mock(return_value=[passage]))
+        with (
+            mock.patch.object(copilot, "get_retriever", return_value=retriever),
+            mock.patch.object(copilot, "get_provider") as get_provider,
+        ):
+            provider = get_provider.return_value
+            provider.complete.return_value = "ok"
+            self.assertEqual(copilot.ask_copilot("Close schools?", {"aqi": 420}, []), "ok")
+        prompt = provider.complete.call_args.args[1][1]["content"]
+        self.assertIn("[1] guide.md > Schools: Close schools.", prompt)
+
+    def test_retrieval_failure_degrades_to_no_context(self):
+        with mock.patch.object(copilot, "get_retriever", side_effect=OSError("read-only")):
+            self.assertEqual(copilot.retrieve_guidelines("anything"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from ecopulse_ai.analytics.prediction import calculate_volatility
+from ecopulse_ai.analytics.rolling import EWMA, RollingStats, RollingWindow
+
+
+class TestRollingWindow(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(7).normal(120, 35, size=200)
+
+    def test_matches_numpy_over_sliding_window(self):
+        """Incremental mean/std/min/max/quantiles agree with a full recompute."""
+        window = RollingWindow(size=11)
+        for i, value in enumerate(self.values):
+            window.push(value)
+            recent = self.values[max(0, i - 10) : i + 1]
+            self.assertAlmostEqual(window.mean(), recent.mean(), places=6)
+            self.assertAlmostEqual(window.std(), recent.std(), places=6)
+            self.assertEqual(window.min(), recent.min())
+            self.assertEqual(window.max(), recent.max())
+            self.assertAlmostEqual(window.quantile(0.95), np.quantile(recent, 0.95), places=6)
+
+    def test_full_flag(self):
+        window = RollingWindow(size=3)
+        window.push(1)
+        window.push(2)
+        self.assertFalse(window.full)
+        window.push(3)
+        self.assertTrue(window.full)
+        self.assertEqual(window.last, 3.0)
+
+    def test_ewma_converges(self):
+        ewma = EWMA(span=5)
+        for _ in range(100):
+            ewma.push(42.0)
+        self.assertAlmostEqual(ewma.value, 42.0)
+        self.assertAlmostEqual(ewma.std(), 0.0)
+
+
+class TestRollingStats(unittest.TestCase):
+    def test_tracks_every_metric(self):
+        stats = RollingStats(window=4)
+        for i in range(6):
+            stats.update({"aqi": 100 + i, "co2": 400 + 10 * i, "temperature": "bad"})
+        self.assertEqual(stats["aqi"].mean(), 103.5)
+        self.assertEqual(stats["co2"].max(), 450.0)
+        self.assertEqual(len(stats["temperature"]), 0)
+
+    def test_volatility_reads_live_window(self):
+        """The forecast module reads the engine's rolling window directly."""
+        window = RollingWindow(size=20)
+        for value in [10, 20, 30, 40, 50]:
+            window.push(value)
+        self.assertAlmostEqual(calculate_volatility(window), np.std([10, 20, 30, 40, 50]))
+        self.assertAlmostEqual(
+            calculate_volatility([10, 20, 30, 40, 50]), np.std([10, 20, 30, 40, 50])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for the EcoPulse AI what-if simulation.
+Validates scenario axis parsing, agreement of the vectorized surfaces with the scalar
+simulation, memoization per data version, and the engine simulate route.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ecopulse_ai.analytics.simulation import (
+    SIMULATION_CACHE,
+    parse_axis,
+    parse_surfaces,
+    scenario_factors,
+    scenario_grid,
+    simulate_window,
+)
+from ecopulse_ai.config import THRESHOLDS
+from ecopulse_ai.streaming.pathway_pipeline import apply_simulation, create_shim_app
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+T0 = datetime(2026, 1, 5, 13, 0, 0)
+
+
+class TestScenarioAxes(unittest.TestCase):
+    def test_parse_axis(self):
+        self.assertEqual(parse_axis("0:20:5").tolist(), [0, 5, 10, 15, 20])
+        self.assertEqual(parse_axis("12,3,130", step=5).tolist(), [5, 10, 100])
+        self.assertEqual(parse_axis(None).tolist(), [0])
+        for spec in ("0:10:0", "a,b", "0:10:5:1", "nan", "10,inf", "0:nan:5", "50:10"):
+            with self.assertRaises(ValueError):
+                parse_axis(spec)
+
+    def test_parse_surfaces(self):
+        self.assertEqual(parse_surfaces("aqi, p95"), ("aqi", "p95"))
+        with self.assertRaises(ValueError):
+            parse_surfaces("aqi,ozone")
+
+
+class TestSurfaces(unittest.TestCase):
+    def setUp(self):
+        self.window = np.random.default_rng(4).uniform(40, 300, 120)
+        self.axes = {
+            "traffic_reduction": parse_axis("0:80:20"),
+            "industrial_restriction": parse_axis("0:100:25"),
+            "green_cover": parse_axis("0:50:25"),
+        }
+
+    def test_matches_scalar_simulation(self):
+        surfaces = simulate_window(self.window, scenario_factors(self.axes))
+        self.assertEqual(surfaces["aqi"].shape, (5, 5, 3))
+        warning = THRESHOLDS["AQI"]["warning"]
+        for i, t in enumerate(self.axes["traffic_reduction"]):
+            for j, ind in enumerate(self.axes["industrial_restriction"]):
+                for k, g in enumerate(self.axes["green_cover"]):
+                    params = {
+                        "traffic_reduction": t,
+                        "industrial_restriction": ind,
+                        "green_cover": g,
+                    }
+                    scaled = [apply_simulation(v, params) for v in self.window]
+                    self.assertAlmostEqual(surfaces["aqi"][i, j, k], scaled[-1], places=1)
+                    self.assertAlmostEqual(surfaces["mean"][i, j, k], np.mean(scaled), places=1)
+                    exceed = surfaces["exceedance"][i, j, k]
+                    self.assertAlmostEqual(exceed, np.mean(np.array(scaled) >= warning), delta=0.01)
+
+    def test_grid_limit_and_empty_window(self):
+        with self.assertRaises(ValueError):
+            scenario_grid(self.window, self.axes, max_scenarios=10)
+        grid = scenario_grid(np.array([np.nan]), self.axes, surfaces=("aqi",))
+        self.assertIsNone(grid["baseline"]["aqi"])
+        self.assertEqual(grid["window"], 0)
+
+
+class TestEngineSimulate(unittest.TestCase):
+    def _records(self, start, n):
+        return [
+            {
+                "sensor_id": "S1",
+                "district": "Industrial North",
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "aqi": 100.0 + 10 * i,
+                "co2": 400.0,
+                "pm25": 30.0,
+            }
+            for i in range(start, start + n)
+        ]
+
+    def test_memoized_per_data_version(self):
+        state = SensorStateStore()
+        client = create_shim_app(state).test_client()
+        self.assertEqual(client.get("/simulate").json, {})
+
+        state.append_batch(self._records(0, 5), hour=13)
+        query = (
+            "/simulate?sensor_id=S1&traffic_reduction=0:80:10"
+            "&industrial_restriction=0,50&metrics=aqi"
+        )
+        misses = SIMULATION_CACHE.labels("miss").value
+        first = client.get(query).json
+        self.assertEqual(first["baseline"], {"aqi": 140.0})
+        self.assertEqual(np.array(first["surfaces"]["aqi"]).shape, (9, 2, 1))
+        self.assertAlmostEqual(first["surfaces"]["aqi"][8][1][0], 140.0 * 0.68 * 0.75)
+
+        # slider positions that quantize to the same grid are served from the cache
+        self.assertEqual(client.get(query.replace("0,50", "1,49")).json, first)
+        self.assertEqual(SIMULATION_CACHE.labels("miss").value, misses + 1)
+
+        # another sensor's readings leave this sensor's surfaces cached
+        other = [{**r, "sensor_id": "S2"} for r in self._records(0, 3)]
+        state.append_batch(other, hour=13)
+        self.assertEqual(client.get(query).json, first)
+        self.assertEqual(SIMULATION_CACHE.labels("miss").value, misses + 1)
+
+        state.append_batch(self._records(5, 1), hour=13)
+        second = client.get(query).json
+        self.assertEqual(second["version"], first["version"] + 1)
+        self.assertEqual(second["baseline"], {"aqi": 150.0})
+        for spec in ("0:100:0.001", "nan", "50:10"):
+            self.assertEqual(client.get(f"/simulate?green_cover={spec}").status_code, 400)
+
+    def test_unknown_sensor_is_rejected_without_allocating(self):
+        state = SensorStateStore()
+        state.append_batch(self._records(0, 5), hour=13)
+        client = create_shim_app(state).test_client()
+        for i in range(50):
+            response = client.get(f"/simulate?sensor_id=ghost-{i}&traffic_reduction=0:50:10")
+            self.assertEqual(response.status_code, 404)
+        self.assertEqual(state.occupancy()["sensors"], 1)
+        self.assertEqual(client.get("/simulate?sensor_id=S1").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
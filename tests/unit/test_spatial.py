@@ -0,0 +1,122 @@
+"""
+Unit tests for the EcoPulse AI spatial aggregation.
+Validates grid index queries, incremental per-region mean/p95/trend maintenance, and
+the engine's district, national and sensor endpoints built on the state store.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ecopulse_ai.analytics.spatial import SpatialAggregator, SpatialIndex, parse_bbox
+from ecopulse_ai.streaming.pathway_pipeline import create_shim_app, vulnerability_class
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+T0 = datetime(2026, 1, 5, 13, 0, 0)
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def test_bbox_query_and_moves(self):
+        index = SpatialIndex(cell=0.1)
+        index.place("a", 19.01, 72.81)
+        index.place("b", 19.25, 72.95)
+        index.place("c", 28.61, 77.20)
+        self.assertEqual(sorted(index.within((18.9, 72.7, 19.3, 73.0))), ["a", "b"])
+        self.assertEqual(index.within((19.0, 72.8, 19.02, 72.82)), ["a"])
+
+        index.place("a", 28.60, 77.21)  # moved between cells
+        self.assertEqual(sorted(index.within((28.0, 77.0, 29.0, 78.0))), ["a", "c"])
+        self.assertEqual(index.within((18.9, 72.7, 19.3, 73.0)), ["b"])
+        index.remove("c")
+        self.assertEqual(len(index), 2)
+
+    def test_parse_bbox(self):
+        self.assertEqual(parse_bbox("18.9,72.7,19.3,73"), (18.9, 72.7, 19.3, 73.0))
+        with self.assertRaises(ValueError):
+            parse_bbox("19.3,72.7,18.9,73")
+
+
+class TestSpatialAggregator(unittest.TestCase):
+    def test_latest_reading_replaces_previous(self):
+        regions = SpatialAggregator()
+        keys = [("Industrial North", f"S{i}") for i in range(40)]
+        rng = np.random.default_rng(3)
+        for _ in range(5):
+            values = rng.uniform(20, 400, len(keys))
+            regions.update(keys, values)
+
+        (district,) = regions.summary("district")
+        self.assertEqual(district["sensors"], 40)
+        self.assertAlmostEqual(district["aqi"], round(values.mean(), 2), places=6)
+        self.assertLessEqual(abs(district["p95"] - np.percentile(values, 95)), 5.0)
+        (state,) = regions.summary("state")
+        self.assertEqual((state["name"], state["sensors"]), ("IN-MH", 40))
+
+    def test_trend_and_reported_state(self):
+        regions = SpatialAggregator()
+        for value in (50, 50, 50):
+            regions.update([("Green Belt West", "G1")], [value])
+        self.assertEqual(regions.summary()[0]["trend"], "Stable")
+        for value in (80, 110, 140):
+            regions.update([("Green Belt West", "G1")], [value])
+        self.assertEqual(regions.summary()[0]["trend"], "Rising")
+
+        regions.update([("Connaught Place", "D1")], [300.0], [(28.63, 77.22)], ["IN-DL"])
+        states = {s["name"]: s["sensors"] for s in regions.summary("state")}
+        self.assertEqual(states, {"IN-MH": 1, "IN-DL": 1})
+        self.assertEqual(regions.sensors((28.0, 77.0, 29.0, 78.0))[0]["sensor_id"], "D1")
+
+    def test_vulnerability_classes(self):
+        self.assertEqual(
+            [vulnerability_class(v) for v in (20, 60, 150, 250)],
+            ["Minimal", "Low", "High", "Critical"],
+        )
+
+
+class TestEngineRegionEndpoints(unittest.TestCase):
+    def test_district_and_national_views_read_aggregates(self):
+        state = SensorStateStore()
+        client = create_shim_app(state).test_client()
+        self.assertEqual(client.get("/district_comparison").json, [])
+
+        records = []
+        for i, (district, sensor, aqi) in enumerate(
+            [
+                ("Industrial North", "N1", 240.0),
+                ("Industrial North", "N2", 260.0),
+                ("Green Belt West", "G1", 40.0),
+                ("Industrial North", "N1", 220.0),  # supersedes N1's first reading
+            ]
+        ):
+            records.append(
+                {
+                    "sensor_id": sensor,
+                    "district": district,
+                    "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                    "aqi": aqi,
+                    "lat": 19.2 + i * 0.001,
+                    "lon": 72.97,
+                }
+            )
+        state.append_batch(records, hour=13)
+
+        districts = client.get("/district_comparison").json
+        self.assertEqual([d["name"] for d in districts], ["Industrial North", "Green Belt West"])
+        north = districts[0]
+        self.assertEqual((north["aqi"], north["sensors"]), (240.0, 2))
+        self.assertEqual((north["risk"], north["vulnerability"]), ("Industrial", "Critical"))
+        self.assertEqual(districts[1]["vulnerability"], "Minimal")
+
+        national = client.get("/national_metrics").json
+        self.assertEqual(
+            [(s["id"], s["name"], s["sensors"]) for s in national], [("IN-MH", "Maharashtra", 3)]
+        )
+
+        inside = client.get("/sensors?bbox=19.2,72.9,19.2025,73.0").json
+        self.assertEqual(sorted(s["sensor_id"] for s in inside), ["G1", "N2"])
+        self.assertEqual(client.get("/sensors?bbox=1,2,3").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
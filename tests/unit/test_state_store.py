@@ -0,0 +1,75 @@
+"""
+Unit tests for the EcoPulse AI streaming state store.
+Validates ring-buffer wrap-around, zero-copy windows, per-sensor partitioning, and that
+request-supplied sensor keys never allocate state.
+"""
+
+import unittest
+
+import numpy as np
+
+from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics, create_shim_app
+from ecopulse_ai.streaming.state_store import RingBuffer, SensorStateStore
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_wraparound_keeps_latest_in_order(self):
+        """Only the most recent `capacity` records are retained, oldest first."""
+        buffer = RingBuffer(capacity=4)
+        for i in range(10):
+            buffer.append({"aqi": float(i), "timestamp": f"t{i}"})
+
+        self.assertEqual(len(buffer), 4)
+        np.testing.assert_array_equal(buffer.column("aqi"), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual([r["timestamp"] for r in buffer.records()], ["t6", "t7", "t8", "t9"])
+
+    def test_window_is_a_view(self):
+        """Windowed reads must share memory with the buffer instead of copying."""
+        buffer = RingBuffer(capacity=8)
+        for i in range(12):
+            buffer.append({"aqi": float(i)})
+
+        window = buffer.column("aqi", 3)
+        np.testing.assert_array_equal(window, [9.0, 10.0, 11.0])
+        self.assertTrue(np.shares_memory(window, buffer._values))
+
+    def test_records_round_trip_nested_fields(self):
+        """Non-numeric fields survive storage alongside the metric columns."""
+        buffer = RingBuffer(capacity=2)
+        buffer.append({"aqi": 50.0, "severity": "Optimal", "attribution": {"traffic": 40.0}})
+        latest = buffer.latest()
+        self.assertEqual(latest["severity"], "Optimal")
+        self.assertEqual(latest["attribution"], {"traffic": 40.0})
+        self.assertNotIn("co2", latest)
+
+
+class TestSensorStateStore(unittest.TestCase):
+    def test_sensors_are_partitioned(self):
+        """Momentum is computed against the record's own sensor, not the shared feed."""
+        store = SensorStateStore(retention=16, feed_retention=16)
+        for sensor_id, aqi in [("A", 50.0), ("B", 200.0), ("A", 60.0)]:
+            record = {"sensor_id": sensor_id, "district": "North", "aqi": aqi}
+            store.append(calculate_analytics(record, history=store.history_for(record)))
+
+        latest = store.latest()
+        self.assertEqual(latest["sensor_id"], "A")
+        self.assertEqual(latest["aqi_momentum"], 10.0)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(len(store.snapshot()), 3)
+
+    def test_unknown_sensor_forecast_allocates_nothing(self):
+        store = SensorStateStore()
+        for aqi in range(100, 110):
+            store.append({"sensor_id": "A", "district": "North", "aqi": float(aqi)})
+        client = create_shim_app(store).test_client()
+
+        self.assertEqual(client.get("/forecast").json["next"], 110.0)
+        for i in range(50):
+            response = client.get(f"/forecast?sensor_id=ghost-{i}")
+            self.assertEqual(response.status_code, 404)
+        self.assertIsNone(store.forecast({"sensor_id": "ghost-0"}))
+        self.assertEqual(len(store._forecasters), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
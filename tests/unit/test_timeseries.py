@@ -0,0 +1,161 @@
+"""
+Unit tests for the EcoPulse AI time-series archive.
+Validates time-range scans, sensor partitioning, rollup correctness, that compaction
+and retention preserve query results, and that consumers flush the archive on shutdown.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+
+from ecopulse_ai.storage.timeseries import Partition, TimeSeriesStore
+from ecopulse_ai.streaming import pathway_pipeline
+from ecopulse_ai.streaming.state_store import SensorStateStore
+
+START = datetime(2026, 2, 25, 10, 0, 0)
+
+
+def _records(sensor, district, n, step_seconds=30, base=100.0):
+    return [
+        {
+            "timestamp": (START + timedelta(seconds=i * step_seconds)).isoformat(),
+            "sensor_id": sensor,
+            "district": district,
+            "aqi": base + i,
+            "co2": 400.0 + i,
+            "health_score": 70.0,
+            "severity": "Warning",
+        }
+        for i in range(n)
+    ]
+
+
+class TestTimeSeriesStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = TimeSeriesStore(
+            root=self.tmp.name,
+            segment_rows=64,
+            flush_rows=10**6,
+            flush_seconds=10**6,
+            raw_retention_days=10**5,
+        )
+
+    def _fill(self):
+        # 240 readings at 30 s spacing = 2 hours per sensor
+        self.store.append_batch(_records("S1", "Industrial North", 240))
+        self.store.append_batch(_records("S2", "Green Belt / West", 240, base=50.0))
+        self.store.flush()
+
+    def test_time_range_scan_per_sensor(self):
+        self._fill()
+        window = self.store.scan(
+            START + timedelta(minutes=10), START + timedelta(minutes=20), sensor_id="S1"
+        )
+        self.assertEqual(len(window["ts"]), 20)
+        np.testing.assert_array_equal(window["aqi"], np.arange(120.0, 140.0))
+        self.assertTrue(np.all(np.diff(window["ts"]) > 0))
+        self.assertEqual(set(window["sensor_id"]), {"S1"})
+        self.assertEqual(window["severity"][0], "Warning")
+
+    def test_partitions_round_trip_special_characters(self):
+        self._fill()
+        self.assertEqual(
+            self.store.partitions(), [("Green Belt / West", "S2"), ("Industrial North", "S1")]
+        )
+        self.assertEqual(len(self.store.scan(district="Green Belt / West")["ts"]), 240)
+
+    def test_rollups_match_raw_aggregates(self):
+        self._fill()
+        hourly = self.store.rollup("1h", sensor_id="S1")
+        np.testing.assert_array_equal(hourly["count"], [120, 120])
+        np.testing.assert_allclose(hourly["aqi_mean"], [100 + 59.5, 220 + 59.5])
+        np.testing.assert_array_equal(hourly["aqi_max"], [219.0, 339.0])
+
+        # Combined across sensors: one bucket per minute, two readings per sensor each
+        minute = self.store.rollup("1m")
+        self.assertEqual(len(minute["bucket"]), 120)
+        self.assertTrue(np.all(minute["count"] == 4))
+
+    def test_mean_ignores_readings_missing_the_metric(self):
+        records = _records("S1", "Industrial North", 2)
+        records[0]["pm25"] = 10.0  # the second reading has no pm25
+        self.store.append_batch(records)
+        self.store.flush()
+        for chunk in (self.store.rollup("1h"), self.store.rollup("1d")):
+            self.assertEqual(chunk["count"][0], 2)
+            self.assertEqual(chunk["pm25_mean"][0], 10.0)
+            self.assertEqual(chunk["pm25_min"][0], 10.0)
+
+    def test_compaction_preserves_queries(self):
+        for chunk in range(4):  # several flushes -> partial rollups and segments
+            self.store.append_batch(_records("S1", "Industrial North", 240)[chunk::4])
+            self.store.flush()
+        before_raw = self.store.scan(sensor_id="S1")
+        before_daily = self.store.rollup("1d", sensor_id="S1")
+
+        self.store.compact()
+        partition = self.store._partition(("Industrial North", "S1"))
+        files = os.listdir(partition.path)
+        self.assertFalse([f for f in files if f.startswith(("active-", "rollup-1d-"))])
+        manifest = partition.manifest()
+        self.assertIn(manifest["rollups"]["1d"], files)
+        self.assertEqual(len(manifest["segments"]), 4)  # 240 rows in 64-row segments
+
+        after_raw = self.store.scan(sensor_id="S1")
+        np.testing.assert_array_equal(after_raw["ts"], np.sort(before_raw["ts"]))
+        after_daily = self.store.rollup("1d", sensor_id="S1")
+        np.testing.assert_array_equal(after_daily["count"], before_daily["count"])
+        np.testing.assert_allclose(after_daily["aqi_mean"], before_daily["aqi_mean"])
+
+    def test_readers_never_see_a_compaction_half_applied(self):
+        for chunk in range(4):
+            self.store.append_batch(_records("S1", "Industrial North", 240)[chunk::4])
+            self.store.flush()
+        self.store.compact()  # leaves small segments for the next compaction to merge
+        self.store.append_batch(_records("S1", "Industrial North", 10, base=500.0))
+        self.store.flush()
+        expected = (len(self.store.scan()["ts"]), self.store.rollup("1d")["count"].tolist())
+        commit = Partition._commit
+
+        def commit_between_reads(partition, manifest):
+            # New files exist but are unpublished; after the commit the old ones still do
+            seen.append((len(self.store.scan()["ts"]), self.store.rollup("1d")["count"].tolist()))
+            commit(partition, manifest)
+            seen.append((len(self.store.scan()["ts"]), self.store.rollup("1d")["count"].tolist()))
+
+        seen = []
+        self.store.segment_rows = 1024  # every segment is now small and gets merged
+        with mock.patch.object(Partition, "_commit", commit_between_reads):
+            self.store.compact()
+        self.assertEqual(seen, [expected, expected])
+        self.assertEqual(len(self.store._partition(("Industrial North", "S1")).segments()), 1)
+
+    def test_retention_drops_raw_but_keeps_rollups(self):
+        self._fill()
+        self.store.raw_retention = 0  # everything from 2026-02-25 is now "old"
+        self.store.compact()
+        self.assertEqual(len(self.store.scan(sensor_id="S1")["ts"]), 0)
+        self.assertEqual(int(self.store.rollup("1d", sensor_id="S1")["count"][0]), 240)
+
+
+class TestConsumerShutdown(unittest.TestCase):
+    def test_consumer_thread_closes_archive_on_stop(self):
+        stop = threading.Event()
+        consumer = mock.Mock()
+        consumer.consume.side_effect = lambda *args: stop.set() or []
+        archive = mock.Mock()
+        with mock.patch.object(pathway_pipeline, "Consumer", return_value=consumer):
+            pathway_pipeline.kafka_consumer_worker(SensorStateStore(), archive, stop)
+        consumer.close.assert_called_once_with()
+        archive.close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
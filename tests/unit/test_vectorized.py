@@ -0,0 +1,95 @@
+"""
+Unit tests for the micro-batched, vectorized analytics path.
+The batch kernels must reproduce the single-record `calculate_analytics` results.
+"""
+
+import json
+import math
+import random
+import unittest
+from datetime import datetime
+
+from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics, calculate_analytics_batch
+from ecopulse_ai.streaming.state_store import SensorStateStore
+from ecopulse_ai.streaming.vectorized import decode_batch
+
+
+def _synthetic_records(n: int, sensors: int = 3):
+    rng = random.Random(11)
+    return [
+        {
+            "sensor_id": f"S{i % sensors}",
+            "aqi": rng.uniform(20, 380),
+            "pm25": rng.uniform(5, 120),
+            "co2": rng.uniform(350, 1500),
+            "temperature": rng.uniform(15, 40),
+            "humidity": rng.uniform(20, 90),
+            "wind_speed": rng.uniform(0, 25),
+            "traffic_density": rng.uniform(0, 100),
+            "industrial_index": rng.uniform(0, 60),
+        }
+        for i in range(n)
+    ]
+
+
+class TestBatchParity(unittest.TestCase):
+    FIELDS = (
+        "attribution",
+        "severity",
+        "carbon_footprint",
+        "heat_pollution_index",
+        "dispersion_factor",
+        "aqi_momentum",
+        "volatility",
+    )
+
+    def test_batch_matches_scalar(self):
+        """Every derived field agrees with the scalar path, including per-sensor state."""
+        records = _synthetic_records(90)
+
+        scalar_histories = {}
+        expected = []
+        for record in records:
+            history = scalar_histories.setdefault(record["sensor_id"], [])
+            enriched = calculate_analytics(dict(record), history=history)
+            history.append(enriched)
+            expected.append(enriched)
+
+        store = SensorStateStore()
+        actual = []
+        for start in range(0, len(records), 25):
+            batch = [dict(r) for r in records[start : start + 25]]
+            actual.extend(calculate_analytics_batch(batch, state=store, hour=datetime.now().hour))
+
+        self.assertEqual(len(actual), len(expected))
+        for exp, act in zip(expected, actual):
+            for field in self.FIELDS:
+                if isinstance(exp[field], float):
+                    self.assertAlmostEqual(exp[field], act[field], places=1, msg=field)
+                else:
+                    self.assertEqual(exp[field], act[field], msg=field)
+            self.assertAlmostEqual(exp["health_score"], act["health_score"], places=6)
+
+    def test_invalid_rows_are_dropped(self):
+        records = [{"aqi": 50}, {"aqi": "n/a"}, {"aqi": 350}]
+        enriched = calculate_analytics_batch(records, hour=12)
+        self.assertEqual([r["severity"] for r in enriched], ["Optimal", "Emergency"])
+
+    def test_null_metrics_are_dropped_without_poisoning_state(self):
+        store = SensorStateStore()
+        records = [{"sensor_id": "S1", "aqi": 80}, {"sensor_id": "S1", "aqi": None}]
+        records += [{"sensor_id": "S1", "aqi": 90, "pm25": float("nan")}]
+        enriched = calculate_analytics_batch(records, state=store, hour=12)
+        self.assertEqual(len(enriched), 1)
+        after = calculate_analytics_batch([{"sensor_id": "S1", "aqi": 100}], state=store, hour=12)
+        self.assertTrue(math.isfinite(after[0]["volatility"]))
+        self.assertTrue(math.isfinite(after[0]["aqi_momentum"]))
+        json.dumps(enriched + after, allow_nan=False)
+
+    def test_decode_batch_skips_malformed_payloads(self):
+        payloads = [json.dumps({"aqi": 1}).encode(), b"{not json", json.dumps({"aqi": 2}).encode()]
+        self.assertEqual([r["aqi"] for r in decode_batch(payloads)], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the EcoPulse AI telemetry wire formats.
+Validates binary round-trips (including version-1 payloads), header-based format
+dispatch in mixed batches, and that binary columns feed the batch analytics exactly
+like decoded JSON.
+"""
+
+import json
+import unittest
+
+import numpy as np
+
+from ecopulse_ai.kafka.producer import SensorFleet
+from ecopulse_ai.kafka.wire import (
+    FORMAT_BINARY,
+    FORMAT_BINARY_V1,
+    FORMAT_HEADER,
+    FORMAT_JSON,
+    TELEMETRY_DTYPE_V1,
+    TELEMETRY_DTYPE_V2,
+    decode_messages,
+    encode_binary,
+    format_headers,
+    message_format,
+)
+from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics_batch
+
+
+def _records(n):
+    return [
+        {
+            "timestamp": f"2026-02-25T10:00:{i:02d}.250000",
+            "sensor_id": f"S{i % 3}",
+            "district": "Industrial North",
+            "aqi": 80.0 + i * 7.5,
+            "pm25": 20.0 + i,
+            "co2": 410.0,
+            "temperature": 27.5,
+            "humidity": 50.0,
+            "wind_speed": 4.0,
+            "traffic_density": 60.0 + i,
+            "industrial_index": 30.0,
+        }
+        for i in range(n)
+    ]
+
+
+class TestWireFormat(unittest.TestCase):
+    def test_binary_round_trip_is_compact_and_lossless(self):
+        records = _records(5)
+        records[1].update(state="IN-DL", lat=28.6139, lon=77.209)
+        payloads = encode_binary(records)
+        self.assertTrue(all(len(p) == TELEMETRY_DTYPE_V2.itemsize for p in payloads))
+        self.assertLess(len(payloads[0]), len(json.dumps(records[0])))
+
+        decoded, columns = decode_messages(payloads, [FORMAT_BINARY] * 5)
+        self.assertEqual(decoded, records)
+        inputs, valid = columns
+        self.assertTrue(valid.all())
+        np.testing.assert_array_equal(inputs["aqi"], [r["aqi"] for r in records])
+
+    def test_version_1_payloads_still_decode(self):
+        records = _records(2)
+        rows = np.frombuffer(b"".join(encode_binary(records)), dtype=TELEMETRY_DTYPE_V2)
+        legacy = rows[list(TELEMETRY_DTYPE_V1.names)].astype(TELEMETRY_DTYPE_V1)
+        legacy["version"] = 1
+        payloads = [row.tobytes() for row in legacy]
+        decoded, _ = decode_messages(payloads, [FORMAT_BINARY_V1] * 2)
+        self.assertEqual(decoded, records)
+
+    def test_header_dispatch_preserves_order_in_mixed_batches(self):
+        records = _records(4)
+        payloads = [
+            json.dumps(records[0]).encode(),
+            *encode_binary(records[1:3]),
+            json.dumps(records[3]).encode(),
+        ]
+        formats = [FORMAT_JSON, FORMAT_BINARY, FORMAT_BINARY, FORMAT_JSON]
+        decoded, columns = decode_messages(payloads, formats)
+        self.assertEqual([r["aqi"] for r in decoded], [r["aqi"] for r in records])
+        self.assertIsNone(columns)
+
+    def test_malformed_and_unknown_payloads_are_dropped(self):
+        good = encode_binary(_records(2))
+        decoded, _ = decode_messages([good[0], b"\x01short", good[1]], [FORMAT_BINARY] * 3)
+        self.assertEqual(len(decoded), 2)
+        decoded, _ = decode_messages([b"x"], ["telemetry-v9"])
+        self.assertEqual(decoded, [])
+
+    def test_headers(self):
+        self.assertEqual(message_format(format_headers(FORMAT_BINARY)), FORMAT_BINARY)
+        self.assertEqual(message_format([(FORMAT_HEADER, b"json")]), FORMAT_JSON)
+        self.assertEqual(message_format(None), FORMAT_JSON)
+
+    def test_binary_columns_match_json_analytics(self):
+        records = _records(12)
+        from_json = calculate_analytics_batch(json.loads(json.dumps(records)), hour=12)
+        decoded, columns = decode_messages(encode_binary(records), [FORMAT_BINARY] * 12)
+        from_binary = calculate_analytics_batch(decoded, hour=12, columns=columns)
+        self.assertEqual(from_binary, from_json)
+
+    def test_fleet_binary_payloads_decode(self):
+        fleet = SensorFleet(6, seed=2)
+        payloads = fleet.encode_binary([0, 5], 1771999200.0)
+        decoded, _ = decode_messages(payloads, [FORMAT_BINARY] * 2)
+        self.assertEqual(decoded[1]["sensor_id"], "SENSOR-00006")
+        self.assertEqual(decoded[0]["timestamp"], "2026-02-25T06:00:00.000000")
+        self.assertAlmostEqual(decoded[0]["aqi"], float(fleet.values["aqi"][0]))
+        self.assertEqual((decoded[1]["lat"], decoded[1]["lon"]), fleet.positions[5])
+
+
+if __name__ == "__main__":
+    unittest.main()
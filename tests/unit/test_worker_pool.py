@@ -0,0 +1,118 @@
+import multiprocessing as mp
+import unittest
+from unittest import mock
+
+from ecopulse_ai.streaming import worker_pool
+from ecopulse_ai.streaming.pathway_pipeline import calculate_analytics_batch
+from ecopulse_ai.streaming.state_store import sensor_key
+from ecopulse_ai.streaming.worker_pool import ConsumerPool, SharedFeed, SharedFeedView
+
+
+def _publish(name, capacity, sensor_id, values):
+    feed = SharedFeed.attach(name, capacity)
+    records = [{"sensor_id": sensor_id, "aqi": v, "wind_speed": 5.0} for v in values]
+    feed.write(calculate_analytics_batch(records, hour=12))
+    feed.close()
+
+
+def _wait_for_stop(index, workers, shm_name, capacity, assignment, stop):
+    """Stand-in worker that exits cleanly only once the pool signals shutdown."""
+    stop.wait(10)
+
+
+class TestSharedFeed(unittest.TestCase):
+    def setUp(self):
+        self.feeds = [SharedFeed.create(capacity=8) for _ in range(2)]
+
+    def tearDown(self):
+        for feed in self.feeds:
+            feed.close()
+
+    def test_ring_keeps_latest_rows(self):
+        feed = self.feeds[0]
+        for start in range(0, 20, 3):
+            feed.write([{"sensor_id": "A", "aqi": float(v)} for v in range(start, start + 3)])
+        rows = feed.read()
+        self.assertEqual(rows["aqi"].tolist(), [13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0, 20.0])
+
+    def test_view_merges_shards_written_by_other_processes(self):
+        """Worker processes publish shards; the parent reads a merged, enriched view."""
+        for feed, sensor_id, values in zip(self.feeds, ["A", "B"], [[50, 60], [250, 260]]):
+            process = mp.Process(target=_publish, args=(feed.name, 8, sensor_id, values))
+            process.start()
+            process.join(10)
+
+        view = SharedFeedView(self.feeds)
+        records = view.snapshot()
+        self.assertEqual(sorted(r["sensor_id"] for r in records), ["A", "A", "B", "B"])
+        self.assertEqual([r["aqi"] for r in view.history_for({"sensor_id": "B"})], [250, 260])
+        latest_b = view.history_for({"sensor_id": "B"})[-1]
+        self.assertEqual(latest_b["severity"], "Critical")
+        self.assertEqual(latest_b["aqi_momentum"], 10.0)
+        self.assertIn("traffic", latest_b["attribution"])
+        (district,) = view.region_summary("district")
+        self.assertEqual((district["sensors"], district["aqi"]), (2, 160.0))
+
+    def test_view_keeps_coordinates_and_state(self):
+        """Distinct sensor positions and states survive the shared feed."""
+        sites = {"A": ("IN-DL", 28.61, 77.21), "B": ("IN-MH", 19.08, 72.88)}
+        for feed, (sensor_id, (state, lat, lon)) in zip(self.feeds, sites.items()):
+            feed.write(
+                [{"sensor_id": sensor_id, "aqi": 100.0, "state": state, "lat": lat, "lon": lon}]
+            )
+        view = SharedFeedView(self.feeds)
+        sensors = {s["sensor_id"]: s for s in view.sensors()}
+        for sensor_id, (state, lat, lon) in sites.items():
+            self.assertEqual((sensors[sensor_id]["lat"], sensors[sensor_id]["lon"]), (lat, lon))
+            self.assertEqual(view.history_for({"sensor_id": sensor_id})[-1]["state"], state)
+        self.assertEqual(
+            sorted(r["name"] for r in view.region_summary("state")), ["IN-DL", "IN-MH"]
+        )
+
+    def test_view_resyncs_after_ring_overrun(self):
+        """Sensors whose rows were overwritten before a read keep their latest value."""
+        feed = self.feeds[0]
+        view = SharedFeedView(self.feeds)
+        feed.write([{"sensor_id": "A", "aqi": 50.0}, {"sensor_id": "Z", "aqi": 300.0}])
+        self.assertEqual(len(view.sensors()), 2)
+
+        feed.write([{"sensor_id": "Z", "aqi": 90.0}])
+        feed.write([{"sensor_id": "A", "aqi": float(v)} for v in range(100, 112)])
+        with self.assertLogs(worker_pool.logger, "WARNING"):
+            sensors = {s["sensor_id"]: s["aqi"] for s in view.sensors()}
+        self.assertEqual(sensors, {"A": 111.0, "Z": 90.0})
+        # the forecaster restarts from the rows the ring still holds
+        self.assertEqual(view._forecasters[sensor_key({"sensor_id": "A"})].holt.count, 8)
+        self.assertNotIn(sensor_key({"sensor_id": "Z"}), view._forecasters)
+
+        restarted = SharedFeed.attach(feed.name, feed.capacity)
+        self.addCleanup(restarted.close)
+        restarted.write([{"sensor_id": "Z", "aqi": 95.0}])
+        self.assertEqual(int(restarted._header[2]), 2)
+
+    def test_view_forecasts_incrementally(self):
+        """Forecasters fold each merged record once, beyond what the ring still holds."""
+        view = SharedFeedView(self.feeds)
+        self.assertIsNone(view.forecast({"sensor_id": "A"}))
+        for start in range(100, 112, 3):
+            self.feeds[0].write(
+                [{"sensor_id": "A", "aqi": float(v)} for v in range(start, start + 3)]
+            )
+            forecast = view.forecast({"sensor_id": "A"}, n_steps=2)
+        self.assertEqual(forecast["next"], 112.0)
+        self.assertEqual(len(forecast["horizon"]["points"]), 2)
+        self.assertEqual(view._forecasters[sensor_key({"sensor_id": "A"})].holt.count, 12)
+        self.assertIsNone(view.forecast({"sensor_id": "ghost"}))
+
+
+class TestConsumerPool(unittest.TestCase):
+    def test_stop_lets_workers_exit_cleanly(self):
+        pool = ConsumerPool(2, capacity=8)
+        with mock.patch.object(worker_pool, "_worker_main", _wait_for_stop):
+            pool.start()
+        pool.stop(timeout=10)
+        self.assertEqual([p.exitcode for p in pool.processes], [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()